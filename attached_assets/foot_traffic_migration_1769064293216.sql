@@ -25,6 +25,14 @@ CREATE TABLE IF NOT EXISTS foot_traffic (
     time_spent_min INTEGER,
     time_spent_max INTEGER,
     
+    -- Summaries of popular_times (app/services/foot_traffic_aggregates.py)
+    avg_intensity REAL,
+    peak_hour SMALLINT,
+    peak_day VARCHAR(10),
+    weekday_avg REAL,
+    weekend_avg REAL,
+    hourly_profile JSONB,
+    
     -- Metadata
     data_source VARCHAR(50) DEFAULT 'google_maps',
     data_quality_score DECIMAL(3, 2),
@@ -48,6 +56,12 @@ CREATE INDEX IF NOT EXISTS idx_foot_traffic_place_type
 CREATE INDEX IF NOT EXISTS idx_foot_traffic_updated 
     ON foot_traffic(last_updated);
 
+CREATE INDEX IF NOT EXISTS idx_foot_traffic_avg_intensity 
+    ON foot_traffic(avg_intensity);
+
+CREATE INDEX IF NOT EXISTS idx_foot_traffic_peak_hour 
+    ON foot_traffic(peak_hour);
+
 -- Add helpful comment
 COMMENT ON COLUMN foot_traffic.popular_times IS 
 'JSON object with day names as keys and arrays of 24 hourly traffic values (0-100). 
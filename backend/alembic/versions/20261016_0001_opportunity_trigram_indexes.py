@@ -0,0 +1,37 @@
+"""Add pg_trgm GIN indexes for opportunity duplicate lookup
+
+Also merges the two open heads (20260121_0001, 20260203_saved_searches).
+
+Revision ID: 20261016_0001
+Revises: 20260121_0001, 20260203_saved_searches
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+
+revision = '20261016_0001'
+down_revision = ('20260121_0001', '20260203_saved_searches')
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS idx_opportunities_title_trgm "
+        "ON opportunities USING gin (title gin_trgm_ops)"
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS idx_opportunities_category_trgm "
+        "ON opportunities USING gin (category gin_trgm_ops)"
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS idx_opportunities_city_trgm "
+        "ON opportunities USING gin (city gin_trgm_ops)"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS idx_opportunities_city_trgm")
+    op.execute("DROP INDEX IF EXISTS idx_opportunities_category_trgm")
+    op.execute("DROP INDEX IF EXISTS idx_opportunities_title_trgm")
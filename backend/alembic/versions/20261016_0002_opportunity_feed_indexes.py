@@ -0,0 +1,34 @@
+"""Add composite indexes for the opportunity feed keyset pagination
+
+Revision ID: 20261016_0002
+Revises: 20261016_0001
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+
+revision = '20261016_0002'
+down_revision = '20261016_0001'
+branch_labels = None
+depends_on = None
+
+# Sort columns of GET /opportunities; each index matches the feed's
+# "column DESC NULLS LAST, id DESC" ordering under the status filters.
+FEED_SORT_COLUMNS = {
+    'idx_opportunities_feed_recent': 'created_at',
+    'idx_opportunities_feed_feasibility': 'feasibility_score',
+    'idx_opportunities_feed_trending': 'growth_rate',
+}
+
+
+def upgrade() -> None:
+    for index_name, column in FEED_SORT_COLUMNS.items():
+        op.execute(
+            f"CREATE INDEX IF NOT EXISTS {index_name} ON opportunities "
+            f"(status, moderation_status, {column} DESC NULLS LAST, id DESC)"
+        )
+
+
+def downgrade() -> None:
+    for index_name in reversed(list(FEED_SORT_COLUMNS)):
+        op.execute(f"DROP INDEX IF EXISTS {index_name}")
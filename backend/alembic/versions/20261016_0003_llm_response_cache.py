@@ -0,0 +1,42 @@
+"""Add llm_response_cache table for the shared LLM response cache
+
+Revision ID: 20261016_0003
+Revises: 20261016_0002
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '20261016_0003'
+down_revision = '20261016_0002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'llm_response_cache',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('cache_key', sa.String(length=64), nullable=False),
+        sa.Column('provider', sa.String(length=50), nullable=False),
+        sa.Column('model', sa.String(length=100), nullable=False),
+        sa.Column('task', sa.String(length=100), nullable=True),
+        sa.Column('response', sa.Text(), nullable=False),
+        sa.Column('input_tokens', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('output_tokens', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('hit_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_llm_response_cache_id', 'llm_response_cache', ['id'], unique=False)
+    op.create_index('ix_llm_response_cache_cache_key', 'llm_response_cache', ['cache_key'], unique=True)
+    op.create_index('ix_llm_response_cache_expires_at', 'llm_response_cache', ['expires_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_llm_response_cache_expires_at', table_name='llm_response_cache')
+    op.drop_index('ix_llm_response_cache_cache_key', table_name='llm_response_cache')
+    op.drop_index('ix_llm_response_cache_id', table_name='llm_response_cache')
+    op.drop_table('llm_response_cache')
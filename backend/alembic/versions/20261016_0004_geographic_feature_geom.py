@@ -0,0 +1,38 @@
+"""Add PostGIS point geometry with GiST index to geographic_features
+
+The column is generated from latitude/longitude, so every existing writer
+keeps it current without application changes.
+
+Revision ID: 20261016_0004
+Revises: 20261016_0003
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+
+revision = '20261016_0004'
+down_revision = '20261016_0003'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS postgis")
+    op.execute("""
+        ALTER TABLE geographic_features
+        ADD COLUMN IF NOT EXISTS geom geometry(Point, 4326)
+        GENERATED ALWAYS AS (
+            CASE WHEN latitude IS NOT NULL AND longitude IS NOT NULL
+                 THEN ST_SetSRID(ST_MakePoint(longitude, latitude), 4326)
+            END
+        ) STORED
+    """)
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS idx_geographic_features_geom "
+        "ON geographic_features USING gist (geom)"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS idx_geographic_features_geom")
+    op.execute("ALTER TABLE geographic_features DROP COLUMN IF EXISTS geom")
@@ -0,0 +1,26 @@
+"""Add an index for claiming queued layer report jobs
+
+Revision ID: 20261016_0005
+Revises: 20261016_0004
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+
+revision = '20261016_0005'
+down_revision = '20261016_0004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Report workers claim the oldest pending report of the layer types and
+    # look up stale "generating" rows (services/report_queue).
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS idx_generated_reports_queue "
+        "ON generated_reports (status, report_type, created_at)"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS idx_generated_reports_queue")
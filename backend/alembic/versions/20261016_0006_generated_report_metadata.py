@@ -0,0 +1,23 @@
+"""Add generation_metadata to generated_reports
+
+Revision ID: 20261016_0006
+Revises: 20261016_0005
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '20261016_0006'
+down_revision = '20261016_0005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Per-section render timings of layer reports (services/report_sections)
+    op.add_column('generated_reports', sa.Column('generation_metadata', sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('generated_reports', 'generation_metadata')
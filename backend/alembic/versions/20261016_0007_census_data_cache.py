@@ -0,0 +1,38 @@
+"""Add census_data_cache table for the shared Census API cache
+
+Revision ID: 20261016_0007
+Revises: 20261016_0006
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '20261016_0007'
+down_revision = '20261016_0006'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'census_data_cache',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('dataset', sa.String(length=50), nullable=False),
+        sa.Column('year', sa.Integer(), nullable=False),
+        sa.Column('geography_type', sa.String(length=20), nullable=False),
+        sa.Column('geography_id', sa.String(length=20), nullable=False),
+        sa.Column('data', sa.Text(), nullable=False),
+        sa.Column('fetched_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('dataset', 'year', 'geography_type', 'geography_id', name='uq_census_data_cache_key')
+    )
+    op.create_index('ix_census_data_cache_id', 'census_data_cache', ['id'], unique=False)
+    op.create_index('ix_census_data_cache_expires_at', 'census_data_cache', ['expires_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_census_data_cache_expires_at', table_name='census_data_cache')
+    op.drop_index('ix_census_data_cache_id', table_name='census_data_cache')
+    op.drop_table('census_data_cache')
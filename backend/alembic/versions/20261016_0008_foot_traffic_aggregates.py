@@ -0,0 +1,67 @@
+"""Precomputed foot traffic intensity columns and hex-binned heatmap table
+
+Adds per-place summaries of popular_times to foot_traffic and the
+foot_traffic_hex_bins table, then backfills both from existing rows.
+
+Revision ID: 20261016_0008
+Revises: 20261016_0007
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '20261016_0008'
+down_revision = '20261016_0007'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'foot_traffic_hex_bins',
+        sa.Column('resolution', sa.SmallInteger(), nullable=False),
+        sa.Column('hex_q', sa.Integer(), nullable=False),
+        sa.Column('hex_r', sa.Integer(), nullable=False),
+        sa.Column('center_latitude', sa.Float(), nullable=False),
+        sa.Column('center_longitude', sa.Float(), nullable=False),
+        sa.Column('place_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('intensity_sum', sa.Float(), nullable=False, server_default='0'),
+        sa.Column('weekday_sum', sa.Float(), nullable=False, server_default='0'),
+        sa.Column('weekend_sum', sa.Float(), nullable=False, server_default='0'),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.PrimaryKeyConstraint('resolution', 'hex_q', 'hex_r')
+    )
+    op.create_index(
+        'ix_foot_traffic_hex_bins_lookup',
+        'foot_traffic_hex_bins',
+        ['resolution', 'center_latitude', 'center_longitude'],
+        unique=False
+    )
+
+    bind = op.get_bind()
+    if not sa.inspect(bind).has_table('foot_traffic'):
+        # Its creation script has the columns; FootTrafficCollector adds them to older tables
+        return
+
+    from app.services.foot_traffic_aggregates import SUMMARY_COLUMNS_DDL, rebuild_foot_traffic_aggregates
+    for statement in SUMMARY_COLUMNS_DDL:
+        op.execute(statement)
+
+    rebuild_foot_traffic_aggregates(bind)
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS idx_foot_traffic_peak_hour")
+    op.execute("DROP INDEX IF EXISTS idx_foot_traffic_avg_intensity")
+    op.execute("""
+        ALTER TABLE IF EXISTS foot_traffic
+            DROP COLUMN IF EXISTS hourly_profile,
+            DROP COLUMN IF EXISTS weekend_avg,
+            DROP COLUMN IF EXISTS weekday_avg,
+            DROP COLUMN IF EXISTS peak_day,
+            DROP COLUMN IF EXISTS peak_hour,
+            DROP COLUMN IF EXISTS avg_intensity
+    """)
+    op.drop_index('ix_foot_traffic_hex_bins_lookup', table_name='foot_traffic_hex_bins')
+    op.drop_table('foot_traffic_hex_bins')
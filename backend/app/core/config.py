@@ -23,9 +23,11 @@ class Settings(BaseSettings):
     # CORS - allow all origins by default for development (set explicit origins in production).
     BACKEND_CORS_ORIGINS: List[str] = ["*"]
 
-    # Basic rate limiting (single-process best-effort).
+    # Rate limiting. Backend "memory" is per-process; "postgres" shares
+    # limits across workers through the rate_limit_counters table.
     RATE_LIMIT_ENABLED: bool = True
     RATE_LIMIT_DEFAULT_PER_MINUTE: int = 300
+    RATE_LIMIT_BACKEND: str = "memory"
 
     # Background jobs (single-runtime in-process scheduler)
     JOBS_ENABLED: bool = True
@@ -37,6 +39,65 @@ class Settings(BaseSettings):
     AI_ANALYSIS_JOB_ENABLED: bool = True
     AI_ANALYSIS_BATCH_SIZE: int = 20
 
+    # Batch LLM work (see services/ai_batch_engine): parallel calls in flight,
+    # results per commit, and the shared per-provider request budget.
+    AI_BATCH_CONCURRENCY: int = 8
+    AI_BATCH_COMMIT_EVERY: int = 25
+    ANTHROPIC_REQUESTS_PER_MINUTE: int = 50
+
+    # Shared LLM response cache (services/llm_cache): in-process LRU size and
+    # the TTL for tasks without an entry in TASK_TTL_SECONDS.
+    LLM_CACHE_ENABLED: bool = True
+    LLM_CACHE_MEMORY_ENTRIES: int = 1000
+    LLM_CACHE_DEFAULT_TTL_SECONDS: int = 86400
+
+    # Shared Census API cache (services/census_cache): in-process LRU size and
+    # how long a stored table row stays valid.
+    CENSUS_CACHE_MEMORY_ENTRIES: int = 5000
+    CENSUS_CACHE_TTL_DAYS: int = 30
+
+    # Instant saved-search alerts (services/instant_alerts): dispatched from
+    # opportunity-created events, batching events that arrive within the window.
+    SAVED_SEARCH_INSTANT_ALERTS_ENABLED: bool = True
+    SAVED_SEARCH_INSTANT_COALESCE_SECONDS: float = 5.0
+
+    # Layer report queue (services/report_queue): workers per process, how
+    # often idle workers poll for jobs queued by other processes, and when a
+    # report stuck in "generating" is retried.
+    REPORT_WORKERS_ENABLED: bool = True
+    REPORT_WORKER_CONCURRENCY: int = 2
+    REPORT_JOB_POLL_SECONDS: float = 5.0
+    REPORT_JOB_TIMEOUT_MINUTES: int = 15
+    REPORT_JOB_MAX_ATTEMPTS: int = 2
+    # Threads rendering independent sections of one layer report (services/report_sections)
+    REPORT_SECTION_WORKERS: int = 4
+
+    # Shared cache of trade area competitors/demographics/maps (services/trade_area_cache)
+    TRADE_AREA_CACHE_ENTRIES: int = 5000
+
+    # Shared nearest-road AADT lookups (services/dot_traffic_service)
+    DOT_TRAFFIC_CACHE_ENTRIES: int = 20000
+    DOT_TRAFFIC_CACHE_TTL_SECONDS: int = 86400
+    # Estimates may stand in for a transient DB/DOT API failure; retry them sooner
+    DOT_TRAFFIC_ESTIMATE_CACHE_TTL_SECONDS: int = 600
+
+    # Authenticated principal cache (services/principal_cache): entries, and how
+    # long other workers may serve a user/tier/unlock set changed elsewhere.
+    PRINCIPAL_CACHE_ENTRIES: int = 10000
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 30
+
+    # Google scrape jobs (services/google_scrape_executor): SerpAPI calls in
+    # flight per job, the account-wide request budget, and cache lifetime.
+    SERPAPI_CONCURRENCY: int = 5
+    SERPAPI_REQUESTS_PER_MINUTE: int = 300
+    GOOGLE_SEARCH_CACHE_TTL_HOURS: int = 24
+
+    # Time budget for fetching all zones of one optimal-zones sweep (services/zone_fanout)
+    ZONE_FETCH_BUDGET_SECONDS: float = 25.0
+
+    # On-disk cache for rendered vector tiles (services/vector_tiles)
+    TILE_CACHE_DIR: str = "/tmp/oppgrid-tiles"
+
     # Stripe subscription reconciliation (defense-in-depth for missed webhooks)
     STRIPE_RECONCILE_JOB_ENABLED: bool = False
     STRIPE_RECONCILE_JOB_INTERVAL_SECONDS: int = 21600  # 6 hours
@@ -4,6 +4,7 @@ from sqlalchemy.orm import Session
 from app.db.database import get_db
 from app.core.security import decode_access_token
 from app.models.user import User
+from app.services.principal_cache import invalidate_principal, load_principal
 from typing import Optional, Any
 from cachetools import TTLCache
 import threading
@@ -33,7 +34,7 @@ async def get_current_user(
     if email is None:
         raise credentials_exception
 
-    user = db.query(User).filter(User.email == email).first()
+    user = load_principal(db, email)
     if user is None:
         raise credentials_exception
 
@@ -82,8 +83,7 @@ async def get_current_user_optional(
     if email is None:
         return None
     
-    user = db.query(User).filter(User.email == email).first()
-    return user
+    return load_principal(db, email)
 
 
 from app.models.subscription import Subscription, SubscriptionTier, SubscriptionStatus
@@ -128,6 +128,12 @@ def invalidate_subscription_cache(user_id: int) -> None:
         _subscription_cache.pop(cache_key, None)
 
 
+def invalidate_user_access(user_id: int) -> None:
+    """Invalidate the cached principal and tier after a ban, role or tier change"""
+    invalidate_subscription_cache(user_id)
+    invalidate_principal(user_id)
+
+
 class RequireSubscription:
     """Dependency that requires a minimum subscription tier"""
     
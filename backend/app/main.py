@@ -9,6 +9,7 @@ from fastapi.responses import FileResponse
 
 from app.core.config import settings
 from app.middleware.rate_limit import RateLimitMiddleware
+from app.services.rate_limiter import get_rate_limiter
 from app.middleware.security import SecurityHeadersMiddleware
 from app.middleware.trace_id import TraceIdMiddleware, install_trace_id_factory, configure_app_logging
 from app.routers import (
@@ -75,6 +76,7 @@ from app.routers import (
     deep_clone,
     saved_layers,
     foot_traffic,
+    tiles,
     saved_searches,
     enhanced_workspaces,
 )
@@ -101,12 +103,14 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Basic platform hardening (best-effort, single-runtime).
+# Basic platform hardening. These are pure ASGI middleware so streaming
+# responses pass through untouched (see scripts/bench_middleware.py).
 app.add_middleware(SecurityHeadersMiddleware)
 app.add_middleware(
     RateLimitMiddleware,
     enabled=settings.RATE_LIMIT_ENABLED,
     default_limit_per_minute=settings.RATE_LIMIT_DEFAULT_PER_MINUTE,
+    backend=get_rate_limiter(),
 )
 app.add_middleware(TraceIdMiddleware)
 
@@ -179,6 +183,7 @@ app.include_router(workspace_digital.router, prefix=f"{settings.API_V1_PREFIX}",
 app.include_router(deep_clone.router, prefix=f"{settings.API_V1_PREFIX}", tags=["Deep Clone"])
 app.include_router(saved_layers.router, prefix=f"{settings.API_V1_PREFIX}/saved-layers", tags=["Saved Layers"])
 app.include_router(foot_traffic.router, prefix=f"{settings.API_V1_PREFIX}", tags=["Foot Traffic"])
+app.include_router(tiles.router, prefix=f"{settings.API_V1_PREFIX}", tags=["Vector Tiles"])
 app.include_router(enhanced_workspaces.router, prefix=f"{settings.API_V1_PREFIX}", tags=["Enhanced Workspaces"])
 
 
@@ -1,36 +1,37 @@
 from __future__ import annotations
 
-import time
-import threading
-from dataclasses import dataclass
-from typing import Dict, Tuple
+from typing import Dict, Optional, Tuple
 
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
-from starlette.responses import Response, JSONResponse
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
+from app.services.rate_limiter import RateLimiter, create_rate_limiter
 
-@dataclass
-class _Bucket:
-    window_start: float
-    count: int
 
-
-class RateLimitMiddleware(BaseHTTPMiddleware):
+class RateLimitMiddleware:
     """
-    Very small in-memory rate limiter (single-process best-effort).
+    Per-client, per-path rate limiter (pure ASGI).
 
-    This is intentionally simple for the current single-runtime deploy shape.
+    Counting is delegated to a RateLimiter backend: "memory" for a single
+    worker, "postgres" to share limits across workers via rate_limit_counters.
     """
 
-    def __init__(self, app, enabled: bool = True, default_limit_per_minute: int = 300):
-        super().__init__(app)
+    def __init__(
+        self,
+        app: ASGIApp,
+        enabled: bool = True,
+        default_limit_per_minute: int = 300,
+        backend: str | RateLimiter = "memory",
+        overrides: Optional[Dict[Tuple[str, str], int]] = None,
+    ):
+        self.app = app
         self.enabled = enabled
         self.default_limit = max(1, int(default_limit_per_minute))
-        self._lock = threading.Lock()
-        self._buckets: Dict[Tuple[str, str], _Bucket] = {}
+        self.limiter = backend if isinstance(backend, RateLimiter) else create_rate_limiter(backend)
 
         # Tighten limits on high-risk endpoints.
+        # A path ending in "*" applies to every path with that prefix.
         self._overrides = {
             ("POST", "/api/v1/auth/login"): 20,
             ("POST", "/api/v1/auth/register"): 10,
@@ -39,6 +40,13 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
             ("POST", "/api/v1/subscriptions/pay-per-unlock"): 60,
             ("POST", "/api/v1/subscriptions/confirm-pay-per-unlock"): 60,
         }
+        if overrides:
+            self._overrides.update(overrides)
+        self._prefix_overrides = sorted(
+            ((method, path[:-1], limit) for (method, path), limit in self._overrides.items() if path.endswith("*")),
+            key=lambda item: len(item[1]),
+            reverse=True,
+        )
 
         # Do not rate-limit provider callbacks/webhooks (providers will retry).
         self._skip_prefixes = (
@@ -51,67 +59,63 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
             "/auth/",
         )
 
-    def _client_ip(self, request: Request) -> str:
-        xff = request.headers.get("x-forwarded-for")
+    def _client_ip(self, scope: Scope) -> str:
+        xff = Headers(scope=scope).get("x-forwarded-for")
         if xff:
             return xff.split(",")[0].strip()
-        return request.client.host if request.client else "unknown"
+        client = scope.get("client")
+        return client[0] if client else "unknown"
 
     def _limit_for(self, method: str, path: str) -> int:
-        return self._overrides.get((method, path), self.default_limit)
-
-    async def dispatch(self, request: Request, call_next):
-        if not self.enabled:
-            return await call_next(request)
-
-        if request.scope.get("type") != "http":
-            return await call_next(request)
-
-        path = request.url.path
-        for prefix in self._skip_prefixes:
-            if path.startswith(prefix):
-                return await call_next(request)
-
-        method = request.method.upper()
-        ip = self._client_ip(request)
-
-        # Fixed 60s window.
-        now = time.time()
-        key = (ip, path)
+        limit = self._overrides.get((method, path))
+        if limit is not None:
+            return limit
+        for override_method, prefix, prefix_limit in self._prefix_overrides:
+            if override_method == method and path.startswith(prefix):
+                return prefix_limit
+        return self.default_limit
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if not self.enabled or scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        path = scope["path"]
+        if path.startswith(self._skip_prefixes):
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"].upper()
+        ip = self._client_ip(scope)
         limit = self._limit_for(method, path)
 
-        with self._lock:
-            b = self._buckets.get(key)
-            if not b or (now - b.window_start) >= 60:
-                b = _Bucket(window_start=now, count=0)
-                self._buckets[key] = b
-
-            b.count += 1
-            remaining = max(0, limit - b.count)
-            reset_in = int(max(0, 60 - (now - b.window_start)))
-
-            # Small pruning to avoid unbounded growth.
-            if len(self._buckets) > 5000:
-                cutoff = now - 120
-                for k in list(self._buckets.keys())[:2000]:
-                    if self._buckets[k].window_start < cutoff:
-                        self._buckets.pop(k, None)
-
-            if b.count > limit:
-                return JSONResponse(
-                    status_code=429,
-                    content={"detail": "Rate limit exceeded"},
-                    headers={
-                        "Retry-After": str(reset_in),
-                        "X-RateLimit-Limit": str(limit),
-                        "X-RateLimit-Remaining": "0",
-                        "X-RateLimit-Reset": str(reset_in),
-                    },
-                )
-
-        response: Response = await call_next(request)
-        response.headers.setdefault("X-RateLimit-Limit", str(limit))
-        response.headers.setdefault("X-RateLimit-Remaining", str(remaining))
-        response.headers.setdefault("X-RateLimit-Reset", str(reset_in))
-        return response
+        result = await self.limiter.hit_async(f"{ip}:{path}", limit)
+
+        if not result.allowed:
+            response = JSONResponse(
+                status_code=429,
+                content={"detail": "Rate limit exceeded"},
+                headers={
+                    "Retry-After": str(result.retry_after),
+                    "X-RateLimit-Limit": str(result.limit),
+                    "X-RateLimit-Remaining": "0",
+                    "X-RateLimit-Reset": str(result.reset_after),
+                },
+            )
+            await response(scope, receive, send)
+            return
+
+        rate_headers = (
+            ("X-RateLimit-Limit", str(result.limit)),
+            ("X-RateLimit-Remaining", str(result.remaining)),
+            ("X-RateLimit-Reset", str(result.reset_after)),
+        )
+
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                for name, value in rate_headers:
+                    headers.setdefault(name, value)
+            await send(message)
 
+        await self.app(scope, receive, send_with_headers)
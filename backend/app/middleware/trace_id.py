@@ -3,8 +3,8 @@
 import uuid
 import logging
 from contextvars import ContextVar
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 trace_id_var: ContextVar[str] = ContextVar("trace_id", default="")
 _old_factory = None
@@ -13,16 +13,29 @@ def get_trace_id() -> str:
     """Get the current request's trace ID."""
     return trace_id_var.get()
 
-class TraceIdMiddleware(BaseHTTPMiddleware):
-    """Middleware that assigns a unique trace ID to each request."""
+class TraceIdMiddleware:
+    """Pure ASGI middleware that assigns a unique trace ID to each request."""
     
-    async def dispatch(self, request: Request, call_next):
-        trace_id = request.headers.get("X-Trace-ID") or str(uuid.uuid4())[:12]
-        trace_id_var.set(trace_id)
+    def __init__(self, app: ASGIApp):
+        self.app = app
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        trace_id = Headers(scope=scope).get("X-Trace-ID") or str(uuid.uuid4())[:12]
+        token = trace_id_var.set(trace_id)
+        
+        async def send_with_trace_id(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message)["X-Trace-ID"] = trace_id
+            await send(message)
         
-        response = await call_next(request)
-        response.headers["X-Trace-ID"] = trace_id
-        return response
+        try:
+            await self.app(scope, receive, send_with_trace_id)
+        finally:
+            trace_id_var.reset(token)
 
 def install_trace_id_factory():
     """Install a LogRecord factory that adds trace_id to all log records.
@@ -33,6 +33,8 @@ from .detected_trend import DetectedTrend
 from .trend_opportunity_mapping import TrendOpportunityMapping
 from .location_analysis_cache import LocationAnalysisCache, BusinessType
 from .idea_validation_cache import IdeaValidationCache
+from .llm_response_cache import LLMResponseCache
+from .census_data_cache import CensusDataCache
 from .scraped_source import ScrapedSource, SourceType
 from .geographic_feature import GeographicFeature, FeatureType
 from .map_layer import MapLayer, LayerType
@@ -133,6 +135,8 @@ __all__ = [
     "LocationAnalysisCache",
     "BusinessType",
     "IdeaValidationCache",
+    "LLMResponseCache",
+    "CensusDataCache",
     "ScrapedSource",
     "SourceType",
     "GeographicFeature",
@@ -0,0 +1,25 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime, UniqueConstraint
+from sqlalchemy.sql import func
+from app.db.database import Base
+
+
+class CensusDataCache(Base):
+    """
+    Back tier of the shared Census API cache (see services/census_cache).
+    One row per (dataset, year, geography); `data` is the parsed result as JSON.
+    """
+    __tablename__ = "census_data_cache"
+    __table_args__ = (
+        UniqueConstraint("dataset", "year", "geography_type", "geography_id", name="uq_census_data_cache_key"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    dataset = Column(String(50), nullable=False)
+    year = Column(Integer, nullable=False)
+    geography_type = Column(String(20), nullable=False)
+    geography_id = Column(String(20), nullable=False)
+
+    data = Column(Text, nullable=False)
+
+    fetched_at = Column(DateTime(timezone=True), server_default=func.now())
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
@@ -1,5 +1,5 @@
 import enum
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Enum
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Enum, JSON
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.db.database import Base
@@ -71,6 +71,7 @@ class GeneratedReport(Base):
     
     generation_time_ms = Column(Integer, nullable=True)
     tokens_used = Column(Integer, nullable=True)
+    generation_metadata = Column(JSON, nullable=True)  # Per-section render timings
     
     error_type = Column(String(50), nullable=True)
     error_message = Column(Text, nullable=True)
@@ -28,3 +28,7 @@ class GeographicFeature(Base):
     confidence_score = Column(Float, nullable=True)
     properties = Column(JSONB, nullable=True)
     processed_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    # The table also has `geom geometry(Point, 4326)`, generated by Postgres
+    # from latitude/longitude with a GiST index (see the geographic_feature_geom
+    # migration). It is queried with raw SQL in MapDataEngine and not mapped here.
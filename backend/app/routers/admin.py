@@ -35,9 +35,10 @@ from app.schemas.admin import (
     AdminPartnerOutreachCreate,
     AdminPartnerOutreachUpdate,
 )
-from app.core.dependencies import get_current_admin_user
+from app.core.dependencies import get_current_admin_user, invalidate_user_access
 from app.services.audit import log_event
 from anthropic import Anthropic
+from app.services.ai_batch_engine import AIBatchEngine
 import json
 import logging
 
@@ -623,6 +624,7 @@ def ban_user(
     user.ban_reason = ban_data.ban_reason
     user.is_active = False
     db.commit()
+    invalidate_user_access(user.id)
 
     log_event(
         db,
@@ -658,6 +660,7 @@ def unban_user(
     user.ban_reason = None
     user.is_active = True
     db.commit()
+    invalidate_user_access(user.id)
 
     log_event(
         db,
@@ -1042,16 +1045,15 @@ async def recategorize_opportunities(
         'pet services': 'Shopping & Services',
     }
     
-    for opp in opportunities:
-        try:
-            context = f"""
+    def build_prompt(opp: Opportunity) -> str:
+        context = f"""
 Title: {opp.title or 'Unknown'}
 Description: {opp.description or 'No description'}
 Current Category: {opp.category or 'None'}
 City: {opp.city or 'Unknown'}
 """
-            
-            prompt = f"""Analyze this business opportunity and determine the best category and improved title.
+        
+        return f"""Analyze this business opportunity and determine the best category and improved title.
 
 {context}
 
@@ -1075,52 +1077,63 @@ Respond in JSON format:
   "reason": "Brief explanation"
 }}"""
 
-            message = client.messages.create(
-                model="claude-sonnet-4-20250514",
-                max_tokens=300,
-                messages=[{"role": "user", "content": prompt}]
-            )
-            response = message.content[0].text if message.content else ""
-            
-            try:
-                import re
-                json_match = re.search(r'\{[\s\S]*?\}', response)
-                if json_match:
-                    result = json.loads(json_match.group())
-                    
-                    new_category = result.get('category', '').strip()
-                    new_title = result.get('title', '').strip()
-                    
-                    updated = False
-                    category_key = new_category.lower()
-                    
-                    if category_key in valid_categories:
-                        normalized_category = valid_categories[category_key]
-                        opp.category = normalized_category
-                        updated = True
-                    else:
-                        errors.append(f"Opportunity {opp.id}: Invalid category '{new_category}'")
-                        skipped_count += 1
-                    
-                    if new_title and len(new_title) >= 20:
-                        opp.title = new_title[:500]
-                        updated = True
-                    
-                    if updated:
-                        opp.ai_analyzed = True
-                        opp.ai_analyzed_at = datetime.utcnow()
-                        updated_count += 1
+    def request_recategorization(job) -> str:
+        message = client.messages.create(
+            model="claude-sonnet-4-20250514",
+            max_tokens=300,
+            messages=[{"role": "user", "content": job[1]}]
+        )
+        return message.content[0].text if message.content else ""
+
+    def apply_recategorization(job, response: str):
+        nonlocal updated_count, skipped_count
+        opp = job[0]
+        try:
+            import re
+            json_match = re.search(r'\{[\s\S]*?\}', response)
+            if json_match:
+                result = json.loads(json_match.group())
+                
+                new_category = result.get('category', '').strip()
+                new_title = result.get('title', '').strip()
+                
+                updated = False
+                category_key = new_category.lower()
+                
+                if category_key in valid_categories:
+                    normalized_category = valid_categories[category_key]
+                    opp.category = normalized_category
+                    updated = True
                 else:
-                    errors.append(f"Opportunity {opp.id}: No JSON in response")
+                    errors.append(f"Opportunity {opp.id}: Invalid category '{new_category}'")
                     skipped_count += 1
-                    
-            except json.JSONDecodeError as e:
-                errors.append(f"Opportunity {opp.id}: JSON parse error - {str(e)[:50]}")
+                
+                if new_title and len(new_title) >= 20:
+                    opp.title = new_title[:500]
+                    updated = True
+                
+                if updated:
+                    opp.ai_analyzed = True
+                    opp.ai_analyzed_at = datetime.utcnow()
+                    updated_count += 1
+            else:
+                errors.append(f"Opportunity {opp.id}: No JSON in response")
                 skipped_count += 1
                 
-        except Exception as e:
-            errors.append(f"Opportunity {opp.id}: {str(e)[:100]}")
-            logger.warning(f"Failed to recategorize opportunity {opp.id}: {e}")
+        except json.JSONDecodeError as e:
+            errors.append(f"Opportunity {opp.id}: JSON parse error - {str(e)[:50]}")
+            skipped_count += 1
+
+    # Prompts are built up front: the engine's incremental commits expire the ORM objects.
+    jobs = [(opp, build_prompt(opp)) for opp in opportunities]
+    stats = await AIBatchEngine(provider="anthropic").run(
+        jobs,
+        request_recategorization,
+        on_result=apply_recategorization,
+        db=db,
+        describe=lambda job: f"Opportunity {job[0].id}",
+    )
+    errors.extend(stats.errors)
     
     db.commit()
     
@@ -1247,6 +1260,7 @@ def promote_to_admin(
 
     user.is_admin = True
     db.commit()
+    invalidate_user_access(user.id)
 
     log_event(
         db,
@@ -1291,6 +1305,7 @@ def demote_from_admin(
 
     user.is_admin = False
     db.commit()
+    invalidate_user_access(user.id)
 
     log_event(
         db,
@@ -1452,6 +1467,8 @@ def bulk_reset_invalid_subscriptions(
         sub.status = SubscriptionStatus.ACTIVE
     
     db.commit()
+    for sub in invalid_subs:
+        invalidate_user_access(sub.user_id)
     return {"message": f"Reset {count} invalid subscriptions to FREE", "count": count}
 
 
@@ -1482,6 +1499,7 @@ def update_subscription_tier(
 
     subscription.tier = new_tier
     db.commit()
+    invalidate_user_access(subscription.user_id)
 
     return {"message": f"Subscription updated to {new_tier.value}"}
 
@@ -1525,6 +1543,7 @@ def grant_subscription(
         db.add(subscription)
 
     db.commit()
+    invalidate_user_access(user_id)
 
     return {"message": f"Granted {tier} subscription to user {user.name}"}
 
@@ -2465,3 +2484,26 @@ async def get_report_usage_stats(
         ],
         "by_day": [{"date": str(r[0]), "count": r[1]} for r in reports_by_day],
     }
+
+
+@router.get("/llm-cache/stats")
+def get_llm_cache_stats(
+    admin_user: User = Depends(get_current_admin_user),
+    db: Session = Depends(get_db),
+):
+    """Shared LLM response cache hit/miss counters (this worker) and stored entries."""
+    from app.services.llm_cache import llm_cache
+    from app.models.llm_response_cache import LLMResponseCache
+    
+    stored = db.query(
+        func.count(LLMResponseCache.id),
+        func.coalesce(func.sum(LLMResponseCache.hit_count), 0),
+        func.coalesce(func.sum(LLMResponseCache.hit_count * (LLMResponseCache.input_tokens + LLMResponseCache.output_tokens)), 0),
+    ).filter(LLMResponseCache.expires_at > datetime.now(timezone.utc)).one()
+    
+    return {
+        "process": llm_cache.stats(),
+        "stored_entries": stored[0],
+        "stored_hits": int(stored[1]),
+        "stored_tokens_saved": int(stored[2]),
+    }
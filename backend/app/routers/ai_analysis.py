@@ -14,6 +14,7 @@ from anthropic import Anthropic
 from app.db.database import get_db
 from app.db.database import SessionLocal
 from app.models.opportunity import Opportunity
+from app.services.ai_batch_engine import AIBatchEngine
 
 router = APIRouter()
 
@@ -129,8 +130,8 @@ def _build_analysis_stats(db: Session) -> dict:
     }
 
 
-def analyze_single_opportunity(opp: Opportunity) -> dict:
-    prompt = f"""Analyze this opportunity:
+def build_analysis_prompt(opp: Opportunity) -> str:
+    return f"""Analyze this opportunity:
 
 TITLE: {opp.title}
 
@@ -144,26 +145,31 @@ GEOGRAPHIC SCOPE: {opp.geographic_scope}
 
 Provide your structured JSON analysis."""
 
+def request_analysis(prompt: str) -> Optional[dict]:
+    """Blocking Anthropic call; API errors propagate so batch callers can retry them"""
+    response = client.messages.create(
+        model="claude-sonnet-4-5",
+        max_tokens=1024,
+        system=ANALYSIS_SYSTEM_PROMPT,
+        messages=[{"role": "user", "content": prompt}]
+    )
+    
+    response_text = response.content[0].text
+    start_idx = response_text.find('{')
+    end_idx = response_text.rfind('}') + 1
+    if start_idx != -1 and end_idx > start_idx:
+        json_str = response_text[start_idx:end_idx]
+        return json.loads(json_str)
+    return None
+
+def analyze_single_opportunity(opp: Opportunity) -> dict:
     try:
-        response = client.messages.create(
-            model="claude-sonnet-4-5",
-            max_tokens=1024,
-            system=ANALYSIS_SYSTEM_PROMPT,
-            messages=[{"role": "user", "content": prompt}]
-        )
-        
-        response_text = response.content[0].text
-        start_idx = response_text.find('{')
-        end_idx = response_text.rfind('}') + 1
-        if start_idx != -1 and end_idx > start_idx:
-            json_str = response_text[start_idx:end_idx]
-            return json.loads(json_str)
-        return None
+        return request_analysis(build_analysis_prompt(opp))
     except Exception as e:
         print(f"Error analyzing opportunity {opp.id}: {e}")
         return None
 
-def update_opportunity_with_analysis(db: Session, opp: Opportunity, analysis: dict):
+def update_opportunity_with_analysis(db: Session, opp: Opportunity, analysis: dict, commit: bool = True):
     opp.ai_analyzed = True
     opp.ai_analyzed_at = datetime.utcnow()
     opp.ai_opportunity_score = analysis.get("opportunity_score", 50)
@@ -194,20 +200,10 @@ def update_opportunity_with_analysis(db: Session, opp: Opportunity, analysis: di
     if opp.ai_opportunity_score and not opp.market_size:
         opp.market_size = analysis.get("market_size_estimate", "")
     
-    db.commit()
+    if commit:
+        db.commit()
 
-@router.post("/analyze/{opportunity_id}", response_model=AnalysisResult)
-async def analyze_opportunity(opportunity_id: int, db: Session = Depends(get_db)):
-    opp = db.query(Opportunity).filter(Opportunity.id == opportunity_id).first()
-    if not opp:
-        raise HTTPException(status_code=404, detail="Opportunity not found")
-    
-    analysis = analyze_single_opportunity(opp)
-    if not analysis:
-        raise HTTPException(status_code=500, detail="Failed to analyze opportunity")
-    
-    update_opportunity_with_analysis(db, opp, analysis)
-    
+def _analysis_result(opp: Opportunity) -> AnalysisResult:
     return AnalysisResult(
         opportunity_id=opp.id,
         ai_opportunity_score=opp.ai_opportunity_score,
@@ -223,6 +219,24 @@ async def analyze_opportunity(opportunity_id: int, db: Session = Depends(get_db)
         ai_next_steps=json.loads(opp.ai_next_steps or "[]")
     )
 
+@router.post("/analyze/{opportunity_id}", response_model=AnalysisResult)
+async def analyze_opportunity(opportunity_id: int, db: Session = Depends(get_db)):
+    opp = db.query(Opportunity).filter(Opportunity.id == opportunity_id).first()
+    if not opp:
+        raise HTTPException(status_code=404, detail="Opportunity not found")
+    
+    try:
+        analysis = await asyncio.to_thread(request_analysis, build_analysis_prompt(opp))
+    except Exception as e:
+        print(f"Error analyzing opportunity {opp.id}: {e}")
+        analysis = None
+    if not analysis:
+        raise HTTPException(status_code=500, detail="Failed to analyze opportunity")
+    
+    update_opportunity_with_analysis(db, opp, analysis)
+    
+    return _analysis_result(opp)
+
 @router.post("/analyze-batch", response_model=BatchAnalysisResponse)
 async def analyze_batch(request: BatchAnalysisRequest, db: Session = Depends(get_db)):
     if request.opportunity_ids:
@@ -236,46 +250,28 @@ async def analyze_batch(request: BatchAnalysisRequest, db: Session = Depends(get
             Opportunity.validation_count.desc()
         ).limit(request.limit or 10).all()
     
+    # Prompts are built up front: incremental commits expire the ORM objects.
+    jobs = [(opp, build_analysis_prompt(opp)) for opp in opportunities]
     results = []
-    failed = 0
-    
-    for opp in opportunities:
-        try:
-            analysis = analyze_single_opportunity(opp)
-            if analysis:
-                update_opportunity_with_analysis(db, opp, analysis)
-                db.flush()
-                results.append(AnalysisResult(
-                    opportunity_id=opp.id,
-                    ai_opportunity_score=opp.ai_opportunity_score,
-                    ai_summary=opp.ai_summary,
-                    ai_market_size_estimate=opp.ai_market_size_estimate,
-                    ai_competition_level=opp.ai_competition_level,
-                    ai_urgency_level=opp.ai_urgency_level,
-                    ai_target_audience=opp.ai_target_audience,
-                    ai_pain_intensity=opp.ai_pain_intensity,
-                    ai_business_model_suggestions=json.loads(opp.ai_business_model_suggestions or "[]"),
-                    ai_competitive_advantages=json.loads(opp.ai_competitive_advantages or "[]"),
-                    ai_key_risks=json.loads(opp.ai_key_risks or "[]"),
-                    ai_next_steps=json.loads(opp.ai_next_steps or "[]")
-                ))
-            else:
-                failed += 1
-        except Exception as e:
-            print(f"Error processing opportunity {opp.id}: {e}")
-            failed += 1
-            db.rollback()
-            continue
-    
-    try:
-        db.commit()
-    except Exception as e:
-        print(f"Error committing batch: {e}")
-        db.rollback()
+
+    def apply_analysis(job, analysis):
+        opp = job[0]
+        if not analysis:
+            return False
+        update_opportunity_with_analysis(db, opp, analysis, commit=False)
+        results.append(_analysis_result(opp))
+
+    stats = await AIBatchEngine(provider="anthropic").run(
+        jobs,
+        lambda job: request_analysis(job[1]),
+        on_result=apply_analysis,
+        db=db,
+        describe=lambda job: f"opportunity {job[0].id}",
+    )
     
     return BatchAnalysisResponse(
         processed=len(results),
-        failed=failed,
+        failed=stats.failed,
         results=results
     )
 
@@ -3,7 +3,6 @@ from sqlalchemy.orm import Session
 from sqlalchemy import func, desc
 from typing import List, Dict, Any
 from datetime import datetime, timedelta
-import re
 
 from app.db.database import get_db
 from app.core.dependencies import get_current_user_optional
@@ -12,29 +11,11 @@ from app.models.opportunity import Opportunity
 from app.schemas.opportunity import Opportunity as OpportunitySchema
 from app.models.tracking import TrackingEvent
 from app.schemas.tracking import TrackingEventCreate
+from app.services.duplicate_index import find_potential_duplicates
 
 router = APIRouter()
 
 
-def calculate_text_similarity(text1: str, text2: str) -> float:
-    """
-    Simple text similarity calculation using word overlap
-    Returns a score between 0 and 1
-    """
-    # Normalize text
-    words1 = set(re.findall(r'\w+', text1.lower()))
-    words2 = set(re.findall(r'\w+', text2.lower()))
-
-    if not words1 or not words2:
-        return 0.0
-
-    # Calculate Jaccard similarity
-    intersection = len(words1.intersection(words2))
-    union = len(words1.union(words2))
-
-    return intersection / union if union > 0 else 0.0
-
-
 def calculate_feasibility_score(opportunity: Opportunity) -> float:
     """
     Calculate feasibility score based on multiple factors
@@ -89,35 +70,8 @@ def check_duplicate(
     Check if a similar opportunity already exists
     Returns potential duplicates with similarity scores
     """
-    # Get all active opportunities
-    opportunities = db.query(Opportunity).filter(
-        Opportunity.status == "active"
-    ).all()
-
-    potential_duplicates = []
-
-    for opp in opportunities:
-        # Calculate title similarity
-        title_similarity = calculate_text_similarity(title, opp.title)
-
-        # Calculate description similarity
-        desc_similarity = calculate_text_similarity(description, opp.description)
-
-        # Combined score (title weighted more heavily)
-        similarity_score = (title_similarity * 0.6) + (desc_similarity * 0.4)
-
-        # If similarity is above threshold, it's a potential duplicate
-        if similarity_score > 0.5:  # 50% similarity threshold
-            potential_duplicates.append({
-                "opportunity_id": opp.id,
-                "title": opp.title,
-                "similarity_score": round(similarity_score * 100, 2),
-                "validation_count": opp.validation_count,
-                "created_at": opp.created_at
-            })
-
-    # Sort by similarity score
-    potential_duplicates.sort(key=lambda x: x['similarity_score'], reverse=True)
+    # Only trigram-similar titles are loaded and scored
+    potential_duplicates = find_potential_duplicates(db, title, description)
 
     return {
         "is_duplicate": len(potential_duplicates) > 0,
@@ -20,6 +20,7 @@ from app.models.scraped_source import ScrapedSource, SourceType
 from app.models.job_run import JobRun
 from app.core.dependencies import get_current_admin_user
 from app.services.serpapi_service import serpapi_service
+from app.services.pattern_matcher import invalidate_pattern_matcher
 
 router = APIRouter()
 
@@ -343,6 +344,7 @@ async def create_pattern(
     db.add(new_pattern)
     db.commit()
     db.refresh(new_pattern)
+    invalidate_pattern_matcher()
     
     return {"id": new_pattern.id, "message": "Pattern created successfully"}
 
@@ -364,6 +366,7 @@ async def update_pattern(
         setattr(pattern, key, value)
     
     db.commit()
+    invalidate_pattern_matcher()
     return {"message": "Pattern updated successfully"}
 
 
@@ -380,6 +383,7 @@ async def delete_pattern(
     
     db.delete(pattern)
     db.commit()
+    invalidate_pattern_matcher()
     return {"message": "Pattern deleted successfully"}
 
 
@@ -1160,7 +1164,7 @@ async def serpapi_places_with_reviews(
 
 @router.post("/signals/process")
 async def process_signals_to_opportunities(
-    limit: int = Query(default=500, le=2000),
+    limit: int = Query(default=500, le=20000),
     db: Session = Depends(get_db),
     admin: User = Depends(get_current_admin_user)
 ):
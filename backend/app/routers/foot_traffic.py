@@ -37,7 +37,8 @@ class AnalyzeAreaRequest(BaseModel):
 class HeatmapRequest(BaseModel):
     latitude: float = Field(..., ge=-90, le=90)
     longitude: float = Field(..., ge=-180, le=180)
-    radius_meters: int = Field(1000, ge=100, le=5000)
+    radius_meters: int = Field(1000, ge=100, le=100000)
+    zoom: Optional[int] = Field(None, ge=0, le=22)
 
 
 @router.post("/collect/area")
@@ -199,7 +200,9 @@ async def get_heatmap_data(
     """
     Get foot traffic data formatted for heatmap visualization
     
-    Returns GeoJSON FeatureCollection with traffic intensity at each point.
+    Returns GeoJSON FeatureCollection with one point per hex bin and the
+    average traffic intensity of the places in it. Bins get coarser as the
+    radius grows (or the map zooms out).
     """
     try:
         analyzer = TrafficAnalyzer(db)
@@ -207,7 +210,8 @@ async def get_heatmap_data(
         heatmap = analyzer.get_heatmap_data(
             latitude=request.latitude,
             longitude=request.longitude,
-            radius_meters=request.radius_meters
+            radius_meters=request.radius_meters,
+            zoom=request.zoom
         )
         
         return heatmap
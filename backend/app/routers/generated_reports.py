@@ -16,6 +16,7 @@ from app.schemas.generated_report import (
     ReportStats,
     UserReportStats,
 )
+from app.core.config import settings
 from app.core.dependencies import get_current_user, get_current_admin_user
 
 router = APIRouter()
@@ -222,6 +223,43 @@ def get_report(
     return report
 
 
+def _queue_layer_report(db: Session, user: User, opportunity, report_type: ReportType, label: str) -> dict:
+    """Queue a layer report job and describe how to follow its progress."""
+    from app.services.report_queue import enqueue_report, report_worker_pool, run_next_report_job
+    
+    report, deduplicated = enqueue_report(db, user, opportunity, report_type)
+    
+    if not report_worker_pool.running and report.status == ReportStatus.PENDING:
+        # No report workers in this process (background jobs disabled): generate inline.
+        run_next_report_job(report.id)
+        db.refresh(report)
+    
+    response = {
+        "report_id": report.id,
+        "job_id": report.id,
+        "status": report.status.value,
+        "deduplicated": deduplicated,
+        "message": f"{label} queued for generation",
+        "status_url": f"{settings.API_V1_PREFIX}/reports/{report.id}/status",
+        "events_url": f"{settings.API_V1_PREFIX}/reports/{report.id}/events",
+    }
+    
+    if report.status == ReportStatus.COMPLETED:
+        response["message"] = f"{label} generated successfully"
+        response["report"] = {
+            "id": report.id,
+            "title": report.title,
+            "summary": report.summary,
+            "content": report.content,
+            "confidence_score": report.confidence_score,
+            "generation_time_ms": report.generation_time_ms,
+            "generation_metadata": report.generation_metadata,
+            "created_at": report.created_at.isoformat() if report.created_at else None,
+        }
+    
+    return response
+
+
 @router.post("/opportunity/{opportunity_id}/layer1")
 def generate_layer1_report(
     opportunity_id: int,
@@ -295,23 +333,7 @@ def generate_layer1_report(
             }
         }
     
-    demographics = opportunity.demographics if hasattr(opportunity, 'demographics') else None
-    report = generator.generate_layer1_report(opportunity, current_user, demographics)
-    
-    return {
-        "report_id": report.id,
-        "status": "generated",
-        "message": "Layer 1 report generated successfully",
-        "report": {
-            "id": report.id,
-            "title": report.title,
-            "summary": report.summary,
-            "content": report.content,
-            "confidence_score": report.confidence_score,
-            "generation_time_ms": report.generation_time_ms,
-            "created_at": report.created_at.isoformat() if report.created_at else None,
-        }
-    }
+    return _queue_layer_report(db, current_user, opportunity, ReportType.LAYER_1_OVERVIEW, "Layer 1 report")
 
 
 @router.post("/opportunity/{opportunity_id}/layer2")
@@ -374,23 +396,7 @@ def generate_layer2_report(
             }
         }
     
-    demographics = opportunity.demographics if hasattr(opportunity, 'demographics') else None
-    report = generator.generate_layer2_report(opportunity, current_user, demographics)
-    
-    return {
-        "report_id": report.id,
-        "status": "generated",
-        "message": "Layer 2 Deep Dive report generated successfully",
-        "report": {
-            "id": report.id,
-            "title": report.title,
-            "summary": report.summary,
-            "content": report.content,
-            "confidence_score": report.confidence_score,
-            "generation_time_ms": report.generation_time_ms,
-            "created_at": report.created_at.isoformat() if report.created_at else None,
-        }
-    }
+    return _queue_layer_report(db, current_user, opportunity, ReportType.LAYER_2_DEEP_DIVE, "Layer 2 Deep Dive report")
 
 
 @router.post("/opportunity/{opportunity_id}/layer3")
@@ -478,23 +484,7 @@ def generate_layer3_report(
             }
         }
     
-    demographics = opportunity.demographics if hasattr(opportunity, 'demographics') else None
-    report = generator.generate_layer3_report(opportunity, current_user, demographics)
-    
-    return {
-        "report_id": report.id,
-        "status": "generated",
-        "message": "Layer 3 Execution Package generated successfully",
-        "report": {
-            "id": report.id,
-            "title": report.title,
-            "summary": report.summary,
-            "content": report.content,
-            "confidence_score": report.confidence_score,
-            "generation_time_ms": report.generation_time_ms,
-            "created_at": report.created_at.isoformat() if report.created_at else None,
-        }
-    }
+    return _queue_layer_report(db, current_user, opportunity, ReportType.LAYER_3_EXECUTION, "Layer 3 Execution Package")
 
 
 from pydantic import BaseModel, EmailStr
@@ -729,10 +719,14 @@ def get_report_status(
     if not report:
         raise HTTPException(status_code=404, detail="Report not found")
     
+    from app.services.report_queue import report_snapshot
+    
+    snapshot = report_snapshot(report)
     response = {
         "id": report.id,
         "status": report.status.value,
-        "progress": 100 if report.status == ReportStatus.COMPLETED else (50 if report.status == ReportStatus.GENERATING else 0),
+        "progress": snapshot["progress"],
+        "message": snapshot["message"],
     }
     
     if report.status == ReportStatus.FAILED:
@@ -742,5 +736,67 @@ def get_report_status(
     if report.status == ReportStatus.COMPLETED:
         response["completed_at"] = report.completed_at.isoformat() if report.completed_at else None
         response["generation_time_ms"] = report.generation_time_ms
+        response["generation_metadata"] = report.generation_metadata
     
     return response
+
+
+@router.get("/{report_id}/events")
+async def stream_report_events(
+    report_id: int,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """
+    Server-Sent Events stream of a queued report's progress.
+    
+    Emits `progress` events ({report_id, status, progress, message}) until the
+    report is completed or failed. Progress from workers in this process is
+    pushed immediately; otherwise the report row is re-read every few seconds.
+    """
+    import asyncio
+    import json
+    from fastapi.responses import StreamingResponse
+    from app.db.database import SessionLocal
+    from app.services.report_queue import TERMINAL_STATUSES, report_progress, report_snapshot
+    
+    report = db.query(GeneratedReport).filter(
+        GeneratedReport.id == report_id,
+        GeneratedReport.user_id == current_user.id
+    ).first()
+    if not report:
+        raise HTTPException(status_code=404, detail="Report not found")
+    initial = report_snapshot(report)
+    
+    def read_snapshot() -> dict:
+        session = SessionLocal()
+        try:
+            row = session.query(GeneratedReport).filter(GeneratedReport.id == report_id).first()
+            return report_snapshot(row) if row else {**initial, "status": ReportStatus.FAILED.value}
+        finally:
+            session.close()
+    
+    async def event_generator():
+        queue = report_progress.subscribe(report_id)
+        try:
+            event = initial
+            while True:
+                yield f"event: progress\ndata: {json.dumps(event)}\n\n"
+                if event["status"] in TERMINAL_STATUSES:
+                    return
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=settings.REPORT_JOB_POLL_SECONDS)
+                except asyncio.TimeoutError:
+                    event = await asyncio.to_thread(read_snapshot)
+        finally:
+            report_progress.unsubscribe(report_id, queue)
+    
+    return StreamingResponse(
+        event_generator(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "Connection": "keep-alive",
+            "X-Accel-Buffering": "no",
+        },
+    )
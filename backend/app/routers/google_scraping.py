@@ -372,7 +372,7 @@ async def run_job(
     db: Session = Depends(get_db)
 ):
     service = GoogleScrapingService(db)
-    result = service.run_job(job_id)
+    result = await service.run_job_async(job_id)
     if not result.get("success"):
         raise HTTPException(status_code=500, detail=result.get("error", "Job execution failed"))
     return result
@@ -15,6 +15,7 @@ class BoundsRequest(BaseModel):
     south: float
     east: float
     west: float
+    zoom: Optional[int] = None
     layers: Optional[List[str]] = None
 
 
@@ -61,7 +62,9 @@ async def get_map_data_by_bounds(
 ):
     """
     Get map data for a geographic bounding box.
-    Returns pins, heatmap points, and polygons for rendering.
+    Returns pins, heatmap points, and polygons for rendering; at low zoom
+    levels points come back as aggregated clusters. Pin popups are loaded
+    on click from /map/features/{feature_id}.
     """
     engine = MapDataEngine(db)
     
@@ -75,11 +78,25 @@ async def get_map_data_by_bounds(
     data = engine.get_map_data_for_bounds(
         bounds=bounds,
         layers=request.layers,
+        zoom=request.zoom,
     )
     
     return data
 
 
+@router.get("/features/{feature_id}")
+async def get_map_feature(
+    feature_id: int,
+    db: Session = Depends(get_db),
+):
+    """Get full details and popup content for a single map feature"""
+    engine = MapDataEngine(db)
+    feature = engine.get_feature_details(feature_id)
+    if not feature:
+        raise HTTPException(status_code=404, detail="Feature not found")
+    return feature
+
+
 @router.post("/data/city")
 async def get_map_data_by_city(
     request: CityRequest,
@@ -6,7 +6,6 @@ from sqlalchemy.orm import Session
 from typing import Any, Literal
 import hashlib
 import logging
-import asyncio
 
 from app.db.database import get_db
 from app.models.opportunity import Opportunity
@@ -920,6 +919,7 @@ class FindOptimalZonesRequest(BaseModel):
     demographics_data: dict[str, Any] | None = None
     competitors: list[dict[str, Any]] | None = None
     top_n: int = Field(default=3, ge=1, le=10)
+    resolution: Literal["standard", "high"] = "standard"
 
 
 class FindOptimalZonesResponse(BaseModel):
@@ -952,7 +952,8 @@ def find_optimal_zones(
         competitors=request.competitors,
         weights=weights,
         top_n=request.top_n,
-        business_type=request.business_type
+        business_type=request.business_type,
+        resolution=request.resolution
     )
     
     zone_results = [
@@ -1009,6 +1010,8 @@ class EnhancedOptimalZone(BaseModel):
     category_scores: dict[str, float] | None = None
     trends: dict | None = None
     insights: list[str]
+    # Sources that ran out of the time budget and were replaced by estimates
+    estimated_sources: list[str] = Field(default_factory=list)
     rank: int
 
 
@@ -1044,8 +1047,8 @@ async def find_optimal_zones_enhanced(
     - Drive By Traffic (monthly)
     - Foot Traffic (monthly)
     """
-    from app.db.database import SessionLocal
-    from app.services.zone_data_fetcher import ZoneDataFetcher, calculate_zone_score
+    from app.services.zone_data_fetcher import calculate_zone_score
+    from app.services.zone_fanout import ZoneMetricsFanout
     from app.services.location_analyzer import LocationAnalyzer
     
     analyzer = LocationAnalyzer()
@@ -1064,23 +1067,15 @@ async def find_optimal_zones_enhanced(
     else:
         traffic_mode = request.traffic_mode
     
-    max_concurrency = min(6, max(2, len(grid_points)))
-    semaphore = asyncio.Semaphore(max_concurrency)
+    fanout = ZoneMetricsFanout(
+        radius_miles=request.analysis_radius_miles,
+        business_type=request.business_type,
+        traffic_mode=traffic_mode
+    )
+    all_metrics = await fanout.fetch_all([(point.lat, point.lng) for point in grid_points])
 
-    def analyze_point(point):
-        local_db = SessionLocal()
+    def analyze_point(point, metrics):
         try:
-            fetcher = ZoneDataFetcher(local_db)
-            metrics = fetcher.fetch_zone_metrics(
-                center_lat=point.lat,
-                center_lng=point.lng,
-                radius_miles=request.analysis_radius_miles,
-                business_type=request.business_type,
-                fetch_competitors=bool(request.business_type),
-                fetch_traffic=True,
-                traffic_mode=traffic_mode
-            )
-            
             score_result = calculate_zone_score(metrics)
             insights = []
             
@@ -1129,25 +1124,16 @@ async def find_optimal_zones_enhanced(
                 'derived_metrics': score_result.get('derived_metrics'),
                 'category_scores': score_result.get('category_scores'),
                 'trends': metrics.raw_data.get('trends') if metrics.raw_data else None,
-                'insights': insights[:4]
+                'insights': insights[:4],
+                'estimated_sources': metrics.raw_data.get('estimated_sources', []) if metrics.raw_data else []
             }
         except Exception as e:
-            logger.warning(f"Failed to fetch metrics for zone at {point.lat}, {point.lng}: {e}")
-            try:
-                local_db.rollback()
-            except Exception:
-                pass
+            logger.warning(f"Failed to score zone at {point.lat}, {point.lng}: {e}")
             return None
-        finally:
-            local_db.close()
-
-    async def analyze_point_bounded(point):
-        async with semaphore:
-            return await asyncio.to_thread(analyze_point, point)
 
-    zone_analysis_results = await asyncio.gather(
-        *(analyze_point_bounded(point) for point in grid_points)
-    )
+    zone_analysis_results = [
+        analyze_point(point, metrics) for point, metrics in zip(grid_points, all_metrics)
+    ]
     scored_zones = [zone for zone in zone_analysis_results if zone is not None]
     
     scored_zones.sort(key=lambda z: z['total_score'], reverse=True)
@@ -1166,6 +1152,7 @@ async def find_optimal_zones_enhanced(
             category_scores=zone.get('category_scores'),
             trends=zone.get('trends'),
             insights=zone['insights'],
+            estimated_sources=zone.get('estimated_sources', []),
             rank=i + 1
         ))
     
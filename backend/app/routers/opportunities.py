@@ -13,7 +13,19 @@ from app.schemas.opportunity import OpportunityCreate, OpportunityUpdate, Opport
 from app.core.dependencies import get_current_active_user, get_current_user_optional, get_user_subscription_tier
 from app.services.badges import award_impact_points
 from app.services.usage_service import usage_service
-from app.services.entitlements import get_opportunity_entitlements
+from app.services.entitlements import (
+    OpportunityEntitlements,
+    get_entitlements_for_many,
+    get_opportunity_entitlements,
+)
+from app.services.opportunity_events import opportunity_created
+from app.services.opportunity_feed import (
+    InvalidCursor,
+    apply_cursor,
+    cached_count,
+    encode_cursor,
+    order_feed,
+)
 
 router = APIRouter()
 optional_auth = HTTPBearer(auto_error=False)
@@ -21,6 +33,20 @@ optional_auth = HTTPBearer(auto_error=False)
 FREE_PREVIEW_LIMIT = 3
 
 
+def _card_access(ent: OpportunityEntitlements) -> dict:
+    """Lock state shown on an opportunity card"""
+    return {
+        "age_days": ent.age_days,
+        "days_until_unlock": ent.days_until_unlock,
+        "is_accessible": ent.is_accessible,
+        "is_unlocked": ent.is_unlocked,
+        "can_pay_to_unlock": ent.can_pay_to_unlock,
+        "unlock_price": ent.unlock_price,
+        "user_tier": ent.user_tier.value if ent.user_tier else "free",
+        "content_state": ent.content_state,
+    }
+
+
 @router.get("/categories", response_model=List[str])
 def get_categories(db: Session = Depends(get_db)):
     """Get all distinct categories from opportunities"""
@@ -212,6 +238,7 @@ def create_opportunity(
     )
 
     db.add(new_opportunity)
+    opportunity_created(db, new_opportunity)
 
     # Award impact points for creating an opportunity (not for anonymous submissions)
     if not opportunity_data.is_anonymous:
@@ -227,6 +254,7 @@ def create_opportunity(
 async def get_opportunities(
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
     category: Optional[str] = None,
     status: str = "active",
     sort_by: str = Query("recent", regex="^(recent|trending|validated|market|feasibility)$"),
@@ -243,7 +271,11 @@ async def get_opportunities(
     Get list of opportunities with filtering and pagination.
     
     Free users see only 3 preview opportunities. 
-    Paid subscribers get full access.
+    Paid subscribers get full access. Pass the returned `next_cursor` as
+    `cursor` to fetch the following page without OFFSET.
+
+    `access` maps each returned opportunity id to its card lock state
+    (same fields as `/batch-access`, without `working_on_count`).
     """
     is_paid = False
     user_tier = SubscriptionTier.FREE
@@ -297,45 +329,56 @@ async def get_opportunities(
         # Pro and above can access all (no additional filter needed)
         # If user is not authenticated, ignore this filter
 
-    # Sorting
-    if sort_by == "recent":
-        query = query.order_by(desc(Opportunity.created_at))
-    elif sort_by == "trending":
-        query = query.order_by(desc(Opportunity.growth_rate))
-    elif sort_by == "validated":
-        query = query.order_by(desc(Opportunity.validation_count))
-    elif sort_by == "market":
-        query = query.order_by(desc(Opportunity.market_size))
-    elif sort_by == "feasibility":
-        query = query.order_by(desc(Opportunity.feasibility_score))
+    # Totals are cached briefly per filter combination (see opportunity_feed)
+    count_key = (
+        status, category, geographic_scope, country, completion_status,
+        realm_type, max_age_days, bool(my_access_only and current_user and user_tier == SubscriptionTier.FREE),
+    )
+    total = cached_count(query, count_key)
+
+    query = order_feed(query, sort_by)
 
-    total = query.count()
-    
     if not is_paid:
-        free_query = query.filter(Opportunity.feasibility_score < 60)
-        free_total = free_query.count()
-        opportunities = free_query.offset(0).limit(FREE_PREVIEW_LIMIT).all()
+        opportunities = query.filter(
+            Opportunity.feasibility_score < 60
+        ).limit(FREE_PREVIEW_LIMIT).all()
+        entitlements = get_entitlements_for_many(db, opportunities, current_user)
         
         return {
             "opportunities": opportunities,
-            "total": min(free_total, FREE_PREVIEW_LIMIT),
+            "access": {opp_id: _card_access(ent) for opp_id, ent in entitlements.items()},
+            "total": len(opportunities),
             "page": 1,
             "page_size": FREE_PREVIEW_LIMIT,
             "is_gated": True,
             "gated_message": f"Subscribe to access all {total} opportunities",
-            "full_total": total
+            "full_total": total,
+            "next_cursor": None
         }
     
-    opportunities = query.offset(skip).limit(limit).all()
+    # Keyset pagination when a cursor is given; skip/offset is kept for older clients
+    if cursor:
+        try:
+            query = apply_cursor(query, sort_by, cursor)
+        except InvalidCursor as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    else:
+        query = query.offset(skip)
+
+    opportunities = query.limit(limit).all()
+    next_cursor = encode_cursor(sort_by, opportunities[-1]) if len(opportunities) == limit else None
+    entitlements = get_entitlements_for_many(db, opportunities, current_user)
 
     return {
         "opportunities": opportunities,
+        "access": {opp_id: _card_access(ent) for opp_id, ent in entitlements.items()},
         "total": total,
-        "page": skip // limit + 1,
+        "page": None if cursor else skip // limit + 1,  # no page number for keyset pages
         "page_size": limit,
         "is_gated": False,
         "gated_message": None,
-        "full_total": total
+        "full_total": total,
+        "next_cursor": next_cursor
     }
 
 
@@ -655,34 +698,31 @@ async def get_batch_access_info(
     current_user: User | None = Depends(get_current_user_optional)
 ):
     """Get access info for multiple opportunities at once (for cards display)"""
-    from app.models.subscription import SubscriptionTier
     from app.models.workspace import UserWorkspace
     
+    opportunity_ids = opportunity_ids[:50]  # Limit to 50 at a time
+    opportunities = db.query(Opportunity).filter(
+        Opportunity.id.in_(opportunity_ids),
+        Opportunity.moderation_status == 'approved'
+    ).all() if opportunity_ids else []
+
+    # Count how many people are working on each opportunity
+    workspace_counts = dict(
+        db.query(UserWorkspace.opportunity_id, func.count(UserWorkspace.id))
+        .filter(UserWorkspace.opportunity_id.in_([opp.id for opp in opportunities]))
+        .group_by(UserWorkspace.opportunity_id)
+        .all()
+    ) if opportunities else {}
+
+    entitlements = get_entitlements_for_many(db, opportunities, current_user)
     result = {}
-    for opp_id in opportunity_ids[:50]:  # Limit to 50 at a time
-        opportunity = db.query(Opportunity).filter(
-            Opportunity.id == opp_id,
-            Opportunity.moderation_status == 'approved'
-        ).first()
-        if not opportunity:
+    for opp_id in opportunity_ids:
+        ent = entitlements.get(opp_id)
+        if ent is None:
             continue
-        
-        # Count how many people are working on this opportunity
-        workspace_count = db.query(func.count(UserWorkspace.id)).filter(
-            UserWorkspace.opportunity_id == opp_id
-        ).scalar() or 0
-            
-        ent = get_opportunity_entitlements(db, opportunity, current_user)
         result[opp_id] = {
-            "age_days": ent.age_days,
-            "days_until_unlock": ent.days_until_unlock,
-            "is_accessible": ent.is_accessible,
-            "is_unlocked": ent.is_unlocked,
-            "can_pay_to_unlock": ent.can_pay_to_unlock,
-            "unlock_price": ent.unlock_price,
-            "user_tier": (current_user.subscription.tier.value if current_user and current_user.subscription and current_user.subscription.tier else "free"),
-            "content_state": ent.content_state,
-            "working_on_count": workspace_count
+            **_card_access(ent),
+            "working_on_count": workspace_counts.get(opp_id, 0)
         }
     
     return result
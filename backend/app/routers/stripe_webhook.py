@@ -12,6 +12,7 @@ import logging
 import json
 
 from app.db.database import get_db
+from app.core.dependencies import invalidate_user_access
 from app.models.user import User
 from app.models.transaction import Transaction, TransactionType, TransactionStatus
 from app.models.subscription import Subscription, SubscriptionTier, SubscriptionStatus, UnlockedOpportunity, UnlockMethod
@@ -751,6 +752,7 @@ def handle_subscription_updated(stripe_subscription: dict, db: Session):
             logger.warning(f"Failed to apply pending tier: {e}")
     
     db.commit()
+    invalidate_user_access(subscription.user_id)
     logger.info(f"Updated subscription {subscription_id}: {old_status} -> {new_status}")
 
 
@@ -772,6 +774,7 @@ def handle_subscription_deleted(stripe_subscription: dict, db: Session):
     subscription.status = SubscriptionStatus.CANCELED
     subscription.stripe_subscription_id = None
     db.commit()
+    invalidate_user_access(subscription.user_id)
     logger.info(f"Canceled subscription for user {subscription.user_id}")
 
 
@@ -0,0 +1,42 @@
+"""
+Vector tile endpoints (Mapbox Vector Tiles rendered by PostGIS)
+"""
+
+from fastapi import APIRouter, Depends, HTTPException, Response
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.database import get_db
+from app.services.vector_tiles import LAYERS, MVT_MEDIA_TYPE, InvalidTile, get_tile
+
+router = APIRouter(prefix="/tiles", tags=["Vector Tiles"])
+
+
+@router.get("/layers")
+def list_tile_layers():
+    """Available tile layers and the zoom they start rendering at"""
+    return {
+        "layers": [
+            {"name": layer.name, "min_zoom": layer.min_zoom, "url": f"{settings.API_V1_PREFIX}/tiles/{layer.name}/{{z}}/{{x}}/{{y}}.mvt"}
+            for layer in LAYERS.values()
+        ]
+    }
+
+
+@router.get("/{layer}/{z}/{x}/{y}.mvt")
+def get_vector_tile(layer: str, z: int, x: int, y: int, db: Session = Depends(get_db)):
+    """
+    One Mapbox Vector Tile for `layer`. Empty tiles are returned with an empty
+    body; browsers may cache tiles for a short while.
+    """
+    try:
+        data, config = get_tile(db, layer, z, x, y)
+    except InvalidTile as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+    max_age = min(config.ttl_seconds, 3600)
+    return Response(
+        content=data,
+        media_type=MVT_MEDIA_TYPE,
+        headers={"Cache-Control": f"public, max-age={max_age}"},
+    )
@@ -249,21 +249,10 @@ async def _background_process_opportunities(limit: int = 50):
         db = SessionLocal()
         processor = OpportunityProcessor(db)
         
-        total_processed = 0
-        total_created = 0
+        # Streams through the backlog, committing as it goes
+        result = await processor.process_pending_sources(limit=limit)
         
-        while total_processed < limit:
-            batch_limit = min(20, limit - total_processed)
-            result = await processor.process_pending_sources(limit=batch_limit)
-            
-            if result.get("processed", 0) == 0:
-                break
-                
-            total_processed += result.get("processed", 0)
-            total_created += result.get("opportunities_created", 0)
-            logger.info(f"Background processing: {total_processed} processed, {total_created} created")
-        
-        logger.info(f"Background processing complete: {total_processed} total processed, {total_created} opportunities created")
+        logger.info(f"Background processing complete: {result.get('processed', 0)} total processed, {result.get('opportunities_created', 0)} opportunities created")
     except Exception as e:
         logger.error(f"Background processing error: {e}\n{traceback.format_exc()}")
     finally:
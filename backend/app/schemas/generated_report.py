@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional, List
+from typing import Any, Dict, Optional, List
 from datetime import datetime
 from enum import Enum
 
@@ -44,6 +44,7 @@ class GeneratedReportResponse(BaseModel):
     confidence_score: Optional[int] = None
     generation_time_ms: Optional[int] = None
     tokens_used: Optional[int] = None
+    generation_metadata: Optional[Dict[str, Any]] = None
     created_at: datetime
     completed_at: Optional[datetime] = None
 
@@ -0,0 +1,222 @@
+"""
+Bounded concurrent engine for batch LLM work.
+
+Blocking provider calls (the sync Anthropic client) run in worker threads,
+at most `concurrency` at a time, each paced through a process-wide token
+bucket for its provider so parallel batches share one request budget.
+Rate-limit/overload responses are retried with exponential backoff and full
+jitter (honouring Retry-After when the provider sends it).
+
+Results are handed back on the event loop thread as they complete, so the
+caller's SQLAlchemy session is only ever touched from one thread. Each result
+is applied inside a savepoint and the session is committed every
+`commit_every` results, so a failure midway keeps the work already done.
+
+Prompts must be built from ORM objects *before* calling `run`: incremental
+commits expire loaded attributes and worker threads must not lazy-load them.
+"""
+
+import asyncio
+import logging
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, TypeVar
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+RETRYABLE_STATUS_CODES = {429, 529}
+DEFAULT_REQUESTS_PER_MINUTE = 60
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket usable from any event loop.
+
+    `reserve` takes a token immediately (going into debt when empty) and
+    returns how long the caller must wait before using it.
+    """
+
+    def __init__(self, requests_per_minute: int, burst: Optional[int] = None):
+        self.rate = max(1, int(requests_per_minute)) / 60.0
+        self.capacity = float(burst if burst is not None else max(1, int(requests_per_minute) // 6))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    async def acquire(self) -> None:
+        wait = self.reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+_buckets: Dict[str, TokenBucket] = {}
+_buckets_lock = threading.Lock()
+
+
+def get_provider_bucket(provider: str) -> TokenBucket:
+    """Shared bucket for `provider`, sized from <PROVIDER>_REQUESTS_PER_MINUTE"""
+    key = provider.lower()
+    with _buckets_lock:
+        bucket = _buckets.get(key)
+        if bucket is None:
+            rpm = getattr(settings, f"{key.upper()}_REQUESTS_PER_MINUTE", DEFAULT_REQUESTS_PER_MINUTE)
+            bucket = TokenBucket(rpm)
+            _buckets[key] = bucket
+        return bucket
+
+
+def _retry_after_seconds(error: Exception) -> Optional[float]:
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+def is_retryable(error: Exception) -> bool:
+    return getattr(error, "status_code", None) in RETRYABLE_STATUS_CODES
+
+
+@dataclass
+class BatchStats:
+    processed: int = 0
+    failed: int = 0
+    retries: int = 0
+    errors: List[str] = field(default_factory=list)
+
+
+class AIBatchEngine:
+    """Run a blocking LLM call over many items with bounded concurrency."""
+
+    def __init__(
+        self,
+        provider: str = "anthropic",
+        concurrency: Optional[int] = None,
+        commit_every: Optional[int] = None,
+        max_retries: int = 4,
+        base_backoff: float = 1.0,
+        max_backoff: float = 30.0,
+        call_timeout: float = 120.0,
+        bucket: Optional[TokenBucket] = None,
+    ):
+        self.provider = provider
+        self.concurrency = max(1, concurrency or settings.AI_BATCH_CONCURRENCY)
+        self.commit_every = max(1, commit_every or settings.AI_BATCH_COMMIT_EVERY)
+        self.max_retries = max_retries
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.call_timeout = call_timeout
+        self.bucket = bucket or get_provider_bucket(provider)
+
+    def _backoff(self, attempt: int, error: Exception) -> float:
+        retry_after = _retry_after_seconds(error)
+        if retry_after is not None:
+            return min(self.max_backoff, retry_after) + random.uniform(0, self.base_backoff)
+        return random.uniform(0, min(self.max_backoff, self.base_backoff * (2 ** attempt)))
+
+    async def _call(self, call: Callable[[T], R], item: T, semaphore: asyncio.Semaphore, stats: BatchStats) -> R:
+        async with semaphore:
+            attempt = 0
+            while True:
+                await self.bucket.acquire()
+                try:
+                    return await asyncio.wait_for(asyncio.to_thread(call, item), timeout=self.call_timeout)
+                except Exception as e:
+                    if attempt >= self.max_retries or not is_retryable(e):
+                        raise
+                    delay = self._backoff(attempt, e)
+                    attempt += 1
+                    stats.retries += 1
+                    logger.info(f"{self.provider} rate limited, retry {attempt}/{self.max_retries} in {delay:.1f}s")
+                    await asyncio.sleep(delay)
+
+    async def run(
+        self,
+        items: Iterable[T],
+        call: Callable[[T], R],
+        on_result: Optional[Callable[[T, R], Any]] = None,
+        db: Optional[Session] = None,
+        describe: Callable[[T], str] = repr,
+    ) -> BatchStats:
+        """
+        Call `call(item)` for every item and pass each outcome to `on_result`.
+
+        `call` runs in a worker thread and must not use `db`. `on_result` runs
+        on the event loop thread; returning False counts the item as failed.
+        With `db`, each `on_result` runs in a savepoint and the session is
+        committed every `commit_every` results and once at the end.
+        """
+        semaphore = asyncio.Semaphore(self.concurrency)
+        stats = BatchStats()
+
+        async def run_one(item: T) -> Tuple[T, Optional[R], Optional[Exception]]:
+            try:
+                return item, await self._call(call, item, semaphore, stats), None
+            except Exception as e:
+                return item, None, e
+
+        tasks = [asyncio.create_task(run_one(item)) for item in items]
+        pending_commit = 0
+
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                item, result, error = await next_done
+
+                if error is None and on_result is not None:
+                    try:
+                        if db is not None:
+                            with db.begin_nested():
+                                ok = on_result(item, result)
+                        else:
+                            ok = on_result(item, result)
+                        if ok is False:
+                            error = ValueError("result rejected")
+                    except Exception as e:
+                        error = e
+
+                if error is not None:
+                    stats.failed += 1
+                    stats.errors.append(f"{describe(item)}: {str(error)[:100]}")
+                    logger.warning(f"AI batch item {describe(item)} failed: {error}")
+                    continue
+
+                stats.processed += 1
+                pending_commit += 1
+                if db is not None and pending_commit >= self.commit_every:
+                    db.commit()
+                    pending_commit = 0
+        finally:
+            for task in tasks:
+                task.cancel()
+
+        if db is not None and pending_commit:
+            db.commit()
+
+        return stats
+
+
+def run_batch_sync(engine: AIBatchEngine, *args, **kwargs) -> BatchStats:
+    """Run `engine.run` from synchronous code such as the backfill scripts"""
+    return asyncio.run(engine.run(*args, **kwargs))
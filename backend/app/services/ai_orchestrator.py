@@ -9,6 +9,8 @@ import logging
 import os
 import asyncio
 
+from app.services.llm_cache import llm_cache, openai_response
+
 logger = logging.getLogger(__name__)
 
 AI_CALL_TIMEOUT_SECONDS = 30
@@ -92,19 +94,29 @@ class AIOrchestrator:
                 base_url="https://api.deepseek.com",
                 timeout=AI_CALL_TIMEOUT_SECONDS
             )
-            return client.chat.completions.create(
+            return openai_response(client.chat.completions.create(
                 model="deepseek-chat",
                 messages=[{"role": "user", "content": prompt}],
                 max_tokens=1500
+            ))
+        
+        def cached_deepseek_call():
+            return llm_cache.get_or_generate(
+                provider="deepseek",
+                model="deepseek-chat",
+                prompt=prompt,
+                generate=sync_deepseek_call,
+                max_tokens=1500,
+                task=task_type.value,
             )
         
         try:
             response = await asyncio.wait_for(
-                asyncio.to_thread(sync_deepseek_call),
+                asyncio.to_thread(cached_deepseek_call),
                 timeout=AI_CALL_TIMEOUT_SECONDS
             )
             
-            response_text = response.choices[0].message.content.strip()
+            response_text = response.text.strip()
             
             try:
                 if response_text.startswith("```"):
@@ -153,7 +165,7 @@ class AIOrchestrator:
         
         try:
             result = await asyncio.wait_for(
-                engine.generate_response(prompt, model="claude"),
+                engine.generate_response(prompt, model="claude", task=task_type.value),
                 timeout=AI_CALL_TIMEOUT_SECONDS
             )
             return {
@@ -9,6 +9,8 @@ import logging
 from typing import Dict, Any, Optional, List
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception
 
+from app.services.llm_cache import anthropic_response, llm_cache
+
 logger = logging.getLogger(__name__)
 
 AI_INTEGRATIONS_ANTHROPIC_API_KEY = os.environ.get("AI_INTEGRATIONS_ANTHROPIC_API_KEY")
@@ -57,18 +59,28 @@ class AIReportGenerator:
         reraise=True
     )
     def _generate(self, system_prompt: str, user_prompt: str) -> str:
-        """Generate content using Claude with retry logic."""
+        """Generate content using Claude with retry logic, via the shared LLM response cache."""
         if not self.client:
             return ""
         
-        try:
-            message = self.client.messages.create(
+        def generate():
+            return anthropic_response(self.client.messages.create(
                 model=self.MODEL,
                 max_tokens=self.MAX_TOKENS,
                 system=system_prompt,
                 messages=[{"role": "user", "content": user_prompt}]
-            )
-            return message.content[0].text if message.content else ""
+            ))
+        
+        try:
+            return llm_cache.get_or_generate(
+                provider="anthropic",
+                model=self.MODEL,
+                prompt=user_prompt,
+                generate=generate,
+                system=system_prompt,
+                max_tokens=self.MAX_TOKENS,
+                task="report",
+            ).text
         except Exception as e:
             logger.error(f"Claude generation error: {e}")
             raise
@@ -18,6 +18,8 @@ from anthropic import Anthropic
 import openai
 import google.generativeai as genai
 
+from app.services.llm_cache import CachedResponse, llm_cache
+
 # Initialize clients
 anthropic_client = Anthropic(
     api_key=os.environ.get("AI_INTEGRATIONS_ANTHROPIC_API_KEY"),
@@ -132,14 +134,58 @@ class AIRouter:
                 "response": str,
                 "model_used": ModelProvider,
                 "tokens_used": {"input": int, "output": int},
-                "estimated_cost_usd": float
+                "estimated_cost_usd": float,
+                "cached": bool  # only present on cache hits (zero tokens/cost)
             }
         """
         
         # Determine which model to use
         model = force_model or TASK_ROUTING.get(task_type, ModelProvider.ANTHROPIC_SONNET)
         
-        # Execute based on provider
+        # Identical requests are served from the shared LLM response cache
+        executed: Dict[str, Any] = {}
+        
+        def generate() -> CachedResponse:
+            executed.update(self._execute(model, prompt, system_prompt, max_tokens, temperature))
+            tokens = executed["tokens_used"]
+            return CachedResponse(
+                text=executed["response"] or "",
+                input_tokens=int(tokens["input"]),
+                output_tokens=int(tokens["output"]),
+            )
+        
+        entry = llm_cache.get_or_generate(
+            provider=model.value.split("_")[0],
+            model=model.value,
+            prompt=prompt,
+            generate=generate,
+            system=system_prompt,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            task=task_type.value,
+        )
+        if not entry.cached:
+            return executed
+        
+        result = {
+            "response": entry.text,
+            "model_used": model.value,
+            "tokens_used": {"input": 0, "output": 0},
+            "estimated_cost_usd": 0.0,
+            "cached": True
+        }
+        self.usage_log.append(result)
+        return result
+    
+    def _execute(
+        self,
+        model: ModelProvider,
+        prompt: str,
+        system_prompt: Optional[str],
+        max_tokens: int,
+        temperature: float
+    ) -> Dict[str, Any]:
+        """Call the provider for `model` directly"""
         if model in [ModelProvider.ANTHROPIC_OPUS, ModelProvider.ANTHROPIC_SONNET, ModelProvider.ANTHROPIC_HAIKU]:
             return self._execute_anthropic(model, prompt, system_prompt, max_tokens, temperature)
         
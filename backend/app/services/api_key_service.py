@@ -19,12 +19,10 @@ from sqlalchemy.orm import Session
 
 from app.models.team import Team, TeamApiKey, TeamMember, TeamRole
 from app.models.user import User
+from app.services.rate_limiter import get_rate_limiter
 
 logger = logging.getLogger(__name__)
 
-# Rate limit tracking (in-memory for development; use Redis in production)
-_rate_limit_cache: Dict[str, List[datetime]] = {}
-
 # Server secret for HMAC - must be configured for production
 # For development, we use a fixed default; in production, set API_KEY_HMAC_SECRET env var
 _API_KEY_SECRET = os.environ.get("API_KEY_HMAC_SECRET")
@@ -178,28 +176,8 @@ def check_rate_limit(team_id: int, rate_limit: int) -> Tuple[bool, int]:
     Returns:
         Tuple of (is_allowed, requests_remaining)
     """
-    cache_key = f"team_{team_id}"
-    now = datetime.utcnow()
-    window_start = now - timedelta(minutes=1)
-    
-    # Clean old entries and get current count
-    if cache_key in _rate_limit_cache:
-        _rate_limit_cache[cache_key] = [
-            ts for ts in _rate_limit_cache[cache_key]
-            if ts > window_start
-        ]
-        current_count = len(_rate_limit_cache[cache_key])
-    else:
-        _rate_limit_cache[cache_key] = []
-        current_count = 0
-    
-    if current_count >= rate_limit:
-        return False, 0
-    
-    # Add this request
-    _rate_limit_cache[cache_key].append(now)
-    
-    return True, rate_limit - current_count - 1
+    result = get_rate_limiter().hit(f"team_{team_id}", rate_limit)
+    return result.allowed, result.remaining
 
 
 def revoke_api_key(key_id: int, user: User, db: Session) -> Tuple[bool, str]:
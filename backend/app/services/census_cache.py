@@ -0,0 +1,219 @@
+"""
+Shared cache for Census API results.
+
+Results are keyed by (dataset, year, geography type, geography id), e.g.
+("acs/acs5", 2023, "county", "06037"). Lookups go through two tiers:
+
+- an in-process LRU (CENSUS_CACHE_MEMORY_ENTRIES entries)
+- the `census_data_cache` table, so every worker and restart shares results
+  and `scripts/prefetch_census_data.py` can warm whole states ahead of time
+
+Entries expire after CENSUS_CACHE_TTL_DAYS. Results are stored as JSON and
+decoded on every read, so callers may mutate what they get back. Database
+errors never fail the caller; the cache just misses.
+"""
+
+import asyncio
+import json
+import logging
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional, Tuple
+
+from cachetools import LRUCache
+from sqlalchemy import and_, delete, insert, select
+
+from app.core.config import settings
+from app.models.census_data_cache import CensusDataCache
+
+logger = logging.getLogger(__name__)
+
+CacheKey = Tuple[str, int, str, str]
+
+DB_BATCH_SIZE = 1000  # rows per upsert; keeps bulk prefetches under bind-parameter limits
+
+_table = CensusDataCache.__table__
+
+
+def _upsert(dialect_name: str, rows: list):
+    """INSERT ... ON CONFLICT DO UPDATE for Postgres and SQLite"""
+    if dialect_name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    elif dialect_name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    else:
+        return None
+    stmt = dialect_insert(_table).values(rows)
+    return stmt.on_conflict_do_update(
+        index_elements=["dataset", "year", "geography_type", "geography_id"],
+        set_={
+            "data": stmt.excluded.data,
+            "fetched_at": stmt.excluded.fetched_at,
+            "expires_at": stmt.excluded.expires_at,
+        },
+    )
+
+
+class CensusCache:
+    """Two-tier (memory LRU + database) Census result cache."""
+
+    def __init__(self, memory_entries: Optional[int] = None, ttl_days: Optional[int] = None, engine=None, use_database: bool = True):
+        self._memory: LRUCache = LRUCache(maxsize=memory_entries or settings.CENSUS_CACHE_MEMORY_ENTRIES)
+        self._lock = threading.Lock()
+        self._ttl = timedelta(days=ttl_days or settings.CENSUS_CACHE_TTL_DAYS)
+        self._engine_override = engine
+        self._use_database = use_database
+        self._stats = {"memory_hits": 0, "db_hits": 0, "misses": 0, "stores": 0}
+
+    def _engine(self):
+        if not self._use_database:
+            return None
+        if self._engine_override is not None:
+            return self._engine_override
+        from app.db import database
+
+        return database.engine
+
+    def _count(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            self._stats[name] += amount
+
+    def _memory_get(self, key: CacheKey) -> Optional[str]:
+        with self._lock:
+            item: Optional[Tuple[float, str]] = self._memory.get(key)
+            if item is None:
+                return None
+            expires_at, payload = item
+            if expires_at <= time.time():
+                del self._memory[key]
+                return None
+            return payload
+
+    def _memory_set(self, key: CacheKey, payload: str, expires_at: float) -> None:
+        with self._lock:
+            self._memory[key] = (expires_at, payload)
+
+    def _db_get(self, key: CacheKey) -> Optional[Tuple[str, float]]:
+        engine = self._engine()
+        if engine is None:
+            return None
+        dataset, year, geography_type, geography_id = key
+        try:
+            with engine.connect() as conn:
+                row = conn.execute(
+                    select(_table.c.data, _table.c.expires_at).where(and_(
+                        _table.c.dataset == dataset,
+                        _table.c.year == year,
+                        _table.c.geography_type == geography_type,
+                        _table.c.geography_id == geography_id,
+                    ))
+                ).fetchone()
+        except Exception as e:
+            logger.warning(f"Census cache lookup failed: {e}")
+            return None
+        if row is None:
+            return None
+        expires_at = row[1]
+        if expires_at.tzinfo is None:
+            expires_at = expires_at.replace(tzinfo=timezone.utc)
+        if expires_at <= datetime.now(timezone.utc):
+            return None
+        return row[0], expires_at.timestamp()
+
+    def _db_set_many(self, rows: list) -> None:
+        engine = self._engine()
+        if engine is None or not rows:
+            return
+        try:
+            with engine.begin() as conn:
+                for start in range(0, len(rows), DB_BATCH_SIZE):
+                    batch = rows[start:start + DB_BATCH_SIZE]
+                    stmt = _upsert(engine.dialect.name, batch)
+                    if stmt is None:
+                        for row in batch:
+                            conn.execute(delete(_table).where(and_(
+                                _table.c.dataset == row["dataset"],
+                                _table.c.year == row["year"],
+                                _table.c.geography_type == row["geography_type"],
+                                _table.c.geography_id == row["geography_id"],
+                            )))
+                        stmt = insert(_table).values(batch)
+                    conn.execute(stmt)
+        except Exception as e:
+            logger.warning(f"Census cache store failed: {e}")
+
+    def get(self, dataset: str, year: int, geography_type: str, geography_id: str) -> Optional[Any]:
+        """Cached result from memory, then the database"""
+        key = (dataset, year, geography_type, geography_id)
+        payload = self._memory_get(key)
+        if payload is not None:
+            self._count("memory_hits")
+            return json.loads(payload)
+
+        found = self._db_get(key)
+        if found is not None:
+            payload, expires_at = found
+            self._memory_set(key, payload, expires_at)
+            self._count("db_hits")
+            return json.loads(payload)
+
+        self._count("misses")
+        return None
+
+    def set(self, dataset: str, year: int, geography_type: str, geography_id: str, data: Any) -> None:
+        self.set_many(dataset, year, geography_type, {geography_id: data})
+
+    def set_many(self, dataset: str, year: int, geography_type: str, results: Dict[str, Any], warm_memory: bool = True) -> int:
+        """
+        Store results for many geographies of one dataset/year with batched upserts.
+
+        Bulk prefetches pass warm_memory=False so they don't evict hot entries
+        from the in-process LRU.
+        """
+        now = datetime.now(timezone.utc)
+        expires_at = now + self._ttl
+        rows = []
+        for geography_id, data in results.items():
+            if not data:
+                continue
+            payload = json.dumps(data, default=str)
+            if warm_memory:
+                self._memory_set((dataset, year, geography_type, geography_id), payload, expires_at.timestamp())
+            rows.append({
+                "dataset": dataset,
+                "year": year,
+                "geography_type": geography_type,
+                "geography_id": geography_id,
+                "data": payload,
+                "fetched_at": now,
+                "expires_at": expires_at,
+            })
+        self._db_set_many(rows)
+        self._count("stores", len(rows))
+        return len(rows)
+
+    async def aget(self, dataset: str, year: int, geography_type: str, geography_id: str) -> Optional[Any]:
+        """`get` for async callers; only the database tier runs off the event loop"""
+        payload = self._memory_get((dataset, year, geography_type, geography_id))
+        if payload is not None:
+            self._count("memory_hits")
+            return json.loads(payload)
+        return await asyncio.to_thread(self.get, dataset, year, geography_type, geography_id)
+
+    async def aset(self, dataset: str, year: int, geography_type: str, geography_id: str, data: Any) -> None:
+        await asyncio.to_thread(self.set, dataset, year, geography_type, geography_id, data)
+
+    async def aset_many(self, dataset: str, year: int, geography_type: str, results: Dict[str, Any], warm_memory: bool = True) -> int:
+        return await asyncio.to_thread(self.set_many, dataset, year, geography_type, results, warm_memory)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {**self._stats, "memory_entries": len(self._memory)}
+
+    def clear_memory(self) -> None:
+        with self._lock:
+            self._memory.clear()
+
+
+census_cache = CensusCache()
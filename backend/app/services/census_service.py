@@ -36,9 +36,11 @@ Population Estimates Variables:
 import os
 import httpx
 from typing import Optional, Dict, Any, List
-from datetime import datetime, timedelta
+from datetime import datetime
 import logging
 
+from app.services.census_cache import census_cache
+
 logger = logging.getLogger(__name__)
 
 
@@ -47,6 +49,11 @@ class CensusDataService:
     DATASET = "acs/acs5"
     DEFAULT_YEAR = 2023
     
+    # census_cache dataset names for results that aren't plain ACS profiles
+    EXTENDED_DATASET = "acs/acs5:extended"
+    PEP_DATASET = "pep/charv"
+    FLOWS_DATASET = "acs/flows"
+    
     VARIABLES = [
         "B01003_001E",  # Total population
         "B01002_001E",  # Median age
@@ -189,27 +196,14 @@ class CensusDataService:
         ("200k_plus", "B19001_017E"),
     ]
     
-    def __init__(self):
+    def __init__(self, cache=census_cache):
         self.api_key = os.getenv("CENSUS_API_KEY")
-        self._cache: Dict[str, Dict[str, Any]] = {}
-        self._cache_ttl = timedelta(days=30)  # Cache for 30 days
+        self.cache = cache
     
     @property
     def is_configured(self) -> bool:
         return bool(self.api_key)
     
-    def _get_cache_key(self, geography_type: str, geography_id: str) -> str:
-        return f"{geography_type}:{geography_id}"
-    
-    def _is_cache_valid(self, cache_key: str) -> bool:
-        if cache_key not in self._cache:
-            return False
-        cached = self._cache[cache_key]
-        fetched_at = cached.get("fetched_at")
-        if not fetched_at:
-            return False
-        return datetime.now() - datetime.fromisoformat(fetched_at) < self._cache_ttl
-    
     async def fetch_by_zipcode(self, zip_code: str, year: int = None) -> Optional[Dict[str, Any]]:
         """
         Fetch ACS 5-Year data for a ZIP Code Tabulation Area (ZCTA).
@@ -226,10 +220,9 @@ class CensusDataService:
             return None
         
         year = year or self.DEFAULT_YEAR
-        cache_key = self._get_cache_key("zcta", zip_code)
-        
-        if self._is_cache_valid(cache_key):
-            return self._cache[cache_key]["data"]
+        cached = await self.cache.aget(self.DATASET, year, "zcta", zip_code)
+        if cached is not None:
+            return cached
         
         variables = ",".join(self.VARIABLES)
         url = f"{self.BASE_URL}/{year}/{self.DATASET}?get={variables}&for=zip%20code%20tabulation%20area:{zip_code}&key={self.api_key}"
@@ -254,10 +247,7 @@ class CensusDataService:
                 result["fetched_at"] = datetime.now().isoformat()
                 result["year"] = year
                 
-                self._cache[cache_key] = {
-                    "data": result,
-                    "fetched_at": datetime.now().isoformat()
-                }
+                await self.cache.aset(self.DATASET, year, result["geography_type"], result["geography_id"], result)
                 
                 return result
                 
@@ -280,10 +270,9 @@ class CensusDataService:
             return None
         
         year = year or self.DEFAULT_YEAR
-        cache_key = self._get_cache_key("state", state_fips)
-        
-        if self._is_cache_valid(cache_key):
-            return self._cache[cache_key]["data"]
+        cached = await self.cache.aget(self.DATASET, year, "state", state_fips)
+        if cached is not None:
+            return cached
         
         variables = ",".join(self.VARIABLES)
         url = f"{self.BASE_URL}/{year}/{self.DATASET}?get={variables}&for=state:{state_fips}&key={self.api_key}"
@@ -303,10 +292,7 @@ class CensusDataService:
                 result["fetched_at"] = datetime.now().isoformat()
                 result["year"] = year
                 
-                self._cache[cache_key] = {
-                    "data": result,
-                    "fetched_at": datetime.now().isoformat()
-                }
+                await self.cache.aset(self.DATASET, year, result["geography_type"], result["geography_id"], result)
                 
                 return result
                 
@@ -328,10 +314,9 @@ class CensusDataService:
         
         year = year or self.DEFAULT_YEAR
         geo_id = f"{state_fips}{county_fips}"
-        cache_key = self._get_cache_key("county", geo_id)
-        
-        if self._is_cache_valid(cache_key):
-            return self._cache[cache_key]["data"]
+        cached = await self.cache.aget(self.DATASET, year, "county", geo_id)
+        if cached is not None:
+            return cached
         
         variables = ",".join(self.VARIABLES)
         url = f"{self.BASE_URL}/{year}/{self.DATASET}?get={variables}&for=county:{county_fips}&in=state:{state_fips}&key={self.api_key}"
@@ -351,10 +336,7 @@ class CensusDataService:
                 result["fetched_at"] = datetime.now().isoformat()
                 result["year"] = year
                 
-                self._cache[cache_key] = {
-                    "data": result,
-                    "fetched_at": datetime.now().isoformat()
-                }
+                await self.cache.aset(self.DATASET, year, result["geography_type"], result["geography_id"], result)
                 
                 return result
                 
@@ -362,6 +344,142 @@ class CensusDataService:
             logger.error(f"Error fetching Census data for county {geo_id}: {e}")
             return None
     
+    async def _fetch_rows(
+        self,
+        client: httpx.AsyncClient,
+        year: int,
+        dataset: str,
+        variables: List[str],
+        geography: str,
+    ) -> List[Dict[str, Any]]:
+        """Fetch a Census table for many geographies at once as header -> value dicts."""
+        url = f"{self.BASE_URL}/{year}/{dataset}?get={','.join(variables)}&{geography}&key={self.api_key}"
+        response = await client.get(url)
+        if response.status_code in (204, 404):
+            return []
+        if response.status_code == 400:
+            logger.warning(f"Census {dataset} {year} not available for {geography}")
+            return []
+        response.raise_for_status()
+        data = response.json()
+        if len(data) < 2:
+            return []
+        headers = data[0]
+        return [dict(zip(headers, row)) for row in data[1:]]
+    
+    async def prefetch_state(
+        self,
+        state_fips: str,
+        year: int = None,
+        population_years: List[int] = (2020, 2021, 2022, 2023),
+        flows_year: int = 2022,
+        include_zctas: bool = False,
+    ) -> Dict[str, int]:
+        """
+        Warm the Census cache for every county of a state in one pass.
+        
+        The ACS profile, extended and migration flow tables are requested for
+        all counties at once (`county:*`), and population estimates once per
+        year, so a state costs about a dozen requests instead of several per
+        county. ZCTAs are
+        not nested in states since the 2020 ACS vintage, so `include_zctas`
+        loads the national ZCTA profile table (one request), warming ZIP
+        lookups for every state.
+        
+        Returns the number of cached rows per table.
+        """
+        if not self.is_configured:
+            raise RuntimeError("CENSUS_API_KEY not configured")
+        
+        year = year or self.DEFAULT_YEAR
+        counts: Dict[str, int] = {}
+        
+        async with httpx.AsyncClient(timeout=120.0) as client:
+            state_rows = await self._fetch_rows(client, year, self.DATASET, self.VARIABLES, f"for=state:{state_fips}")
+            counties = await self._fetch_rows(
+                client, year, self.DATASET, self.VARIABLES, f"for=county:*&in=state:{state_fips}"
+            )
+            profiles = {}
+            for geography_type, rows in (("state", state_rows), ("county", counties)):
+                for row in rows:
+                    geo_id = row["state"] + row.get("county", "")
+                    result = self._parse_response([list(row.keys()), list(row.values())])
+                    result.update(geography_type=geography_type, geography_id=geo_id,
+                                  fetched_at=datetime.now().isoformat(), year=year)
+                    profiles[(geography_type, geo_id)] = result
+            for geography_type in ("state", "county"):
+                counts[f"acs_{geography_type}"] = await self.cache.aset_many(self.DATASET, year, geography_type, {
+                    geo_id: result for (kind, geo_id), result in profiles.items() if kind == geography_type
+                }, warm_memory=False)
+            
+            raw_by_county: Dict[str, Dict[str, Any]] = {}
+            for i in range(0, len(self.EXTENDED_VARIABLES), 25):
+                rows = await self._fetch_rows(
+                    client, year, self.DATASET, self.EXTENDED_VARIABLES[i:i + 25], f"for=county:*&in=state:{state_fips}"
+                )
+                for row in rows:
+                    raw = raw_by_county.setdefault(row["state"] + row["county"], {})
+                    for header, val in row.items():
+                        if header in ("state", "county"):
+                            continue
+                        try:
+                            if val is None or val == "" or val == "-":
+                                raw[header] = None
+                            else:
+                                raw[header] = int(val) if str(val).lstrip('-').isdigit() else float(val)
+                        except (ValueError, TypeError):
+                            raw[header] = None
+            extended = {}
+            for geo_id, raw in raw_by_county.items():
+                result = self._parse_extended_demographics_from_raw(raw)
+                result.update(geography_type="county", geography_id=geo_id,
+                              fetched_at=datetime.now().isoformat(), year=year)
+                extended[geo_id] = result
+            counts["acs_extended_county"] = await self.cache.aset_many(
+                self.EXTENDED_DATASET, year, "county", extended, warm_memory=False
+            )
+            
+            flow_rows = await self._fetch_rows(
+                client, flows_year, "acs/flows",
+                ["MOVEDIN", "MOVEDOUT", "MOVEDNET", "GEOID1", "FULL1_NAME", "GEOID2", "FULL2_NAME"],
+                f"for=county:*&in=state:{state_fips}",
+            )
+            flows_by_county: Dict[str, List[list]] = {}
+            for row in flow_rows:
+                flows_by_county.setdefault(row["county"], []).append(list(row.values()))
+            flows = {
+                f"{state_fips}{county_fips}": self._parse_migration_flows(
+                    [list(flow_rows[0].keys())] + rows, state_fips, county_fips
+                )
+                for county_fips, rows in flows_by_county.items()
+            }
+            counts["migration_flows"] = await self.cache.aset_many(
+                self.FLOWS_DATASET, flows_year, "county", flows, warm_memory=False
+            )
+            
+            if include_zctas:
+                zctas = await self._fetch_rows(
+                    client, year, self.DATASET, self.VARIABLES, "for=zip%20code%20tabulation%20area:*"
+                )
+                zcta_profiles = {}
+                for row in zctas:
+                    zip_code = row["zip code tabulation area"]
+                    result = self._parse_response([list(row.keys()), list(row.values())])
+                    result.update(geography_type="zcta", geography_id=zip_code,
+                                  fetched_at=datetime.now().isoformat(), year=year)
+                    zcta_profiles[zip_code] = result
+                counts["acs_zcta"] = await self.cache.aset_many(
+                    self.DATASET, year, "zcta", zcta_profiles, warm_memory=False
+                )
+        
+        counts["population_estimates"] = 0
+        for population_year in population_years:
+            # A state-wide call caches every county's estimate for that year.
+            rows = await self.fetch_population_estimates(state_fips, None, population_year)
+            counts["population_estimates"] += len(rows or [])
+        
+        return counts
+    
     def _parse_response(self, data: list) -> Dict[str, Any]:
         """Parse Census API response into a clean dictionary."""
         headers = data[0]
@@ -497,6 +615,11 @@ class CensusDataService:
             return None
         
         year = year or self.DEFAULT_YEAR
+        geo_id = f"{state_fips}{county_fips}"
+        
+        cached = await self.cache.aget(self.EXTENDED_DATASET, year, "county", geo_id)
+        if cached is not None:
+            return cached
         
         chunk_size = 25
         all_raw = {}
@@ -542,10 +665,11 @@ class CensusDataService:
                 
                 result = self._parse_extended_demographics_from_raw(all_raw)
                 result["geography_type"] = "county"
-                result["geography_id"] = f"{state_fips}{county_fips}"
+                result["geography_id"] = geo_id
                 result["fetched_at"] = datetime.now().isoformat()
                 result["year"] = year
                 
+                await self.cache.aset(self.EXTENDED_DATASET, year, "county", geo_id, result)
                 return result
                 
         except httpx.HTTPStatusError as e:
@@ -689,6 +813,11 @@ class CensusDataService:
             logger.warning("Census API key not configured")
             return None
         
+        if county_fips and state_fips:
+            cached = await self.cache.aget(self.PEP_DATASET, year, "county", f"{state_fips}{county_fips}")
+            if cached is not None:
+                return cached
+        
         variables = "NAME,POP"
         
         if county_fips and state_fips:
@@ -728,6 +857,12 @@ class CensusDataService:
                     return None
                 
                 results = self._parse_population_estimates(data)
+                # Cache per county; a state-wide call warms all of its counties.
+                await self.cache.aset_many(self.PEP_DATASET, year, "county", {
+                    f"{record['state_fips']}{record['county_fips']}": [record]
+                    for record in results
+                    if record.get("state_fips") and record.get("county_fips")
+                })
                 return results
                 
         except httpx.HTTPStatusError as e:
@@ -840,6 +975,10 @@ class CensusDataService:
             logger.warning("Census API key not configured")
             return None
         
+        cached = await self.cache.aget(self.FLOWS_DATASET, year, "county", f"{state_fips}{county_fips}")
+        if cached is not None:
+            return cached
+        
         variables = "MOVEDIN,MOVEDOUT,MOVEDNET,GEOID1,FULL1_NAME,GEOID2,FULL2_NAME"
         url = f"{self.BASE_URL}/{year}/acs/flows?get={variables}&for=county:{county_fips}&in=state:{state_fips}&key={self.api_key}"
         
@@ -862,6 +1001,7 @@ class CensusDataService:
                     return None
                 
                 result = self._parse_migration_flows(data, state_fips, county_fips)
+                await self.cache.aset(self.FLOWS_DATASET, year, "county", f"{state_fips}{county_fips}", result)
                 return result
                 
         except httpx.HTTPStatusError as e:
@@ -11,11 +11,16 @@ and queries the appropriate one based on coordinates.
 
 import requests
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any, Optional, Tuple, List
 from dataclasses import dataclass
 import math
+from cachetools import TTLCache
 from sqlalchemy import text
 
+from app.core.config import settings
+
 logger = logging.getLogger(__name__)
 
 STATES_WITH_LOCAL_DATA = {'FL'}
@@ -96,12 +101,40 @@ class TrafficDataResult:
     raw_data: Optional[Dict] = None
 
 
+# Nearest-road AADT lookups, shared by every DOTTrafficService instance
+# (callers create one per request). Keyed by rounded lat/lng and radius.
+# Estimates live in their own short-lived cache: one may only mean the local
+# query or DOT API failed, and that must not pin it for a day.
+_traffic_cache: TTLCache = TTLCache(
+    maxsize=settings.DOT_TRAFFIC_CACHE_ENTRIES,
+    ttl=settings.DOT_TRAFFIC_CACHE_TTL_SECONDS
+)
+_estimate_cache: TTLCache = TTLCache(
+    maxsize=settings.DOT_TRAFFIC_CACHE_ENTRIES,
+    ttl=settings.DOT_TRAFFIC_ESTIMATE_CACHE_TTL_SECONDS
+)
+_traffic_cache_lock = threading.Lock()
+
+DOT_API_CONCURRENCY = 4  # parallel state DOT requests per batch lookup
+SAMPLE_RADIUS_MILES = 0.5  # nearest-road search radius around each area sample point
+
+
+def _cache_key(lat: float, lng: float, radius_miles: float) -> str:
+    return f"{lat:.3f},{lng:.3f},{radius_miles}"
+
+
+def invalidate_dot_traffic_cache() -> None:
+    """Drop cached AADT lookups, e.g. after reloading traffic_roads."""
+    with _traffic_cache_lock:
+        _traffic_cache.clear()
+        _estimate_cache.clear()
+
+
 class DOTTrafficService:
     """Service to fetch traffic data from DOT sources"""
     
     def __init__(self, timeout: int = 10):
         self.timeout = timeout
-        self._cache: Dict[str, TrafficDataResult] = {}
     
     def _query_local_database(
         self,
@@ -218,67 +251,82 @@ class DOTTrafficService:
             logger.warning(f"Local database query failed: {e}")
             return None
     
-    def _query_local_nearest_traffic(
+    def _query_local_nearest_traffic_batch(
         self,
-        lat: float,
-        lng: float,
+        points: Dict[str, Tuple[float, float]],
         radius_miles: float,
         state: str
-    ) -> Optional[TrafficDataResult]:
+    ) -> Dict[str, TrafficDataResult]:
         """
-        Query local database for nearest road segment traffic data.
-        Returns TrafficDataResult with AADT from nearest road within radius.
+        Query local database for the nearest road segment to many points at once.
+        
+        One round-trip: the points are unnested into a derived table and each
+        one is LATERAL-joined to its nearest segment using the KNN `<->`
+        operator, which walks the geometry GiST index instead of measuring
+        every segment in the radius.
+        
+        Returns {point key: TrafficDataResult} for points with a road within radius.
         """
         from app.db.database import SessionLocal
         
+        if not points:
+            return {}
+        
+        keys = list(points)
         try:
-            radius_meters = radius_miles * 1609.34
-            
             sql = text("""
-                SELECT 
-                    road_name, roadway_id, aadt, year,
-                    ST_Distance(
-                        geometry::geography,
-                        ST_SetSRID(ST_MakePoint(:lng, :lat), 4326)::geography
-                    ) as distance_m
-                FROM traffic_roads
-                WHERE state = :state
-                  AND ST_DWithin(
-                        geometry::geography,
-                        ST_SetSRID(ST_MakePoint(:lng, :lat), 4326)::geography,
-                        :radius_meters
-                  )
-                ORDER BY distance_m ASC
-                LIMIT 1
+                SELECT pts.idx, nearest.road_name, nearest.roadway_id, nearest.aadt, nearest.year,
+                       nearest.distance_m
+                FROM unnest(
+                    CAST(:idxs AS integer[]),
+                    CAST(:lats AS double precision[]),
+                    CAST(:lngs AS double precision[])
+                ) AS pts(idx, lat, lng)
+                CROSS JOIN LATERAL (
+                    SELECT road_name, roadway_id, aadt, year,
+                           ST_Distance(
+                               geometry::geography,
+                               ST_SetSRID(ST_MakePoint(pts.lng, pts.lat), 4326)::geography
+                           ) as distance_m
+                    FROM traffic_roads
+                    WHERE state = :state
+                      AND ST_DWithin(
+                            geometry::geography,
+                            ST_SetSRID(ST_MakePoint(pts.lng, pts.lat), 4326)::geography,
+                            :radius_meters
+                      )
+                    ORDER BY geometry <-> ST_SetSRID(ST_MakePoint(pts.lng, pts.lat), 4326)
+                    LIMIT 1
+                ) nearest
             """)
             
             db = SessionLocal()
             try:
-                result = db.execute(sql, {
-                    "lat": lat,
-                    "lng": lng,
+                rows = db.execute(sql, {
+                    "idxs": list(range(len(keys))),
+                    "lats": [points[key][0] for key in keys],
+                    "lngs": [points[key][1] for key in keys],
                     "state": state,
-                    "radius_meters": radius_meters
-                })
-                row = result.fetchone()
+                    "radius_meters": radius_miles * 1609.34
+                }).fetchall()
             finally:
                 db.close()
             
-            if not row:
-                return None
-            
-            return TrafficDataResult(
-                aadt=int(row.aadt),
-                route_name=row.road_name or row.roadway_id,
-                source='local_db',
-                distance_miles=round(row.distance_m / 1609.34, 3) if row.distance_m else None,
-                state=state,
-                raw_data={'year': row.year}
-            )
+            return {
+                keys[row.idx]: TrafficDataResult(
+                    aadt=int(row.aadt),
+                    route_name=row.road_name or row.roadway_id,
+                    source='local_db',
+                    distance_miles=round(row.distance_m / 1609.34, 3) if row.distance_m else None,
+                    state=state,
+                    raw_data={'year': row.year}
+                )
+                for row in rows
+            }
             
         except Exception as e:
             logger.warning(f"Local nearest traffic query failed: {e}")
-            return None
+            return {}
     
     def get_traffic_for_location(
         self,
@@ -300,29 +348,88 @@ class DOTTrafficService:
         Returns:
             TrafficDataResult with AADT and metadata
         """
-        cache_key = f"{lat:.3f},{lng:.3f},{radius_miles}"
-        if cache_key in self._cache:
-            return self._cache[cache_key]
+        return self.get_traffic_for_locations([(lat, lng)], radius_miles)[0]
+    
+    def get_traffic_for_locations(
+        self,
+        points: List[Tuple[float, float]],
+        radius_miles: float = 1.0
+    ) -> List[TrafficDataResult]:
+        """
+        Get AADT traffic data for many locations, in the order given.
         
-        state = self._get_state_from_coords(lat, lng)
+        Points already in the shared cache are served from it. The rest are
+        resolved with one nearest-road query per state with local data, then
+        the state DOT API (a few requests in parallel), then estimates.
         
-        # First try local database for states with cached data
-        if state in STATES_WITH_LOCAL_DATA:
-            result = self._query_local_nearest_traffic(lat, lng, radius_miles, state)
-            if result:
-                self._cache[cache_key] = result
-                return result
+        Args:
+            points: (lat, lng) pairs
+            radius_miles: Search radius for nearby road segments
+            
+        Returns:
+            One TrafficDataResult per point
+        """
+        keys = [_cache_key(lat, lng, radius_miles) for lat, lng in points]
+        with _traffic_cache_lock:
+            found = {}
+            for key in keys:
+                cached = _traffic_cache.get(key) or _estimate_cache.get(key)
+                if cached is not None:
+                    found[key] = cached
+        
+        missing: Dict[str, Tuple[float, float]] = {}
+        for key, point in zip(keys, points):
+            if key not in found:
+                missing.setdefault(key, point)
+        
+        if missing:
+            resolved = self._resolve_traffic(missing, radius_miles)
+            with _traffic_cache_lock:
+                for key, result in resolved.items():
+                    cache = _estimate_cache if result.source == 'estimated' else _traffic_cache
+                    cache[key] = result
+            found.update(resolved)
         
-        if state and state in STATE_DOT_ENDPOINTS:
-            result = self._query_state_dot(state, lat, lng, radius_miles)
-            if result:
-                self._cache[cache_key] = result
-                return result
+        return [found[key] for key in keys]
+    
+    def _resolve_traffic(
+        self,
+        points: Dict[str, Tuple[float, float]],
+        radius_miles: float
+    ) -> Dict[str, TrafficDataResult]:
+        """Look up uncached points: local database, then state DOT API, then estimate"""
+        by_state: Dict[Optional[str], Dict[str, Tuple[float, float]]] = {}
+        for key, (lat, lng) in points.items():
+            by_state.setdefault(self._get_state_from_coords(lat, lng), {})[key] = (lat, lng)
+        
+        resolved: Dict[str, TrafficDataResult] = {}
+        for state, state_points in by_state.items():
+            if state in STATES_WITH_LOCAL_DATA:
+                resolved.update(self._query_local_nearest_traffic_batch(state_points, radius_miles, state))
+        
+        api_points = [
+            (key, state, lat, lng)
+            for state, state_points in by_state.items()
+            if state and state in STATE_DOT_ENDPOINTS
+            for key, (lat, lng) in state_points.items()
+            if key not in resolved
+        ]
+        if api_points:
+            with ThreadPoolExecutor(max_workers=min(DOT_API_CONCURRENCY, len(api_points))) as executor:
+                api_results = executor.map(
+                    lambda item: self._query_state_dot(item[1], item[2], item[3], radius_miles),
+                    api_points
+                )
+                for (key, _, _, _), result in zip(api_points, api_results):
+                    if result:
+                        resolved[key] = result
         
         # Fall back to estimate
-        result = self._estimate_traffic(lat, lng, radius_miles)
-        self._cache[cache_key] = result
-        return result
+        for key, (lat, lng) in points.items():
+            if key not in resolved:
+                resolved[key] = self._estimate_traffic(lat, lng, radius_miles)
+        
+        return resolved
     
     def get_area_traffic_summary(
         self,
@@ -345,10 +452,7 @@ class DOTTrafficService:
         """
         points = self._generate_sample_points(lat, lng, radius_miles, sample_points)
         
-        results: List[TrafficDataResult] = []
-        for p_lat, p_lng in points:
-            result = self.get_traffic_for_location(p_lat, p_lng, 0.5)
-            results.append(result)
+        results = self.get_traffic_for_locations(points, SAMPLE_RADIUS_MILES)
         
         aadt_values = [r.aadt for r in results if r.aadt > 0]
         api_results = [r for r in results if r.source in ('dot_api', 'local_db')]
@@ -375,6 +479,23 @@ class DOTTrafficService:
             'samples': len(results),
         }
     
+    def prefetch_area_traffic(
+        self,
+        centers: List[Tuple[float, float]],
+        radius_miles: float = 3.0,
+        sample_points: int = 5
+    ) -> None:
+        """
+        Warm the shared cache for the sample points of many areas in one batch,
+        so the `get_area_traffic_summary` calls that follow are cache hits.
+        """
+        points = [
+            point
+            for lat, lng in centers
+            for point in self._generate_sample_points(lat, lng, radius_miles, sample_points)
+        ]
+        self.get_traffic_for_locations(points, SAMPLE_RADIUS_MILES)
+    
     async def get_road_segments_with_geometry(
         self,
         lat: float,
@@ -0,0 +1,150 @@
+"""
+Near-duplicate lookup for opportunities.
+
+Candidates are fetched through pg_trgm GIN indexes on opportunities.title,
+category and city (see the opportunity_trigram_indexes migration), so callers
+only score a small candidate set instead of loading the whole table. Postgres
+keeps the indexes current on every insert/update, so no application-side
+maintenance is needed when opportunities are created or edited.
+"""
+
+import logging
+import re
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import func, text
+from sqlalchemy.orm import Session
+
+from app.models.opportunity import Opportunity
+
+logger = logging.getLogger(__name__)
+
+# Word-overlap scoring weights used by /analytics/check-duplicate.
+TITLE_WEIGHT = 0.6
+DESCRIPTION_WEIGHT = 0.4
+DUPLICATE_THRESHOLD = 0.5
+
+# A candidate needs title Jaccard > (0.5 - 0.4) / 0.6 ~= 0.17 to pass the
+# threshold, so a low trigram threshold on the title keeps recall high.
+TITLE_TRIGRAM_THRESHOLD = 0.1
+CANDIDATE_LIMIT = 100
+
+
+def calculate_text_similarity(text1: str, text2: str) -> float:
+    """
+    Simple text similarity calculation using word overlap
+    Returns a score between 0 and 1
+    """
+    # Normalize text
+    words1 = set(re.findall(r'\w+', (text1 or '').lower()))
+    words2 = set(re.findall(r'\w+', (text2 or '').lower()))
+
+    if not words1 or not words2:
+        return 0.0
+
+    # Calculate Jaccard similarity
+    intersection = len(words1.intersection(words2))
+    union = len(words1.union(words2))
+
+    return intersection / union if union > 0 else 0.0
+
+
+def _supports_trigram(db: Session) -> bool:
+    bind = db.get_bind()
+    return bind is not None and bind.dialect.name == "postgresql"
+
+
+def find_similar_titles(
+    db: Session,
+    title: str,
+    status: Optional[str] = "active",
+    limit: int = CANDIDATE_LIMIT,
+) -> List[Opportunity]:
+    """
+    Return opportunities whose title is trigram-similar to `title`, most similar first.
+
+    Falls back to every opportunity (the old full scan) on databases without pg_trgm.
+    """
+    query = db.query(Opportunity)
+    if status:
+        query = query.filter(Opportunity.status == status)
+
+    if not title or not _supports_trigram(db):
+        return query.all()
+
+    try:
+        # Savepoint so a missing pg_trgm extension does not abort the caller's transaction.
+        with db.begin_nested():
+            # Transaction-local, so it does not leak into other requests on the pooled connection.
+            db.execute(
+                text("SELECT set_config('pg_trgm.similarity_threshold', :threshold, true)"),
+                {"threshold": str(TITLE_TRIGRAM_THRESHOLD)},
+            )
+            return (
+                query.filter(Opportunity.title.op("%")(title))
+                .order_by(func.similarity(Opportunity.title, title).desc())
+                .limit(limit)
+                .all()
+            )
+    except Exception as e:
+        logger.warning(f"Trigram duplicate lookup failed, falling back to full scan: {e}")
+        return query.all()
+
+
+def find_potential_duplicates(
+    db: Session,
+    title: str,
+    description: str,
+    threshold: float = DUPLICATE_THRESHOLD,
+) -> List[Dict[str, Any]]:
+    """Score trigram candidates with the exact word-overlap similarity, best first."""
+    potential_duplicates = []
+
+    for opp in find_similar_titles(db, title):
+        title_similarity = calculate_text_similarity(title, opp.title)
+        desc_similarity = calculate_text_similarity(description, opp.description)
+
+        # Combined score (title weighted more heavily)
+        similarity_score = (title_similarity * TITLE_WEIGHT) + (desc_similarity * DESCRIPTION_WEIGHT)
+
+        if similarity_score > threshold:
+            potential_duplicates.append({
+                "opportunity_id": opp.id,
+                "title": opp.title,
+                "similarity_score": round(similarity_score * 100, 2),
+                "validation_count": opp.validation_count,
+                "created_at": opp.created_at
+            })
+
+    potential_duplicates.sort(key=lambda x: x['similarity_score'], reverse=True)
+    return potential_duplicates
+
+
+def find_by_category_and_city(
+    db: Session,
+    category: str,
+    city: str,
+    title: Optional[str] = None,
+    limit: int = 5,
+) -> List[Opportunity]:
+    """
+    Opportunities whose category and city contain the given values.
+
+    The ILIKE '%...%' filters are served by the trigram GIN indexes; when a
+    title is given, the closest titles are returned first.
+    """
+    query = db.query(Opportunity).filter(
+        Opportunity.category.ilike(f"%{category}%"),
+        Opportunity.city.ilike(f"%{city}%")
+    )
+
+    if title and _supports_trigram(db):
+        try:
+            with db.begin_nested():
+                return query.order_by(
+                    func.similarity(Opportunity.title, title).desc()
+                ).limit(limit).all()
+        except Exception as e:
+            logger.warning(f"Trigram ordering unavailable: {e}")
+
+    return query.limit(limit).all()
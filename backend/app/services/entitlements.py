@@ -1,16 +1,16 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
-from typing import Optional
+from typing import Dict, Iterable, Optional
 
 from sqlalchemy.orm import Session
 
 from app.models.opportunity import Opportunity
-from app.models.subscription import SubscriptionTier, UnlockedOpportunity
+from app.models.subscription import SubscriptionTier
 from app.models.user import User
+from app.services.principal_cache import UnlockInfo, cached_tier, cached_unlocks
 from app.services.stripe_service import stripe_service
-from app.services.usage_service import usage_service
 
 
 @dataclass(frozen=True)
@@ -33,6 +33,32 @@ class OpportunityEntitlements:
     execution_package_available: bool
 
 
+@dataclass(frozen=True)
+class EntitlementContext:
+    """What access checks need to know about the user, loaded once per request."""
+    user: Optional[User]
+    tier: Optional[SubscriptionTier]
+    unlocks: Dict[int, UnlockInfo] = field(default_factory=dict)
+
+
+def load_entitlement_context(
+    db: Session,
+    user: User | None,
+    opportunity_ids: Optional[Iterable[int]] = None,
+) -> EntitlementContext:
+    """
+    Subscription tier and unlock records for `user` (served from the principal
+    cache when warm). Pass `opportunity_ids` to load only those unlock records.
+    """
+    if user is None:
+        return EntitlementContext(user=None, tier=None)
+    return EntitlementContext(
+        user=user,
+        tier=cached_tier(db, user),
+        unlocks=cached_unlocks(db, user, opportunity_ids),
+    )
+
+
 def _utc_age_days(created_at: datetime | None) -> int:
     now = datetime.now(timezone.utc)
     if created_at is None:
@@ -46,36 +72,37 @@ def get_opportunity_entitlements(
     db: Session,
     opportunity: Opportunity,
     user: User | None,
+    context: EntitlementContext | None = None,
 ) -> OpportunityEntitlements:
     """
     Single source of truth for opportunity access rules.
 
+    Pass a `context` from `load_entitlement_context` to evaluate several
+    opportunities for one user without reloading tier and unlocks.
+
     Notes:
     - `is_accessible_by_tier` is purely time-decay tier access.
     - `is_accessible` includes any explicit unlock record.
     """
 
+    if context is None:
+        context = load_entitlement_context(db, user)
+
     is_authenticated = user is not None
     age_days = _utc_age_days(opportunity.created_at)
     freshness_badge = stripe_service.get_opportunity_freshness_badge(age_days)
 
-    user_tier: SubscriptionTier | None = None
+    user_tier: SubscriptionTier | None = context.tier
     is_unlocked = False
     unlock_method: str | None = None
+    unlock_record = context.unlocks.get(opportunity.id) if user else None
 
     if user:
-        subscription = usage_service.get_or_create_subscription(user, db)
-        user_tier = subscription.tier if isinstance(subscription.tier, SubscriptionTier) else SubscriptionTier(subscription.tier)
-
-        # NOTE: usage_service.is_opportunity_unlocked treats authors as unlocked.
-        is_unlocked = usage_service.is_opportunity_unlocked(user, opportunity.id, db)
+        # Authors can always see their own opportunities
+        is_unlocked = opportunity.author_id == user.id or unlock_record is not None
         if is_unlocked:
-            unlock_record = db.query(UnlockedOpportunity).filter(
-                UnlockedOpportunity.user_id == user.id,
-                UnlockedOpportunity.opportunity_id == opportunity.id,
-            ).first()
             if unlock_record and unlock_record.unlock_method:
-                unlock_method = unlock_record.unlock_method.value
+                unlock_method = unlock_record.unlock_method
 
             # Expiration handling (pay-per-unlock)
             if unlock_record and unlock_record.expires_at:
@@ -114,14 +141,7 @@ def get_opportunity_entitlements(
     # - Business/Enterprise: included with tier access
     # - Pro: available for $49 add-on (check has_deep_dive field)
     # - Free: not available
-    has_paid_deep_dive = False
-    if user:
-        unlock_record = db.query(UnlockedOpportunity).filter(
-            UnlockedOpportunity.user_id == user.id,
-            UnlockedOpportunity.opportunity_id == opportunity.id,
-        ).first()
-        if unlock_record and unlock_record.has_deep_dive:
-            has_paid_deep_dive = True
+    has_paid_deep_dive = bool(unlock_record and unlock_record.has_deep_dive)
     
     deep_dive_available = (
         (tier_value in ["business", "enterprise"] and is_accessible) or
@@ -181,3 +201,20 @@ def get_opportunity_entitlements(
         execution_package_available=execution_package_available,
     )
 
+
+def get_entitlements_for_many(
+    db: Session,
+    opportunities: Iterable[Opportunity],
+    user: User | None,
+) -> Dict[int, OpportunityEntitlements]:
+    """
+    Entitlements for a page of opportunities, keyed by opportunity id.
+
+    The user's tier and the unlock records for the whole page are loaded
+    once (a single IN query when the principal cache is cold); every row is
+    then evaluated in memory with the same rules as
+    `get_opportunity_entitlements`.
+    """
+    opportunities = list(opportunities)
+    context = load_entitlement_context(db, user, [opp.id for opp in opportunities])
+    return {opp.id: get_opportunity_entitlements(db, opp, user, context) for opp in opportunities}
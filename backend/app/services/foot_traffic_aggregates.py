@@ -0,0 +1,281 @@
+"""
+Precomputed foot traffic aggregates.
+
+`popular_times` (7 days x 24 hourly values) is summarized once, when a place
+is saved, into indexed columns on `foot_traffic`: average intensity, peak
+hour/day and weekday/weekend averages.
+
+Places are also counted into `foot_traffic_hex_bins`, a hexagonal grid at
+several resolutions (edge lengths follow H3 resolutions 5-10). Bins hold
+additive sums, so saving a place is one upsert per resolution and heatmaps
+read a bounded number of bins whatever the radius:
+
+- `resolution_for` picks the finest resolution that keeps the radius within
+  MAX_BINS_ACROSS cells (and no finer than the map zoom needs)
+- cells are laid out in Web Mercator, so they are the same size on screen
+"""
+
+import math
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import text
+
+# Intensity the heatmap has always used for places without popular times
+DEFAULT_INTENSITY = 50.0
+
+WEEKEND_DAYS = {'Saturday', 'Sunday'}
+
+# resolution -> hexagon edge length in meters (H3 average edge lengths)
+HEX_EDGE_METERS: Dict[int, float] = {
+    5: 8544.0,
+    6: 3229.0,
+    7: 1220.0,
+    8: 461.0,
+    9: 174.0,
+    10: 66.0,
+}
+
+# map zoom -> finest resolution worth drawing at that zoom
+ZOOM_RESOLUTIONS: List[Tuple[int, int]] = [(8, 5), (10, 6), (11, 7), (13, 8), (14, 9)]
+MAX_RESOLUTION = 10
+
+MAX_BINS_ACROSS = 20  # cells from center to edge of a heatmap; bounds bins per request
+
+_MERCATOR_RADIUS = 6378137.0
+_MAX_MERCATOR_LAT = 85.05112878
+
+
+# foot_traffic is created outside alembic (attached_assets SQL), possibly after
+# the migration that adds these; both the migration and the collector apply them.
+SUMMARY_COLUMNS_DDL = [
+    """
+    ALTER TABLE foot_traffic
+        ADD COLUMN IF NOT EXISTS avg_intensity REAL,
+        ADD COLUMN IF NOT EXISTS peak_hour SMALLINT,
+        ADD COLUMN IF NOT EXISTS peak_day VARCHAR(10),
+        ADD COLUMN IF NOT EXISTS weekday_avg REAL,
+        ADD COLUMN IF NOT EXISTS weekend_avg REAL,
+        ADD COLUMN IF NOT EXISTS hourly_profile JSONB
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_foot_traffic_avg_intensity ON foot_traffic (avg_intensity)",
+    "CREATE INDEX IF NOT EXISTS idx_foot_traffic_peak_hour ON foot_traffic (peak_hour)",
+]
+
+_summary_columns_ready = False
+
+
+def ensure_summary_columns(db) -> None:
+    """Add the summary columns to foot_traffic if missing (checked once per process)"""
+    global _summary_columns_ready
+    if _summary_columns_ready:
+        return
+    missing = db.execute(text("""
+        SELECT COUNT(*) FROM information_schema.columns
+        WHERE table_name = 'foot_traffic' AND column_name = 'hourly_profile'
+    """)).scalar() == 0
+    if missing:
+        for statement in SUMMARY_COLUMNS_DDL:
+            db.execute(text(statement))
+    _summary_columns_ready = True
+
+
+def summarize_popular_times(popular_times: Optional[Dict[str, List[float]]]) -> Dict[str, Any]:
+    """Average intensity, peak hour/day, weekday/weekend averages and the 24-hour profile"""
+    summary = {
+        'avg_intensity': None,
+        'peak_hour': None,
+        'peak_day': None,
+        'weekday_avg': None,
+        'weekend_avg': None,
+        'hourly_profile': None,
+    }
+    if not popular_times:
+        return summary
+
+    days = {day: values for day, values in popular_times.items() if isinstance(values, list) and values}
+    if not days:
+        return summary
+
+    all_values = [value for values in days.values() for value in values]
+    weekday = [value for day, values in days.items() if day not in WEEKEND_DAYS for value in values]
+    weekend = [value for day, values in days.items() if day in WEEKEND_DAYS for value in values]
+
+    hourly_totals = [0.0] * 24
+    hourly_counts = [0] * 24
+    for values in days.values():
+        for hour, value in enumerate(values[:24]):
+            hourly_totals[hour] += value
+            hourly_counts[hour] += 1
+    hourly_profile = [
+        round(total / count, 1) if count else 0.0
+        for total, count in zip(hourly_totals, hourly_counts)
+    ]
+
+    summary.update({
+        'avg_intensity': round(sum(all_values) / len(all_values), 2),
+        'peak_hour': max(range(24), key=lambda hour: hourly_profile[hour]) if any(hourly_profile) else None,
+        'peak_day': max(days, key=lambda day: sum(days[day])) if any(all_values) else None,
+        'weekday_avg': round(sum(weekday) / len(weekday), 2) if weekday else None,
+        'weekend_avg': round(sum(weekend) / len(weekend), 2) if weekend else None,
+        'hourly_profile': hourly_profile,
+    })
+    return summary
+
+
+def _mercator(lat: float, lng: float) -> Tuple[float, float]:
+    lat = max(-_MAX_MERCATOR_LAT, min(_MAX_MERCATOR_LAT, lat))
+    x = _MERCATOR_RADIUS * math.radians(lng)
+    y = _MERCATOR_RADIUS * math.log(math.tan(math.pi / 4 + math.radians(lat) / 2))
+    return x, y
+
+
+def hex_cell(lat: float, lng: float, resolution: int) -> Tuple[int, int]:
+    """Axial (q, r) of the pointy-top hexagon containing the point"""
+    size = HEX_EDGE_METERS[resolution]
+    x, y = _mercator(lat, lng)
+    q = (math.sqrt(3) / 3 * x - y / 3) / size
+    r = (2 / 3 * y) / size
+
+    # Cube rounding
+    cx, cz = q, r
+    cy = -cx - cz
+    rx, ry, rz = round(cx), round(cy), round(cz)
+    dx, dy, dz = abs(rx - cx), abs(ry - cy), abs(rz - cz)
+    if dx > dy and dx > dz:
+        rx = -ry - rz
+    elif dy <= dz:
+        rz = -rx - ry
+    return int(rx), int(rz)
+
+
+def hex_center(q: int, r: int, resolution: int) -> Tuple[float, float]:
+    """(lat, lng) of a hexagon's center"""
+    size = HEX_EDGE_METERS[resolution]
+    x = size * math.sqrt(3) * (q + r / 2)
+    y = size * 1.5 * r
+    lng = math.degrees(x / _MERCATOR_RADIUS)
+    lat = math.degrees(2 * math.atan(math.exp(y / _MERCATOR_RADIUS)) - math.pi / 2)
+    return lat, lng
+
+
+def resolution_for(radius_meters: float, zoom: Optional[int] = None) -> int:
+    """Finest resolution that keeps the radius within MAX_BINS_ACROSS cells"""
+    resolution = min(HEX_EDGE_METERS)
+    for candidate in sorted(HEX_EDGE_METERS):
+        if radius_meters / HEX_EDGE_METERS[candidate] <= MAX_BINS_ACROSS:
+            resolution = candidate
+    if zoom is not None:
+        zoom_resolution = next((res for max_zoom, res in ZOOM_RESOLUTIONS if zoom <= max_zoom), MAX_RESOLUTION)
+        resolution = min(resolution, zoom_resolution)
+    return resolution
+
+
+def _bin_values(summary: Dict[str, Any]) -> Tuple[float, float, float]:
+    intensity = summary.get('avg_intensity')
+    if intensity is None:
+        intensity = DEFAULT_INTENSITY
+    weekday = summary.get('weekday_avg')
+    weekend = summary.get('weekend_avg')
+    return (
+        float(intensity),
+        float(weekday if weekday is not None else intensity),
+        float(weekend if weekend is not None else intensity),
+    )
+
+
+def bin_deltas(changes: Iterable[Tuple[float, float, Optional[Dict[str, Any]], Dict[str, Any]]]) -> Dict[Tuple[int, int, int], List[float]]:
+    """
+    Per-bin [place_count, intensity_sum, weekday_sum, weekend_sum] changes for
+    saved places, given (lat, lng, previous summary or None if new, new summary).
+    """
+    deltas: Dict[Tuple[int, int, int], List[float]] = defaultdict(lambda: [0, 0.0, 0.0, 0.0])
+    for lat, lng, previous, current in changes:
+        new_values = _bin_values(current)
+        old_values = _bin_values(previous) if previous is not None else (0.0, 0.0, 0.0)
+        for resolution in HEX_EDGE_METERS:
+            q, r = hex_cell(lat, lng, resolution)
+            delta = deltas[(resolution, q, r)]
+            if previous is None:
+                delta[0] += 1
+            for i in range(3):
+                delta[i + 1] += new_values[i] - old_values[i]
+    return {key: delta for key, delta in deltas.items() if any(delta)}
+
+
+def apply_bin_deltas(db, deltas: Dict[Tuple[int, int, int], List[float]]) -> None:
+    """Add deltas to foot_traffic_hex_bins (one additive upsert per bin)"""
+    if not deltas:
+        return
+    rows = []
+    for (resolution, q, r), (count, intensity, weekday, weekend) in deltas.items():
+        center_lat, center_lng = hex_center(q, r, resolution)
+        rows.append({
+            'resolution': resolution,
+            'hex_q': q,
+            'hex_r': r,
+            'center_latitude': center_lat,
+            'center_longitude': center_lng,
+            'place_count': count,
+            'intensity_sum': intensity,
+            'weekday_sum': weekday,
+            'weekend_sum': weekend,
+        })
+    db.execute(text("""
+        INSERT INTO foot_traffic_hex_bins (
+            resolution, hex_q, hex_r, center_latitude, center_longitude,
+            place_count, intensity_sum, weekday_sum, weekend_sum, updated_at
+        )
+        VALUES (
+            :resolution, :hex_q, :hex_r, :center_latitude, :center_longitude,
+            :place_count, :intensity_sum, :weekday_sum, :weekend_sum, NOW()
+        )
+        ON CONFLICT (resolution, hex_q, hex_r) DO UPDATE SET
+            place_count = foot_traffic_hex_bins.place_count + EXCLUDED.place_count,
+            intensity_sum = foot_traffic_hex_bins.intensity_sum + EXCLUDED.intensity_sum,
+            weekday_sum = foot_traffic_hex_bins.weekday_sum + EXCLUDED.weekday_sum,
+            weekend_sum = foot_traffic_hex_bins.weekend_sum + EXCLUDED.weekend_sum,
+            updated_at = NOW()
+    """), rows)
+
+
+def rebuild_foot_traffic_aggregates(db, batch_size: int = 1000) -> int:
+    """
+    Recompute every place's summary columns and rebuild the hex bins from
+    scratch (backfill, or after bulk edits outside FootTrafficCollector).
+    Returns the number of places processed.
+    """
+    import json
+
+    db.execute(text("DELETE FROM foot_traffic_hex_bins"))
+    rows = db.execute(text("SELECT id, latitude, longitude, popular_times FROM foot_traffic")).fetchall()
+
+    for start in range(0, len(rows), batch_size):
+        batch = rows[start:start + batch_size]
+        updates = []
+        changes = []
+        for place_id, lat, lng, popular_times in batch:
+            if isinstance(popular_times, str):
+                popular_times = json.loads(popular_times)
+            summary = summarize_popular_times(popular_times)
+            updates.append({
+                'id': place_id,
+                **summary,
+                'hourly_profile': json.dumps(summary['hourly_profile']) if summary['hourly_profile'] else None,
+            })
+            changes.append((float(lat), float(lng), None, summary))
+
+        if updates:
+            db.execute(text("""
+                UPDATE foot_traffic SET
+                    avg_intensity = :avg_intensity,
+                    peak_hour = :peak_hour,
+                    peak_day = :peak_day,
+                    weekday_avg = :weekday_avg,
+                    weekend_avg = :weekend_avg,
+                    hourly_profile = CAST(:hourly_profile AS jsonb)
+                WHERE id = :id
+            """), updates)
+        apply_bin_deltas(db, bin_deltas(changes))
+
+    return len(rows)
@@ -19,6 +19,9 @@ from sqlalchemy.orm import Session
 from sqlalchemy import text
 import logging
 
+from app.services.foot_traffic_aggregates import apply_bin_deltas, bin_deltas, ensure_summary_columns, summarize_popular_times
+from app.services.vector_tiles import invalidate_tile_cache
+
 logger = logging.getLogger(__name__)
 
 SERPAPI_KEY = os.getenv('SERPAPI_KEY')
@@ -242,12 +245,23 @@ class FootTrafficCollector:
             logger.warning("No traffic data to save")
             return 0
         
+        import json
+        
         saved_count = 0
+        try:
+            ensure_summary_columns(self.db)
+            self.db.commit()
+        except Exception as e:
+            logger.error(f"Error adding foot traffic summary columns: {str(e)}")
+            self.db.rollback()
+        # Previous location and summary of places being updated, to move their bin counts
+        existing = self._existing_summaries([data['place_id'] for data in traffic_data if data.get('place_id')])
+        bin_changes = []
         
         for data in traffic_data:
             try:
-                import json
                 popular_times_json = json.dumps(data.get('popular_times')) if data.get('popular_times') else None
+                summary = summarize_popular_times(data.get('popular_times'))
                 
                 time_spent = data.get('time_spent')
                 time_spent_min = None
@@ -271,14 +285,19 @@ class FootTrafficCollector:
                     latitude, longitude, location,
                     popular_times, current_popularity,
                     time_spent_min, time_spent_max,
-                    data_quality_score, last_updated
+                    data_quality_score,
+                    avg_intensity, peak_hour, peak_day, weekday_avg, weekend_avg, hourly_profile,
+                    last_updated
                 )
                 VALUES (
                     :place_id, :place_name, :place_address, :place_type,
                     :latitude, :longitude, ST_MakePoint(:longitude, :latitude)::geography,
                     CAST(:popular_times AS jsonb), :current_popularity,
                     :time_spent_min, :time_spent_max,
-                    :data_quality_score, NOW()
+                    :data_quality_score,
+                    :avg_intensity, :peak_hour, :peak_day, :weekday_avg, :weekend_avg,
+                    CAST(:hourly_profile AS jsonb),
+                    NOW()
                 )
                 ON CONFLICT (place_id) DO UPDATE SET
                     place_name = EXCLUDED.place_name,
@@ -288,6 +307,12 @@ class FootTrafficCollector:
                     time_spent_min = EXCLUDED.time_spent_min,
                     time_spent_max = EXCLUDED.time_spent_max,
                     data_quality_score = EXCLUDED.data_quality_score,
+                    avg_intensity = EXCLUDED.avg_intensity,
+                    peak_hour = EXCLUDED.peak_hour,
+                    peak_day = EXCLUDED.peak_day,
+                    weekday_avg = EXCLUDED.weekday_avg,
+                    weekend_avg = EXCLUDED.weekend_avg,
+                    hourly_profile = EXCLUDED.hourly_profile,
                     last_updated = NOW()
                 """)
                 
@@ -302,18 +327,62 @@ class FootTrafficCollector:
                     'current_popularity': data.get('current_popularity'),
                     'time_spent_min': time_spent_min,
                     'time_spent_max': time_spent_max,
-                    'data_quality_score': data.get('data_quality_score', 0.7)
+                    'data_quality_score': data.get('data_quality_score', 0.7),
+                    **summary,
+                    'hourly_profile': json.dumps(summary['hourly_profile']) if summary['hourly_profile'] else None
                 })
                 saved_count += 1
                 
+                # The upsert keeps an existing place's coordinates, so its bins stay put.
+                previous = existing.get(data['place_id'])
+                if previous:
+                    lat, lng, previous_summary = previous
+                else:
+                    lat, lng, previous_summary = float(data['latitude']), float(data['longitude']), None
+                bin_changes.append((lat, lng, previous_summary, summary))
+                existing[data['place_id']] = (lat, lng, summary)
+                
             except Exception as e:
                 logger.error(f"Error saving traffic data for {data.get('place_id', 'unknown')}: {str(e)}")
                 continue
         
+        try:
+            # Savepoint: a failed bin update must not lose the saved places
+            with self.db.begin_nested():
+                apply_bin_deltas(self.db, bin_deltas(bin_changes))
+        except Exception as e:
+            logger.error(f"Error updating foot traffic hex bins: {str(e)}")
+        
         self.db.commit()
+        if saved_count:
+            invalidate_tile_cache("foot_traffic")
         logger.info(f"Successfully saved {saved_count} traffic records")
         return saved_count
     
+    def _existing_summaries(self, place_ids: List[str]) -> Dict[str, tuple]:
+        """place_id -> (latitude, longitude, summary) for places already stored"""
+        if not place_ids:
+            return {}
+        try:
+            rows = self.db.execute(text("""
+            SELECT place_id, latitude, longitude, avg_intensity, weekday_avg, weekend_avg
+            FROM foot_traffic
+            WHERE place_id = ANY(:place_ids)
+            """), {'place_ids': place_ids}).fetchall()
+        except Exception as e:
+            logger.error(f"Error loading existing traffic summaries: {str(e)}")
+            self.db.rollback()
+            return {}
+        
+        return {
+            row.place_id: (
+                float(row.latitude),
+                float(row.longitude),
+                {'avg_intensity': row.avg_intensity, 'weekday_avg': row.weekday_avg, 'weekend_avg': row.weekend_avg}
+            )
+            for row in rows
+        }
+    
     def _format_popular_times(self, popular_times_raw: Dict) -> Dict:
         """
         Format SerpAPI popular times data into consistent structure
@@ -0,0 +1,265 @@
+"""
+Concurrent, cached execution of Google scrape jobs.
+
+`GoogleScrapingService.run_job` used to call SerpAPI once per keyword and
+then once per place for reviews, one call at a time, and never read the
+results it stored in google_search_cache. `ScrapeJobExecutor`:
+
+- looks every search up in google_search_cache first (one IN query per
+  stage: searches, then reviews); only missing or expired entries reach
+  SerpAPI, so re-running a job within the cache TTL costs no credits
+- runs the remaining calls in threads, at most `concurrency` at a time,
+  each paced through the shared "serpapi" token bucket
+  (SERPAPI_REQUESTS_PER_MINUTE), so parallel jobs share one account budget
+- stores new responses and the scraped places with one bulk upsert each
+
+A job's wall time is about its slowest search plus its slowest reviews
+call. Review fetch errors are logged and the place skipped, as before; a
+failed search fails the job after the successful responses are cached.
+"""
+
+import asyncio
+import hashlib
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.google_scraping import GoogleMapsBusiness, GoogleSearchCache
+from app.services.ai_batch_engine import get_provider_bucket
+
+logger = logging.getLogger(__name__)
+
+MAPS_KEYWORD_LIMIT = 5
+PLACES_PER_KEYWORD = 3
+SEARCH_KEYWORD_LIMIT = 10
+
+
+def search_cache_hash(search_type: str, keyword: str, location: str) -> str:
+    """google_search_cache.query_hash for a search (organic keeps its original key format)"""
+    query_string = f"{keyword}|{location}" if search_type == "organic" else f"{search_type}|{keyword}|{location}"
+    return hashlib.sha256(query_string.encode()).hexdigest()
+
+
+class ScrapeJobExecutor:
+    """Runs the SerpAPI calls of one scrape job with caching and bounded concurrency."""
+
+    def __init__(
+        self,
+        db: Session,
+        serpapi,
+        concurrency: Optional[int] = None,
+        cache_ttl_hours: Optional[int] = None,
+    ):
+        self.db = db
+        self.serpapi = serpapi
+        self.concurrency = concurrency or settings.SERPAPI_CONCURRENCY
+        self.cache_ttl = timedelta(hours=cache_ttl_hours or settings.GOOGLE_SEARCH_CACHE_TTL_HOURS)
+        self.api_calls = 0
+        self.cache_hits = 0
+        self._new_entries: Dict[str, Dict[str, Any]] = {}
+
+    async def run_maps_reviews(
+        self,
+        keywords: List[str],
+        location_query: str,
+        location_id: Optional[int],
+    ) -> List[Dict[str, Any]]:
+        """Maps search per keyword, then reviews for its top places; results in keyword order"""
+        semaphore = asyncio.Semaphore(self.concurrency)
+        keywords = keywords[:MAPS_KEYWORD_LIMIT]
+
+        searches = [
+            ("maps", keyword, location_query, self.serpapi.google_maps_search,
+             {"query": f"{keyword} {location_query}", "location": location_query})
+            for keyword in keywords
+        ]
+        search_results = await self._fetch_all(searches, semaphore)
+        self._raise_first_error(search_results)
+
+        places: List[Tuple[str, Dict[str, Any]]] = []
+        for keyword, result in zip(keywords, search_results):
+            for place in result.get("local_results", [])[:PLACES_PER_KEYWORD]:
+                if place.get("data_id"):
+                    places.append((keyword, place))
+
+        reviews = [
+            ("reviews", place["data_id"], "", self.serpapi.google_maps_reviews, {"data_id": place["data_id"]})
+            for _, place in places
+        ]
+        review_results = await self._fetch_all(reviews, semaphore)
+
+        all_results = []
+        scraped_places = []
+        for (keyword, place), result in zip(places, review_results):
+            if isinstance(result, Exception):
+                logger.warning(f"Error fetching reviews for {place.get('data_id')}: {result}")
+                continue
+            all_results.append({
+                "place": place,
+                "reviews": result.get("reviews", []),
+                "keyword": keyword
+            })
+            scraped_places.append(place)
+
+        self._flush_cache()
+        self.upsert_businesses(scraped_places, location_id)
+        return all_results
+
+    async def run_google_search(self, keywords: List[str], location_query: str, depth: int) -> List[Dict[str, Any]]:
+        """Organic search per keyword; results in keyword order"""
+        semaphore = asyncio.Semaphore(self.concurrency)
+        num = depth // len(keywords) if keywords else depth
+        keywords = keywords[:SEARCH_KEYWORD_LIMIT]
+
+        searches = [
+            ("organic", keyword, location_query, self.serpapi.google_search,
+             {"query": f"{keyword} {location_query}", "location": location_query, "num": num})
+            for keyword in keywords
+        ]
+        search_results = await self._fetch_all(searches, semaphore)
+        self._raise_first_error(search_results)
+        self._flush_cache()
+
+        all_results = []
+        for keyword, result in zip(keywords, search_results):
+            organic_results = result.get("organic_results", [])
+            if organic_results:
+                all_results.append({
+                    "keyword": keyword,
+                    "results": organic_results
+                })
+        return all_results
+
+    async def _fetch_all(
+        self,
+        calls: List[Tuple[str, str, str, Callable[..., Dict[str, Any]], Dict[str, Any]]],
+        semaphore: asyncio.Semaphore,
+    ) -> List[Any]:
+        """
+        Response (or the exception raised) for each (search_type, keyword,
+        location, fn, kwargs) call, served from the cache where possible.
+        """
+        hashes = [search_cache_hash(search_type, keyword, location) for search_type, keyword, location, _, _ in calls]
+        cached = self.read_cache(hashes)
+
+        async def fetch(query_hash: str, call) -> Dict[str, Any]:
+            search_type, keyword, location, fn, kwargs = call
+            if query_hash in cached:
+                self.cache_hits += 1
+                return cached[query_hash]
+            async with semaphore:
+                await get_provider_bucket("serpapi").acquire()
+                self.api_calls += 1
+                result = await asyncio.to_thread(fn, **kwargs)
+            if not result.get("error"):
+                self._new_entries[query_hash] = {
+                    "query_hash": query_hash,
+                    "location_query": location,
+                    "keyword_query": keyword,
+                    "search_type": search_type,
+                    "total_results": (result.get("search_information") or {}).get("total_results"),
+                    "raw_results": result,
+                }
+            return result
+
+        # Identical calls within a job share one fetch
+        tasks: Dict[str, asyncio.Task] = {}
+        for query_hash, call in zip(hashes, calls):
+            if query_hash not in tasks:
+                tasks[query_hash] = asyncio.ensure_future(fetch(query_hash, call))
+        await asyncio.gather(*tasks.values(), return_exceptions=True)
+
+        return [
+            tasks[query_hash].exception() or tasks[query_hash].result()
+            for query_hash in hashes
+        ]
+
+    def _raise_first_error(self, results: List[Any]) -> None:
+        """Fail the job on a search error, keeping (committing) the responses already paid for"""
+        error = next((result for result in results if isinstance(result, Exception)), None)
+        if error is None:
+            return
+        if self._new_entries:
+            self._flush_cache()
+            self.db.commit()
+        raise error
+
+    def read_cache(self, hashes: List[str]) -> Dict[str, Dict[str, Any]]:
+        """query_hash -> raw_results for unexpired cache entries"""
+        if not hashes:
+            return {}
+        rows = self.db.query(GoogleSearchCache.query_hash, GoogleSearchCache.raw_results).filter(
+            GoogleSearchCache.query_hash.in_(set(hashes)),
+            GoogleSearchCache.expires_at > datetime.utcnow(),
+        ).all()
+        return {query_hash: raw_results for query_hash, raw_results in rows if raw_results}
+
+    def _flush_cache(self) -> None:
+        entries = list(self._new_entries.values())
+        self._new_entries.clear()
+        self.write_cache(entries)
+
+    def write_cache(self, entries: List[Dict[str, Any]]) -> None:
+        """Upsert new responses into google_search_cache (not committed)"""
+        if not entries:
+            return
+        from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+        now = datetime.utcnow()
+        rows = [{**entry, "created_at": now, "expires_at": now + self.cache_ttl} for entry in entries]
+        stmt = pg_insert(GoogleSearchCache.__table__).values(rows)
+        self.db.execute(stmt.on_conflict_do_update(
+            index_elements=["query_hash"],
+            set_={
+                "raw_results": stmt.excluded.raw_results,
+                "total_results": stmt.excluded.total_results,
+                "created_at": stmt.excluded.created_at,
+                "expires_at": stmt.excluded.expires_at,
+            },
+        ))
+
+    def upsert_businesses(self, places: List[Dict[str, Any]], location_id: Optional[int]) -> None:
+        """Insert new places and bump last_scraped_at/scraped_count of known ones (not committed)"""
+        now = datetime.utcnow()
+        rows: Dict[str, Dict[str, Any]] = {}
+        for place in places:
+            place_id = place.get("place_id") or place.get("data_id")
+            if not place_id:
+                continue
+            if place_id in rows:
+                rows[place_id]["scraped_count"] += 1
+                continue
+            coords = place.get("gps_coordinates") or {}
+            rows[place_id] = {
+                "place_id": place_id,
+                "name": place.get("title") or place.get("name", "Unknown"),
+                "address": place.get("address"),
+                "latitude": coords.get("latitude"),
+                "longitude": coords.get("longitude"),
+                "location_id": location_id,
+                "types": place.get("types", []),
+                "rating": place.get("rating"),
+                "user_ratings_total": place.get("reviews"),
+                "phone_number": place.get("phone"),
+                "website": place.get("website"),
+                "last_scraped_at": now,
+                "scraped_count": 1,
+                "is_active": True,
+            }
+        if not rows:
+            return
+        from sqlalchemy import func
+        from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+        table = GoogleMapsBusiness.__table__
+        stmt = pg_insert(table).values(list(rows.values()))
+        self.db.execute(stmt.on_conflict_do_update(
+            index_elements=["place_id"],
+            set_={
+                "last_scraped_at": stmt.excluded.last_scraped_at,
+                "scraped_count": func.coalesce(table.c.scraped_count, 0) + stmt.excluded.scraped_count,
+            },
+        ))
@@ -1,13 +1,13 @@
-import os
-import hashlib
-from datetime import datetime, timedelta
+import asyncio
+from datetime import datetime
 from typing import Optional, List, Dict, Any
 from sqlalchemy.orm import Session
 from sqlalchemy import desc, or_, case
 
 from app.models.google_scraping import (
-    LocationCatalog, KeywordGroup, GoogleScrapeJob, GoogleMapsBusiness, GoogleSearchCache
+    LocationCatalog, KeywordGroup, GoogleScrapeJob, GoogleMapsBusiness
 )
+from app.services.google_scrape_executor import ScrapeJobExecutor
 from app.services.serpapi_service import SerpAPIService
 
 
@@ -215,6 +215,14 @@ class GoogleScrapingService:
         return job
     
     def run_job(self, job_id: int) -> Dict[str, Any]:
+        """Synchronous wrapper around `run_job_async` for callers without an event loop"""
+        return asyncio.run(self.run_job_async(job_id))
+    
+    async def run_job_async(self, job_id: int) -> Dict[str, Any]:
+        """
+        Run a scrape job. Searches and reviews already in google_search_cache
+        are reused; the rest are fetched concurrently (see ScrapeJobExecutor).
+        """
         job = self.get_job(job_id)
         if not job:
             return {"success": False, "error": "Job not found"}
@@ -230,41 +238,16 @@ class GoogleScrapingService:
             location_query = location.name if location else "Austin, TX"
             keywords = keyword_group.keywords if keyword_group else []
             
+            executor = ScrapeJobExecutor(self.db, self.serpapi)
             all_results = []
             
             if job.source_type == "google_maps_reviews":
-                for keyword in keywords[:5]:
-                    search_query = f"{keyword} {location_query}"
-                    places_result = self.serpapi.google_maps_search(query=search_query, location=location_query)
-                    
-                    local_results = places_result.get("local_results", [])
-                    if local_results:
-                        for place in local_results[:3]:
-                            if place.get("data_id"):
-                                try:
-                                    reviews_result = self.serpapi.google_maps_reviews(data_id=place["data_id"])
-                                    all_results.append({
-                                        "place": place,
-                                        "reviews": reviews_result.get("reviews", []),
-                                        "keyword": keyword
-                                    })
-                                    self._cache_business(place, location.id if location else None)
-                                except Exception as e:
-                                    print(f"Error fetching reviews: {e}")
+                all_results = await executor.run_maps_reviews(
+                    keywords, location_query, location.id if location else None
+                )
             
             elif job.source_type == "google_search":
-                for keyword in keywords[:10]:
-                    search_query = f"{keyword} {location_query}"
-                    search_result = self.serpapi.google_search(query=search_query, location=location_query, num=job.depth // len(keywords) if keywords else job.depth)
-                    
-                    organic_results = search_result.get("organic_results", [])
-                    if organic_results:
-                        all_results.append({
-                            "keyword": keyword,
-                            "results": organic_results
-                        })
-                        
-                        self._cache_search_results(keyword, location_query, search_result)
+                all_results = await executor.run_google_search(keywords, location_query, job.depth)
             
             job.status = "completed"
             job.completed_at = datetime.utcnow()
@@ -291,62 +274,13 @@ class GoogleScrapingService:
             }
         
         except Exception as e:
+            self.db.rollback()
             job.status = "failed"
             job.error_message = str(e)
             job.retry_count = (job.retry_count or 0) + 1
             self.db.commit()
             return {"success": False, "error": str(e)}
     
-    def _cache_business(self, place_data: Dict, location_id: Optional[int]):
-        place_id = place_data.get("place_id") or place_data.get("data_id")
-        if not place_id:
-            return
-        
-        existing = self.db.query(GoogleMapsBusiness).filter(GoogleMapsBusiness.place_id == place_id).first()
-        
-        if existing:
-            existing.last_scraped_at = datetime.utcnow()
-            existing.scraped_count = (existing.scraped_count or 0) + 1
-        else:
-            coords = place_data.get("gps_coordinates", {})
-            business = GoogleMapsBusiness(
-                place_id=place_id,
-                name=place_data.get("title") or place_data.get("name", "Unknown"),
-                address=place_data.get("address"),
-                latitude=coords.get("latitude"),
-                longitude=coords.get("longitude"),
-                location_id=location_id,
-                types=place_data.get("types", []),
-                rating=place_data.get("rating"),
-                user_ratings_total=place_data.get("reviews"),
-                phone_number=place_data.get("phone"),
-                website=place_data.get("website"),
-                last_scraped_at=datetime.utcnow()
-            )
-            self.db.add(business)
-    
-    def _cache_search_results(self, keyword: str, location: str, results: Dict):
-        query_string = f"{keyword}|{location}"
-        query_hash = hashlib.sha256(query_string.encode()).hexdigest()
-        
-        existing = self.db.query(GoogleSearchCache).filter(GoogleSearchCache.query_hash == query_hash).first()
-        
-        if existing:
-            existing.raw_results = results
-            existing.created_at = datetime.utcnow()
-            existing.expires_at = datetime.utcnow() + timedelta(hours=24)
-        else:
-            cache = GoogleSearchCache(
-                query_hash=query_hash,
-                location_query=location,
-                keyword_query=keyword,
-                search_type="organic",
-                total_results=results.get("search_information", {}).get("total_results"),
-                raw_results=results,
-                expires_at=datetime.utcnow() + timedelta(hours=24)
-            )
-            self.db.add(cache)
-    
     def get_keyword_categories(self) -> List[str]:
         categories = self.db.query(KeywordGroup.category).distinct().filter(
             KeywordGroup.category.isnot(None),
@@ -0,0 +1,204 @@
+"""
+Vectorized grid scoring for LocationAnalyzer.
+
+Scores every candidate center at once with NumPy instead of filtering
+competitors and scoring zones one point at a time:
+
+- the point x competitor haversine matrix is computed in chunks, so dense
+  grids (thousands of centers) stay within a bounded amount of memory
+- competition scores are derived from per-point competitor counts and
+  ratings with the same rules as `LocationAnalyzer.score_competition`;
+  demographics and market signal scores do not depend on the point and are
+  computed once
+- `refine` adds finer hex lattices around the best cells, so the high
+  resolution mode concentrates candidates where scores are highest
+
+Only ranking happens here. The winning points are turned into `ScoredZone`s
+by `LocationAnalyzer.analyze_zone`, so scores and insights are unchanged.
+"""
+
+import math
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+EARTH_RADIUS_MILES = 3959
+MILES_PER_DEGREE_LAT = 69.0
+MATRIX_CHUNK_CELLS = 1_000_000  # point x competitor distances held in memory at once
+
+IDEAL_COMPETITOR_COUNT = 3
+
+
+def hex_lattice(
+    center_lat: float,
+    center_lng: float,
+    radius_miles: float,
+    spacing_miles: float
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Hexagonal lattice of (lats, lngs) within radius_miles of the center, including the center."""
+    miles_per_degree_lng = MILES_PER_DEGREE_LAT * math.cos(math.radians(center_lat))
+    row_height = spacing_miles * math.sqrt(3) / 2
+    rows = int(radius_miles // row_height)
+    cols = int(radius_miles // spacing_miles) + 1
+
+    j, i = np.meshgrid(np.arange(-rows, rows + 1), np.arange(-cols, cols + 1), indexing="ij")
+    y = j * row_height
+    x = (i + (j % 2) * 0.5) * spacing_miles
+    inside = x ** 2 + y ** 2 <= radius_miles ** 2
+
+    return (
+        center_lat + y[inside] / MILES_PER_DEGREE_LAT,
+        center_lng + x[inside] / miles_per_degree_lng,
+    )
+
+
+def spacing_for_points(radius_miles: float, num_points: int) -> float:
+    """Lattice spacing that puts about num_points centers inside the radius."""
+    return radius_miles * math.sqrt(2 * math.pi / (math.sqrt(3) * max(1, num_points)))
+
+
+def haversine_matrix(
+    lats1: np.ndarray,
+    lngs1: np.ndarray,
+    lats2: np.ndarray,
+    lngs2: np.ndarray
+) -> np.ndarray:
+    """Distance in miles between every (lats1, lngs1) point and every (lats2, lngs2) point."""
+    lat1 = np.radians(lats1)[:, None]
+    lat2 = np.radians(lats2)[None, :]
+    delta_lat = lat2 - lat1
+    delta_lng = np.radians(lngs2)[None, :] - np.radians(lngs1)[:, None]
+
+    a = np.sin(delta_lat / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin(delta_lng / 2) ** 2
+    return EARTH_RADIUS_MILES * 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+
+
+class GridScorer:
+    """Scores candidate zone centers for one find_optimal_zones request."""
+
+    def __init__(
+        self,
+        competitors: Optional[List[Dict[str, Any]]],
+        analysis_radius_miles: float,
+        base_score: float,
+        competition_weight: float
+    ):
+        located = []
+        for comp in competitors or []:
+            comp_lat = comp.get("latitude") or comp.get("lat")
+            comp_lng = comp.get("longitude") or comp.get("lng")
+            if comp_lat is not None and comp_lng is not None:
+                located.append(comp)
+
+        self.competitors = located
+        self.comp_lats = np.array([c.get("latitude") or c.get("lat") for c in located], dtype=float)
+        self.comp_lngs = np.array([c.get("longitude") or c.get("lng") for c in located], dtype=float)
+        self.comp_ratings = np.array([c.get("rating") or 0 for c in located], dtype=float)
+        self.analysis_radius_miles = analysis_radius_miles
+        # Weighted demographics + market signal scores, identical for every point
+        self.base_score = base_score
+        self.competition_weight = competition_weight
+
+    def nearby_mask(self, lats: np.ndarray, lngs: np.ndarray) -> np.ndarray:
+        """Boolean (points x competitors) matrix: competitor within the analysis radius."""
+        mask = np.zeros((len(lats), len(self.competitors)), dtype=bool)
+        if not self.competitors:
+            return mask
+        chunk = max(1, MATRIX_CHUNK_CELLS // len(self.competitors))
+        for start in range(0, len(lats), chunk):
+            distances = haversine_matrix(
+                lats[start:start + chunk], lngs[start:start + chunk], self.comp_lats, self.comp_lngs
+            )
+            mask[start:start + chunk] = distances <= self.analysis_radius_miles
+        return mask
+
+    def competition_scores(self, mask: np.ndarray) -> np.ndarray:
+        """Vectorized `LocationAnalyzer.score_competition` over each point's nearby competitors."""
+        ideal = IDEAL_COMPETITOR_COUNT
+        count = mask.sum(axis=1)
+        score = np.select(
+            [count == 0, count <= ideal, count <= ideal * 2],
+            [40.0, 90.0 - count * 5, 70.0 - (count - ideal) * 5],
+            40.0 - np.minimum(20, (count - ideal * 2) * 2),
+        ).astype(float)
+
+        if self.competitors:
+            rating_sum = mask.astype(float) @ self.comp_ratings
+            avg_rating = np.divide(rating_sum, count, out=np.zeros(len(count)), where=count > 0)
+            score += np.where((count > 0) & (avg_rating < 3.5), 10.0, 0.0)
+            score -= np.where((count > 0) & (avg_rating > 4.5), 5.0, 0.0)
+
+        return np.clip(score, 0.0, 100.0)
+
+    def score(self, lats: np.ndarray, lngs: np.ndarray) -> np.ndarray:
+        """Total zone score for every point, rounded like `ScoredZone.total_score`."""
+        competition = self.competition_scores(self.nearby_mask(lats, lngs))
+        return np.round(self.base_score + competition * self.competition_weight, 1)
+
+    def competitors_near(self, lat: float, lng: float) -> List[Dict[str, Any]]:
+        mask = self.nearby_mask(np.array([lat]), np.array([lng]))[0]
+        return [comp for comp, near in zip(self.competitors, mask) if near]
+
+    def refine(
+        self,
+        lats: np.ndarray,
+        lngs: np.ndarray,
+        scores: np.ndarray,
+        center_lat: float,
+        center_lng: float,
+        target_radius_miles: float,
+        spacing_miles: float,
+        top_cells: int,
+        levels: int
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Add finer lattices (spacing / 3 per level) around the top_cells best
+        points and score them. Returns all points and scores, old and new.
+        """
+        for _ in range(levels):
+            best = np.argsort(-scores, kind="stable")[:top_cells]
+            fine_spacing = spacing_miles / 3
+            new_lats, new_lngs = [], []
+            for idx in best:
+                cell_lats, cell_lngs = hex_lattice(lats[idx], lngs[idx], spacing_miles, fine_spacing)
+                new_lats.append(cell_lats)
+                new_lngs.append(cell_lngs)
+
+            cand_lats = np.concatenate(new_lats)
+            cand_lngs = np.concatenate(new_lngs)
+            in_target = haversine_matrix(
+                np.array([center_lat]), np.array([center_lng]), cand_lats, cand_lngs
+            )[0] <= target_radius_miles
+            cand_lats, cand_lngs = cand_lats[in_target], cand_lngs[in_target]
+
+            lats = np.concatenate([lats, cand_lats])
+            lngs = np.concatenate([lngs, cand_lngs])
+            scores = np.concatenate([scores, self.score(cand_lats, cand_lngs)])
+            spacing_miles = fine_spacing
+
+        return lats, lngs, scores
+
+
+def select_top(
+    lats: np.ndarray,
+    lngs: np.ndarray,
+    scores: np.ndarray,
+    top_n: int,
+    min_separation_miles: float = 0.0
+) -> List[int]:
+    """
+    Indices of the top_n scores (stable on ties), skipping points closer than
+    min_separation_miles to one already chosen.
+    """
+    chosen: List[int] = []
+    for idx in np.argsort(-scores, kind="stable"):
+        if len(chosen) >= top_n:
+            break
+        if chosen and min_separation_miles > 0:
+            distances = haversine_matrix(
+                lats[[idx]], lngs[[idx]], lats[chosen], lngs[chosen]
+            )[0]
+            if (distances < min_separation_miles).any():
+                continue
+        chosen.append(int(idx))
+    return chosen
@@ -0,0 +1,184 @@
+"""
+Instant saved-search alerts driven by opportunity-created events.
+
+The dispatcher subscribes to `opportunity_events`. Ids arriving within
+SAVED_SEARCH_INSTANT_COALESCE_SECONDS of each other are matched together
+against every active 'instant' saved search (one SavedSearchIndex pass).
+Matches accumulate per search until the search is out of its
+INSTANT_ALERT_DEBOUNCE window, then everything due is delivered as one
+digest per user, so a burst of new opportunities becomes a single alert.
+
+Pending matches live in memory only. If the process stops first, the hourly
+saved-search job still finds them, since last_notified_at was not advanced.
+"""
+
+import asyncio
+import logging
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.database import SessionLocal
+from app.models.opportunity import Opportunity
+from app.models.saved_search import SavedSearch
+from app.services.opportunity_events import opportunity_events
+from app.services.saved_search_alerts import (
+    INSTANT_ALERT_DEBOUNCE,
+    deliver_matches,
+    has_notification_channel,
+)
+from app.services.saved_search_matcher import SavedSearchIndex, as_utc, rank_matches
+
+logger = logging.getLogger(__name__)
+
+
+class InstantAlertDispatcher:
+    """Coalescing, debounced delivery of instant saved-search alerts."""
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = SessionLocal,
+        coalesce_seconds: Optional[float] = None,
+        debounce: timedelta = INSTANT_ALERT_DEBOUNCE,
+    ):
+        self._session_factory = session_factory
+        self.coalesce_seconds = (
+            settings.SAVED_SEARCH_INSTANT_COALESCE_SECONDS if coalesce_seconds is None else coalesce_seconds
+        )
+        self.debounce = debounce
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        # Only touched by the dispatcher task (and the worker threads it awaits one at a time).
+        self._pending: Dict[int, Set[int]] = defaultdict(set)
+        self._due_at: Dict[int, datetime] = {}
+
+    def start(self, loop: Optional[asyncio.AbstractEventLoop] = None) -> None:
+        if self._task is not None:
+            return
+        self._loop = loop or asyncio.get_event_loop()
+        self._queue = asyncio.Queue()
+        opportunity_events.subscribe(self.enqueue)
+        self._task = self._loop.create_task(self._run())
+        logger.info("Instant saved-search alerts enabled")
+
+    def stop(self) -> None:
+        opportunity_events.unsubscribe(self.enqueue)
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def enqueue(self, opportunity_ids: Iterable[int]) -> None:
+        """Event handler; safe to call from any thread"""
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+        loop.call_soon_threadsafe(self._queue.put_nowait, list(opportunity_ids))
+
+    def _seconds_until_due(self) -> Optional[float]:
+        if not self._due_at:
+            return None
+        next_due = min(self._due_at.values())
+        return max(0.0, (next_due - datetime.now(timezone.utc)).total_seconds())
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                ids = await asyncio.wait_for(self._queue.get(), timeout=self._seconds_until_due())
+            except asyncio.TimeoutError:
+                ids = []
+
+            if ids:
+                await asyncio.sleep(self.coalesce_seconds)
+                batch = set(ids)
+                while not self._queue.empty():
+                    batch.update(self._queue.get_nowait())
+                try:
+                    await asyncio.to_thread(self.match_opportunities, batch)
+                except Exception as e:
+                    logger.error(f"Instant alert matching failed: {e}")
+
+            try:
+                await asyncio.to_thread(self.deliver_due)
+            except Exception as e:
+                logger.error(f"Instant alert delivery failed: {e}")
+
+    def match_opportunities(self, opportunity_ids: Iterable[int], now: Optional[datetime] = None) -> int:
+        """Queue matches of the given new opportunities; returns the number of searches matched"""
+        now = now or datetime.now(timezone.utc)
+        db = self._session_factory()
+        try:
+            searches = [
+                search for search in db.query(SavedSearch).filter(
+                    SavedSearch.is_active == True,
+                    SavedSearch.notification_prefs["frequency"].astext == "instant",
+                ).all()
+                if has_notification_channel(search)
+            ]
+            if not searches:
+                return 0
+
+            opportunities = db.query(Opportunity).filter(
+                Opportunity.id.in_(list(opportunity_ids)),
+                Opportunity.status == "active",
+                Opportunity.moderation_status == "approved",
+            ).all()
+
+            index = SavedSearchIndex(searches, now)
+            matched: Set[int] = set()
+            for opportunity in opportunities:
+                for search_id in index.match(opportunity):
+                    matched.add(search_id)
+                    self._pending[search_id].add(opportunity.id)
+                    last_notified = as_utc(index.compiled[search_id].search.last_notified_at)
+                    due_at = max(now, last_notified + self.debounce) if last_notified else now
+                    self._due_at.setdefault(search_id, due_at)
+            return len(matched)
+        finally:
+            db.close()
+
+    def deliver_due(self, now: Optional[datetime] = None) -> int:
+        """Send alerts for searches whose debounce has elapsed; returns the number sent"""
+        now = now or datetime.now(timezone.utc)
+        due = [search_id for search_id, due_at in self._due_at.items() if due_at <= now]
+        if not due:
+            return 0
+
+        pending = {search_id: self._pending.pop(search_id, set()) for search_id in due}
+        for search_id in due:
+            del self._due_at[search_id]
+
+        db = self._session_factory()
+        try:
+            searches = db.query(SavedSearch).filter(
+                SavedSearch.id.in_(due),
+                SavedSearch.is_active == True,
+            ).all()
+            opportunity_ids = set().union(*pending.values())
+            opportunities = {
+                opportunity.id: opportunity
+                for opportunity in db.query(Opportunity).filter(Opportunity.id.in_(list(opportunity_ids))).all()
+            }
+
+            matches_by_user: Dict[int, List[Tuple[SavedSearch, List[Opportunity]]]] = defaultdict(list)
+            for search in searches:
+                # Skip anything an hourly catch-up run already delivered.
+                last_notified = as_utc(search.last_notified_at)
+                matches = [
+                    opportunities[opportunity_id]
+                    for opportunity_id in pending[search.id]
+                    if opportunity_id in opportunities
+                    and (last_notified is None or as_utc(opportunities[opportunity_id].created_at) > last_notified)
+                ]
+                if matches:
+                    matches_by_user[search.user_id].append((search, rank_matches(search, matches)))
+
+            return deliver_matches(db, dict(matches_by_user))
+        finally:
+            db.close()
+
+
+instant_alert_dispatcher = InstantAlertDispatcher()
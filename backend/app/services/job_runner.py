@@ -261,6 +261,16 @@ def start_background_jobs() -> None:
         loop.create_task(_loop("apify_import_and_analyze", settings.APIFY_IMPORT_JOB_INTERVAL_SECONDS, _apify_import_and_analyze_job))
         logger.info("Started job: apify_import_and_analyze")
 
+    if settings.REPORT_WORKERS_ENABLED:
+        from app.services.report_queue import report_worker_pool
+
+        report_worker_pool.start(loop)
+
+    if settings.SAVED_SEARCH_INSTANT_ALERTS_ENABLED:
+        from app.services.instant_alerts import instant_alert_dispatcher
+
+        instant_alert_dispatcher.start(loop)
+
     if settings.STRIPE_RECONCILE_JOB_ENABLED:
         loop.create_task(_loop("stripe_subscription_reconcile", settings.STRIPE_RECONCILE_JOB_INTERVAL_SECONDS, _stripe_subscription_reconcile_job))
         logger.info("Started job: stripe_subscription_reconcile")
@@ -24,6 +24,7 @@ from app.models.expert import Expert
 from app.models.success_pattern import SuccessPattern
 from app.services.json_codec import loads_json
 from app.services.ai_engine import ai_engine_service
+from app.services.llm_cache import anthropic_response, llm_cache
 
 logger = logging.getLogger(__name__)
 
@@ -157,13 +158,7 @@ Provide a JSON response with:
 
 Respond only with valid JSON."""
 
-            response = client.messages.create(
-                model=self.fast_model,
-                max_tokens=800,
-                messages=[{"role": "user", "content": prompt}]
-            )
-            
-            response_text = response.content[0].text.strip()
+            response_text = self._complete(client, self.fast_model, 800, prompt, task="match")
             if response_text.startswith("```"):
                 response_text = response_text.split("```")[1]
                 if response_text.startswith("json"):
@@ -246,13 +241,7 @@ Create a JSON response with:
 
 Respond only with valid JSON."""
 
-            response = client.messages.create(
-                model=self.fast_model,
-                max_tokens=1200,
-                messages=[{"role": "user", "content": prompt}]
-            )
-            
-            response_text = response.content[0].text.strip()
+            response_text = self._complete(client, self.fast_model, 1200, prompt, task="roadmap")
             if response_text.startswith("```"):
                 response_text = response_text.split("```")[1]
                 if response_text.startswith("json"):
@@ -328,13 +317,7 @@ Provide a comprehensive JSON response with:
 
 Respond only with valid JSON."""
 
-            response = client.messages.create(
-                model=self.model,
-                max_tokens=1500,
-                messages=[{"role": "user", "content": prompt}]
-            )
-            
-            response_text = response.content[0].text.strip()
+            response_text = self._complete(client, self.model, 1500, prompt, task="validation")
             if response_text.startswith("```"):
                 response_text = response_text.split("```")[1]
                 if response_text.startswith("json"):
@@ -360,13 +343,32 @@ Respond only with valid JSON."""
             return heuristic_result
 
 
-    async def generate_response(self, prompt: str, model: str = "deepseek") -> Dict[str, Any]:
+    def _complete(self, client, model_id: str, max_tokens: int, prompt: str, task: Optional[str] = None) -> str:
+        """Messages API call served through the shared LLM response cache; returns stripped text."""
+        def generate():
+            return anthropic_response(client.messages.create(
+                model=model_id,
+                max_tokens=max_tokens,
+                messages=[{"role": "user", "content": prompt}]
+            ))
+        
+        return llm_cache.get_or_generate(
+            provider="anthropic",
+            model=model_id,
+            prompt=prompt,
+            generate=generate,
+            max_tokens=max_tokens,
+            task=task,
+        ).text.strip()
+
+    async def generate_response(self, prompt: str, model: str = "deepseek", task: Optional[str] = None) -> Dict[str, Any]:
         """
         Generate a response from the AI model.
         
         Args:
             prompt: The prompt to send to the model
             model: Which model to use ("deepseek" or "claude")
+            task: Task name used to pick the response cache TTL
         
         Returns:
             Dictionary with the response
@@ -379,20 +381,11 @@ Respond only with valid JSON."""
         try:
             model_id = self.fast_model if model == "deepseek" else self.model
             
-            def sync_call():
-                return client.messages.create(
-                    model=model_id,
-                    max_tokens=1500,
-                    messages=[{"role": "user", "content": prompt}]
-                )
-            
-            response = await asyncio.wait_for(
-                asyncio.to_thread(sync_call),
+            response_text = await asyncio.wait_for(
+                asyncio.to_thread(self._complete, client, model_id, 1500, prompt, task),
                 timeout=AI_CALL_TIMEOUT_SECONDS
             )
             
-            response_text = response.content[0].text.strip()
-            
             if response_text.startswith("```"):
                 response_text = response_text.split("```")[1]
                 if response_text.startswith("json"):
@@ -0,0 +1,299 @@
+"""
+Content-addressed cache for LLM responses, shared by every AI call site.
+
+A request is identified by a SHA-256 over (provider, model, system prompt,
+user prompt, temperature, max_tokens). Lookups go through two tiers:
+
+- an in-process LRU (LLM_CACHE_MEMORY_ENTRIES entries) for hot prompts
+- the `llm_response_cache` table, so workers and restarts share results
+
+Entries expire after a per-task TTL (TASK_TTL_SECONDS, falling back to
+LLM_CACHE_DEFAULT_TTL_SECONDS). Only successful, non-empty responses are
+stored. Database errors never fail the caller; the cache just misses.
+
+Hit/miss counts and the tokens saved by hits are exposed via `llm_cache.stats()`.
+"""
+
+import hashlib
+import json
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from cachetools import LRUCache
+from sqlalchemy import text
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+HOUR = 3600
+DAY = 24 * HOUR
+
+# TTL per task name passed by call sites; unknown tasks use the default.
+TASK_TTL_SECONDS = {
+    "report": 7 * DAY,
+    "business_plan_generation": 3 * DAY,
+    "document_generation": 3 * DAY,
+    "market_research": 3 * DAY,
+    "opportunity_validation": DAY,
+    "idea_analysis": DAY,
+    "content_rewriting": DAY,
+    "validation": DAY,
+    "roadmap": DAY,
+    "match": 6 * HOUR,
+    "lead_scoring": 6 * HOUR,
+    "expert_matching": 6 * HOUR,
+    "platform_coordination": HOUR,
+}
+
+
+@dataclass
+class CachedResponse:
+    text: str
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cached: bool = False
+
+
+def anthropic_response(message: Any) -> CachedResponse:
+    """CachedResponse from an Anthropic Messages API result"""
+    content = getattr(message, "content", None) or []
+    usage = getattr(message, "usage", None)
+    return CachedResponse(
+        text=content[0].text if content else "",
+        input_tokens=getattr(usage, "input_tokens", 0) or 0,
+        output_tokens=getattr(usage, "output_tokens", 0) or 0,
+    )
+
+
+def openai_response(completion: Any) -> CachedResponse:
+    """CachedResponse from an OpenAI-compatible chat completion (OpenAI, DeepSeek)"""
+    usage = getattr(completion, "usage", None)
+    return CachedResponse(
+        text=completion.choices[0].message.content or "",
+        input_tokens=getattr(usage, "prompt_tokens", 0) or 0,
+        output_tokens=getattr(usage, "completion_tokens", 0) or 0,
+    )
+
+
+def ttl_for_task(task: Optional[str]) -> int:
+    return TASK_TTL_SECONDS.get(task or "", settings.LLM_CACHE_DEFAULT_TTL_SECONDS)
+
+
+class LLMResponseCache:
+    """Two-tier (memory LRU + Postgres) LLM response cache."""
+
+    CLEANUP_INTERVAL_SECONDS = HOUR
+
+    _get_sql = text("""
+        UPDATE llm_response_cache
+        SET hit_count = hit_count + 1
+        WHERE cache_key = :cache_key AND expires_at > :now
+        RETURNING response, input_tokens, output_tokens, expires_at
+    """)
+
+    _set_sql = text("""
+        INSERT INTO llm_response_cache
+            (cache_key, provider, model, task, response, input_tokens, output_tokens, hit_count, created_at, expires_at)
+        VALUES
+            (:cache_key, :provider, :model, :task, :response, :input_tokens, :output_tokens, 0, :now, :expires_at)
+        ON CONFLICT (cache_key) DO UPDATE SET
+            response = EXCLUDED.response,
+            input_tokens = EXCLUDED.input_tokens,
+            output_tokens = EXCLUDED.output_tokens,
+            task = EXCLUDED.task,
+            expires_at = EXCLUDED.expires_at
+    """)
+
+    _cleanup_sql = text("DELETE FROM llm_response_cache WHERE expires_at <= :now")
+
+    def __init__(self, memory_entries: Optional[int] = None, use_database: bool = True):
+        self._memory: LRUCache = LRUCache(maxsize=memory_entries or settings.LLM_CACHE_MEMORY_ENTRIES)
+        self._lock = threading.Lock()
+        self._use_database = use_database
+        self._last_cleanup = 0.0
+        self._stats = {
+            "memory_hits": 0,
+            "db_hits": 0,
+            "misses": 0,
+            "stores": 0,
+            "input_tokens_saved": 0,
+            "output_tokens_saved": 0,
+        }
+
+    @staticmethod
+    def make_key(
+        provider: str,
+        model: str,
+        prompt: str,
+        system: Optional[str] = None,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+    ) -> str:
+        payload = json.dumps(
+            [provider, model, system or "", prompt, temperature, max_tokens],
+            ensure_ascii=False,
+            separators=(",", ":"),
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _engine():
+        from app.db import database
+
+        return database.engine
+
+    def _count(self, name: str, entry: Optional[CachedResponse] = None) -> None:
+        with self._lock:
+            self._stats[name] += 1
+            if entry is not None:
+                self._stats["input_tokens_saved"] += entry.input_tokens
+                self._stats["output_tokens_saved"] += entry.output_tokens
+
+    def _memory_get(self, key: str) -> Optional[CachedResponse]:
+        with self._lock:
+            item: Optional[Tuple[float, CachedResponse]] = self._memory.get(key)
+            if item is None:
+                return None
+            expires_at, entry = item
+            if expires_at <= time.time():
+                del self._memory[key]
+                return None
+            return entry
+
+    def _memory_set(self, key: str, entry: CachedResponse, expires_at: float) -> None:
+        with self._lock:
+            self._memory[key] = (expires_at, entry)
+
+    def _db_get(self, key: str) -> Optional[Tuple[CachedResponse, float]]:
+        engine = self._engine() if self._use_database else None
+        if engine is None:
+            return None
+        try:
+            with engine.begin() as conn:
+                row = conn.execute(self._get_sql, {
+                    "cache_key": key,
+                    "now": datetime.now(timezone.utc),
+                }).fetchone()
+        except Exception as e:
+            logger.warning(f"LLM cache lookup failed: {e}")
+            return None
+        if row is None:
+            return None
+        expires_at = row[3]
+        if expires_at.tzinfo is None:
+            expires_at = expires_at.replace(tzinfo=timezone.utc)
+        return CachedResponse(text=row[0], input_tokens=row[1], output_tokens=row[2]), expires_at.timestamp()
+
+    def _db_set(self, key: str, entry: CachedResponse, provider: str, model: str, task: Optional[str], ttl: int) -> None:
+        engine = self._engine() if self._use_database else None
+        if engine is None:
+            return
+        now = datetime.now(timezone.utc)
+        try:
+            with engine.begin() as conn:
+                conn.execute(self._set_sql, {
+                    "cache_key": key,
+                    "provider": provider[:50],
+                    "model": model[:100],
+                    "task": (task or "")[:100] or None,
+                    "response": entry.text,
+                    "input_tokens": entry.input_tokens,
+                    "output_tokens": entry.output_tokens,
+                    "now": now,
+                    "expires_at": now + timedelta(seconds=ttl),
+                })
+            self._maybe_cleanup(engine, now)
+        except Exception as e:
+            logger.warning(f"LLM cache store failed: {e}")
+
+    def _maybe_cleanup(self, engine, now: datetime) -> None:
+        if time.monotonic() - self._last_cleanup < self.CLEANUP_INTERVAL_SECONDS:
+            return
+        self._last_cleanup = time.monotonic()
+        try:
+            with engine.begin() as conn:
+                conn.execute(self._cleanup_sql, {"now": now})
+        except Exception as e:
+            logger.warning(f"LLM cache cleanup failed: {e}")
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        """Cached response for `key` from memory, then the database"""
+        entry = self._memory_get(key)
+        if entry is not None:
+            self._count("memory_hits", entry)
+            return CachedResponse(entry.text, entry.input_tokens, entry.output_tokens, cached=True)
+
+        found = self._db_get(key)
+        if found is not None:
+            entry, expires_at = found
+            self._memory_set(key, entry, expires_at)
+            self._count("db_hits", entry)
+            return CachedResponse(entry.text, entry.input_tokens, entry.output_tokens, cached=True)
+
+        self._count("misses")
+        return None
+
+    def set(
+        self,
+        key: str,
+        entry: CachedResponse,
+        provider: str,
+        model: str,
+        task: Optional[str] = None,
+    ) -> None:
+        if not entry.text or not entry.text.strip():
+            return
+        ttl = ttl_for_task(task)
+        stored = CachedResponse(entry.text, entry.input_tokens, entry.output_tokens)
+        self._memory_set(key, stored, time.time() + ttl)
+        self._db_set(key, stored, provider, model, task, ttl)
+        self._count("stores")
+
+    def get_or_generate(
+        self,
+        provider: str,
+        model: str,
+        prompt: str,
+        generate: Callable[[], CachedResponse],
+        system: Optional[str] = None,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        task: Optional[str] = None,
+    ) -> CachedResponse:
+        """
+        Return the cached response for this request, or call `generate()` and cache it.
+
+        Blocking (the database tier is synchronous): async callers should run
+        this inside the same worker thread as the provider call.
+        """
+        if not settings.LLM_CACHE_ENABLED:
+            return generate()
+
+        key = self.make_key(provider, model, prompt, system, temperature, max_tokens)
+        cached = self.get(key)
+        if cached is not None:
+            return cached
+
+        entry = generate()
+        self.set(key, entry, provider, model, task)
+        return entry
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["memory_entries"] = len(self._memory)
+        lookups = stats["memory_hits"] + stats["db_hits"] + stats["misses"]
+        stats["hit_rate"] = round((stats["memory_hits"] + stats["db_hits"]) / lookups, 4) if lookups else 0.0
+        return stats
+
+    def clear_memory(self) -> None:
+        with self._lock:
+            self._memory.clear()
+
+
+llm_cache = LLMResponseCache()
@@ -8,14 +8,20 @@ Features:
 - Grid sampling across target radius
 - Scoring functions based on demographics, competition density, market signals
 - Weighted scoring based on active layer configurations
+- Vectorized ranking of every candidate (services/grid_scoring), with a high
+  resolution mode: a dense hex grid plus refinement around the best cells
 - Returns ranked optimal zones with explanations
 """
 
 import math
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Literal, Optional, Tuple
 from dataclasses import dataclass
 import logging
 
+import numpy as np
+
+from app.services.grid_scoring import GridScorer, hex_lattice, select_top, spacing_for_points
+
 logger = logging.getLogger(__name__)
 
 
@@ -48,6 +54,11 @@ class LocationAnalyzer:
     DEFAULT_ANALYSIS_RADIUS = 3.0
     MIN_GRID_POINTS = 7
     MAX_GRID_POINTS = 19
+    # High resolution mode: initial hex grid size, then REFINE_LEVELS rounds of
+    # finer lattices around the REFINE_TOP_CELLS best candidates
+    HIGH_RES_GRID_POINTS = 1500
+    REFINE_TOP_CELLS = 8
+    REFINE_LEVELS = 2
     
     @staticmethod
     def generate_grid_points(
@@ -255,7 +266,8 @@ class LocationAnalyzer:
         deep_clone_data: Optional[Dict[str, Any]] = None,
         weights: Optional[ScoringWeights] = None,
         top_n: int = 3,
-        business_type: Optional[str] = None
+        business_type: Optional[str] = None,
+        resolution: Literal["standard", "high"] = "standard"
     ) -> List[ScoredZone]:
         """
         Find the top N optimal zones within the target radius.
@@ -270,84 +282,66 @@ class LocationAnalyzer:
             weights: Scoring weight configuration
             top_n: Number of best zones to return
             business_type: Type of business for context-aware scoring
+            resolution: "standard" scores the ring grid (up to 37 points);
+                "high" scores a dense hex grid refined around the best cells
+                and keeps returned zones at least analysis_radius_miles apart
             
         Returns:
             List of top N ScoredZone objects, ranked by score
         """
-        num_rings = 2 if target_radius_miles <= 10 else 3
-        grid_points = self.generate_grid_points(
-            center_lat, center_lng, target_radius_miles, num_rings
+        if weights is None:
+            weights = ScoringWeights()
+        
+        demo_score, _ = self.score_demographics(demographics_data, business_type)
+        market_score, _ = self.score_market_signals(deep_clone_data)
+        scorer = GridScorer(
+            competitors,
+            analysis_radius_miles,
+            base_score=demo_score * weights.demographics + market_score * weights.market_signals,
+            competition_weight=weights.competition
         )
         
-        logger.info(f"Analyzing {len(grid_points)} candidate zones within {target_radius_miles}mi radius")
+        if resolution == "high":
+            spacing = spacing_for_points(target_radius_miles, self.HIGH_RES_GRID_POINTS)
+            lats, lngs = hex_lattice(center_lat, center_lng, target_radius_miles, spacing)
+            scores = scorer.score(lats, lngs)
+            lats, lngs, scores = scorer.refine(
+                lats, lngs, scores, center_lat, center_lng, target_radius_miles,
+                spacing, self.REFINE_TOP_CELLS, self.REFINE_LEVELS
+            )
+            # Neighbouring cells of a dense grid score alike; keep the zones apart.
+            chosen = select_top(lats, lngs, scores, top_n, min_separation_miles=analysis_radius_miles)
+        else:
+            num_rings = 2 if target_radius_miles <= 10 else 3
+            grid_points = self.generate_grid_points(
+                center_lat, center_lng, target_radius_miles, num_rings
+            )
+            lats = np.array([p.lat for p in grid_points])
+            lngs = np.array([p.lng for p in grid_points])
+            scores = scorer.score(lats, lngs)
+            chosen = select_top(lats, lngs, scores, top_n)
+        
+        logger.info(f"Scored {len(lats)} candidate zones within {target_radius_miles}mi radius")
         
         scored_zones = []
-        for point in grid_points:
-            point_competitors = self._filter_competitors_for_point(
-                competitors or [], point, analysis_radius_miles
-            )
-            
-            zone = self.analyze_zone(
+        for idx in chosen:
+            point = GridPoint(lat=float(lats[idx]), lng=float(lngs[idx]))
+            scored_zones.append(self.analyze_zone(
                 point=point,
                 radius_miles=analysis_radius_miles,
                 demographics_data=demographics_data,
-                competitors=point_competitors,
+                competitors=scorer.competitors_near(point.lat, point.lng),
                 deep_clone_data=deep_clone_data,
                 weights=weights,
                 business_type=business_type
-            )
-            scored_zones.append(zone)
+            ))
         
         scored_zones.sort(key=lambda z: z.total_score, reverse=True)
         
-        for i, zone in enumerate(scored_zones[:top_n]):
+        for i, zone in enumerate(scored_zones):
             zone.rank = i + 1
         
-        return scored_zones[:top_n]
-    
-    def _filter_competitors_for_point(
-        self,
-        all_competitors: List[Dict[str, Any]],
-        point: GridPoint,
-        radius_miles: float
-    ) -> List[Dict[str, Any]]:
-        """
-        Filter competitors that fall within the analysis radius of a point.
-        """
-        nearby = []
-        for comp in all_competitors:
-            comp_lat = comp.get("latitude") or comp.get("lat")
-            comp_lng = comp.get("longitude") or comp.get("lng")
-            
-            if comp_lat is None or comp_lng is None:
-                continue
-            
-            distance = self._haversine_distance(
-                point.lat, point.lng, comp_lat, comp_lng
-            )
-            
-            if distance <= radius_miles:
-                nearby.append(comp)
-        
-        return nearby
-    
-    @staticmethod
-    def _haversine_distance(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
-        """
-        Calculate distance in miles between two coordinates.
-        """
-        R = 3959
-        
-        lat1_rad = math.radians(lat1)
-        lat2_rad = math.radians(lat2)
-        delta_lat = math.radians(lat2 - lat1)
-        delta_lng = math.radians(lng2 - lng1)
-        
-        a = (math.sin(delta_lat / 2) ** 2 +
-             math.cos(lat1_rad) * math.cos(lat2_rad) * math.sin(delta_lng / 2) ** 2)
-        c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
-        
-        return R * c
+        return scored_zones
 
 
 def get_layer_weights(active_layers: List[str]) -> ScoringWeights:
@@ -1,8 +1,9 @@
 import logging
+import math
 from datetime import datetime, timedelta
 from typing import Any, Dict, List, Optional, Tuple
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
+from sqlalchemy import or_, text
 
 from app.models.geographic_feature import GeographicFeature, FeatureType
 from app.models.map_layer import MapLayer, LayerType
@@ -11,6 +12,14 @@ from app.models.location_analysis_cache import LocationAnalysisCache
 
 logger = logging.getLogger(__name__)
 
+# Whether geographic_features.geom (PostGIS) is queryable; None until first checked.
+_geom_supported: Optional[bool] = None
+
+# SQLSTATEs meaning the geom column, its type or the PostGIS functions are
+# missing: undefined_column, undefined_function, undefined_object. Other
+# errors (timeouts, dropped connections, locks) are transient.
+_MISSING_GEOM_PGCODES = {"42703", "42883", "42704"}
+
 
 class MapDataEngine:
     """
@@ -95,11 +104,72 @@ class MapDataEngine:
             for layer in layers
         ]
 
+    # At or below this zoom, points are aggregated into grid buckets in SQL.
+    CLUSTER_MAX_ZOOM = 12
+    # Grid cells across 360 degrees of longitude at zoom 0; doubles per zoom level.
+    CLUSTER_CELLS_AT_ZOOM_0 = 8
+    MAX_RAW_FEATURES = 5000
+    MAX_POLYGONS = 1000
+
+    _BBOX_GEOM = "geom && ST_MakeEnvelope(:west, :south, :east, :north, 4326)"
+    _BBOX_FLOAT = "latitude BETWEEN :south AND :north AND longitude BETWEEN :west AND :east"
+
+    _LAYER_SQL = """
+        CASE WHEN feature_type = 'polygon' THEN 'polygons'
+             WHEN properties->>'source' IN ('reddit', 'twitter') THEN 'heatmap'
+             ELSE 'pins'
+        END
+    """
+
+    @staticmethod
+    def estimate_zoom(bounds: Dict[str, float]) -> int:
+        """Web-map zoom level whose viewport roughly spans the given longitudes"""
+        span = bounds.get("east", 180) - bounds.get("west", -180)
+        if span <= 0 or span >= 360:
+            return 0
+        return max(0, min(20, int(round(math.log2(360 / span)))))
+
+    def _bounds_filter(self, filters: Optional[Dict[str, Any]], params: Dict[str, Any]) -> str:
+        clauses = ["latitude IS NOT NULL", "longitude IS NOT NULL"]
+        if filters:
+            if filters.get("city"):
+                clauses.append("city ILIKE :city")
+                params["city"] = f"%{filters['city']}%"
+            if filters.get("source"):
+                source_ids = [int(s) for s in str(filters["source"]).split(",") if s.strip().isdigit()]
+                if source_ids:
+                    clauses.append("source_id = ANY(:source_ids)")
+                    params["source_ids"] = source_ids
+        return " AND ".join(clauses)
+
+    def _execute_in_bounds(self, sql_template: str, params: Dict[str, Any]) -> List[Any]:
+        """
+        Run a query whose template has a {bbox} placeholder.
+
+        Uses the GiST-indexed geom column; databases without it (PostGIS
+        missing, migration not applied) fall back to plain lat/lng comparisons.
+        """
+        global _geom_supported
+        if _geom_supported is not False:
+            try:
+                with self.db.begin_nested():
+                    rows = self.db.execute(text(sql_template.format(bbox=self._BBOX_GEOM)), params).fetchall()
+                _geom_supported = True
+                return rows
+            except Exception as e:
+                if getattr(getattr(e, "orig", None), "pgcode", None) in _MISSING_GEOM_PGCODES:
+                    logger.warning(f"PostGIS bounds query unavailable, using lat/lng filter: {e}")
+                    _geom_supported = False
+                else:
+                    logger.warning(f"PostGIS bounds query failed, using lat/lng filter for this request: {e}")
+        return self.db.execute(text(sql_template.format(bbox=self._BBOX_FLOAT)), params).fetchall()
+
     def get_map_data_for_bounds(
         self,
         bounds: Dict[str, float],
         layers: Optional[List[str]] = None,
         filters: Optional[Dict[str, Any]] = None,
+        zoom: Optional[int] = None,
     ) -> Dict[str, Any]:
         """
         Get map data for a given geographic bounds.
@@ -108,78 +178,83 @@ class MapDataEngine:
             bounds: {north, south, east, west} lat/lng bounds
             layers: List of layer names to include (None = all)
             filters: Additional filters to apply
+            zoom: Map zoom level (estimated from the bounds when omitted)
         
         Returns:
-            MapData structure for frontend rendering
+            MapData structure for frontend rendering. Up to CLUSTER_MAX_ZOOM,
+            pins and heatmap points are aggregated per grid cell and returned
+            under the "clusters" layer. Pins carry no popup HTML; fetch it from
+            get_feature_details when a pin is clicked.
         """
-        north = bounds.get("north", 90)
-        south = bounds.get("south", -90)
-        east = bounds.get("east", 180)
-        west = bounds.get("west", -180)
+        if zoom is None:
+            zoom = self.estimate_zoom(bounds)
 
-        query = self.db.query(GeographicFeature).filter(
-            and_(
-                GeographicFeature.latitude.isnot(None),
-                GeographicFeature.longitude.isnot(None),
-                GeographicFeature.latitude <= north,
-                GeographicFeature.latitude >= south,
-                GeographicFeature.longitude <= east,
-                GeographicFeature.longitude >= west,
-            )
-        )
+        params: Dict[str, Any] = {
+            "north": bounds.get("north", 90),
+            "south": bounds.get("south", -90),
+            "east": bounds.get("east", 180),
+            "west": bounds.get("west", -180),
+        }
+        where = self._bounds_filter(filters, params)
 
-        if filters:
-            if filters.get("city"):
-                query = query.filter(GeographicFeature.city.ilike(f"%{filters['city']}%"))
-            if filters.get("source"):
-                sources = filters["source"].split(",")
-                query = query.join(GeographicFeature.source_id).filter(
-                    GeographicFeature.source_id.in_(sources)
-                )
+        if zoom <= self.CLUSTER_MAX_ZOOM:
+            return self._clustered_map_data(bounds, zoom, where, params)
 
-        features = query.limit(5000).all()
+        params["limit"] = self.MAX_RAW_FEATURES
+        rows = self._execute_in_bounds(f"""
+            SELECT id, latitude, longitude, feature_type, location_name,
+                   properties->>'source' AS source,
+                   properties->>'name' AS name,
+                   properties->'rating' AS rating,
+                   properties->'reviews_count' AS reviews,
+                   properties->'intensity' AS intensity,
+                   properties->>'title' AS title,
+                   CASE WHEN feature_type = 'polygon' THEN geojson END AS geojson
+            FROM geographic_features
+            WHERE {where} AND {{bbox}}
+            LIMIT :limit
+        """, params)
 
         pins = []
         heatmap_points = []
         polygons = []
 
-        for feature in features:
-            props = feature.properties or {}
-            source = props.get("source", "")
+        for row in rows:
+            source = row.source or ""
 
-            if feature.feature_type == FeatureType.polygon.value:
-                polygons.append(feature.geojson)
+            if row.feature_type == FeatureType.polygon.value:
+                polygons.append(row.geojson)
             elif source in ["google_maps", "yelp"]:
                 pins.append({
-                    "id": feature.id,
-                    "lat": feature.latitude,
-                    "lng": feature.longitude,
-                    "name": props.get("name", ""),
-                    "rating": props.get("rating"),
-                    "reviews": props.get("reviews_count"),
+                    "id": row.id,
+                    "lat": row.latitude,
+                    "lng": row.longitude,
+                    "name": row.name or "",
+                    "rating": row.rating,
+                    "reviews": row.reviews,
                     "source": source,
-                    "popup": self._build_popup_content(feature),
                 })
             elif source in ["reddit", "twitter"]:
                 heatmap_points.append({
-                    "lat": feature.latitude,
-                    "lng": feature.longitude,
-                    "intensity": props.get("intensity", 0.5),
-                    "title": props.get("title", ""),
+                    "lat": row.latitude,
+                    "lng": row.longitude,
+                    "intensity": row.intensity if row.intensity is not None else 0.5,
+                    "title": row.title or "",
                     "source": source,
                 })
             else:
                 pins.append({
-                    "id": feature.id,
-                    "lat": feature.latitude,
-                    "lng": feature.longitude,
-                    "name": props.get("name") or feature.location_name or "Unknown",
+                    "id": row.id,
+                    "lat": row.latitude,
+                    "lng": row.longitude,
+                    "name": row.name or row.location_name or "Unknown",
                     "source": source,
-                    "popup": self._build_popup_content(feature),
                 })
 
         return {
             "bounds": bounds,
+            "zoom": zoom,
+            "clustered": False,
             "layers": {
                 "pins": {
                     "type": "pins",
@@ -197,10 +272,100 @@ class MapDataEngine:
                     "count": len(polygons),
                 },
             },
-            "totalFeatures": len(features),
+            "totalFeatures": len(rows),
             "timestamp": datetime.utcnow().isoformat(),
         }
 
+    def _clustered_map_data(
+        self,
+        bounds: Dict[str, float],
+        zoom: int,
+        where: str,
+        params: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        """Grid-aggregated pins/heatmap for low zoom levels, computed in SQL"""
+        params = dict(params, cell=360.0 / (self.CLUSTER_CELLS_AT_ZOOM_0 * (2 ** zoom)))
+        buckets = self._execute_in_bounds(f"""
+            SELECT layer,
+                   count(*) AS n,
+                   avg(latitude) AS lat,
+                   avg(longitude) AS lng,
+                   avg(intensity) AS intensity,
+                   min(id) AS first_id
+            FROM (
+                SELECT id, latitude, longitude, {self._LAYER_SQL} AS layer,
+                       CASE WHEN jsonb_typeof(properties->'intensity') = 'number'
+                            THEN (properties->>'intensity')::float END AS intensity
+                FROM geographic_features
+                WHERE {where} AND feature_type <> 'polygon' AND {{bbox}}
+            ) AS points
+            GROUP BY layer, floor(longitude / :cell), floor(latitude / :cell)
+        """, params)
+
+        polygon_rows = self._execute_in_bounds(f"""
+            SELECT geojson
+            FROM geographic_features
+            WHERE {where} AND feature_type = 'polygon' AND {{bbox}}
+            LIMIT :polygon_limit
+        """, dict(params, polygon_limit=self.MAX_POLYGONS))
+
+        pins = []
+        clusters = []
+        heatmap_points = []
+        total = len(polygon_rows)
+
+        for bucket in buckets:
+            total += bucket.n
+            if bucket.layer == "heatmap":
+                heatmap_points.append({
+                    "lat": bucket.lat,
+                    "lng": bucket.lng,
+                    "intensity": bucket.intensity if bucket.intensity is not None else 0.5,
+                    "count": bucket.n,
+                })
+            elif bucket.n == 1:
+                pins.append({"id": bucket.first_id, "lat": bucket.lat, "lng": bucket.lng})
+            else:
+                clusters.append({"lat": bucket.lat, "lng": bucket.lng, "count": bucket.n})
+
+        polygons = [row.geojson for row in polygon_rows]
+
+        return {
+            "bounds": bounds,
+            "zoom": zoom,
+            "clustered": True,
+            "layers": {
+                "pins": {"type": "pins", "data": pins, "count": len(pins)},
+                "clusters": {"type": "clusters", "data": clusters, "count": len(clusters)},
+                "heatmap": {"type": "heatmap", "data": heatmap_points, "count": len(heatmap_points)},
+                "polygons": {"type": "polygons", "data": polygons, "count": len(polygons)},
+            },
+            "totalFeatures": total,
+            "timestamp": datetime.utcnow().isoformat(),
+        }
+
+    def get_feature_details(self, feature_id: int) -> Optional[Dict[str, Any]]:
+        """Full properties and popup HTML for one feature (loaded when a pin is clicked)"""
+        feature = self.db.query(GeographicFeature).filter(GeographicFeature.id == feature_id).first()
+        if not feature:
+            return None
+
+        props = feature.properties or {}
+        return {
+            "id": feature.id,
+            "lat": feature.latitude,
+            "lng": feature.longitude,
+            "name": props.get("name") or feature.location_name or "Unknown",
+            "rating": props.get("rating"),
+            "reviews": props.get("reviews_count"),
+            "source": props.get("source", ""),
+            "featureType": feature.feature_type,
+            "city": feature.city,
+            "state": feature.state,
+            "properties": props,
+            "popup": self._build_popup_content(feature),
+        }
+
     def get_map_data_for_city(
         self,
         city: str,
@@ -0,0 +1,103 @@
+"""
+In-process "opportunity created" events.
+
+Code that creates an opportunity calls `opportunity_created(db, opportunity)`.
+The event is held on the session and published to `opportunity_events`
+subscribers only after the transaction commits (ids are collected at flush
+time), so subscribers never see rows that were rolled back.
+
+Handlers run synchronously on the committing thread and must only enqueue
+work; the instant saved-search alert dispatcher is the main subscriber.
+Events are not persisted: processes without subscribers (scripts, workers)
+rely on the hourly saved-search job to pick their opportunities up.
+"""
+
+import logging
+import threading
+from typing import Callable, List, Sequence
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.models.opportunity import Opportunity
+
+logger = logging.getLogger(__name__)
+
+OpportunityCreatedHandler = Callable[[Sequence[int]], None]
+
+_PENDING_KEY = "opportunity_events.pending"
+_FLUSHED_KEY = "opportunity_events.flushed_ids"
+
+
+class OpportunityEventBus:
+    """Fan-out of committed opportunity ids to subscribed handlers."""
+
+    def __init__(self):
+        self._handlers: List[OpportunityCreatedHandler] = []
+        self._lock = threading.Lock()
+
+    def subscribe(self, handler: OpportunityCreatedHandler) -> None:
+        with self._lock:
+            if handler not in self._handlers:
+                self._handlers.append(handler)
+
+    def unsubscribe(self, handler: OpportunityCreatedHandler) -> None:
+        with self._lock:
+            if handler in self._handlers:
+                self._handlers.remove(handler)
+
+    def publish(self, opportunity_ids: Sequence[int]) -> None:
+        if not opportunity_ids:
+            return
+        with self._lock:
+            handlers = list(self._handlers)
+        for handler in handlers:
+            try:
+                handler(list(opportunity_ids))
+            except Exception as e:
+                logger.error(f"Opportunity created handler {handler!r} failed: {e}")
+
+
+opportunity_events = OpportunityEventBus()
+
+
+def opportunity_created(db: Session, opportunity: Opportunity) -> None:
+    """Publish an opportunity_created event for `opportunity` once `db` commits"""
+    if opportunity.id is not None:
+        db.info.setdefault(_FLUSHED_KEY, []).append(opportunity.id)
+    else:
+        db.info.setdefault(_PENDING_KEY, []).append(opportunity)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_flushed_ids(session: Session, flush_context) -> None:
+    pending = session.info.get(_PENDING_KEY)
+    if not pending:
+        return
+    flushed = session.info.setdefault(_FLUSHED_KEY, [])
+    unflushed = []
+    for opportunity in pending:
+        if opportunity.id is not None:
+            flushed.append(opportunity.id)
+        else:
+            unflushed.append(opportunity)
+    session.info[_PENDING_KEY] = unflushed
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_committed(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
+    ids = session.info.pop(_FLUSHED_KEY, None)
+    if ids:
+        opportunity_events.publish(list(dict.fromkeys(ids)))
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_rolled_back(session: Session, previous_transaction) -> None:
+    # Only the outermost transaction discards: a failed SAVEPOINT (or the flush
+    # inside it) keeps the outer transaction's events. Ids of rows it rolled
+    # back match nothing when subscribers load them.
+    if previous_transaction.parent is not None:
+        return
+    session.info.pop(_PENDING_KEY, None)
+    session.info.pop(_FLUSHED_KEY, None)
@@ -0,0 +1,178 @@
+"""
+Keyset pagination and cached counts for the opportunity feed (GET /opportunities).
+
+Each `sort_by` option orders by its column descending (NULLs last) and then by
+id descending, so (sort value, id) identifies a position in the feed. A page
+returns an opaque cursor for its last row; the next page filters to rows after
+that position instead of using OFFSET, which keeps deep pages as cheap as the
+first one. The composite indexes from the opportunity_feed_indexes migration
+serve these scans.
+
+Totals are cached for a short TTL keyed by the filter tuple. ORM listeners on
+Opportunity note on the session when an opportunity is inserted, deleted, or
+has a filtered column changed, and the cache is cleared once that session
+commits (clearing at flush would let a concurrent request re-cache the old
+committed total). A count that races with a clear is not cached.
+
+Staleness that remains: other workers catch up within COUNT_CACHE_TTL_SECONDS,
+and writes that bypass the ORM unit of work (bulk `query.update()`/`delete()`,
+raw SQL) fire no listeners, so code doing them must call
+`invalidate_opportunity_counts()` after committing. No such path in the app
+currently touches FILTER_COLUMNS; scripts/batch_ai_runner.py updates only ai_*
+columns from its own process.
+"""
+
+import base64
+import json
+import logging
+import threading
+from datetime import datetime
+from typing import Any, Hashable, Tuple
+
+from cachetools import TTLCache
+from sqlalchemy import and_, event, inspect, or_
+from sqlalchemy.orm import Query, Session
+
+from app.models.opportunity import Opportunity
+
+logger = logging.getLogger(__name__)
+
+SORT_COLUMNS = {
+    "recent": Opportunity.created_at,
+    "trending": Opportunity.growth_rate,
+    "validated": Opportunity.validation_count,
+    "market": Opportunity.market_size,
+    "feasibility": Opportunity.feasibility_score,
+}
+
+# Columns the feed filters on; updates touching anything else keep cached counts.
+FILTER_COLUMNS = (
+    "status",
+    "moderation_status",
+    "category",
+    "geographic_scope",
+    "country",
+    "completion_status",
+    "realm_type",
+    "feasibility_score",
+    "created_at",
+)
+
+COUNT_CACHE_TTL_SECONDS = 30
+
+_count_cache: TTLCache = TTLCache(maxsize=2000, ttl=COUNT_CACHE_TTL_SECONDS)
+_count_cache_lock = threading.Lock()
+_count_generation = 0  # bumped on every clear, to detect counts that raced with one
+
+_CHANGED_KEY = "opportunity_feed.counts_changed"
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def order_feed(query: Query, sort_by: str) -> Query:
+    """Apply the feed ordering for `sort_by` (column desc NULLS LAST, id desc)"""
+    column = SORT_COLUMNS[sort_by]
+    return query.order_by(column.desc().nullslast(), Opportunity.id.desc())
+
+
+def encode_cursor(sort_by: str, opportunity: Opportunity) -> str:
+    """Opaque cursor pointing just after `opportunity` in the `sort_by` ordering"""
+    value = getattr(opportunity, SORT_COLUMNS[sort_by].key)
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    payload = json.dumps({"s": sort_by, "v": value, "id": opportunity.id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_by: str) -> Tuple[Any, int]:
+    """Return (sort value, id) from a cursor, raising InvalidCursor if malformed"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        value, last_id = payload["v"], int(payload["id"])
+        if payload["s"] != sort_by:
+            raise InvalidCursor("Cursor was issued for a different sort order")
+        if value is not None and sort_by == "recent":
+            value = datetime.fromisoformat(value)
+    except InvalidCursor:
+        raise
+    except (ValueError, TypeError, KeyError) as e:
+        raise InvalidCursor(f"Malformed cursor: {e}")
+    return value, last_id
+
+
+def apply_cursor(query: Query, sort_by: str, cursor: str) -> Query:
+    """Restrict an ordered feed query to rows after `cursor`"""
+    value, last_id = decode_cursor(cursor, sort_by)
+    column = SORT_COLUMNS[sort_by]
+
+    if value is None:
+        # Already inside the trailing NULL block, which is ordered by id only.
+        return query.filter(column.is_(None), Opportunity.id < last_id)
+
+    return query.filter(
+        or_(
+            column < value,
+            and_(column == value, Opportunity.id < last_id),
+            column.is_(None),
+        )
+    )
+
+
+def cached_count(query: Query, key: Hashable) -> int:
+    """query.count(), memoised per filter tuple for COUNT_CACHE_TTL_SECONDS"""
+    with _count_cache_lock:
+        cached = _count_cache.get(key)
+        if cached is not None:
+            return cached
+        generation = _count_generation
+
+    total = query.order_by(None).count()
+
+    with _count_cache_lock:
+        if _count_generation == generation:
+            _count_cache[key] = total
+    return total
+
+
+def invalidate_opportunity_counts() -> None:
+    """Drop every cached feed total"""
+    global _count_generation
+    with _count_cache_lock:
+        _count_cache.clear()
+        _count_generation += 1
+
+
+def _counts_changed(target) -> None:
+    session = Session.object_session(target)
+    if session is None:
+        invalidate_opportunity_counts()
+    else:
+        session.info[_CHANGED_KEY] = True
+
+
+@event.listens_for(Opportunity, "after_insert")
+@event.listens_for(Opportunity, "after_delete")
+def _opportunity_written(mapper, connection, target) -> None:
+    _counts_changed(target)
+
+
+@event.listens_for(Opportunity, "after_update")
+def _opportunity_updated(mapper, connection, target) -> None:
+    attrs = inspect(target).attrs
+    if any(attrs[name].history.has_changes() for name in FILTER_COLUMNS):
+        _counts_changed(target)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed(session: Session) -> None:
+    if session.info.pop(_CHANGED_KEY, False):
+        invalidate_opportunity_counts()
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_rolled_back(session: Session, previous_transaction) -> None:
+    if previous_transaction.parent is None:
+        session.info.pop(_CHANGED_KEY, None)
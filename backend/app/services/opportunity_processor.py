@@ -2,13 +2,15 @@ import os
 import json
 import logging
 import asyncio
-from typing import Dict, Any, List, Optional, Tuple
+from dataclasses import dataclass
+from typing import Dict, Any, AsyncIterator, List, Optional, Tuple
 from datetime import datetime
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, sessionmaker
 from anthropic import Anthropic
 
 from app.models.scraped_source import ScrapedSource
 from app.models.opportunity import Opportunity
+from app.services.opportunity_events import opportunity_created
 
 logger = logging.getLogger(__name__)
 
@@ -16,10 +18,24 @@ MAX_CONCURRENT_CLAUDE_CALLS = 5
 AI_CALL_TIMEOUT_SECONDS = 30
 MIN_OPPORTUNITY_SCORE = 50
 
+SOURCE_PAGE_SIZE = 50  # sources per keyset page; also bounds the analysis queue
+COMMIT_EVERY = 10  # results per writer commit
+COMMIT_INTERVAL_SECONDS = 5.0  # commit a partial micro-batch after this long without results
+
 AI_INTEGRATIONS_ANTHROPIC_API_KEY = os.environ.get("AI_INTEGRATIONS_ANTHROPIC_API_KEY")
 AI_INTEGRATIONS_ANTHROPIC_BASE_URL = os.environ.get("AI_INTEGRATIONS_ANTHROPIC_BASE_URL")
 
 
+@dataclass
+class _PendingSource:
+    """Plain copy of a scraped source for the analysis workers (no session access)"""
+    id: int
+    external_id: Optional[str]
+    source_type: str
+    raw_data: Dict[str, Any]
+    duplicate: bool
+
+
 class OpportunityProcessor:
     def __init__(self, db: Session):
         self.db = db
@@ -30,83 +46,248 @@ class OpportunityProcessor:
                 base_url=AI_INTEGRATIONS_ANTHROPIC_BASE_URL
             )
 
-    async def process_pending_sources(self, limit: int = 20) -> Dict[str, Any]:
-        sources = self.db.query(ScrapedSource).filter(
-            ScrapedSource.processed == 0
-        ).order_by(ScrapedSource.received_at.desc()).limit(limit).all()
+    async def process_pending_sources(
+        self,
+        limit: int = 20,
+        page_size: int = SOURCE_PAGE_SIZE,
+        commit_every: int = COMMIT_EVERY,
+    ) -> Dict[str, Any]:
+        """
+        Analyze up to `limit` unprocessed sources, newest first, as a pipeline:
 
-        if not sources:
-            return {"processed": 0, "opportunities_created": 0, "skipped": 0}
+        - a producer pages through scraped_sources by id (keyset, on its own
+          session in a worker thread) and checks each page for existing
+          opportunities with one IN query
+        - MAX_CONCURRENT_CLAUDE_CALLS workers run the analysis
+        - a single writer (on `self.db`) applies outcomes and commits every
+          `commit_every` results, or sooner when results arrive slowly
 
+        The queues between stages are bounded, so memory stays flat however
+        large `limit` is, and a failure only loses the uncommitted micro-batch.
+        """
         stats = {"processed": 0, "opportunities_created": 0, "skipped": 0, "errors": 0}
-        
-        semaphore = asyncio.Semaphore(MAX_CONCURRENT_CLAUDE_CALLS)
-        
-        async def process_with_semaphore(source: ScrapedSource) -> Tuple[ScrapedSource, Dict[str, Any]]:
-            async with semaphore:
-                try:
-                    raw_data = source.raw_data or {}
-                    raw_text = self._extract_text_from_raw_data(raw_data, source.source_type)
-                    
-                    if not raw_text or len(raw_text) < 20:
-                        return source, {"skipped": True, "reason": "insufficient_content"}
-                    
-                    existing = self.db.query(Opportunity).filter(
-                        Opportunity.source_id == source.external_id
-                    ).first()
-                    if existing:
-                        return source, {"skipped": True, "reason": "duplicate"}
-                    
-                    analysis = await self._analyze_with_claude(raw_text, source.source_type, raw_data)
-                    return source, {"analysis": analysis, "raw_data": raw_data}
-                except Exception as e:
-                    logger.error(f"Error analyzing source {source.id}: {e}")
-                    return source, {"error": str(e)}
-        
-        results = await asyncio.gather(*[process_with_semaphore(s) for s in sources])
-        
-        for source, result in results:
-            stats["processed"] += 1
-            
-            if result.get("error"):
-                source.processed = -1
-                source.error_message = result["error"][:500]
-                stats["errors"] += 1
-            elif result.get("skipped"):
-                source.processed = 1
-                source.processed_at = datetime.utcnow()
-                stats["skipped"] += 1
-            else:
-                analysis = result.get("analysis", {})
-                raw_data = result.get("raw_data", {})
-                
-                if not analysis.get("is_valid_opportunity", False):
-                    source.processed = 1
-                    source.processed_at = datetime.utcnow()
-                    stats["skipped"] += 1
-                else:
-                    opportunity_score = analysis.get("opportunity_score") or 0
-                    if opportunity_score < MIN_OPPORTUNITY_SCORE:
-                        logger.info(f"Skipping source {source.id}: opportunity_score {opportunity_score} below minimum {MIN_OPPORTUNITY_SCORE}")
-                        source.processed = 1
-                        source.processed_at = datetime.utcnow()
-                        stats["skipped"] += 1
-                    else:
-                        opportunity = self._create_opportunity_from_analysis(source, analysis, raw_data)
-                        self.db.add(opportunity)
-                        source.processed = 1
-                        source.processed_at = datetime.utcnow()
-                        stats["opportunities_created"] += 1
-
-        self.db.commit()
+        if limit <= 0:
+            return stats
+
+        workers = MAX_CONCURRENT_CLAUDE_CALLS
+        work_queue: asyncio.Queue = asyncio.Queue(maxsize=page_size)
+        result_queue: asyncio.Queue = asyncio.Queue(maxsize=max(commit_every, workers) * 2)
+
+        async def produce() -> None:
+            try:
+                async for item in self._pending_pages(limit, page_size):
+                    await work_queue.put(item)
+            finally:
+                for _ in range(workers):
+                    await work_queue.put(None)
+
+        async def work() -> None:
+            try:
+                while (item := await work_queue.get()) is not None:
+                    await result_queue.put((item, await self._analyze_item(item)))
+            finally:
+                await result_queue.put(None)
+
+        tasks = [asyncio.create_task(produce())]
+        tasks += [asyncio.create_task(work()) for _ in range(workers)]
+        tasks.append(asyncio.create_task(self._write_results(result_queue, workers, commit_every, stats)))
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+
         logger.info(f"Opportunity processing complete: {stats}")
         return stats
+
+    async def _pending_pages(self, limit: int, page_size: int) -> AsyncIterator[_PendingSource]:
+        """Unprocessed sources, newest first, fetched a page at a time on a separate session"""
+        db = sessionmaker(bind=self.db.get_bind())()
+        try:
+            before_id = None
+            remaining = limit
+            while remaining > 0:
+                page = await asyncio.to_thread(self._fetch_page, db, before_id, min(page_size, remaining))
+                if not page:
+                    return
+                for item in page:
+                    yield item
+                before_id = page[-1].id
+                remaining -= len(page)
+        finally:
+            db.close()
+
+    @staticmethod
+    def _fetch_page(db: Session, before_id: Optional[int], size: int) -> List[_PendingSource]:
+        query = db.query(
+            ScrapedSource.id, ScrapedSource.external_id, ScrapedSource.source_type, ScrapedSource.raw_data
+        ).filter(ScrapedSource.processed == 0)
+        if before_id is not None:
+            query = query.filter(ScrapedSource.id < before_id)
+        rows = query.order_by(ScrapedSource.id.desc()).limit(size).all()
+
+        external_ids = {row.external_id for row in rows if row.external_id}
+        existing = set()
+        if external_ids:
+            existing = {
+                source_id for (source_id,) in db.query(Opportunity.source_id).filter(
+                    Opportunity.source_id.in_(external_ids)
+                )
+            }
+        db.rollback()  # end the read transaction between pages
+
+        return [
+            _PendingSource(
+                id=row.id,
+                external_id=row.external_id,
+                source_type=row.source_type,
+                raw_data=row.raw_data or {},
+                duplicate=row.external_id is not None and row.external_id in existing,
+            )
+            for row in rows
+        ]
+
+    async def _analyze_item(self, item: _PendingSource) -> Dict[str, Any]:
+        try:
+            raw_text = self._extract_text_from_raw_data(item.raw_data, item.source_type)
+            
+            if not raw_text or len(raw_text) < 20:
+                return {"skipped": True, "reason": "insufficient_content"}
+            
+            if item.duplicate:
+                return {"skipped": True, "reason": "duplicate"}
+            
+            analysis = await self._analyze_with_claude(raw_text, item.source_type, item.raw_data)
+            return {"analysis": analysis}
+        except Exception as e:
+            logger.error(f"Error analyzing source {item.id}: {e}")
+            return {"error": str(e)}
+
+    async def _write_results(
+        self,
+        result_queue: asyncio.Queue,
+        workers: int,
+        commit_every: int,
+        stats: Dict[str, int],
+    ) -> None:
+        """Single writer: apply results to self.db and commit them in micro-batches"""
+        batch: List[Tuple[_PendingSource, Dict[str, Any]]] = []
+        created_source_ids = set()
+        finished = 0
+        while finished < workers:
+            try:
+                entry = await asyncio.wait_for(result_queue.get(), timeout=COMMIT_INTERVAL_SECONDS)
+            except asyncio.TimeoutError:
+                entry = False
+            if entry is None:
+                finished += 1
+            elif entry:
+                batch.append(entry)
+            if batch and (len(batch) >= commit_every or entry is False or finished == workers):
+                self._commit_batch(batch, created_source_ids, stats)
+                batch = []
+
+    def _commit_batch(
+        self,
+        batch: List[Tuple[_PendingSource, Dict[str, Any]]],
+        created_source_ids: set,
+        stats: Dict[str, int],
+    ) -> None:
+        counts = {"processed": 0, "opportunities_created": 0, "skipped": 0, "errors": 0}
+        try:
+            sources = {
+                source.id: source
+                for source in self.db.query(ScrapedSource).filter(ScrapedSource.id.in_([item.id for item, _ in batch]))
+            }
+            created = set()
+            for item, result in batch:
+                self._apply_result(sources.get(item.id), item, result, created_source_ids | created, counts, created)
+            self.db.commit()
+            created_source_ids |= created
+        except Exception as e:
+            # Keep what can be kept: retry the micro-batch one source at a time
+            self.db.rollback()
+            logger.error(f"Opportunity batch commit failed, retrying per source: {e}")
+            counts = {key: 0 for key in counts}
+            for item, result in batch:
+                item_counts = {key: 0 for key in counts}
+                try:
+                    created = set()
+                    source = self.db.get(ScrapedSource, item.id)
+                    self._apply_result(source, item, result, created_source_ids, item_counts, created)
+                    self.db.commit()
+                    created_source_ids |= created
+                except Exception as item_error:
+                    self.db.rollback()
+                    item_counts = {key: 0 for key in counts}
+                    item_counts["processed"] = item_counts["errors"] = 1
+                    self._mark_failed(item.id, str(item_error))
+                for key, value in item_counts.items():
+                    counts[key] += value
+        for key, value in counts.items():
+            stats[key] += value
+
+    def _apply_result(
+        self,
+        source: Optional[ScrapedSource],
+        item: _PendingSource,
+        result: Dict[str, Any],
+        created_source_ids: set,
+        counts: Dict[str, int],
+        created: set,
+    ) -> None:
+        """Apply one outcome to its source; external ids of new opportunities are added to `created`"""
+        if source is None or source.processed != 0:
+            return  # deleted or handled elsewhere meanwhile
+        counts["processed"] += 1
+
+        if result.get("error"):
+            source.processed = -1
+            source.error_message = result["error"][:500]
+            counts["errors"] += 1
+            return
+
+        analysis = result.get("analysis", {})
+        if result.get("skipped") or not analysis.get("is_valid_opportunity", False):
+            source.processed = 1
+            source.processed_at = datetime.utcnow()
+            counts["skipped"] += 1
+            return
+
+        opportunity_score = analysis.get("opportunity_score") or 0
+        if opportunity_score < MIN_OPPORTUNITY_SCORE:
+            logger.info(f"Skipping source {source.id}: opportunity_score {opportunity_score} below minimum {MIN_OPPORTUNITY_SCORE}")
+        if opportunity_score < MIN_OPPORTUNITY_SCORE or source.external_id in created_source_ids:
+            # Below the bar, or an opportunity for this external id was created earlier in the run
+            source.processed = 1
+            source.processed_at = datetime.utcnow()
+            counts["skipped"] += 1
+            return
+
+        opportunity = self._create_opportunity_from_analysis(source, analysis, item.raw_data)
+        self.db.add(opportunity)
+        if source.external_id is not None:
+            created.add(source.external_id)
+        source.processed = 1
+        source.processed_at = datetime.utcnow()
+        counts["opportunities_created"] += 1
+
+    def _mark_failed(self, source_id: int, error: str) -> None:
+        try:
+            source = self.db.get(ScrapedSource, source_id)
+            if source is not None:
+                source.processed = -1
+                source.error_message = error[:500]
+                self.db.commit()
+        except Exception as e:
+            self.db.rollback()
+            logger.error(f"Could not mark source {source_id} as failed: {e}")
     
     def _create_opportunity_from_analysis(self, source: ScrapedSource, analysis: Dict, raw_data: Dict) -> Opportunity:
         lat = raw_data.get("latitude") or raw_data.get("lat")
         lng = raw_data.get("longitude") or raw_data.get("lng") or raw_data.get("lon")
         
-        return Opportunity(
+        opportunity = Opportunity(
             title=analysis.get("professional_title", "Untitled Opportunity")[:500],
             description=analysis.get("professional_description", "")[:5000],
             category=analysis.get("category", "Other")[:100],
@@ -137,6 +318,8 @@ class OpportunityProcessor:
             ai_next_steps=json.dumps(analysis.get("next_steps", [])),
             ai_problem_statement=analysis.get("problem_statement"),
         )
+        opportunity_created(self.db, opportunity)
+        return opportunity
 
     async def _process_single_source(self, source: ScrapedSource) -> Dict[str, Any]:
         raw_data = source.raw_data or {}
@@ -196,6 +379,7 @@ class OpportunityProcessor:
         )
 
         self.db.add(opportunity)
+        opportunity_created(self.db, opportunity)
         source.processed = 1
         source.processed_at = datetime.utcnow()
 
@@ -0,0 +1,275 @@
+"""
+Compiled multi-pattern matcher for signal scoring.
+
+All keyword-matrix patterns plus the active Command Center validation patterns
+are compiled once. Each pattern is indexed by the literal text it requires (e.g.
+"hidden" for a pattern starting with "hidden\\s+"); matching a text first checks which
+literals occur in it and then runs `search` only on the patterns whose literal
+was seen. Patterns without an extractable literal are always searched.
+
+The result is the same list, in the same order, as calling
+`re.search(pattern, text, re.IGNORECASE)` for every pattern.
+"""
+
+import logging
+import re
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.services.google_maps_keyword_matrix import (
+    APARTMENT_PATTERNS,
+    CHILDCARE_PATTERNS,
+    RESTAURANT_PATTERNS,
+    HOME_SERVICES_PATTERNS,
+    HEALTHCARE_PATTERNS,
+    COMPETITIVE_PATTERNS,
+)
+
+logger = logging.getLogger(__name__)
+
+SIGNAL_PATTERN_GROUPS = {
+    'apartment': APARTMENT_PATTERNS,
+    'childcare': CHILDCARE_PATTERNS,
+    'restaurant': RESTAURANT_PATTERNS,
+    'home_services': HOME_SERVICES_PATTERNS,
+    'healthcare': HEALTHCARE_PATTERNS,
+    'competitive': COMPETITIVE_PATTERNS,
+}
+
+MIN_LITERAL_LENGTH = 3
+
+_REGEX_META = set('.^$*+?{}[]\\|()')
+_OPTIONAL_QUANTIFIERS = set('?*{')
+
+# Non-ASCII characters that re.IGNORECASE matches against ASCII letters but
+# that str.lower() does not map onto them.
+_IGNORECASE_ASCII_FOLDS = str.maketrans({'\u0130': 'i', '\u0131': 'i', '\u017f': 's'})
+
+
+@dataclass(frozen=True)
+class PatternEntry:
+    category: str
+    name: str
+    regex: str
+    confidence: float
+
+
+def _has_top_level_alternation(pattern: str) -> bool:
+    depth = 0
+    in_class = False
+    escaped = False
+    for ch in pattern:
+        if escaped:
+            escaped = False
+        elif ch == '\\':
+            escaped = True
+        elif in_class:
+            if ch == ']':
+                in_class = False
+        elif ch == '[':
+            in_class = True
+        elif ch == '(':
+            depth += 1
+        elif ch == ')':
+            depth -= 1
+        elif ch == '|' and depth == 0:
+            return True
+    return False
+
+
+def required_literal(pattern: str) -> Optional[str]:
+    """
+    Return a literal prefix every match of `pattern` must contain, or None.
+
+    Only the plain-text run at the start of the pattern is used (after any
+    leading word boundaries/anchors), which covers most keyword patterns.
+    """
+    if _has_top_level_alternation(pattern):
+        return None
+
+    while True:
+        if pattern.startswith('\\b'):
+            pattern = pattern[2:]
+        elif pattern.startswith('^'):
+            pattern = pattern[1:]
+        else:
+            break
+
+    literal = []
+    for ch in pattern:
+        if ch in _REGEX_META:
+            if ch in _OPTIONAL_QUANTIFIERS and literal:
+                literal.pop()
+            break
+        literal.append(ch)
+
+    result = ''.join(literal)
+    if len(result.strip()) < MIN_LITERAL_LENGTH:
+        return None
+    return result
+
+
+class PatternMatcher:
+    """Immutable compiled view over a list of PatternEntry."""
+
+    def __init__(self, entries: List[PatternEntry]):
+        self.entries: List[PatternEntry] = []
+        self._compiled: List[re.Pattern] = []
+        always: List[int] = []
+        by_literal: Dict[str, List[int]] = {}
+
+        for entry in entries:
+            try:
+                compiled = re.compile(entry.regex, re.IGNORECASE)
+            except re.error as e:
+                logger.warning(f"Skipping invalid pattern {entry.category}/{entry.name}: {e}")
+                continue
+
+            index = len(self.entries)
+            self.entries.append(entry)
+            self._compiled.append(compiled)
+
+            literal = required_literal(entry.regex)
+            if literal is None or not literal.isascii():
+                always.append(index)
+            else:
+                by_literal.setdefault(literal.lower(), []).append(index)
+
+        self._always = always
+        self._literal_entries = list(by_literal.items())
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def _candidate_indexes(self, text: str) -> List[int]:
+        candidates = list(self._always)
+        if not self._literal_entries:
+            return candidates
+
+        if text.isascii():
+            lowered = text.lower()
+        else:
+            lowered = text.translate(_IGNORECASE_ASCII_FOLDS).lower()
+
+        for literal, indexes in self._literal_entries:
+            if literal in lowered:
+                candidates.extend(indexes)
+
+        candidates.sort()
+        return candidates
+
+    def match(self, text: str) -> List[Dict[str, Any]]:
+        """Return every matching pattern as {'category', 'pattern', 'confidence'}."""
+        if not text:
+            return []
+
+        matches = []
+        for index in self._candidate_indexes(text):
+            if self._compiled[index].search(text):
+                entry = self.entries[index]
+                matches.append({
+                    'category': entry.category,
+                    'pattern': entry.name,
+                    'confidence': entry.confidence,
+                })
+        return matches
+
+
+def keyword_matrix_entries() -> List[PatternEntry]:
+    """Static patterns from google_maps_keyword_matrix, in scoring order."""
+    entries = []
+    for pattern_category, patterns in SIGNAL_PATTERN_GROUPS.items():
+        for pattern_name, pattern_data in patterns.items():
+            for pattern in pattern_data.get('patterns', []):
+                entries.append(PatternEntry(
+                    category=pattern_category,
+                    name=pattern_name,
+                    regex=pattern,
+                    confidence=pattern_data.get('confidence', 0.5),
+                ))
+    return entries
+
+
+def _validation_pattern_fingerprint(db: Session) -> Optional[Tuple]:
+    from app.models.data_source import ValidationPattern
+
+    row = db.query(
+        func.count(ValidationPattern.id),
+        func.max(ValidationPattern.id),
+        func.max(ValidationPattern.updated_at),
+    ).one()
+    return tuple(row)
+
+
+def _validation_pattern_entries(db: Session) -> List[PatternEntry]:
+    from app.models.data_source import ValidationPattern
+
+    rows = db.query(ValidationPattern).filter(
+        ValidationPattern.is_active == True
+    ).order_by(ValidationPattern.id).all()
+    return [
+        PatternEntry(
+            category=row.category,
+            name=row.name,
+            regex=row.regex_pattern,
+            confidence=row.confidence if row.confidence is not None else 0.8,
+        )
+        for row in rows
+    ]
+
+
+_matcher: Optional[PatternMatcher] = None
+_matcher_fingerprint: Optional[Tuple] = None
+_matcher_lock = threading.Lock()
+
+
+def get_pattern_matcher(db: Optional[Session] = None) -> PatternMatcher:
+    """
+    Return the shared compiled matcher, rebuilding it when patterns changed.
+
+    With a session, active ValidationPattern rows are included and a cheap
+    count/max(updated_at) fingerprint picks up edits made by other workers.
+    """
+    global _matcher, _matcher_fingerprint
+
+    # Reads run in savepoints: a failure must not discard the caller's pending work
+    fingerprint = None
+    if db is not None:
+        try:
+            with db.begin_nested():
+                fingerprint = _validation_pattern_fingerprint(db)
+        except Exception as e:
+            logger.warning(f"Could not read validation patterns, using keyword matrix only: {e}")
+            db = None
+
+    with _matcher_lock:
+        if _matcher is not None and _matcher_fingerprint == fingerprint:
+            return _matcher
+
+    entries = keyword_matrix_entries()
+    if db is not None:
+        try:
+            with db.begin_nested():
+                entries.extend(_validation_pattern_entries(db))
+        except Exception as e:
+            logger.warning(f"Could not load validation patterns, using keyword matrix only: {e}")
+            fingerprint = None
+    matcher = PatternMatcher(entries)
+
+    with _matcher_lock:
+        _matcher = matcher
+        _matcher_fingerprint = fingerprint
+    logger.info(f"Compiled pattern matcher with {len(matcher)} patterns")
+    return matcher
+
+
+def invalidate_pattern_matcher() -> None:
+    """Drop the compiled matcher so the next caller recompiles it"""
+    global _matcher, _matcher_fingerprint
+    with _matcher_lock:
+        _matcher = None
+        _matcher_fingerprint = None
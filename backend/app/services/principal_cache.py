@@ -0,0 +1,221 @@
+"""
+Short-lived cache of authenticated principals.
+
+`get_current_user` used to look the user up by email on every request, and
+`get_opportunity_entitlements` then loaded the subscription and unlock
+records again. Entries here are keyed by token subject (email) and hold:
+
+- the user's id; the User itself is always loaded into the request's
+  session by primary key, so callers get the current row and can safely
+  modify and commit it (e.g. impact points)
+- the subscription tier and the user's unlock records, filled on first use
+  by the entitlement checks
+
+Each entry carries the user's version stamp. `invalidate_principal` bumps
+the stamp, so the next lookup misses; it runs from the admin and Stripe
+webhook routers on ban/role/tier changes, and after commit for every user
+whose User, Subscription or UnlockedOpportunity rows a session flushed in
+this process (bumping at flush would let a concurrent request re-cache the
+old committed row under the new stamp). A lookup that raced with any
+invalidation is not cached. Other processes see such changes once
+PRINCIPAL_CACHE_TTL_SECONDS expires.
+"""
+
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Iterable, Optional
+
+from cachetools import TTLCache
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.subscription import Subscription, SubscriptionTier, UnlockedOpportunity
+from app.models.user import User
+
+
+@dataclass(frozen=True)
+class UnlockInfo:
+    unlock_method: Optional[str]
+    expires_at: Optional[datetime]
+    has_deep_dive: bool
+
+
+class _Entry:
+    __slots__ = ("user_id", "version", "tier", "unlocks")
+
+    def __init__(self, user_id: int, version: int):
+        self.user_id = user_id
+        self.version = version
+        self.tier: Optional[SubscriptionTier] = None
+        self.unlocks: Optional[Dict[int, UnlockInfo]] = None
+
+
+_principals: TTLCache = TTLCache(
+    maxsize=settings.PRINCIPAL_CACHE_ENTRIES,
+    ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS
+)
+_lock = threading.Lock()
+_generation = 0  # count of invalidations, to detect lookups that raced with one
+
+_CHANGED_KEY = "principal_cache.changed_user_ids"
+
+
+class _VersionStamps(TTLCache):
+    """
+    user id -> version. A stamp lives as long as any entry cached before its
+    last bump; if one must be evicted early, every principal is dropped.
+    """
+
+    def popitem(self):
+        item = super().popitem()
+        _principals.clear()
+        return item
+
+
+_versions: TTLCache = _VersionStamps(
+    maxsize=settings.PRINCIPAL_CACHE_ENTRIES,
+    ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS
+)
+
+
+def _current_entry(subject: str) -> Optional[_Entry]:
+    with _lock:
+        entry = _principals.get(subject)
+        if entry is not None and entry.version != _versions.get(entry.user_id, 0):
+            del _principals[subject]
+            return None
+        return entry
+
+
+def _entry_for(user: User) -> Optional[_Entry]:
+    entry = _current_entry(user.email)
+    if entry is None or entry.user_id != user.id:
+        return None
+    return entry
+
+
+def load_principal(db: Session, subject: str) -> Optional[User]:
+    """The user for a token subject, loaded fresh into `db` (by primary key when cached)"""
+    entry = _current_entry(subject)
+    if entry is not None:
+        user = db.get(User, entry.user_id)
+        if user is not None and user.email == subject:
+            return user
+        invalidate_principal(entry.user_id)
+
+    generation = _generation
+    user = db.query(User).filter(User.email == subject).first()
+    if user is None:
+        return None
+
+    with _lock:
+        if _generation == generation:
+            _principals[subject] = _Entry(user.id, _versions.get(user.id, 0))
+    return user
+
+
+def cached_tier(db: Session, user: User) -> SubscriptionTier:
+    """Tier from `usage_service.get_or_create_subscription`, cached with the principal"""
+    from app.services.usage_service import usage_service
+
+    entry = _entry_for(user)
+    if entry is not None and entry.tier is not None:
+        return entry.tier
+
+    subscription = usage_service.get_or_create_subscription(user, db)
+    tier = subscription.tier if isinstance(subscription.tier, SubscriptionTier) else SubscriptionTier(subscription.tier)
+    if entry is not None:
+        entry.tier = tier
+    return tier
+
+
+def cached_unlocks(
+    db: Session,
+    user: User,
+    opportunity_ids: Optional[Iterable[int]] = None
+) -> Dict[int, UnlockInfo]:
+    """
+    opportunity_id -> UnlockInfo for the user's unlock records, cached with
+    the principal. With `opportunity_ids` and a cold cache, only those
+    records are loaded (one IN query) and nothing is cached.
+    """
+    entry = _entry_for(user)
+    if entry is not None and entry.unlocks is not None:
+        return entry.unlocks
+
+    query = db.query(
+        UnlockedOpportunity.opportunity_id,
+        UnlockedOpportunity.unlock_method,
+        UnlockedOpportunity.expires_at,
+        UnlockedOpportunity.has_deep_dive,
+    ).filter(UnlockedOpportunity.user_id == user.id)
+    if opportunity_ids is not None:
+        ids = list(set(opportunity_ids))
+        if not ids:
+            return {}
+        query = query.filter(UnlockedOpportunity.opportunity_id.in_(ids))
+    rows = query.all()
+    unlocks = {
+        row.opportunity_id: UnlockInfo(
+            unlock_method=row.unlock_method.value if row.unlock_method else None,
+            expires_at=row.expires_at,
+            has_deep_dive=bool(row.has_deep_dive),
+        )
+        for row in rows
+    }
+    if entry is not None and opportunity_ids is None:
+        entry.unlocks = unlocks
+    return unlocks
+
+
+def invalidate_principal(user_id: Optional[int]) -> None:
+    """Drop the cached principal, tier and unlocks of a user (bumps their version stamp)."""
+    global _generation
+    if user_id is None:
+        return
+    with _lock:
+        _versions[user_id] = _versions.get(user_id, 0) + 1
+        _generation += 1
+
+
+def clear_principals() -> None:
+    with _lock:
+        _principals.clear()
+
+
+def _changed_on_commit(target, user_id: Optional[int]) -> None:
+    session = Session.object_session(target)
+    if session is None:
+        invalidate_principal(user_id)
+    elif user_id is not None:
+        session.info.setdefault(_CHANGED_KEY, set()).add(user_id)
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _user_changed(mapper, connection, target: User) -> None:
+    _changed_on_commit(target, target.id)
+
+
+@event.listens_for(Subscription, "after_insert")
+@event.listens_for(Subscription, "after_update")
+@event.listens_for(Subscription, "after_delete")
+@event.listens_for(UnlockedOpportunity, "after_insert")
+@event.listens_for(UnlockedOpportunity, "after_update")
+@event.listens_for(UnlockedOpportunity, "after_delete")
+def _access_changed(mapper, connection, target) -> None:
+    _changed_on_commit(target, target.user_id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed(session: Session) -> None:
+    for user_id in session.info.pop(_CHANGED_KEY, ()):
+        invalidate_principal(user_id)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_rolled_back(session: Session, previous_transaction) -> None:
+    if previous_transaction.parent is None:
+        session.info.pop(_CHANGED_KEY, None)
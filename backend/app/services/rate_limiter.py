@@ -0,0 +1,262 @@
+"""
+Pluggable rate limiter shared by the HTTP middleware and the public API.
+
+Backends:
+- "memory": GCRA (generic cell rate algorithm) per key in a process-local
+  dict. Smooth sliding-window behaviour with one float per key; only correct
+  for a single worker.
+- "postgres": sliding-window approximation over the `rate_limit_counters`
+  table (the same table WebhookGateway reserves webhook quota in), so all
+  uvicorn workers enforce one shared limit.
+
+Select the backend with RATE_LIMIT_BACKEND.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import math
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional
+
+from sqlalchemy import text
+from starlette.concurrency import run_in_threadpool
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WINDOW_SECONDS = 60
+
+# rate_limit_counters.source is VARCHAR(50); longer keys are hashed.
+_MAX_SOURCE_LENGTH = 50
+_KEY_PREFIX = "rl:"
+
+
+@dataclass
+class RateLimitResult:
+    allowed: bool
+    limit: int
+    remaining: int
+    reset_after: int
+    retry_after: int = 0
+
+
+class RateLimiter:
+    """Backend interface: count one hit for `key` against `limit` per `window_seconds`."""
+
+    def hit(self, key: str, limit: int, window_seconds: int = DEFAULT_WINDOW_SECONDS) -> RateLimitResult:
+        raise NotImplementedError
+
+    async def hit_async(self, key: str, limit: int, window_seconds: int = DEFAULT_WINDOW_SECONDS) -> RateLimitResult:
+        return self.hit(key, limit, window_seconds)
+
+
+class InMemoryRateLimiter(RateLimiter):
+    """
+    GCRA limiter: each key stores its theoretical arrival time (TAT).
+
+    A request is allowed while TAT stays within one window of now, which lets a
+    full `limit` burst through and then refills at limit/window. Rejected
+    requests do not consume quota. Keys whose TAT is in the past carry no state
+    and are swept out once per window.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._tat: Dict[str, float] = {}
+        self._last_sweep = time.monotonic()
+
+    def hit(self, key: str, limit: int, window_seconds: int = DEFAULT_WINDOW_SECONDS) -> RateLimitResult:
+        limit = max(1, int(limit))
+        interval = window_seconds / limit
+        now = time.monotonic()
+
+        with self._lock:
+            if now - self._last_sweep >= window_seconds:
+                self._sweep(now)
+
+            tat = max(self._tat.get(key, now), now)
+            new_tat = tat + interval
+
+            if new_tat - now > window_seconds:
+                retry_after = new_tat - window_seconds - now
+                return RateLimitResult(
+                    allowed=False,
+                    limit=limit,
+                    remaining=0,
+                    reset_after=int(math.ceil(tat - now)),
+                    retry_after=max(1, int(math.ceil(retry_after))),
+                )
+
+            self._tat[key] = new_tat
+
+        remaining = int((window_seconds - (new_tat - now)) / interval)
+        return RateLimitResult(
+            allowed=True,
+            limit=limit,
+            remaining=max(0, remaining),
+            reset_after=int(math.ceil(new_tat - now)),
+        )
+
+    def _sweep(self, now: float) -> None:
+        expired = [k for k, tat in self._tat.items() if tat <= now]
+        for k in expired:
+            del self._tat[k]
+        self._last_sweep = now
+
+    def __len__(self) -> int:
+        return len(self._tat)
+
+
+class PostgresRateLimiter(RateLimiter):
+    """
+    Shared limiter on `rate_limit_counters`.
+
+    Each hit upserts the current fixed window's counter and reads the previous
+    window in the same statement; the estimate weights the previous count by
+    how much of it still overlaps the sliding window. Fails open when the
+    database is unavailable, like WebhookGateway's reservation.
+    """
+
+    CLEANUP_INTERVAL_SECONDS = 300
+    RETENTION = timedelta(hours=1)
+
+    _hit_sql = text("""
+        WITH cur AS (
+            INSERT INTO rate_limit_counters (source, window_start, count, max_requests, created_at, updated_at)
+            VALUES (:source, :window_start, 1, :max_requests, :now, :now)
+            ON CONFLICT (source, window_start) DO UPDATE SET
+                count = rate_limit_counters.count + 1,
+                updated_at = :now
+            RETURNING count
+        )
+        SELECT cur.count,
+               COALESCE((
+                   SELECT count FROM rate_limit_counters
+                   WHERE source = :source AND window_start = :previous_window
+               ), 0) AS previous_count
+        FROM cur
+    """)
+
+    _cleanup_sql = text("""
+        DELETE FROM rate_limit_counters
+        WHERE source LIKE :prefix AND window_start < :cutoff
+    """)
+
+    def __init__(self):
+        self._last_cleanup = 0.0
+        self._cleanup_lock = threading.Lock()
+
+    @staticmethod
+    def _source_for(key: str) -> str:
+        source = f"{_KEY_PREFIX}{key}"
+        if len(source) > _MAX_SOURCE_LENGTH:
+            source = f"{_KEY_PREFIX}{hashlib.sha256(key.encode()).hexdigest()[:40]}"
+        return source
+
+    @staticmethod
+    def _engine():
+        from app.db import database
+
+        return database.engine
+
+    def hit(self, key: str, limit: int, window_seconds: int = DEFAULT_WINDOW_SECONDS) -> RateLimitResult:
+        limit = max(1, int(limit))
+        epoch = time.time()
+        # Naive UTC, like the rest of rate_limit_counters (WebhookGateway)
+        now = datetime.fromtimestamp(epoch, timezone.utc).replace(tzinfo=None)
+        window_index = int(epoch // window_seconds)
+        window_start = datetime.fromtimestamp(window_index * window_seconds, timezone.utc).replace(tzinfo=None)
+        previous_window = window_start - timedelta(seconds=window_seconds)
+        elapsed = epoch - window_index * window_seconds
+        reset_after = int(math.ceil(window_seconds - elapsed))
+
+        engine = self._engine()
+        if engine is None:
+            return RateLimitResult(allowed=True, limit=limit, remaining=limit, reset_after=reset_after)
+
+        try:
+            with engine.begin() as conn:
+                row = conn.execute(self._hit_sql, {
+                    "source": self._source_for(key),
+                    "window_start": window_start,
+                    "previous_window": previous_window,
+                    "max_requests": limit,
+                    "now": now,
+                }).fetchone()
+            self._maybe_cleanup(engine, now)
+        except Exception as e:
+            logger.error(f"Rate limit check failed, allowing request: {e}")
+            return RateLimitResult(allowed=True, limit=limit, remaining=limit, reset_after=reset_after)
+
+        current, previous = row[0], row[1]
+        weight = 1.0 - (elapsed / window_seconds)
+        estimated = previous * weight + current
+
+        if estimated > limit:
+            return RateLimitResult(
+                allowed=False,
+                limit=limit,
+                remaining=0,
+                reset_after=reset_after,
+                retry_after=max(1, reset_after),
+            )
+
+        return RateLimitResult(
+            allowed=True,
+            limit=limit,
+            remaining=max(0, int(limit - estimated)),
+            reset_after=reset_after,
+        )
+
+    async def hit_async(self, key: str, limit: int, window_seconds: int = DEFAULT_WINDOW_SECONDS) -> RateLimitResult:
+        return await run_in_threadpool(self.hit, key, limit, window_seconds)
+
+    def _maybe_cleanup(self, engine, now: datetime) -> None:
+        if time.monotonic() - self._last_cleanup < self.CLEANUP_INTERVAL_SECONDS:
+            return
+        if not self._cleanup_lock.acquire(blocking=False):
+            return
+        try:
+            self._last_cleanup = time.monotonic()
+            with engine.begin() as conn:
+                conn.execute(self._cleanup_sql, {
+                    "prefix": f"{_KEY_PREFIX}%",
+                    "cutoff": now - self.RETENTION,
+                })
+        except Exception as e:
+            logger.warning(f"Rate limit counter cleanup failed: {e}")
+        finally:
+            self._cleanup_lock.release()
+
+
+_BACKENDS = {
+    "memory": InMemoryRateLimiter,
+    "postgres": PostgresRateLimiter,
+}
+
+_limiter: Optional[RateLimiter] = None
+_limiter_lock = threading.Lock()
+
+
+def create_rate_limiter(backend: str) -> RateLimiter:
+    backend_cls = _BACKENDS.get((backend or "memory").lower())
+    if backend_cls is None:
+        logger.warning(f"Unknown rate limit backend '{backend}', using memory")
+        backend_cls = InMemoryRateLimiter
+    return backend_cls()
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Process-wide limiter for the configured RATE_LIMIT_BACKEND"""
+    global _limiter
+    if _limiter is None:
+        with _limiter_lock:
+            if _limiter is None:
+                from app.core.config import settings
+
+                _limiter = create_rate_limiter(settings.RATE_LIMIT_BACKEND)
+    return _limiter
@@ -8,18 +8,24 @@ Generates tiered opportunity reports:
 """
 import os
 from datetime import datetime
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, Callable, List
+from sqlalchemy import inspect as sa_inspect
 from sqlalchemy.orm import Session
 
 import logging
+from app.core.config import settings
 from app.models.opportunity import Opportunity
 from app.models.generated_report import GeneratedReport, ReportType, ReportStatus
 from app.models.user import User
 from app.services.ai_report_generator import ai_report_generator
 from app.services.branding_service import get_user_team_branding, inject_branding_into_report
+from app.services.report_sections import RenderedSections, ReportSection, render_sections
 
 logger = logging.getLogger(__name__)
 
+# progress(percent, message), called while a layer report is rendered
+ProgressCallback = Callable[[int, str], None]
+
 
 MAPBOX_STYLE_SATELLITE = "mapbox/satellite-streets-v11"
 MAPBOX_STYLE_DARK = "mapbox/dark-v11"
@@ -93,6 +99,12 @@ class ReportGenerator:
         ReportType.LAYER_3_EXECUTION: None,
     }
     
+    LAYER_TITLES = {
+        ReportType.LAYER_1_OVERVIEW: "Problem Overview",
+        ReportType.LAYER_2_DEEP_DIVE: "Deep Dive Analysis",
+        ReportType.LAYER_3_EXECUTION: "Execution Package",
+    }
+    
     def __init__(self, db: Session):
         self.db = db
     
@@ -175,48 +187,134 @@ class ReportGenerator:
             "price": self.TIER_PRICES.get(report_type)
         }
     
-    def generate_layer1_report(self, opportunity: Opportunity, user: User, demographics: Optional[Dict] = None) -> GeneratedReport:
-        """Generate Layer 1: Problem Overview report."""
-        start_time = datetime.utcnow()
-        
+    def create_report(
+        self,
+        report_type: ReportType,
+        opportunity: Opportunity,
+        user: User,
+        status: ReportStatus = ReportStatus.GENERATING,
+    ) -> GeneratedReport:
+        """Insert the GeneratedReport row for a layer report."""
         report = GeneratedReport(
             user_id=user.id,
             opportunity_id=opportunity.id,
-            report_type=ReportType.LAYER_1_OVERVIEW,
-            status=ReportStatus.GENERATING,
-            title=f"Problem Overview: {opportunity.title}",
+            report_type=report_type,
+            status=status,
+            title=f"{self.LAYER_TITLES[report_type]}: {opportunity.title}",
         )
         self.db.add(report)
         self.db.commit()
+        return report
+    
+    def render_report(
+        self,
+        report_type: ReportType,
+        opportunity: Opportunity,
+        demographics: Optional[Dict] = None,
+        progress: Optional[ProgressCallback] = None,
+    ) -> Dict[str, Any]:
+        """
+        Build the content of a layer report without touching any GeneratedReport.
         
-        try:
-            content = self._build_layer1_content(opportunity, demographics)
-            summary = self._build_layer1_summary(opportunity)
-            
+        Returns content, summary and confidence_score. The result depends only
+        on the opportunity, so one rendering can complete several users' reports.
+        """
+        progress = progress or (lambda percent, message: None)
+        
+        if report_type == ReportType.LAYER_1_OVERVIEW:
+            progress(20, "Building problem overview")
+            return {
+                "content": self._build_layer1_content(opportunity, demographics),
+                "summary": self._build_layer1_summary(opportunity),
+                "confidence_score": opportunity.ai_opportunity_score or 75,
+            }
+        
+        if report_type == ReportType.LAYER_2_DEEP_DIVE:
+            progress(10, "Analyzing trade area")
+            sections = self._render_sections(opportunity, self._layer2_sections(opportunity, demographics), progress)
+            return {
+                "content": self._build_layer2_content(opportunity, sections),
+                "summary": f"Deep Dive Analysis for '{opportunity.title}' including trade area analysis, TAM/SAM/SOM, competitive landscape, and AI-powered market insights.",
+                "confidence_score": opportunity.ai_opportunity_score or 80,
+                "metadata": sections.metadata(),
+            }
+        
+        if report_type == ReportType.LAYER_3_EXECUTION:
+            progress(10, "Building execution package")
+            sections = self._render_sections(opportunity, self._layer3_sections(opportunity, demographics), progress)
+            return {
+                "content": self._build_layer3_content(opportunity, sections),
+                "summary": f"Complete Execution Package for '{opportunity.title}' including business plan, go-to-market strategy, and 90-day roadmap.",
+                "confidence_score": opportunity.ai_opportunity_score or 85,
+                "metadata": sections.metadata(),
+            }
+        
+        raise ValueError(f"Unsupported layer report type: {report_type}")
+    
+    def complete_report(self, report: GeneratedReport, rendered: Dict[str, Any], user: Optional[User], start_time: datetime) -> GeneratedReport:
+        """Store rendered content on `report` (with team branding for Layer 1) and mark it completed."""
+        content = rendered["content"]
+        if report.report_type == ReportType.LAYER_1_OVERVIEW and user is not None:
             branding = get_user_team_branding(user, self.db)
             if branding:
                 content = inject_branding_into_report(content, branding)
-            
-            report.content = content
-            report.summary = summary
-            report.status = ReportStatus.COMPLETED
-            report.completed_at = datetime.utcnow()
-            report.generation_time_ms = int((datetime.utcnow() - start_time).total_seconds() * 1000)
-            report.confidence_score = opportunity.ai_opportunity_score or 75
-            
-            self.db.commit()
-            self.db.refresh(report)
-            
-            return report
+        
+        report.content = content
+        report.summary = rendered["summary"]
+        report.status = ReportStatus.COMPLETED
+        report.completed_at = datetime.utcnow()
+        report.generation_time_ms = int((datetime.utcnow() - start_time).total_seconds() * 1000)
+        report.confidence_score = rendered["confidence_score"]
+        report.generation_metadata = rendered.get("metadata")
+        
+        self.db.commit()
+        self.db.refresh(report)
+        return report
+    
+    def fail_report(self, report: GeneratedReport, error: Exception, start_time: datetime, error_type: str = "generation_error") -> GeneratedReport:
+        report.status = ReportStatus.FAILED
+        report.error_type = error_type
+        report.error_message = str(error)[:500]
+        report.generation_time_ms = int((datetime.utcnow() - start_time).total_seconds() * 1000)
+        self.db.commit()
+        self.db.refresh(report)
+        return report
+    
+    def _render_sections(self, opportunity: Opportunity, sections: List[ReportSection], progress: ProgressCallback) -> RenderedSections:
+        """Render a layer's section graph on the section pool, reporting 10-90% progress."""
+        # Sections read the opportunity from worker threads; load expired
+        # attributes here so they never lazy-load through self.db concurrently.
+        state = sa_inspect(opportunity)
+        if state.expired_attributes and state.session is not None:
+            self.db.refresh(opportunity)
+        
+        def section_done(done: int, total: int, name: str) -> None:
+            progress(10 + int(80 * done / total), f"Built {name.replace('_', ' ')}")
+        
+        rendered = render_sections(
+            sections,
+            max_workers=settings.REPORT_SECTION_WORKERS,
+            session_factory=lambda: Session(bind=self.db.get_bind()),
+            progress=section_done,
+        )
+        logger.info(f"Rendered {len(sections)} report sections in {rendered.total_ms}ms (slowest: {rendered.slowest})")
+        return rendered
+    
+    def _generate(self, report_type: ReportType, opportunity: Opportunity, user: User, demographics: Optional[Dict] = None) -> GeneratedReport:
+        start_time = datetime.utcnow()
+        report = self.create_report(report_type, opportunity, user)
+        
+        try:
+            rendered = self.render_report(report_type, opportunity, demographics)
+            return self.complete_report(report, rendered, user, start_time)
         except Exception as e:
-            logger.error(f"Failed to generate Layer 1 report for opportunity {opportunity.id}: {e}")
-            report.status = ReportStatus.FAILED
-            report.error_type = "generation_error"
-            report.error_message = str(e)[:500]
-            report.generation_time_ms = int((datetime.utcnow() - start_time).total_seconds() * 1000)
-            self.db.commit()
-            self.db.refresh(report)
-            return report
+            logger.error(f"Failed to generate {self.LAYER_TITLES[report_type]} report for opportunity {opportunity.id}: {e}")
+            self.db.rollback()
+            return self.fail_report(report, e, start_time)
+    
+    def generate_layer1_report(self, opportunity: Opportunity, user: User, demographics: Optional[Dict] = None) -> GeneratedReport:
+        """Generate Layer 1: Problem Overview report."""
+        return self._generate(ReportType.LAYER_1_OVERVIEW, opportunity, user, demographics)
     
     def _build_layer1_content(self, opp: Opportunity, demographics: Optional[Dict] = None) -> str:
         """Build Layer 1 report content in HTML format with AI-generated insights."""
@@ -724,72 +822,41 @@ class ReportGenerator:
     
     def generate_layer2_report(self, opportunity: Opportunity, user: User, demographics: Optional[Dict] = None) -> GeneratedReport:
         """Generate Layer 2: Deep Dive Analysis report with trade area analysis."""
+        return self._generate(ReportType.LAYER_2_DEEP_DIVE, opportunity, user, demographics)
+    
+    def _analyze_trade_area(self, opportunity: Opportunity, demographics: Optional[Dict] = None):
+        """Run trade area analysis; returns (trade_area or None, demographics)."""
         from app.services.trade_area_analyzer import trade_area_analyzer
         
-        start_time = datetime.utcnow()
-        
-        report = GeneratedReport(
-            user_id=user.id,
-            opportunity_id=opportunity.id,
-            report_type=ReportType.LAYER_2_DEEP_DIVE,
-            status=ReportStatus.GENERATING,
-            title=f"Deep Dive Analysis: {opportunity.title}",
-        )
-        self.db.add(report)
-        self.db.commit()
+        opp_dict = {
+            'title': opportunity.title,
+            'category': opportunity.category,
+            'city': opportunity.city,
+            'region': opportunity.region,
+            'country': opportunity.country,
+            'description': opportunity.description,
+            'latitude': opportunity.latitude,
+            'longitude': opportunity.longitude,
+            'severity': opportunity.severity,
+            'market_size': opportunity.ai_market_size_estimate or opportunity.market_size,
+            'target_audience': opportunity.ai_target_audience,
+        }
         
         try:
-            opp_dict = {
-                'title': opportunity.title,
-                'category': opportunity.category,
-                'city': opportunity.city,
-                'region': opportunity.region,
-                'country': opportunity.country,
-                'description': opportunity.description,
-                'latitude': opportunity.latitude,
-                'longitude': opportunity.longitude,
-                'severity': opportunity.severity,
-                'market_size': opportunity.ai_market_size_estimate or opportunity.market_size,
-                'target_audience': opportunity.ai_target_audience,
-            }
+            trade_area = trade_area_analyzer.analyze(
+                opp_dict,
+                include_competitors=True,
+                include_demographics=demographics is None,
+                include_ai_synthesis=True
+            )
             
-            try:
-                trade_area = trade_area_analyzer.analyze(
-                    opp_dict,
-                    include_competitors=True,
-                    include_demographics=demographics is None,
-                    include_ai_synthesis=True
-                )
-                
-                if demographics is None and trade_area.demographics:
-                    demographics = trade_area.demographics
-            except Exception as e:
-                logger.warning(f"Trade area analysis failed: {e}")
-                trade_area = None
-            
-            content = self._build_layer2_content(opportunity, demographics, trade_area)
-            summary = f"Deep Dive Analysis for '{opportunity.title}' including trade area analysis, TAM/SAM/SOM, competitive landscape, and AI-powered market insights."
-            
-            report.content = content
-            report.summary = summary
-            report.status = ReportStatus.COMPLETED
-            report.completed_at = datetime.utcnow()
-            report.generation_time_ms = int((datetime.utcnow() - start_time).total_seconds() * 1000)
-            report.confidence_score = opportunity.ai_opportunity_score or 80
-            
-            self.db.commit()
-            self.db.refresh(report)
-            
-            return report
+            if demographics is None and trade_area.demographics:
+                demographics = trade_area.demographics
         except Exception as e:
-            logger.error(f"Failed to generate Layer 2 report for opportunity {opportunity.id}: {e}")
-            report.status = ReportStatus.FAILED
-            report.error_type = "generation_error"
-            report.error_message = str(e)[:500]
-            report.generation_time_ms = int((datetime.utcnow() - start_time).total_seconds() * 1000)
-            self.db.commit()
-            self.db.refresh(report)
-            return report
+            logger.warning(f"Trade area analysis failed: {e}")
+            trade_area = None
+        
+        return trade_area, demographics
     
     def _calculate_tam_sam_som(self, opp: Opportunity, demographics: Optional[Dict] = None) -> Dict[str, Any]:
         """Calculate TAM/SAM/SOM using Census data and opportunity characteristics."""
@@ -899,11 +966,11 @@ class ReportGenerator:
     </section>
 """
     
-    def _build_top_markets_section(self, opp: Opportunity) -> str:
+    def _build_top_markets_section(self, opp: Opportunity, db: Optional[Session] = None) -> str:
         """Build Top 10 Markets by Opportunity Score section for Layer 2."""
         from sqlalchemy import func
         
-        top_markets = self.db.query(
+        top_markets = (db or self.db).query(
             Opportunity.city,
             Opportunity.region,
             func.count(Opportunity.id).label('signal_count'),
@@ -1078,15 +1145,41 @@ class ReportGenerator:
     </section>
 """
     
-    def _build_layer2_content(self, opp: Opportunity, demographics: Optional[Dict] = None, trade_area=None) -> str:
+    def _layer2_sections(self, opp: Opportunity, demographics: Optional[Dict] = None) -> List[ReportSection]:
+        """
+        Section graph for Layer 2.
+        
+        The trade area analysis (which also supplies demographics when none were
+        passed in) runs once; the top markets query runs alongside it.
+        """
+        def trade_area(r):
+            return r["trade_area"][0]
+        
+        def area_demographics(r):
+            return r["trade_area"][1]
+        
+        after_trade_area = ("trade_area",)
+        return [
+            ReportSection("trade_area", lambda r, db: self._analyze_trade_area(opp, demographics)),
+            ReportSection("top_markets", lambda r, db: self._build_top_markets_section(opp, db), uses_db=True),
+            ReportSection("market_sizing", lambda r, db: self._calculate_tam_sam_som(opp, area_demographics(r)), after_trade_area),
+            ReportSection("income_distribution", lambda r, db: self._build_income_distribution_section(area_demographics(r)), after_trade_area),
+            ReportSection("housing_lifestyle", lambda r, db: self._build_housing_lifestyle_section(area_demographics(r)), after_trade_area),
+            ReportSection("trade_area_map", lambda r, db: self._build_trade_area_section(opp, trade_area(r)), after_trade_area),
+            ReportSection("competitive_analysis", lambda r, db: self._build_competitive_analysis_section(opp, trade_area(r)), after_trade_area),
+            ReportSection("ai_insights", lambda r, db: self._build_ai_insights_section(opp, area_demographics(r), trade_area(r)), after_trade_area),
+        ]
+    
+    def _build_layer2_content(self, opp: Opportunity, sections: RenderedSections) -> str:
         """Build Layer 2 report content with trade area analysis and demographics."""
-        market_sizing = self._calculate_tam_sam_som(opp, demographics)
-        income_section = self._build_income_distribution_section(demographics)
-        housing_section = self._build_housing_lifestyle_section(demographics)
-        top_markets_section = self._build_top_markets_section(opp)
-        trade_area_section = self._build_trade_area_section(opp, trade_area)
-        competitive_section = self._build_competitive_analysis_section(opp, trade_area)
-        ai_insights_section = self._build_ai_insights_section(opp, demographics, trade_area)
+        _, demographics = sections["trade_area"]
+        market_sizing = sections["market_sizing"]
+        income_section = sections["income_distribution"]
+        housing_section = sections["housing_lifestyle"]
+        top_markets_section = sections["top_markets"]
+        trade_area_section = sections["trade_area_map"]
+        competitive_section = sections["competitive_analysis"]
+        ai_insights_section = sections["ai_insights"]
         
         pop_display = "--"
         income_display = "--"
@@ -1390,45 +1483,19 @@ class ReportGenerator:
     
     def generate_layer3_report(self, opportunity: Opportunity, user: User, demographics: Optional[Dict] = None) -> GeneratedReport:
         """Generate Layer 3: Execution Package report."""
-        start_time = datetime.utcnow()
-        
-        report = GeneratedReport(
-            user_id=user.id,
-            opportunity_id=opportunity.id,
-            report_type=ReportType.LAYER_3_EXECUTION,
-            status=ReportStatus.GENERATING,
-            title=f"Execution Package: {opportunity.title}",
-        )
-        self.db.add(report)
-        self.db.commit()
-        
+        return self._generate(ReportType.LAYER_3_EXECUTION, opportunity, user, demographics)
+    
+    def _ai_content_html(self, label: str, generate: Callable[[], Optional[str]]) -> str:
+        """Run one AI generation call and convert its markdown-ish output to HTML ("" on failure)."""
         try:
-            content = self._build_layer3_content(opportunity, demographics)
-            summary = f"Complete Execution Package for '{opportunity.title}' including business plan, go-to-market strategy, and 90-day roadmap."
-            
-            report.content = content
-            report.summary = summary
-            report.status = ReportStatus.COMPLETED
-            report.completed_at = datetime.utcnow()
-            report.generation_time_ms = int((datetime.utcnow() - start_time).total_seconds() * 1000)
-            report.confidence_score = opportunity.ai_opportunity_score or 85
-            
-            self.db.commit()
-            self.db.refresh(report)
-            
-            return report
+            text = generate()
+            return text.replace('\n', '<br>').replace('**', '<strong>').replace('</strong><strong>', '') if text else ""
         except Exception as e:
-            logger.error(f"Failed to generate Layer 3 report for opportunity {opportunity.id}: {e}")
-            report.status = ReportStatus.FAILED
-            report.error_type = "generation_error"
-            report.error_message = str(e)[:500]
-            report.generation_time_ms = int((datetime.utcnow() - start_time).total_seconds() * 1000)
-            self.db.commit()
-            self.db.refresh(report)
-            return report
-    
-    def _build_layer3_content(self, opp: Opportunity, demographics: Optional[Dict] = None) -> str:
-        """Build Layer 3 Execution Package content with AI-generated business plan and strategy."""
+            logger.warning(f"Failed to generate AI {label}: {e}")
+            return ""
+    
+    def _layer3_sections(self, opp: Opportunity, demographics: Optional[Dict] = None) -> List[ReportSection]:
+        """Section graph for Layer 3: three independent AI calls plus the expansion map."""
         opp_dict = {
             'title': opp.title,
             'category': opp.category,
@@ -1440,28 +1507,22 @@ class ReportGenerator:
             'business_models': ', '.join(opp.ai_business_model_suggestions or []) if opp.ai_business_model_suggestions else '',
         }
         
-        try:
-            ai_business_plan = ai_report_generator.generate_business_plan(opp_dict)
-            ai_business_plan_html = ai_business_plan.replace('\n', '<br>').replace('**', '<strong>').replace('</strong><strong>', '') if ai_business_plan else ""
-        except Exception as e:
-            logger.warning(f"Failed to generate AI business plan: {e}")
-            ai_business_plan_html = ""
-        
-        try:
-            ai_financial = ai_report_generator.generate_financial_projections(opp_dict)
-            ai_financial_html = ai_financial.replace('\n', '<br>').replace('**', '<strong>').replace('</strong><strong>', '') if ai_financial else ""
-        except Exception as e:
-            logger.warning(f"Failed to generate AI financial projections: {e}")
-            ai_financial_html = ""
-        
-        try:
-            ai_strategy = ai_report_generator.generate_strategic_recommendations(opp_dict, demographics)
-            ai_strategy_html = ai_strategy.replace('\n', '<br>').replace('**', '<strong>').replace('</strong><strong>', '') if ai_strategy else ""
-        except Exception as e:
-            logger.warning(f"Failed to generate AI strategic recommendations: {e}")
-            ai_strategy_html = ""
-        
-        expansion_map_section = self._build_expansion_map_section(opp)
+        return [
+            ReportSection("business_plan", lambda r, db: self._ai_content_html(
+                "business plan", lambda: ai_report_generator.generate_business_plan(opp_dict))),
+            ReportSection("financial_projections", lambda r, db: self._ai_content_html(
+                "financial projections", lambda: ai_report_generator.generate_financial_projections(opp_dict))),
+            ReportSection("strategic_recommendations", lambda r, db: self._ai_content_html(
+                "strategic recommendations", lambda: ai_report_generator.generate_strategic_recommendations(opp_dict, demographics))),
+            ReportSection("expansion_map", lambda r, db: self._build_expansion_map_section(opp)),
+        ]
+    
+    def _build_layer3_content(self, opp: Opportunity, sections: RenderedSections) -> str:
+        """Build Layer 3 Execution Package content with AI-generated business plan and strategy."""
+        ai_business_plan_html = sections["business_plan"]
+        ai_financial_html = sections["financial_projections"]
+        ai_strategy_html = sections["strategic_recommendations"]
+        expansion_map_section = sections["expansion_map"]
         
         business_plan_section = ""
         if ai_business_plan_html:
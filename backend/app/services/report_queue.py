@@ -0,0 +1,422 @@
+"""
+Persistent job queue for layer 1/2/3 opportunity reports.
+
+POST /reports/opportunity/{id}/layerN only inserts a GeneratedReport in
+PENDING status and returns its id; the row *is* the job. Report workers
+(started with the background jobs) claim the oldest pending report with
+`FOR UPDATE SKIP LOCKED`, so any number of API processes can share the queue,
+and record each execution in `job_runs`.
+
+Identical jobs are deduplicated across users: when a worker claims a report
+it also claims every other pending report for the same (opportunity,
+report_type), renders the content once and completes all of them (team
+branding is still applied per user). Reports queued while that rendering is
+in flight are picked up when it finishes.
+
+Progress is published through `report_progress`: to the owner's WebSocket
+connections (`type: "report_progress"`) and to SSE subscribers of
+GET /reports/{id}/events. While rendering, progress also bumps the reports'
+`updated_at` (at most every HEARTBEAT_INTERVAL_SECONDS); reports left
+GENERATING without a heartbeat for REPORT_JOB_TIMEOUT_MINUTES (dead worker)
+are requeued, up to REPORT_JOB_MAX_ATTEMPTS.
+"""
+
+import asyncio
+import json
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from cachetools import TTLCache
+from sqlalchemy import and_, func, or_
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.database import SessionLocal
+from app.models.generated_report import GeneratedReport, ReportStatus, ReportType
+from app.models.job_run import JobRun
+from app.models.opportunity import Opportunity
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+QUEUED_REPORT_TYPES = (
+    ReportType.LAYER_1_OVERVIEW,
+    ReportType.LAYER_2_DEEP_DIVE,
+    ReportType.LAYER_3_EXECUTION,
+)
+ACTIVE_STATUSES = (ReportStatus.PENDING, ReportStatus.GENERATING)
+TERMINAL_STATUSES = {ReportStatus.COMPLETED.value, ReportStatus.FAILED.value}
+
+STALE_CHECK_INTERVAL_SECONDS = 60
+HEARTBEAT_INTERVAL_SECONDS = 30
+
+
+class ReportProgressBroker:
+    """Fan-out of report progress events to WebSocket and SSE listeners."""
+
+    def __init__(self):
+        self._latest: TTLCache = TTLCache(maxsize=5000, ttl=3600)
+        self._subscribers: Dict[int, List[Tuple[asyncio.AbstractEventLoop, asyncio.Queue]]] = {}
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def bind_loop(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Event loop that owns the WebSocket connections"""
+        self._loop = loop
+
+    def latest(self, report_id: int) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            return self._latest.get(report_id)
+
+    def subscribe(self, report_id: int) -> asyncio.Queue:
+        queue: asyncio.Queue = asyncio.Queue()
+        with self._lock:
+            self._subscribers.setdefault(report_id, []).append((asyncio.get_running_loop(), queue))
+        return queue
+
+    def unsubscribe(self, report_id: int, queue: asyncio.Queue) -> None:
+        with self._lock:
+            listeners = [entry for entry in self._subscribers.get(report_id, []) if entry[1] is not queue]
+            if listeners:
+                self._subscribers[report_id] = listeners
+            else:
+                self._subscribers.pop(report_id, None)
+
+    def publish(
+        self,
+        report_id: int,
+        user_id: Optional[int],
+        status: str,
+        progress: int,
+        message: Optional[str] = None,
+    ) -> None:
+        """Record and broadcast a progress event; safe to call from any thread"""
+        event = {
+            "report_id": report_id,
+            "status": status,
+            "progress": progress,
+            "message": message,
+        }
+        with self._lock:
+            self._latest[report_id] = event
+            listeners = list(self._subscribers.get(report_id, []))
+
+        for loop, queue in listeners:
+            if not loop.is_closed():
+                loop.call_soon_threadsafe(queue.put_nowait, event)
+
+        loop = self._loop
+        if user_id is not None and loop is not None and not loop.is_closed():
+            from app.websocket.manager import manager
+
+            asyncio.run_coroutine_threadsafe(
+                manager.send_personal_message({"type": "report_progress", **event}, user_id),
+                loop,
+            )
+
+
+report_progress = ReportProgressBroker()
+
+
+def report_snapshot(report: GeneratedReport) -> Dict[str, Any]:
+    """Progress event for `report` from its row, refined by the latest published event"""
+    status = report.status.value
+    latest = report_progress.latest(report.id)
+    if latest and latest["status"] == status:
+        return latest
+    progress = 100 if status in TERMINAL_STATUSES else (5 if status == ReportStatus.GENERATING.value else 0)
+    return {
+        "report_id": report.id,
+        "status": status,
+        "progress": progress,
+        "message": report.error_message if report.status == ReportStatus.FAILED else None,
+    }
+
+
+def enqueue_report(db: Session, user: User, opportunity: Opportunity, report_type: ReportType) -> Tuple[GeneratedReport, bool]:
+    """
+    Queue a layer report for `user`.
+
+    Returns (report, deduplicated). An in-flight report of the same type for
+    this user and opportunity is returned instead of queueing a second one.
+    `deduplicated` is True when another user's identical job is in flight, so
+    this report will be completed from the same rendering.
+    """
+    from app.services.report_generator import ReportGenerator
+
+    report = db.query(GeneratedReport).filter(
+        GeneratedReport.user_id == user.id,
+        GeneratedReport.opportunity_id == opportunity.id,
+        GeneratedReport.report_type == report_type,
+        GeneratedReport.status.in_(ACTIVE_STATUSES),
+    ).first()
+    if report is None:
+        report = ReportGenerator(db).create_report(report_type, opportunity, user, status=ReportStatus.PENDING)
+        report_progress.publish(report.id, user.id, ReportStatus.PENDING.value, 0, "Queued")
+
+    deduplicated = db.query(GeneratedReport.id).filter(
+        GeneratedReport.opportunity_id == opportunity.id,
+        GeneratedReport.report_type == report_type,
+        GeneratedReport.status.in_(ACTIVE_STATUSES),
+        GeneratedReport.user_id != user.id,
+    ).first() is not None
+
+    report_worker_pool.wake()
+    return report, deduplicated
+
+
+@dataclass
+class ReportJob:
+    report_ids: List[int]
+    opportunity_id: Optional[int]
+    report_type: ReportType
+    claimed_at: datetime = field(default_factory=datetime.utcnow)
+
+
+def _claim_pending(db: Session, opportunity_id: Optional[int], report_type: ReportType) -> List[GeneratedReport]:
+    reports = db.query(GeneratedReport).filter(
+        GeneratedReport.status == ReportStatus.PENDING,
+        GeneratedReport.opportunity_id == opportunity_id,
+        GeneratedReport.report_type == report_type,
+    ).with_for_update(skip_locked=True).all()
+    for report in reports:
+        report.status = ReportStatus.GENERATING
+    return reports
+
+
+def claim_next_job(db: Session, report_id: Optional[int] = None) -> Optional[ReportJob]:
+    """
+    Claim the oldest pending layer report (or `report_id`) together with every
+    pending duplicate of it. Returns None when nothing is pending.
+    """
+    query = db.query(GeneratedReport).filter(
+        GeneratedReport.status == ReportStatus.PENDING,
+        GeneratedReport.report_type.in_(QUEUED_REPORT_TYPES),
+    )
+    if report_id is not None:
+        query = query.filter(GeneratedReport.id == report_id)
+    leader = query.order_by(GeneratedReport.created_at, GeneratedReport.id).with_for_update(skip_locked=True).first()
+    if leader is None:
+        db.rollback()
+        return None
+
+    leader.status = ReportStatus.GENERATING
+    reports = [leader] + [
+        report for report in _claim_pending(db, leader.opportunity_id, leader.report_type)
+        if report.id != leader.id
+    ]
+    job = ReportJob(
+        report_ids=[report.id for report in reports],
+        opportunity_id=leader.opportunity_id,
+        report_type=leader.report_type,
+    )
+    user_ids = {report.id: report.user_id for report in reports}
+    db.commit()
+
+    for claimed_id, user_id in user_ids.items():
+        report_progress.publish(claimed_id, user_id, ReportStatus.GENERATING.value, 5, "Starting")
+    return job
+
+
+def heartbeat_reports(db: Session, report_ids: List[int]) -> None:
+    """Mark reports still GENERATING as alive, so requeue_stale_reports leaves them alone"""
+    db.query(GeneratedReport).filter(
+        GeneratedReport.id.in_(report_ids),
+        GeneratedReport.status == ReportStatus.GENERATING,
+    ).update({GeneratedReport.updated_at: func.now()}, synchronize_session=False)
+    db.commit()
+
+
+def requeue_stale_reports(db: Session) -> int:
+    """Return reports stuck in GENERATING (dead worker) to the queue, or fail them"""
+    cutoff = datetime.utcnow() - timedelta(minutes=settings.REPORT_JOB_TIMEOUT_MINUTES)
+    stale = db.query(GeneratedReport).filter(
+        GeneratedReport.status == ReportStatus.GENERATING,
+        GeneratedReport.report_type.in_(QUEUED_REPORT_TYPES),
+        or_(
+            GeneratedReport.updated_at < cutoff,
+            and_(GeneratedReport.updated_at.is_(None), GeneratedReport.created_at < cutoff),
+        ),
+    ).with_for_update(skip_locked=True).all()
+
+    for report in stale:
+        attempts = (report.retry_count or 0) + 1
+        if attempts < settings.REPORT_JOB_MAX_ATTEMPTS:
+            report.retry_count = attempts
+            report.status = ReportStatus.PENDING
+        else:
+            report.status = ReportStatus.FAILED
+            report.error_type = "timeout"
+            report.error_message = f"Report generation did not finish after {attempts} attempts"
+    db.commit()
+
+    if stale:
+        logger.warning(f"Requeued or failed {len(stale)} stale report jobs")
+    return len(stale)
+
+
+class ReportJobExecutor:
+    """Runs one claimed ReportJob to completion in its own session."""
+
+    def __init__(self, session_factory=SessionLocal):
+        self._session_factory = session_factory
+
+    def run(self, job: ReportJob) -> None:
+        from app.services.report_generator import ReportGenerator
+
+        db = self._session_factory()
+        run = JobRun(job_name=f"report:{job.report_type.value}", status="running")
+        db.add(run)
+        db.commit()
+
+        generator = ReportGenerator(db)
+        start_time = job.claimed_at
+        reports = db.query(GeneratedReport).filter(GeneratedReport.id.in_(job.report_ids)).all()
+        owners = {report.id: report.user_id for report in reports}
+        heartbeat_lock = threading.Lock()
+        last_heartbeat = [time.monotonic()]
+
+        def progress(percent: int, message: str) -> None:
+            for report_id, user_id in owners.items():
+                report_progress.publish(report_id, user_id, ReportStatus.GENERATING.value, percent, message)
+            with heartbeat_lock:
+                if time.monotonic() - last_heartbeat[0] < HEARTBEAT_INTERVAL_SECONDS:
+                    return
+                last_heartbeat[0] = time.monotonic()
+            self._heartbeat(list(owners))
+
+        try:
+            opportunity = db.query(Opportunity).filter(Opportunity.id == job.opportunity_id).first()
+            if opportunity is None:
+                raise ValueError(f"Opportunity {job.opportunity_id} no longer exists")
+
+            demographics = opportunity.demographics if hasattr(opportunity, 'demographics') else None
+            rendered = generator.render_report(job.report_type, opportunity, demographics, progress=progress)
+            progress(95, "Saving report")
+
+            # Pick up identical jobs queued while this one was rendering.
+            reports += _claim_pending(db, job.opportunity_id, job.report_type)
+            db.commit()
+
+            for report in reports:
+                user = db.query(User).filter(User.id == report.user_id).first() if report.user_id else None
+                generator.complete_report(report, rendered, user, start_time)
+                report_progress.publish(report.id, report.user_id, ReportStatus.COMPLETED.value, 100, "Report ready")
+
+            run.status = "succeeded"
+        except Exception as e:
+            logger.error(f"Report job {job.report_type.value} for opportunity {job.opportunity_id} failed: {e}")
+            db.rollback()
+            for report in reports:
+                if report.status == ReportStatus.COMPLETED:
+                    continue
+                generator.fail_report(report, e, start_time)
+                report_progress.publish(report.id, report.user_id, ReportStatus.FAILED.value, 100, str(e)[:200])
+            run.status = "failed"
+            run.error = str(e)
+        finally:
+            run.finished_at = datetime.utcnow()
+            run.details_json = json.dumps({
+                "opportunity_id": job.opportunity_id,
+                "report_ids": [report.id for report in reports],
+            })
+            db.commit()
+            db.close()
+
+    def _heartbeat(self, report_ids: List[int]) -> None:
+        # Own session: progress runs mid-render, possibly from section threads
+        db = self._session_factory()
+        try:
+            heartbeat_reports(db, report_ids)
+        except Exception as e:
+            logger.warning(f"Report heartbeat for {report_ids} failed: {e}")
+        finally:
+            db.close()
+
+
+def run_next_report_job(report_id: Optional[int] = None, session_factory=SessionLocal) -> bool:
+    """Claim and run one job synchronously; returns False when nothing was pending"""
+    db = session_factory()
+    try:
+        job = claim_next_job(db, report_id)
+    finally:
+        db.close()
+    if job is None:
+        return False
+    ReportJobExecutor(session_factory).run(job)
+    return True
+
+
+class ReportWorkerPool:
+    """asyncio workers that drain the report queue, running jobs in threads."""
+
+    def __init__(self, concurrency: Optional[int] = None, poll_seconds: Optional[float] = None):
+        self.concurrency = max(1, concurrency or settings.REPORT_WORKER_CONCURRENCY)
+        self.poll_seconds = poll_seconds or settings.REPORT_JOB_POLL_SECONDS
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._tasks: List[asyncio.Task] = []
+        self._last_stale_check = 0.0
+
+    @property
+    def running(self) -> bool:
+        return bool(self._tasks)
+
+    def start(self, loop: Optional[asyncio.AbstractEventLoop] = None) -> None:
+        if self._tasks:
+            return
+        self._loop = loop or asyncio.get_event_loop()
+        self._wake = asyncio.Event()
+        report_progress.bind_loop(self._loop)
+        self._tasks = [self._loop.create_task(self._worker(i)) for i in range(self.concurrency)]
+        logger.info(f"Started {self.concurrency} report workers")
+
+    def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        self._tasks = []
+
+    def wake(self) -> None:
+        """Signal that a job was queued; safe to call from any thread"""
+        loop = self._loop
+        if loop is not None and not loop.is_closed() and self._wake is not None:
+            loop.call_soon_threadsafe(self._wake.set)
+
+    def _claim(self) -> Optional[ReportJob]:
+        db = SessionLocal()
+        try:
+            if time.monotonic() - self._last_stale_check > STALE_CHECK_INTERVAL_SECONDS:
+                self._last_stale_check = time.monotonic()
+                requeue_stale_reports(db)
+            return claim_next_job(db)
+        finally:
+            db.close()
+
+    async def _worker(self, index: int) -> None:
+        executor = ReportJobExecutor()
+        while True:
+            self._wake.clear()
+            try:
+                job = await asyncio.to_thread(self._claim)
+            except Exception as e:
+                logger.error(f"Report worker {index} could not claim a job: {e}")
+                job = None
+
+            if job is not None:
+                try:
+                    await asyncio.to_thread(executor.run, job)
+                except Exception as e:
+                    logger.error(f"Report worker {index} crashed on {job.report_ids}: {e}")
+                continue
+
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.poll_seconds)
+            except asyncio.TimeoutError:
+                pass
+
+
+report_worker_pool = ReportWorkerPool()
@@ -0,0 +1,153 @@
+"""
+Concurrent section rendering for layer reports.
+
+A report is described as a graph of `ReportSection`s. Each section names the
+sections whose results it needs (`after`); sections whose inputs are ready
+run together on a bounded thread pool, so slow AI/HTTP calls and independent
+DB queries overlap instead of running back to back. Shared inputs such as the
+trade area analysis are ordinary sections computed once and passed to every
+dependent section.
+
+Sessions are not thread-safe: sections flagged `uses_db` are given their own
+session from `session_factory` (or run on the calling thread's session when
+no factory is supplied, one at a time).
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+# build(results, db) -> section result; `results` holds the outputs of `after`
+SectionBuilder = Callable[[Dict[str, Any], Optional[Session]], Any]
+
+
+@dataclass(frozen=True)
+class ReportSection:
+    name: str
+    build: SectionBuilder
+    after: Tuple[str, ...] = ()
+    uses_db: bool = False
+
+
+@dataclass
+class RenderedSections:
+    results: Dict[str, Any]
+    timings_ms: Dict[str, int]
+    total_ms: int
+
+    def __getitem__(self, name: str) -> Any:
+        return self.results[name]
+
+    @property
+    def slowest(self) -> Optional[str]:
+        return max(self.timings_ms, key=self.timings_ms.get, default=None)
+
+    def metadata(self) -> Dict[str, Any]:
+        return {
+            "section_timings_ms": self.timings_ms,
+            "sections_total_ms": self.total_ms,
+            "slowest_section": self.slowest,
+        }
+
+
+def _check_graph(sections: Dict[str, ReportSection]) -> None:
+    for section in sections.values():
+        for dependency in section.after:
+            if dependency not in sections:
+                raise ValueError(f"Section {section.name!r} depends on unknown section {dependency!r}")
+
+    visiting, done = set(), set()
+
+    def visit(name: str) -> None:
+        if name in done:
+            return
+        if name in visiting:
+            raise ValueError(f"Report sections have a dependency cycle through {name!r}")
+        visiting.add(name)
+        for dependency in sections[name].after:
+            visit(dependency)
+        visiting.discard(name)
+        done.add(name)
+
+    for name in sections:
+        visit(name)
+
+
+def render_sections(
+    sections: Iterable[ReportSection],
+    max_workers: int,
+    db: Optional[Session] = None,
+    session_factory: Optional[Callable[[], Session]] = None,
+    progress: Optional[Callable[[int, int, str], None]] = None,
+) -> RenderedSections:
+    """
+    Run `sections` in dependency order, independent ones concurrently.
+
+    `progress(done, total, name)` is called on the calling thread as each
+    section finishes. The first section to raise cancels the sections not yet
+    started and its exception propagates.
+    """
+    sections = list(sections)
+    graph = {section.name: section for section in sections}
+    if len(graph) != len(sections):
+        raise ValueError("Duplicate report section names")
+    _check_graph(graph)
+
+    results: Dict[str, Any] = {}
+    timings_ms: Dict[str, int] = {}
+    db_lock = threading.Lock()
+    started_at = time.perf_counter()
+
+    def run(section: ReportSection, inputs: Dict[str, Any]) -> Tuple[Any, int]:
+        section_start = time.perf_counter()
+        if not section.uses_db:
+            value = section.build(inputs, None)
+        elif session_factory is not None:
+            section_db = session_factory()
+            try:
+                value = section.build(inputs, section_db)
+            finally:
+                section_db.close()
+        else:
+            with db_lock:
+                value = section.build(inputs, db)
+        return value, int((time.perf_counter() - section_start) * 1000)
+
+    remaining = dict(graph)
+    running: Dict[Future, str] = {}
+    with ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="report-section") as executor:
+        while remaining or running:
+            ready = [
+                section for section in remaining.values()
+                if all(dependency in results for dependency in section.after)
+            ]
+            for section in ready:
+                del remaining[section.name]
+                inputs = {name: results[name] for name in section.after}
+                running[executor.submit(run, section, inputs)] = section.name
+
+            finished, _ = wait(list(running), return_when=FIRST_COMPLETED)
+            for future in finished:
+                name = running.pop(future)
+                try:
+                    results[name], timings_ms[name] = future.result()
+                except Exception:
+                    for pending in running:
+                        pending.cancel()
+                    logger.error(f"Report section {name!r} failed")
+                    raise
+                if progress is not None:
+                    progress(len(results), len(graph), name)
+
+    return RenderedSections(
+        results=results,
+        timings_ms=timings_ms,
+        total_ms=int((time.perf_counter() - started_at) * 1000),
+    )
@@ -9,7 +9,7 @@ Integrates with AI Router for cost-optimized match scoring.
 
 import logging
 from datetime import datetime, timedelta
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 from sqlalchemy.orm import Session
 from sqlalchemy import and_, or_
 
@@ -19,15 +19,26 @@ from app.models.opportunity import Opportunity
 from app.models.user import User
 from app.services.email_service import send_email
 from app.services.ai_router import AIRouter, TaskType
+from app.services.saved_search_matcher import match_new_opportunities
 
 logger = logging.getLogger(__name__)
 
+# Minimum gap between two alerts for an 'instant' saved search
+INSTANT_ALERT_DEBOUNCE = timedelta(minutes=10)
+
 
 def run_saved_search_alerts():
     """
     Main entry point for the background job
     
-    Should be called by a scheduler (cron, Celery, etc.) every hour
+    Should be called by a scheduler (cron, Celery, etc.) every hour.
+    New opportunities are matched against every due search in a single pass
+    (see saved_search_matcher) and each user gets one digest for all of
+    their matching searches.
+    
+    'instant' searches are normally alerted within seconds by
+    services/instant_alerts; for them this run is a catch-up for
+    opportunities created in processes without the dispatcher.
     """
     logger.info("Starting saved search alerts job...")
     
@@ -36,30 +47,12 @@ def run_saved_search_alerts():
         active_searches = db.query(SavedSearch).filter(
             SavedSearch.is_active == True
         ).all()
+        due_searches = [search for search in active_searches if should_send_alert(search)]
         
-        logger.info(f"Found {len(active_searches)} active saved searches")
+        logger.info(f"Found {len(active_searches)} active saved searches, {len(due_searches)} due")
         
-        alerts_sent = 0
-        for search in active_searches:
-            try:
-                if should_send_alert(search):
-                    matches = find_matching_opportunities(search, db)
-                    
-                    if matches:
-                        send_notifications(search, matches, db)
-                        
-                        # Update tracking
-                        search.last_notified_at = datetime.utcnow()
-                        search.match_count += len(matches)
-                        db.commit()
-                        
-                        alerts_sent += 1
-                        logger.info(f"Sent alert for search '{search.name}' ({len(matches)} matches)")
-            
-            except Exception as e:
-                logger.error(f"Error processing search {search.id}: {str(e)}")
-                db.rollback()
-                continue
+        matches_by_user = match_new_opportunities(db, due_searches)
+        alerts_sent = deliver_matches(db, matches_by_user)
         
         logger.info(f"Saved search alerts job completed. Sent {alerts_sent} alerts.")
     
@@ -67,6 +60,58 @@ def run_saved_search_alerts():
         db.close()
 
 
+def deliver_matches(db: Session, matches_by_user: Dict[int, List[Tuple[SavedSearch, List[Opportunity]]]]) -> int:
+    """
+    Send each user one digest for their matching searches and record it
+    
+    Args:
+        db: Database session
+        matches_by_user: {user_id: [(search, matches), ...]} from saved_search_matcher
+        
+    Returns:
+        int: Number of saved searches alerted
+    """
+    users = {}
+    if matches_by_user:
+        users = {
+            user.id: user
+            for user in db.query(User).filter(User.id.in_(list(matches_by_user))).all()
+        }
+    
+    alerts_sent = 0
+    for user_id, search_matches in matches_by_user.items():
+        user = users.get(user_id)
+        if not user:
+            logger.error(f"User {user_id} not found for {len(search_matches)} saved searches")
+            continue
+        
+        try:
+            send_user_digest(user, search_matches)
+            
+            # Update tracking
+            notified_at = datetime.utcnow()
+            for search, matches in search_matches:
+                search.last_notified_at = notified_at
+                search.match_count += len(matches)
+            db.commit()
+            
+            alerts_sent += len(search_matches)
+            logger.info(f"Sent digest to user {user_id} for {len(search_matches)} saved searches")
+        
+        except Exception as e:
+            logger.error(f"Error sending digest to user {user_id}: {str(e)}")
+            db.rollback()
+            continue
+    
+    return alerts_sent
+
+
+def has_notification_channel(search: SavedSearch) -> bool:
+    """True if email, push or Slack is enabled for the search"""
+    prefs = search.notification_prefs or {}
+    return bool(prefs.get('email') or prefs.get('push') or prefs.get('slack'))
+
+
 def should_send_alert(search: SavedSearch) -> bool:
     """
     Check if enough time has passed to send alert based on frequency
@@ -81,8 +126,7 @@ def should_send_alert(search: SavedSearch) -> bool:
     frequency = prefs.get('frequency', 'daily')
     
     # Check if any notification method is enabled
-    has_notification = prefs.get('email') or prefs.get('push') or prefs.get('slack')
-    if not has_notification:
+    if not has_notification_channel(search):
         return False
     
     # If never notified, send alert
@@ -93,7 +137,7 @@ def should_send_alert(search: SavedSearch) -> bool:
     
     # Instant notifications - send if more than 10 minutes passed (rate limiting)
     if frequency == 'instant':
-        return time_since_last >= timedelta(minutes=10)
+        return time_since_last >= INSTANT_ALERT_DEBOUNCE
     
     # Daily digest - send if more than 24 hours passed
     elif frequency == 'daily':
@@ -197,42 +241,91 @@ def find_matching_opportunities(
     return matches
 
 
-def send_notifications(search: SavedSearch, opportunities: List[Opportunity], db: Session):
+def send_user_digest(user: User, search_matches: List[Tuple[SavedSearch, List[Opportunity]]]):
     """
-    Send notifications via enabled channels
+    Send one user their matches across saved searches via enabled channels
+    
+    Searches with email enabled are combined into a single email; push and
+    Slack stay per search.
     
     Args:
-        search: SavedSearch instance
-        opportunities: List of matching opportunities
-        db: Database session
+        user: Owner of the searches
+        search_matches: (search, matching opportunities) pairs
     """
-    prefs = search.notification_prefs
-    user = db.query(User).filter(User.id == search.user_id).first()
-    
-    if not user:
-        logger.error(f"User {search.user_id} not found for search {search.id}")
-        return
-    
-    # Email notification
-    if prefs.get('email', False):
+    email_matches = [
+        (search, opportunities) for search, opportunities in search_matches
+        if search.notification_prefs.get('email', False)
+    ]
+    if email_matches:
         try:
-            send_email_notification(user, search, opportunities)
+            if len(email_matches) == 1:
+                send_email_notification(user, *email_matches[0])
+            else:
+                send_digest_email(user, email_matches)
         except Exception as e:
-            logger.error(f"Failed to send email for search {search.id}: {str(e)}")
+            logger.error(f"Failed to send email digest to user {user.id}: {str(e)}")
     
-    # Push notification
-    if prefs.get('push', False):
-        try:
-            send_push_notification(user, search, opportunities)
-        except Exception as e:
-            logger.error(f"Failed to send push for search {search.id}: {str(e)}")
+    for search, opportunities in search_matches:
+        prefs = search.notification_prefs
+        
+        # Push notification
+        if prefs.get('push', False):
+            try:
+                send_push_notification(user, search, opportunities)
+            except Exception as e:
+                logger.error(f"Failed to send push for search {search.id}: {str(e)}")
+        
+        # Slack notification
+        if prefs.get('slack', False):
+            try:
+                send_slack_notification(user, search, opportunities)
+            except Exception as e:
+                logger.error(f"Failed to send Slack for search {search.id}: {str(e)}")
+
+
+EMAIL_HEAD = """
+    <head>
+        <style>
+            body { font-family: Arial, sans-serif; line-height: 1.6; color: #333; }
+            .header { background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); 
+                       color: white; padding: 20px; text-align: center; }
+            .content { padding: 20px; }
+            .opportunity { background: #f8f9fa; border-left: 4px solid #667eea; 
+                           padding: 15px; margin: 15px 0; }
+            .opportunity h3 { margin-top: 0; color: #667eea; }
+            .metrics { display: flex; gap: 15px; margin: 10px 0; }
+            .metric { background: white; padding: 8px 12px; border-radius: 4px; }
+            .cta { background: #667eea; color: white; padding: 12px 24px; 
+                   text-decoration: none; border-radius: 6px; display: inline-block;
+                   margin: 20px 0; }
+            .footer { text-align: center; padding: 20px; color: #666; font-size: 12px; }
+        </style>
+    </head>
+"""
+
+
+def opportunity_email_html(i: int, opp: Opportunity) -> str:
+    """HTML block for one opportunity in an alert email"""
+    score = opp.feasibility_score or 0
+    feasibility_color = "green" if score >= 75 else "orange" if score >= 60 else "gray"
+    description = opp.description or ""
     
-    # Slack notification
-    if prefs.get('slack', False):
-        try:
-            send_slack_notification(user, search, opportunities)
-        except Exception as e:
-            logger.error(f"Failed to send Slack for search {search.id}: {str(e)}")
+    return f"""
+            <div class="opportunity">
+                <h3>{i}. {opp.title}</h3>
+                <p>{description[:200]}{'...' if len(description) > 200 else ''}</p>
+                <div class="metrics">
+                    <div class="metric">
+                        <strong style="color: {feasibility_color}">Feasibility:</strong> {opp.feasibility_score or 'N/A'}
+                    </div>
+                    <div class="metric">
+                        <strong>Validations:</strong> {opp.validation_count}
+                    </div>
+                    {f'<div class="metric"><strong>Growth:</strong> +{opp.growth_rate}%</div>' if opp.growth_rate else ''}
+                </div>
+                <p><strong>Category:</strong> {opp.category} | <strong>Scope:</strong> {opp.geographic_scope}</p>
+            </div>
+        """
 
 
 def send_email_notification(user: User, search: SavedSearch, opportunities: List[Opportunity]):
@@ -248,23 +341,7 @@ def send_email_notification(user: User, search: SavedSearch, opportunities: List
     
     email_html = f"""
     <html>
-    <head>
-        <style>
-            body {{ font-family: Arial, sans-serif; line-height: 1.6; color: #333; }}
-            .header {{ background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); 
-                       color: white; padding: 20px; text-align: center; }}
-            .content {{ padding: 20px; }}
-            .opportunity {{ background: #f8f9fa; border-left: 4px solid #667eea; 
-                           padding: 15px; margin: 15px 0; }}
-            .opportunity h3 {{ margin-top: 0; color: #667eea; }}
-            .metrics {{ display: flex; gap: 15px; margin: 10px 0; }}
-            .metric {{ background: white; padding: 8px 12px; border-radius: 4px; }}
-            .cta {{ background: #667eea; color: white; padding: 12px 24px; 
-                   text-decoration: none; border-radius: 6px; display: inline-block;
-                   margin: 20px 0; }}
-            .footer {{ text-align: center; padding: 20px; color: #666; font-size: 12px; }}
-        </style>
-    </head>
+    {EMAIL_HEAD}
     <body>
         <div class="header">
             <h1>🔔 New Opportunities Found!</h1>
@@ -278,24 +355,7 @@ def send_email_notification(user: User, search: SavedSearch, opportunities: List
     
     # Add up to 10 opportunities to email
     for i, opp in enumerate(opportunities[:10], 1):
-        feasibility_color = "green" if opp.feasibility_score >= 75 else "orange" if opp.feasibility_score >= 60 else "gray"
-        
-        email_html += f"""
-            <div class="opportunity">
-                <h3>{i}. {opp.title}</h3>
-                <p>{opp.description[:200]}{'...' if len(opp.description) > 200 else ''}</p>
-                <div class="metrics">
-                    <div class="metric">
-                        <strong style="color: {feasibility_color}">Feasibility:</strong> {opp.feasibility_score or 'N/A'}
-                    </div>
-                    <div class="metric">
-                        <strong>Validations:</strong> {opp.validation_count}
-                    </div>
-                    {f'<div class="metric"><strong>Growth:</strong> +{opp.growth_rate}%</div>' if opp.growth_rate else ''}
-                </div>
-                <p><strong>Category:</strong> {opp.category} | <strong>Scope:</strong> {opp.geographic_scope}</p>
-            </div>
-        """
+        email_html += opportunity_email_html(i, opp)
     
     if len(opportunities) > 10:
         email_html += f"<p><em>... and {len(opportunities) - 10} more opportunities.</em></p>"
@@ -335,6 +395,68 @@ def send_email_notification(user: User, search: SavedSearch, opportunities: List
     logger.info(f"Sent email to {user.email} for search '{search.name}'")
 
 
+def send_digest_email(user: User, search_matches: List[Tuple[SavedSearch, List[Opportunity]]]):
+    """
+    Send one email covering several saved searches with new matches
+    
+    Each search gets its own section with up to 5 opportunities.
+    """
+    total = sum(len(opportunities) for _, opportunities in search_matches)
+    plural = "opportunities" if total != 1 else "opportunity"
+    
+    email_html = f"""
+    <html>
+    {EMAIL_HEAD}
+    <body>
+        <div class="header">
+            <h1>🔔 New Opportunities Found!</h1>
+            <p>{len(search_matches)} of your saved searches have {total} new {plural}</p>
+        </div>
+        
+        <div class="content">
+            <p>Hi {user.name or user.email.split('@')[0]},</p>
+    """
+    
+    for search, opportunities in search_matches:
+        email_html += f"""
+            <h2>{search.name} ({len(opportunities)} new)</h2>
+        """
+        for i, opp in enumerate(opportunities[:5], 1):
+            email_html += opportunity_email_html(i, opp)
+        email_html += f"""
+            <a href="https://oppgrid.com/discover?saved_search={search.id}" class="cta">
+                View All Matches →
+            </a>
+        """
+    
+    email_html += """
+            <hr style="margin: 30px 0; border: none; border-top: 1px solid #ddd;">
+            
+            <p style="font-size: 14px; color: #666;">
+                You're receiving this because these saved searches have email notifications enabled.
+                <br>
+                <a href="https://oppgrid.com/saved-searches">Manage saved searches</a> | 
+                <a href="https://oppgrid.com/settings/notifications">Notification settings</a>
+            </p>
+        </div>
+        
+        <div class="footer">
+            <p>OppGrid - Discover Validated Business Opportunities</p>
+            <p>© 2026 OppGrid. All rights reserved.</p>
+        </div>
+    </body>
+    </html>
+    """
+    
+    send_email(
+        to_email=user.email,
+        subject=f"🔔 {total} new {plural} across {len(search_matches)} saved searches",
+        html_content=email_html
+    )
+    
+    logger.info(f"Sent digest email to {user.email} for {len(search_matches)} saved searches")
+
+
 def send_push_notification(user: User, search: SavedSearch, opportunities: List[Opportunity]):
     """
     Send push notification
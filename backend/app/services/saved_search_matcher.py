@@ -0,0 +1,225 @@
+"""
+Inverted matcher for saved-search alerts.
+
+Instead of running one query per saved search, every due search is compiled
+into a `SavedSearchIndex`: equality filters (category, realm_type, country,
+geographic_scope, completion_status) become value -> search-id maps, and
+free-text terms are keyed by one of their trigrams. New opportunities are then
+streamed once and each one is checked only against the searches its field
+values and text can possibly satisfy. Range filters (feasibility, validations,
+age, "new since last alert") are verified on that short candidate list.
+
+Matching follows `saved_search_alerts.find_matching_opportunities`: a search
+term matches case-insensitively as a substring of the title or description,
+and missing opportunity values never satisfy a range filter.
+"""
+
+import logging
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.models.opportunity import Opportunity
+from app.models.saved_search import SavedSearch
+
+logger = logging.getLogger(__name__)
+
+EQUALITY_FILTERS = ("category", "realm_type", "country", "geographic_scope", "completion_status")
+FIRST_ALERT_LOOKBACK = timedelta(hours=24)
+MAX_MATCHES_PER_SEARCH = 50
+STREAM_BATCH_SIZE = 500
+
+
+def as_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """Treat naive datetimes as UTC"""
+    if value is None or value.tzinfo is not None:
+        return value
+    return value.replace(tzinfo=timezone.utc)
+
+
+def _trigrams(text: str) -> Set[str]:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+@dataclass
+class CompiledSearch:
+    search: SavedSearch
+    since: datetime
+    term: Optional[str] = None
+    equals: Dict[str, str] = field(default_factory=dict)
+    min_feasibility: Optional[float] = None
+    max_feasibility: Optional[float] = None
+    min_validations: Optional[int] = None
+    max_age_days: Optional[float] = None
+
+    @classmethod
+    def compile(cls, search: SavedSearch, now: datetime) -> "CompiledSearch":
+        filters = search.filters or {}
+        return cls(
+            search=search,
+            since=as_utc(search.last_notified_at) or now - FIRST_ALERT_LOOKBACK,
+            term=(filters.get("search") or "").lower() or None,
+            equals={name: filters[name] for name in EQUALITY_FILTERS if filters.get(name)},
+            min_feasibility=filters.get("min_feasibility"),
+            max_feasibility=filters.get("max_feasibility"),
+            min_validations=filters.get("min_validations"),
+            max_age_days=filters.get("max_age_days"),
+        )
+
+    def accepts_ranges(self, opportunity: Opportunity, now: datetime) -> bool:
+        created_at = as_utc(opportunity.created_at)
+        if created_at is None or created_at <= self.since:
+            return False
+        if self.max_age_days is not None and created_at < now - timedelta(days=self.max_age_days):
+            return False
+        score = opportunity.feasibility_score
+        if self.min_feasibility is not None and (score is None or score < self.min_feasibility):
+            return False
+        if self.max_feasibility is not None and (score is None or score > self.max_feasibility):
+            return False
+        validations = opportunity.validation_count
+        if self.min_validations is not None and (validations is None or validations < self.min_validations):
+            return False
+        return True
+
+
+class SavedSearchIndex:
+    """Predicate indexes over a set of saved searches."""
+
+    def __init__(self, searches: Iterable[SavedSearch], now: Optional[datetime] = None):
+        self.now = now or datetime.now(timezone.utc)
+        self.compiled: Dict[int, CompiledSearch] = {}
+        self._any_value: Dict[str, Set[int]] = {name: set() for name in EQUALITY_FILTERS}
+        self._by_value: Dict[str, Dict[str, Set[int]]] = {name: defaultdict(set) for name in EQUALITY_FILTERS}
+        self._no_term: Set[int] = set()
+        self._by_trigram: Dict[str, Set[int]] = defaultdict(set)
+        self._short_terms: Set[int] = set()
+
+        for search in searches:
+            self.add(search)
+
+    def add(self, search: SavedSearch) -> None:
+        compiled = CompiledSearch.compile(search, self.now)
+        self.compiled[search.id] = compiled
+
+        for name in EQUALITY_FILTERS:
+            value = compiled.equals.get(name)
+            if value is None:
+                self._any_value[name].add(search.id)
+            else:
+                self._by_value[name][value].add(search.id)
+
+        if compiled.term is None:
+            self._no_term.add(search.id)
+        elif len(compiled.term) < 3:
+            self._short_terms.add(search.id)
+        else:
+            # Any trigram of the term must occur in matching text; use the
+            # first one as the posting key.
+            self._by_trigram[compiled.term[:3]].add(search.id)
+
+    def __len__(self) -> int:
+        return len(self.compiled)
+
+    @property
+    def earliest_since(self) -> Optional[datetime]:
+        return min((c.since for c in self.compiled.values()), default=None)
+
+    def _text_candidates(self, title: str, description: str) -> Set[int]:
+        candidates = set(self._no_term) | self._short_terms
+        for trigram in _trigrams(title) | _trigrams(description):
+            posting = self._by_trigram.get(trigram)
+            if posting:
+                candidates |= posting
+        return candidates
+
+    def match(self, opportunity: Opportunity) -> List[int]:
+        """Ids of the indexed searches that `opportunity` satisfies"""
+        candidates: Optional[Set[int]] = None
+        for name in EQUALITY_FILTERS:
+            allowed = self._any_value[name] | self._by_value[name].get(getattr(opportunity, name), set())
+            candidates = allowed if candidates is None else candidates & allowed
+            if not candidates:
+                return []
+
+        title = (opportunity.title or "").lower()
+        description = (opportunity.description or "").lower()
+        candidates &= self._text_candidates(title, description)
+
+        matched = []
+        for search_id in candidates:
+            compiled = self.compiled[search_id]
+            if compiled.term and compiled.term not in title and compiled.term not in description:
+                continue
+            if compiled.accepts_ranges(opportunity, self.now):
+                matched.append(search_id)
+        return matched
+
+
+def rank_matches(search: SavedSearch, opportunities: List[Opportunity]) -> List[Opportunity]:
+    """Order matches by the search's `sort_by` and cap them at MAX_MATCHES_PER_SEARCH"""
+    sort_by = (search.filters or {}).get("sort_by", "feasibility")
+    if sort_by == "recent":
+        key = lambda o: as_utc(o.created_at) or datetime.min.replace(tzinfo=timezone.utc)
+    elif sort_by == "validated":
+        key = lambda o: o.validation_count or 0
+    elif sort_by == "feasibility":
+        key = lambda o: o.feasibility_score if o.feasibility_score is not None else float("-inf")
+    else:
+        return opportunities[:MAX_MATCHES_PER_SEARCH]
+    return sorted(opportunities, key=key, reverse=True)[:MAX_MATCHES_PER_SEARCH]
+
+
+def stream_new_opportunities(db: Session, since: datetime) -> Iterable[Opportunity]:
+    return (
+        db.query(Opportunity)
+        .filter(
+            Opportunity.status == "active",
+            Opportunity.moderation_status == "approved",
+            Opportunity.created_at > since,
+        )
+        .order_by(Opportunity.created_at)
+        .yield_per(STREAM_BATCH_SIZE)
+    )
+
+
+def group_matches(
+    index: SavedSearchIndex,
+    opportunities: Iterable[Opportunity],
+) -> Dict[int, List[Tuple[SavedSearch, List[Opportunity]]]]:
+    """
+    Run `opportunities` through `index` once.
+
+    Returns {user_id: [(search, ranked matches), ...]} for searches with at
+    least one match.
+    """
+    matches: Dict[int, List[Opportunity]] = defaultdict(list)
+    scanned = 0
+    for opportunity in opportunities:
+        scanned += 1
+        for search_id in index.match(opportunity):
+            matches[search_id].append(opportunity)
+
+    by_user: Dict[int, List[Tuple[SavedSearch, List[Opportunity]]]] = defaultdict(list)
+    for search_id, found in matches.items():
+        search = index.compiled[search_id].search
+        by_user[search.user_id].append((search, rank_matches(search, found)))
+
+    logger.info(f"Matched {scanned} new opportunities against {len(index)} saved searches")
+    return dict(by_user)
+
+
+def match_new_opportunities(
+    db: Session,
+    searches: Iterable[SavedSearch],
+    now: Optional[datetime] = None,
+) -> Dict[int, List[Tuple[SavedSearch, List[Opportunity]]]]:
+    """Match opportunities created since each search's last alert in one pass"""
+    index = SavedSearchIndex(searches, now)
+    since = index.earliest_since
+    if since is None:
+        return {}
+    return group_matches(index, stream_new_opportunities(db, since))
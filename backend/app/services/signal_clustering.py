@@ -0,0 +1,204 @@
+"""
+Bucketed clustering engine for the Signal-to-Opportunity pipeline.
+
+Reproduces the greedy clustering of SignalToOpportunityProcessor exactly, but
+without comparing every signal against every other signal:
+
+1. Each signal is prepared once: interned token set, parsed scraped_at,
+   normalized city, latitude band.
+2. Signals are bucketed by detected category and by normalized city.
+3. A seed is only compared against signals sharing its category or city.
+
+The pruning is exact for the current weights. Without a category match the
+best possible score is city (0.30) + keywords (0.20) + recency (0.10) = 0.60,
+and without a city match it is 0.40 + 0.15 + 0.20 + 0.10 = 0.85. Any pair that
+shares neither key tops out at 0.15 + 0.20 + 0.10 = 0.45 < 0.55, so it can never
+join a cluster.
+"""
+
+import sys
+from datetime import datetime
+from math import radians, cos, sin, asin, sqrt, floor
+from typing import Dict, Any, List, Optional
+
+CLUSTER_THRESHOLD = 0.55
+
+CATEGORY_WEIGHT = 0.40
+CITY_WEIGHT = 0.30
+PROXIMITY_WEIGHT = 0.15
+KEYWORD_WEIGHT = 0.20
+RECENCY_WEIGHT = 0.10
+
+PROXIMITY_MILES = 25
+RECENCY_DAYS = 30
+
+EARTH_RADIUS_MILES = 3959
+# Great-circle distance is never shorter than the latitude difference, so two
+# points more than one band apart are always further than PROXIMITY_MILES.
+LAT_BAND_DEGREES = PROXIMITY_MILES / (EARTH_RADIUS_MILES * 3.141592653589793 / 180)
+
+# Guards the upper-bound pruning against float rounding in the exact score.
+_BOUND_EPSILON = 1e-9
+
+
+def _haversine_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Calculate distance between two points in miles"""
+    dlat = radians(lat2 - lat1)
+    dlon = radians(lon2 - lon1)
+
+    a = sin(dlat/2)**2 + cos(radians(lat1)) * cos(radians(lat2)) * sin(dlon/2)**2
+    c = 2 * asin(sqrt(a))
+
+    return EARTH_RADIUS_MILES * c
+
+
+def _parse_scraped_at(value: Any) -> Optional[datetime]:
+    if not value:
+        return None
+    if isinstance(value, str):
+        return datetime.fromisoformat(value.replace('Z', '+00:00'))
+    return value
+
+
+class _PreparedSignal:
+    """Per-signal features computed once per batch instead of once per pair."""
+
+    __slots__ = ('index', 'signal', 'signal_id', 'category', 'city',
+                 'latitude', 'longitude', 'lat_band', 'tokens', 'token_count',
+                 'scraped_at')
+
+    def __init__(self, index: int, signal: Dict[str, Any]):
+        self.index = index
+        self.signal = signal
+        self.signal_id = signal['id']
+        self.category = signal.get('detected_category', '') or ''
+        self.city = (signal.get('city') or '').lower().strip()
+
+        self.latitude = signal.get('latitude')
+        self.longitude = signal.get('longitude')
+        self.lat_band = floor(self.latitude / LAT_BAND_DEGREES) if self.latitude else None
+
+        self.tokens = frozenset(sys.intern(t) for t in signal.get('text', '').lower().split())
+        self.token_count = len(self.tokens)
+        self.scraped_at = _parse_scraped_at(signal.get('scraped_at'))
+
+
+class SignalClusterer:
+    """
+    Greedy signal clustering over category and city buckets.
+
+    Output is identical to comparing each unclustered seed against every
+    remaining signal in input order: clusters are seeded in input order and
+    members keep their input order.
+    """
+
+    def __init__(self, threshold: float = CLUSTER_THRESHOLD):
+        self.threshold = threshold
+
+    def cluster(self, signals: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+        prepared = [_PreparedSignal(i, s) for i, s in enumerate(signals)]
+
+        by_category: Dict[str, List[_PreparedSignal]] = {}
+        by_city: Dict[str, List[_PreparedSignal]] = {}
+        for p in prepared:
+            if p.category:
+                by_category.setdefault(p.category, []).append(p)
+            if p.city:
+                by_city.setdefault(p.city, []).append(p)
+
+        clusters = []
+        processed = set()
+
+        for seed in prepared:
+            if seed.signal_id in processed:
+                continue
+
+            processed.add(seed.signal_id)
+            members = []
+            seen = {seed.index}
+
+            for bucket in self._buckets_for(seed, by_category, by_city):
+                live = []
+                for candidate in bucket:
+                    if candidate.signal_id in processed:
+                        continue
+                    live.append(candidate)
+                    if candidate.index in seen:
+                        continue
+                    seen.add(candidate.index)
+                    if self._similarity_at_least(seed, candidate, self.threshold):
+                        members.append(candidate)
+                # Compact the bucket so clustered signals are not rescanned.
+                bucket[:] = live
+
+            cluster = [seed.signal]
+            members.sort(key=lambda m: m.index)
+            for member in members:
+                # Signals sharing an id are only clustered once, first one wins.
+                if member.signal_id in processed:
+                    continue
+                processed.add(member.signal_id)
+                cluster.append(member.signal)
+            clusters.append(cluster)
+
+        return clusters
+
+    @staticmethod
+    def _buckets_for(seed: _PreparedSignal, by_category: Dict, by_city: Dict) -> List[List[_PreparedSignal]]:
+        buckets = []
+        if seed.category:
+            buckets.append(by_category[seed.category])
+        if seed.city:
+            buckets.append(by_city[seed.city])
+        return buckets
+
+    @staticmethod
+    def similarity(a: _PreparedSignal, b: _PreparedSignal) -> float:
+        """Same score as SignalToOpportunityProcessor._calculate_similarity."""
+        similarity = 0.0
+
+        if a.category and b.category and a.category == b.category:
+            similarity += CATEGORY_WEIGHT
+
+        if a.city and b.city and a.city == b.city:
+            similarity += CITY_WEIGHT
+        elif a.latitude and b.latitude:
+            if a.lat_band is not None and b.lat_band is not None and abs(a.lat_band - b.lat_band) > 1:
+                pass
+            elif _haversine_distance(a.latitude, a.longitude, b.latitude, b.longitude) <= PROXIMITY_MILES:
+                similarity += PROXIMITY_WEIGHT
+
+        if a.token_count and b.token_count:
+            overlap = len(a.tokens & b.tokens)
+            max_len = max(a.token_count, b.token_count)
+            similarity += KEYWORD_WEIGHT * (overlap / max_len)
+
+        if a.scraped_at and b.scraped_at:
+            days_apart = abs((a.scraped_at - b.scraped_at).days)
+            if days_apart <= RECENCY_DAYS:
+                similarity += RECENCY_WEIGHT * (1.0 - (days_apart / RECENCY_DAYS))
+
+        return similarity
+
+    def _similarity_at_least(self, a: _PreparedSignal, b: _PreparedSignal, threshold: float) -> bool:
+        """Skip the token intersection when even a perfect overlap cannot reach the threshold."""
+        bound = 0.0
+        if a.category and b.category and a.category == b.category:
+            bound += CATEGORY_WEIGHT
+        if a.city and b.city and a.city == b.city:
+            bound += CITY_WEIGHT
+        elif a.latitude and b.latitude:
+            bound += PROXIMITY_WEIGHT
+        if a.token_count and b.token_count:
+            bound += KEYWORD_WEIGHT * (min(a.token_count, b.token_count) / max(a.token_count, b.token_count))
+        if a.scraped_at and b.scraped_at:
+            bound += RECENCY_WEIGHT
+
+        if bound + _BOUND_EPSILON < threshold:
+            return False
+        return self.similarity(a, b) >= threshold
+
+
+def cluster_signals(signals: List[Dict[str, Any]], threshold: float = CLUSTER_THRESHOLD) -> List[List[Dict[str, Any]]]:
+    """Group similar signals into clusters (see SignalClusterer)."""
+    return SignalClusterer(threshold).cluster(signals)
@@ -8,7 +8,7 @@ This service ENHANCES the existing OpportunityProcessor with:
 3. Market sizing estimates
 4. Deduplication logic
 
-Uses existing: google_maps_keyword_matrix.py for pattern matching
+Uses existing: google_maps_keyword_matrix.py for pattern matching (compiled by pattern_matcher.py)
 """
 
 import os
@@ -24,14 +24,10 @@ from sqlalchemy.orm import Session
 from sqlalchemy import text
 from anthropic import Anthropic
 
-from app.services.google_maps_keyword_matrix import (
-    APARTMENT_PATTERNS,
-    CHILDCARE_PATTERNS,
-    RESTAURANT_PATTERNS,
-    HOME_SERVICES_PATTERNS,
-    HEALTHCARE_PATTERNS,
-    COMPETITIVE_PATTERNS,
-)
+from app.services.signal_clustering import cluster_signals
+from app.services.pattern_matcher import get_pattern_matcher
+from app.services.duplicate_index import find_by_category_and_city
+from app.services.opportunity_events import opportunity_created
 from app.models.opportunity import Opportunity
 
 logger = logging.getLogger(__name__)
@@ -271,35 +267,16 @@ class SignalToOpportunityProcessor:
     
     def _score_signals(self, signals: List[Dict]) -> List[Dict]:
         """Apply pattern matching and scoring to signals"""
+        matcher = get_pattern_matcher(self.db)
+        
         for signal in signals:
             text = signal.get('text', '') + ' ' + signal.get('content', '')
             category = self._detect_category(text, signal.get('category', ''))
             
             score = 0.5
-            patterns_matched = []
-            
-            all_patterns = {
-                'apartment': APARTMENT_PATTERNS,
-                'childcare': CHILDCARE_PATTERNS,
-                'restaurant': RESTAURANT_PATTERNS,
-                'home_services': HOME_SERVICES_PATTERNS,
-                'healthcare': HEALTHCARE_PATTERNS,
-                'competitive': COMPETITIVE_PATTERNS,
-            }
-            
-            for pattern_category, patterns in all_patterns.items():
-                for pattern_name, pattern_data in patterns.items():
-                    for pattern in pattern_data.get('patterns', []):
-                        try:
-                            if re.search(pattern, text, re.IGNORECASE):
-                                patterns_matched.append({
-                                    'category': pattern_category,
-                                    'pattern': pattern_name,
-                                    'confidence': pattern_data.get('confidence', 0.5)
-                                })
-                                score = max(score, pattern_data.get('confidence', 0.5))
-                        except:
-                            continue
+            patterns_matched = matcher.match(text)
+            for match in patterns_matched:
+                score = max(score, match['confidence'])
             
             if signal.get('rating'):
                 try:
@@ -369,7 +346,11 @@ class SignalToOpportunityProcessor:
         return 'retail'
     
     def _cluster_signals(self, signals: List[Dict]) -> List[List[Dict]]:
-        """Group similar signals into clusters"""
+        """Group similar signals into clusters using the bucketed clustering engine"""
+        return cluster_signals(signals)
+
+    def _cluster_signals_pairwise(self, signals: List[Dict]) -> List[List[Dict]]:
+        """Reference O(n^2) greedy clustering; kept to verify the bucketed engine"""
         clusters = []
         processed = set()
         
@@ -751,12 +732,10 @@ class SignalToOpportunityProcessor:
         if not category or not city:
             return []
         
-        existing = self.db.query(Opportunity).filter(
-            Opportunity.category.ilike(f"%{category}%"),
-            Opportunity.city.ilike(f"%{city}%")
-        ).limit(5).all()
-        
-        return existing
+        return find_by_category_and_city(
+            self.db, category, city,
+            title=business_idea.get('ai_title') or business_idea.get('primary_keyword'),
+        )
     
     def _merge_with_existing(self, existing: Opportunity, cluster: List[Dict], validation: Dict):
         """Merge new signals with existing opportunity"""
@@ -1391,6 +1370,7 @@ Consumer analysis across {signal_count} data points reveals a clear demand patte
         
         self.db.add(opportunity)
         self.db.flush()
+        opportunity_created(self.db, opportunity)
         
         self._link_signals_to_opportunity(opportunity.id, cluster)
         self._mark_signals_processed(cluster, batch_id)
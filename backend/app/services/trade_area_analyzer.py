@@ -16,6 +16,8 @@ from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any, Optional, List, Tuple
 from dataclasses import dataclass
 
+from app.services.trade_area_cache import round_coord, trade_area_cache
+
 logger = logging.getLogger(__name__)
 
 _executor = ThreadPoolExecutor(max_workers=4)
@@ -91,13 +93,13 @@ class TradeAreaAnalyzer:
         
         competitors = []
         if include_competitors and self.serpapi_key:
-            competitors = self._fetch_competitors(opportunity, lat, lng)
+            competitors = self._cached_competitors(opportunity, lat, lng)
         
         trade_area = self._compute_trade_area(lat, lng, signal_clusters, competitors)
         
         demographics = None
         if include_demographics:
-            demographics = self._fetch_demographics(
+            demographics = self._cached_demographics(
                 trade_area['center_lat'],
                 trade_area['center_lng'],
                 opportunity.get('region')
@@ -112,7 +114,7 @@ class TradeAreaAnalyzer:
                 demographics
             )
         
-        map_url = self._generate_trade_area_map(
+        map_url = self._cached_trade_area_map(
             trade_area['center_lat'],
             trade_area['center_lng'],
             trade_area['radius_km'],
@@ -187,7 +189,7 @@ class TradeAreaAnalyzer:
                 comp_start = time.time()
                 competitors = await loop.run_in_executor(
                     _executor,
-                    self._fetch_competitors,
+                    self._cached_competitors,
                     opportunity, lat, lng
                 )
                 logger.info(f"[TIMING] Fetch competitors: {int((time.time() - comp_start) * 1000)}ms, found {len(competitors)}")
@@ -205,7 +207,7 @@ class TradeAreaAnalyzer:
                     demo_start = time.time()
                     result = await loop.run_in_executor(
                         _executor,
-                        self._fetch_demographics,
+                        self._cached_demographics,
                         trade_area['center_lat'],
                         trade_area['center_lng'],
                         opportunity.get('region') or opportunity.get('state')
@@ -218,7 +220,7 @@ class TradeAreaAnalyzer:
                 map_start = time.time()
                 result = await loop.run_in_executor(
                     _executor,
-                    self._generate_trade_area_map,
+                    self._cached_trade_area_map,
                     trade_area['center_lat'],
                     trade_area['center_lng'],
                     trade_area['radius_km'],
@@ -317,6 +319,31 @@ class TradeAreaAnalyzer:
         
         return signals
     
+    def _competitor_search_query(self, opportunity: Dict[str, Any]) -> str:
+        business_description = opportunity.get('business_description') or opportunity.get('title') or ''
+        category = opportunity.get('category', '')
+        city = opportunity.get('city', '')
+        
+        if business_description and city:
+            return f"{business_description} in {city}"
+        if business_description:
+            return business_description
+        if category and city:
+            return f"{category} near {city}"
+        return category or "business"
+    
+    def _cached_competitors(self, opportunity: Dict[str, Any], lat: float, lng: float) -> List[Dict[str, Any]]:
+        """Competitors for the trade area, shared across callers via trade_area_cache."""
+        key = (
+            round_coord(lat),
+            round_coord(lng),
+            self._competitor_search_query(opportunity).lower(),
+            (opportunity.get('region') or opportunity.get('state') or '').upper(),
+        )
+        return trade_area_cache.get_or_fetch(
+            "competitors", key, lambda: self._fetch_competitors(opportunity, lat, lng)
+        ) or []
+    
     def _fetch_competitors(
         self, 
         opportunity: Dict[str, Any], 
@@ -330,18 +357,8 @@ class TradeAreaAnalyzer:
             logger.warning("SERPAPI_KEY not configured, skipping competitor fetch")
             return []
         
-        business_description = opportunity.get('business_description') or opportunity.get('title') or ''
-        category = opportunity.get('category', '')
         city = opportunity.get('city', '')
-        
-        if business_description and city:
-            search_query = f"{business_description} in {city}"
-        elif business_description:
-            search_query = business_description
-        elif category and city:
-            search_query = f"{category} near {city}"
-        else:
-            search_query = category or "business"
+        search_query = self._competitor_search_query(opportunity)
         
         logger.info(f"Competitor search query: '{search_query}' at ({lat}, {lng})")
         
@@ -466,6 +483,14 @@ class TradeAreaAnalyzer:
         white_space = max(0, 100 - (density * 20))
         return round(white_space, 1)
     
+    def _cached_demographics(self, lat: float, lng: float, state: Optional[str]) -> Optional[Dict[str, Any]]:
+        """Demographics (state-level ACS) shared across callers via trade_area_cache."""
+        if not state:
+            return self._fetch_demographics(lat, lng, state)
+        return trade_area_cache.get_or_fetch(
+            "demographics", state.upper(), lambda: self._fetch_demographics(lat, lng, state)
+        )
+    
     def _fetch_demographics(
         self,
         lat: float,
@@ -598,6 +623,30 @@ class TradeAreaAnalyzer:
             logger.error(f"Failed to generate AI synthesis: {e}")
             return ""
     
+    def _cached_trade_area_map(
+        self,
+        center_lat: float,
+        center_lng: float,
+        radius_km: float,
+        competitors: List[Dict[str, Any]],
+        signals: List[Dict[str, Any]]
+    ) -> Optional[str]:
+        """Static trade area map URL shared across callers via trade_area_cache."""
+        key = (
+            round_coord(center_lat),
+            round_coord(center_lng),
+            round(radius_km, 2),
+            tuple((round_coord(c.get('lat')), round_coord(c.get('lng'))) for c in competitors[:8]),
+            tuple(
+                (round_coord(s['lat']), round_coord(s['lng']))
+                for s in signals[:5] if s.get('type') == 'secondary'
+            ),
+        )
+        return trade_area_cache.get_or_fetch(
+            "map", key,
+            lambda: self._generate_trade_area_map(center_lat, center_lng, radius_km, competitors, signals)
+        )
+    
     def _generate_trade_area_map(
         self,
         center_lat: float,
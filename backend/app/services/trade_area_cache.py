@@ -0,0 +1,139 @@
+"""
+Shared, in-process cache for trade area analysis components.
+
+`TradeAreaAnalyzer` fetches three expensive components per call: SerpAPI
+competitors, Census demographics and the static trade area map. Each is
+cached here under its own key and TTL so that repeated layer-2 reports and
+Consultant Studio runs for the same place reuse them across requests and
+users:
+
+- competitors: rounded lat/lng + search query + state (short TTL; listings change)
+- demographics: state (long TTL; ACS estimates change yearly)
+- map: rounded center + radius + marker positions (long TTL)
+
+Entries are fresh for the first TTL and then served stale while one
+background refresh runs, until the stale TTL runs out. Concurrent misses for
+the same key share one fetch. Empty results (None, []) are never stored, so a
+failed upstream call is retried on the next request.
+"""
+
+import logging
+import threading
+import time
+from collections import Counter
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from cachetools import LRUCache
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+HOUR = 3600
+DAY = 24 * HOUR
+
+# component -> (fresh seconds, stale-while-revalidate seconds)
+COMPONENT_TTLS: Dict[str, Tuple[int, int]] = {
+    "competitors": (6 * HOUR, DAY),
+    "demographics": (7 * DAY, 30 * DAY),
+    "map": (7 * DAY, 30 * DAY),
+}
+
+COORD_PRECISION = 3  # ~110m; nearby opportunities share competitor lookups
+
+
+def round_coord(value: Optional[float]) -> Optional[float]:
+    return None if value is None else round(float(value), COORD_PRECISION)
+
+
+@dataclass
+class _Entry:
+    value: Any
+    fetched_at: float
+
+
+class TradeAreaCache:
+    """Per-component TTL cache with stale-while-revalidate and single-flight fetches."""
+
+    def __init__(
+        self,
+        max_entries: Optional[int] = None,
+        ttls: Optional[Dict[str, Tuple[int, int]]] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.ttls = dict(ttls or COMPONENT_TTLS)
+        self._clock = clock
+        self._entries: LRUCache = LRUCache(maxsize=max_entries or settings.TRADE_AREA_CACHE_ENTRIES)
+        self._inflight: Dict[Tuple[str, Hashable], Future] = {}
+        self._lock = threading.Lock()
+        self._stats: Counter = Counter()
+        # Refreshes never wait on other work, so they cannot starve callers
+        # that are blocked on an in-flight fetch.
+        self._refresh_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="trade-area-refresh")
+
+    def get_or_fetch(self, component: str, key: Hashable, fetch: Callable[[], Any]) -> Any:
+        fresh_ttl, stale_ttl = self.ttls[component]
+        cache_key = (component, key)
+
+        with self._lock:
+            entry = self._entries.get(cache_key)
+            if entry is not None:
+                age = self._clock() - entry.fetched_at
+                if age < fresh_ttl:
+                    self._stats[f"{component}.hit"] += 1
+                    return entry.value
+                if age < stale_ttl:
+                    self._stats[f"{component}.stale"] += 1
+                    if cache_key not in self._inflight:
+                        future = Future()
+                        self._inflight[cache_key] = future
+                        self._refresh_executor.submit(self._fetch, cache_key, fetch, future)
+                    return entry.value
+                del self._entries[cache_key]
+
+            future = self._inflight.get(cache_key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._inflight[cache_key] = future
+            self._stats[f"{component}.miss" if owner else f"{component}.joined"] += 1
+
+        if owner:
+            self._fetch(cache_key, fetch, future)
+        return future.result()
+
+    def _fetch(self, cache_key: Tuple[str, Hashable], fetch: Callable[[], Any], future: Future) -> None:
+        try:
+            value = fetch()
+        except Exception as e:
+            logger.warning(f"Trade area {cache_key[0]} fetch failed: {e}")
+            with self._lock:
+                self._inflight.pop(cache_key, None)
+            future.set_exception(e)
+            return
+
+        with self._lock:
+            if value is not None and value != []:
+                self._entries[cache_key] = _Entry(value=value, fetched_at=self._clock())
+            self._inflight.pop(cache_key, None)
+        future.set_result(value)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"entries": len(self._entries), **self._stats}
+
+    def clear(self, component: Optional[str] = None) -> None:
+        with self._lock:
+            for cache_key in list(self._entries.keys()):
+                if component is None or cache_key[0] == component:
+                    del self._entries[cache_key]
+
+
+trade_area_cache = TradeAreaCache()
+
+
+def invalidate_trade_area_cache(component: Optional[str] = None) -> None:
+    """Drop cached trade area components (all of them when `component` is None)."""
+    trade_area_cache.clear(component)
@@ -13,11 +13,14 @@ Usage:
 from sqlalchemy.orm import Session
 from sqlalchemy import text
 import json
+import math
 from typing import Dict, List, Tuple, Optional
 from datetime import datetime
 import statistics
 import logging
 
+from app.services.foot_traffic_aggregates import HEX_EDGE_METERS, resolution_for
+
 logger = logging.getLogger(__name__)
 
 
@@ -255,46 +258,45 @@ class TrafficAnalyzer:
             return None
     
     def get_heatmap_data(self, latitude: float, longitude: float,
-                         radius_meters: int = 1000) -> List[Dict]:
+                         radius_meters: int = 1000, zoom: Optional[int] = None) -> List[Dict]:
         """
         Get foot traffic data formatted for heatmap visualization
+        
+        Reads precomputed hex bins (see foot_traffic_aggregates) at a
+        resolution chosen from the radius and zoom, so the number of points
+        returned stays bounded however large the radius is.
         """
+        resolution = resolution_for(radius_meters, zoom)
+        # Bin centers can sit up to one edge outside the circle their places are in
+        search_meters = radius_meters + HEX_EDGE_METERS[resolution]
+        delta_lat = search_meters / 111320.0
+        delta_lng = search_meters / (111320.0 * max(0.01, math.cos(math.radians(latitude))))
+        
         try:
             query = text("""
             SELECT 
-                place_id, place_name, place_type,
-                latitude, longitude,
-                popular_times, current_popularity,
-                data_quality_score
-            FROM foot_traffic
-            WHERE ST_DWithin(
-                location,
-                ST_MakePoint(:lng, :lat)::geography,
-                :radius
-            )
-            ORDER BY data_quality_score DESC
+                hex_q, hex_r, center_latitude, center_longitude,
+                place_count, intensity_sum, weekday_sum, weekend_sum
+            FROM foot_traffic_hex_bins
+            WHERE resolution = :resolution
+              AND center_latitude BETWEEN :min_lat AND :max_lat
+              AND center_longitude BETWEEN :min_lng AND :max_lng
+              AND place_count > 0
             """)
             
             results = self.db.execute(query, {
-                'lat': latitude,
-                'lng': longitude,
-                'radius': radius_meters
+                'resolution': resolution,
+                'min_lat': latitude - delta_lat,
+                'max_lat': latitude + delta_lat,
+                'min_lng': longitude - delta_lng,
+                'max_lng': longitude + delta_lng
             }).fetchall()
             
             heatmap_points = []
             for row in results:
-                place_id, name, ptype, lat, lng, popular_times, current_pop, quality = row
-                
-                avg_traffic = 50
-                if popular_times:
-                    if isinstance(popular_times, str):
-                        popular_times = json.loads(popular_times)
-                    all_values = []
-                    for day_data in popular_times.values():
-                        if isinstance(day_data, list):
-                            all_values.extend(day_data)
-                    if all_values:
-                        avg_traffic = sum(all_values) / len(all_values)
+                q, r, lat, lng, count, intensity_sum, weekday_sum, weekend_sum = row
+                if self._distance_meters(latitude, longitude, lat, lng) > search_meters:
+                    continue
                 
                 heatmap_points.append({
                     'type': 'Feature',
@@ -303,17 +305,18 @@ class TrafficAnalyzer:
                         'coordinates': [float(lng), float(lat)]
                     },
                     'properties': {
-                        'place_id': place_id,
-                        'name': name,
-                        'type': ptype,
-                        'traffic_intensity': avg_traffic,
-                        'current_popularity': current_pop
+                        'hex_id': f"{resolution}:{q}:{r}",
+                        'place_count': count,
+                        'traffic_intensity': round(intensity_sum / count, 1),
+                        'weekday_intensity': round(weekday_sum / count, 1),
+                        'weekend_intensity': round(weekend_sum / count, 1)
                     }
                 })
             
             return {
                 'type': 'FeatureCollection',
-                'features': heatmap_points
+                'features': heatmap_points,
+                'metadata': {'resolution': resolution, 'hex_edge_meters': HEX_EDGE_METERS[resolution]}
             }
             
         except Exception as e:
@@ -324,6 +327,14 @@ class TrafficAnalyzer:
                 pass
             return {'type': 'FeatureCollection', 'features': []}
     
+    @staticmethod
+    def _distance_meters(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+        """Haversine distance in meters"""
+        lat1_rad, lat2_rad = math.radians(lat1), math.radians(lat2)
+        a = (math.sin(math.radians(lat2 - lat1) / 2) ** 2 +
+             math.cos(lat1_rad) * math.cos(lat2_rad) * math.sin(math.radians(lng2 - lng1) / 2) ** 2)
+        return 6371000 * 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+    
     def _average_traffic_patterns(self, patterns: List[Dict]) -> Dict:
         """Average multiple traffic patterns into one aggregate pattern"""
         if not patterns:
@@ -0,0 +1,206 @@
+"""
+Mapbox Vector Tiles (MVT) for the map layers, rendered by PostGIS.
+
+Each layer is one `ST_AsMVT` query over the tile envelope (`ST_TileEnvelope`),
+filtered through the layer's GiST index, so the browser downloads compact
+binary tiles instead of GeoJSON for the whole viewport:
+
+- traffic_roads: DOT road segments. Geometry is simplified to about one tile
+  pixel at the requested zoom and minor roads are dropped at low zooms.
+- geographic_features: points from the generated `geom` column.
+- foot_traffic: places from the `location` geography column.
+
+Rendered tiles are cached on disk under TILE_CACHE_DIR/<layer>/<z>/<x>/<y>.mvt,
+so every worker on the host shares them. Entries expire after the layer's TTL;
+layers reloaded in bulk (the traffic import script, the foot traffic
+collector) call `invalidate_tile_cache(layer)` to drop theirs immediately.
+"""
+
+import logging
+import os
+import shutil
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+MVT_MEDIA_TYPE = "application/vnd.mapbox-vector-tile"
+MAX_ZOOM = 22
+
+HOUR = 3600
+DAY = 24 * HOUR
+
+# Roads below this AADT are left out of tiles at or below the zoom level.
+ROAD_MIN_AADT_BY_ZOOM = (
+    (6, 50000),
+    (8, 20000),
+    (10, 5000),
+)
+
+_ENVELOPE_CTE = """
+    WITH bounds AS (
+        SELECT ST_TileEnvelope(:z, :x, :y) AS geom,
+               ST_Transform(ST_TileEnvelope(:z, :x, :y), 4326) AS geom_4326
+    )
+"""
+
+
+@dataclass(frozen=True)
+class TileLayer:
+    name: str
+    sql: str
+    min_zoom: int
+    ttl_seconds: int
+
+
+LAYERS: Dict[str, TileLayer] = {
+    "traffic_roads": TileLayer(
+        name="traffic_roads",
+        min_zoom=5,
+        ttl_seconds=30 * DAY,
+        sql=_ENVELOPE_CTE + """
+            SELECT ST_AsMVT(tile, 'traffic_roads', 4096, 'geom') FROM (
+                SELECT r.id, r.roadway_id, r.road_name, r.aadt, r.year, r.state,
+                       ST_AsMVTGeom(
+                           ST_Transform(ST_SimplifyPreserveTopology(r.geometry, :tolerance), 3857),
+                           bounds.geom, 4096, 64, true
+                       ) AS geom
+                FROM traffic_roads r, bounds
+                WHERE r.geometry && bounds.geom_4326
+                  AND (:min_aadt = 0 OR r.aadt >= :min_aadt)
+            ) AS tile
+            WHERE tile.geom IS NOT NULL
+        """,
+    ),
+    "geographic_features": TileLayer(
+        name="geographic_features",
+        min_zoom=3,
+        ttl_seconds=HOUR,
+        sql=_ENVELOPE_CTE + """
+            SELECT ST_AsMVT(tile, 'geographic_features', 4096, 'geom') FROM (
+                SELECT g.id, g.feature_type, g.properties->>'name' AS name,
+                       g.properties->>'source' AS source,
+                       ST_AsMVTGeom(ST_Transform(g.geom, 3857), bounds.geom, 4096, 64, true) AS geom
+                FROM geographic_features g, bounds
+                WHERE g.geom && bounds.geom_4326
+            ) AS tile
+            WHERE tile.geom IS NOT NULL
+        """,
+    ),
+    "foot_traffic": TileLayer(
+        name="foot_traffic",
+        min_zoom=8,
+        ttl_seconds=6 * HOUR,
+        sql=_ENVELOPE_CTE + """
+            SELECT ST_AsMVT(tile, 'foot_traffic', 4096, 'geom') FROM (
+                SELECT f.place_id, f.place_name, f.place_type, f.current_popularity,
+                       f.data_quality_score,
+                       ST_AsMVTGeom(ST_Transform(f.location::geometry, 3857), bounds.geom, 4096, 64, true) AS geom
+                FROM foot_traffic f, bounds
+                WHERE f.location && bounds.geom_4326::geography
+            ) AS tile
+            WHERE tile.geom IS NOT NULL
+        """,
+    ),
+}
+
+
+class InvalidTile(ValueError):
+    pass
+
+
+def validate_tile(layer: str, z: int, x: int, y: int) -> TileLayer:
+    """Layer config for a tile request, raising InvalidTile for unknown layers or coordinates"""
+    config = LAYERS.get(layer)
+    if config is None:
+        raise InvalidTile(f"Unknown tile layer '{layer}'")
+    if not 0 <= z <= MAX_ZOOM:
+        raise InvalidTile(f"Zoom must be between 0 and {MAX_ZOOM}")
+    limit = 2 ** z
+    if not (0 <= x < limit and 0 <= y < limit):
+        raise InvalidTile(f"Tile {z}/{x}/{y} is outside the tile grid")
+    return config
+
+
+def simplify_tolerance(z: int) -> float:
+    """About one pixel of a 256px tile at zoom `z`, in degrees"""
+    return 360.0 / (256 * 2 ** z)
+
+
+def road_min_aadt(z: int) -> int:
+    for max_zoom, min_aadt in ROAD_MIN_AADT_BY_ZOOM:
+        if z <= max_zoom:
+            return min_aadt
+    return 0
+
+
+def _cache_root() -> Path:
+    return Path(settings.TILE_CACHE_DIR)
+
+
+def tile_cache_path(layer: str, z: int, x: int, y: int) -> Path:
+    return _cache_root() / layer / str(z) / str(x) / f"{y}.mvt"
+
+
+def read_cached_tile(config: TileLayer, z: int, x: int, y: int) -> Optional[bytes]:
+    path = tile_cache_path(config.name, z, x, y)
+    try:
+        if time.time() - path.stat().st_mtime > config.ttl_seconds:
+            return None
+        return path.read_bytes()
+    except OSError:
+        return None
+
+
+def write_cached_tile(layer: str, z: int, x: int, y: int, data: bytes) -> None:
+    """Store a tile atomically so concurrent readers never see a partial file"""
+    path = tile_cache_path(layer, z, x, y)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.warning(f"Could not cache tile {layer}/{z}/{x}/{y}: {e}")
+
+
+def invalidate_tile_cache(layer: Optional[str] = None) -> None:
+    """Drop cached tiles for `layer`, or for every layer"""
+    targets = [layer] if layer else list(LAYERS)
+    for name in targets:
+        shutil.rmtree(_cache_root() / name, ignore_errors=True)
+    logger.info(f"Invalidated tile cache for {', '.join(targets)}")
+
+
+def render_tile(db: Session, config: TileLayer, z: int, x: int, y: int) -> bytes:
+    if z < config.min_zoom:
+        return b""
+    row = db.execute(text(config.sql), {
+        "z": z,
+        "x": x,
+        "y": y,
+        "tolerance": simplify_tolerance(z),
+        "min_aadt": road_min_aadt(z),
+    }).fetchone()
+    return bytes(row[0]) if row and row[0] is not None else b""
+
+
+def get_tile(db: Session, layer: str, z: int, x: int, y: int) -> Tuple[bytes, TileLayer]:
+    """Tile bytes (possibly empty) from the disk cache, rendering and caching on a miss"""
+    config = validate_tile(layer, z, x, y)
+    cached = read_cached_tile(config, z, x, y)
+    if cached is not None:
+        return cached, config
+
+    data = render_tile(db, config, z, x, y)
+    write_cached_tile(config.name, z, x, y, data)
+    return data, config
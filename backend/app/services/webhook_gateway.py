@@ -3,7 +3,7 @@ import hmac
 import logging
 import os
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 from sqlalchemy.orm import Session
 
 from app.models.scraped_source import ScrapedSource, SourceType
@@ -52,6 +52,8 @@ class WebhookGateway:
         "custom": ["id", "data"],
     }
 
+    BULK_CHUNK_SIZE = 1000  # ids per duplicate lookup / rows per INSERT in process_batch
+
     def __init__(self, db: Session):
         self.db = db
         self.is_dev_mode = os.getenv("WEBHOOK_DEV_MODE", "0") == "1"
@@ -257,8 +259,15 @@ class WebhookGateway:
         Process a batch of items from a single source.
         
         Two-phase processing:
-        1. Validation phase: Check schema and duplicates for all items (no quota consumed)
-        2. Insertion phase: Reserve quota and insert only valid, non-duplicate items
+        1. Validation phase: Check schema for every item, then duplicates for the
+           whole batch with one (source_type, external_id) IN query (no quota consumed)
+        2. Insertion phase: Reserve quota for all valid, non-duplicate items in one
+           statement and bulk insert them (INSERT ... ON CONFLICT DO NOTHING RETURNING).
+           If the bulk insert fails, items are inserted one savepoint at a time and
+           only the failing ones are reported as errors (their slots released).
+        
+        Items beyond the remaining quota are reported as rate_limited, in order.
+        `items` in the result holds one status entry per input item.
         
         Args:
             source: The source type (google_maps, yelp, etc.)
@@ -282,9 +291,8 @@ class WebhookGateway:
         }
 
         from sqlalchemy import text
-        import json
         
-        valid_items = []
+        candidates = []
         for item in items:
             if source not in self.SUPPORTED_SOURCES:
                 results["errors"] += 1
@@ -297,13 +305,19 @@ class WebhookGateway:
                 results["items"].append({"status": "error", "message": f"Missing required fields: {required}"})
                 continue
             
-            external_id = self.extract_external_id(source, item)
-            
-            if external_id and self.check_duplicate(source, external_id):
+            candidates.append((item, self.extract_external_id(source, item)))
+        
+        existing_ids = self.find_existing_ids(source, [ext_id for _, ext_id in candidates if ext_id])
+        
+        valid_items = []
+        for item, external_id in candidates:
+            if external_id and external_id in existing_ids:
                 results["duplicates"] += 1
                 results["items"].append({"status": "duplicate", "external_id": external_id})
                 continue
-            
+            if external_id:
+                # Later copies within the same batch are duplicates of the first
+                existing_ids.add(external_id)
             valid_items.append((item, external_id))
         
         if not valid_items:
@@ -319,25 +333,24 @@ class WebhookGateway:
             ON CONFLICT (source, window_start) DO NOTHING
         """)
         
-        lock_and_reserve_sql = text("""
+        # Grants min(requested, remaining) slots under the counter's row lock
+        reserve_slots_sql = text("""
+            WITH counter AS (
+                SELECT id, LEAST(:slots, max_requests - count) AS granted
+                FROM rate_limit_counters
+                WHERE source = :source AND window_start = :window_start
+                FOR UPDATE
+            )
             UPDATE rate_limit_counters
-            SET count = count + 1, updated_at = :now
-            WHERE source = :source AND window_start = :window_start
-              AND count < max_requests
-            RETURNING id, count
-        """)
-        
-        insert_sql = text("""
-            INSERT INTO scraped_sources (external_id, source_type, scrape_id, raw_data, processed, received_at)
-            VALUES (:external_id, :source_type, :scrape_id, CAST(:raw_data AS JSONB), 0, :received_at)
-            ON CONFLICT (source_type, external_id) WHERE external_id IS NOT NULL
-            DO NOTHING
-            RETURNING id
+            SET count = rate_limit_counters.count + counter.granted, updated_at = :now
+            FROM counter
+            WHERE rate_limit_counters.id = counter.id AND counter.granted > 0
+            RETURNING counter.granted
         """)
         
-        release_slot_sql = text("""
+        release_slots_sql = text("""
             UPDATE rate_limit_counters
-            SET count = GREATEST(count - 1, 0), updated_at = :now
+            SET count = GREATEST(count - :slots, 0), updated_at = :now
             WHERE source = :source AND window_start = :window_start
         """)
         
@@ -349,58 +362,160 @@ class WebhookGateway:
         })
         self.db.commit()
         
-        for item, external_id in valid_items:
+        try:
+            row = self.db.execute(reserve_slots_sql, {
+                "source": source,
+                "window_start": window_start,
+                "slots": len(valid_items),
+                "now": now,
+            }).fetchone()
+            granted = row[0] if row else 0
+            
+            to_insert = valid_items[:granted]
+            failed: Dict[int, str] = {}
             try:
-                result = self.db.execute(lock_and_reserve_sql, {
+                with self.db.begin_nested():
+                    source_ids = self._bulk_insert(source, scrape_id, to_insert, now)
+            except Exception as e:
+                # One bad row (e.g. text JSONB rejects) must not fail the others
+                logger.warning(f"Bulk insert failed for source {source}, inserting items one at a time: {e}")
+                source_ids, failed = self._insert_each(source, scrape_id, to_insert, now)
+            
+            lost = sum(1 for i in range(len(to_insert)) if i not in source_ids)
+            if lost:
+                # Failed, or inserted concurrently since the duplicate check; give their slots back
+                self.db.execute(release_slots_sql, {
                     "source": source,
                     "window_start": window_start,
+                    "slots": lost,
                     "now": now,
                 })
-                row = result.fetchone()
-                
-                if row is None:
-                    self.db.rollback()
-                    results["rate_limited"] += 1
-                    results["items"].append({
-                        "status": "rate_limited",
-                        "external_id": external_id,
-                        "message": "Rate limit exceeded"
-                    })
-                    continue
-                
-                result = self.db.execute(insert_sql, {
+            self.db.commit()
+        except Exception as e:
+            self.db.rollback()
+            logger.error(f"Batch insert failed for source {source}: {e}")
+            results["errors"] += len(valid_items)
+            results["items"].extend({"status": "error", "message": str(e)} for _ in valid_items)
+            return results
+        
+        for i, (item, external_id) in enumerate(valid_items):
+            if i >= granted:
+                results["rate_limited"] += 1
+                results["items"].append({
+                    "status": "rate_limited",
                     "external_id": external_id,
-                    "source_type": source,
-                    "scrape_id": scrape_id,
-                    "raw_data": json.dumps(item),
-                    "received_at": now,
+                    "message": "Rate limit exceeded"
                 })
-                row = result.fetchone()
-                
-                if row is None:
-                    self.db.execute(release_slot_sql, {
-                        "source": source,
-                        "window_start": window_start,
-                        "now": now,
-                    })
-                    self.db.commit()
-                    results["duplicates"] += 1
-                    results["items"].append({"status": "duplicate", "external_id": external_id})
-                else:
-                    self.db.commit()
-                    results["accepted"] += 1
-                    results["items"].append({
-                        "status": "accepted",
-                        "source_id": row[0],
-                        "external_id": external_id,
-                    })
-            except Exception as e:
-                self.db.rollback()
+            elif i in failed:
                 results["errors"] += 1
-                results["items"].append({"status": "error", "message": str(e)})
+                results["items"].append({"status": "error", "external_id": external_id, "message": failed[i]})
+            elif i in source_ids:
+                results["accepted"] += 1
+                results["items"].append({
+                    "status": "accepted",
+                    "source_id": source_ids[i],
+                    "external_id": external_id,
+                })
+            else:
+                results["duplicates"] += 1
+                results["items"].append({"status": "duplicate", "external_id": external_id})
+        
+        if granted < len(valid_items):
+            logger.warning(f"Rate limit exceeded for source: {source} ({len(valid_items) - granted} items)")
 
         return results
     
+    def find_existing_ids(self, source: str, external_ids: List[str]) -> set:
+        """Stage 3 for a whole batch: the external ids already stored for this source"""
+        from sqlalchemy import tuple_
+        
+        ids = list(dict.fromkeys(external_ids))
+        existing = set()
+        for start in range(0, len(ids), self.BULK_CHUNK_SIZE):
+            chunk = ids[start:start + self.BULK_CHUNK_SIZE]
+            rows = self.db.query(ScrapedSource.external_id).filter(
+                tuple_(ScrapedSource.source_type, ScrapedSource.external_id).in_(
+                    [(source, external_id) for external_id in chunk]
+                )
+            ).all()
+            existing.update(row[0] for row in rows)
+        return existing
+    
+    def _bulk_insert(
+        self,
+        source: str,
+        scrape_id: Optional[str],
+        items: List[Tuple[Dict[str, Any], Optional[str]]],
+        received_at: datetime,
+    ) -> Dict[int, int]:
+        """
+        Insert (item, external_id) pairs without committing. Returns
+        {position in items: new source id}; positions missing from the result
+        hit the unique index (inserted by someone else in the meantime).
+        """
+        from sqlalchemy.dialects.postgresql import insert as pg_insert
+        
+        table = ScrapedSource.__table__
+        rows = [
+            {
+                "external_id": external_id,
+                "source_type": source,
+                "scrape_id": scrape_id,
+                "raw_data": item,
+                "processed": 0,
+                "received_at": received_at,
+            }
+            for item, external_id in items
+        ]
+        keyed = [i for i, row in enumerate(rows) if row["external_id"]]
+        unkeyed = [i for i, row in enumerate(rows) if not row["external_id"]]
+        source_ids: Dict[int, int] = {}
+        
+        for start in range(0, len(keyed), self.BULK_CHUNK_SIZE):
+            chunk = keyed[start:start + self.BULK_CHUNK_SIZE]
+            stmt = pg_insert(table).values([rows[i] for i in chunk]).on_conflict_do_nothing(
+                index_elements=["source_type", "external_id"],
+                index_where=table.c.external_id.isnot(None),
+            ).returning(table.c.id, table.c.external_id)
+            inserted = dict((external_id, source_id) for source_id, external_id in self.db.execute(stmt))
+            for i in chunk:
+                if rows[i]["external_id"] in inserted:
+                    source_ids[i] = inserted[rows[i]["external_id"]]
+        
+        if unkeyed:
+            # No unique key to conflict on: executemany, ids returned in parameter order
+            stmt = pg_insert(table).returning(table.c.id, sort_by_parameter_order=True)
+            result = self.db.execute(stmt, [rows[i] for i in unkeyed])
+            for i, (source_id,) in zip(unkeyed, result):
+                source_ids[i] = source_id
+        
+        return source_ids
+    
+    def _insert_each(
+        self,
+        source: str,
+        scrape_id: Optional[str],
+        items: List[Tuple[Dict[str, Any], Optional[str]]],
+        received_at: datetime,
+    ) -> Tuple[Dict[int, int], Dict[int, str]]:
+        """
+        Fallback for a failed bulk insert: one savepoint per item. Returns
+        ({position: new source id}, {position: error message}).
+        """
+        source_ids: Dict[int, int] = {}
+        failed: Dict[int, str] = {}
+        for i, pair in enumerate(items):
+            try:
+                with self.db.begin_nested():
+                    inserted = self._bulk_insert(source, scrape_id, [pair], received_at)
+            except Exception as e:
+                logger.error(f"Insert failed for {source}/{pair[1]}: {e}")
+                failed[i] = str(e)
+                continue
+            if 0 in inserted:
+                source_ids[i] = inserted[0]
+        return source_ids, failed
+    
     async def _process_batch_item(
         self,
         source: str,
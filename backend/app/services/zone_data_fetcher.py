@@ -9,7 +9,7 @@ Fetches real data for each optimal zone candidate:
 """
 
 import math
-from typing import Dict, Any, List, Optional, Literal
+from typing import Dict, Any, List, Optional, Literal, Tuple
 from dataclasses import dataclass
 from sqlalchemy.orm import Session
 import logging
@@ -67,17 +67,11 @@ class ZoneDataFetcher:
             'radius_miles': radius_miles
         }
         
-        demographics = self._fetch_demographics(center_lat, center_lng, radius_miles)
-        metrics.total_population = demographics.get('population', 0)
-        metrics.population_growth = demographics.get('growth_rate', 0.0)
-        metrics.median_income = demographics.get('median_income', 0)
-        metrics.median_age = demographics.get('median_age', 0.0)
-        metrics.raw_data['demographics'] = demographics
+        self.apply_demographics(metrics, self._fetch_demographics(center_lat, center_lng, radius_miles))
         
         if fetch_competitors and business_type:
             competitors = self._fetch_competitors(center_lat, center_lng, radius_miles, business_type)
-            metrics.total_competitors = competitors.get('count', 0)
-            metrics.raw_data['competitors'] = competitors
+            self.apply_competitors(metrics, competitors)
         
         if fetch_traffic:
             traffic = self._fetch_traffic(
@@ -86,9 +80,7 @@ class ZoneDataFetcher:
                 radius_miles,
                 mode=traffic_mode
             )
-            metrics.foot_traffic_monthly = traffic.get('foot_traffic_monthly', 0)
-            metrics.drive_by_traffic_monthly = traffic.get('drive_by_traffic_monthly', 0)
-            metrics.raw_data['traffic'] = traffic
+            self.apply_traffic(metrics, traffic)
         
         # Calculate trend indicators
         try:
@@ -111,6 +103,39 @@ class ZoneDataFetcher:
         
         return metrics
     
+    @staticmethod
+    def apply_demographics(metrics: ZoneMetrics, demographics: Dict[str, Any]) -> None:
+        metrics.total_population = demographics.get('population', 0)
+        metrics.population_growth = demographics.get('growth_rate', 0.0)
+        metrics.median_income = demographics.get('median_income', 0)
+        metrics.median_age = demographics.get('median_age', 0.0)
+        metrics.raw_data['demographics'] = demographics
+    
+    @staticmethod
+    def apply_competitors(metrics: ZoneMetrics, competitors: Dict[str, Any]) -> None:
+        metrics.total_competitors = competitors.get('count', 0)
+        metrics.raw_data['competitors'] = competitors
+    
+    @staticmethod
+    def apply_traffic(metrics: ZoneMetrics, traffic: Dict[str, Any]) -> None:
+        metrics.foot_traffic_monthly = traffic.get('foot_traffic_monthly', 0)
+        metrics.drive_by_traffic_monthly = traffic.get('drive_by_traffic_monthly', 0)
+        metrics.raw_data['traffic'] = traffic
+    
+    @staticmethod
+    def prefetch_traffic(centers: List[Tuple[float, float]], radius_miles: float = 3.0) -> None:
+        """
+        Resolve DOT traffic for many zone centers in one batch lookup.
+        
+        `_fetch_traffic` then finds each zone's AADT in the shared cache
+        instead of querying per zone.
+        """
+        try:
+            from app.services.dot_traffic_service import DOTTrafficService
+            DOTTrafficService(timeout=2).prefetch_area_traffic(centers, radius_miles, sample_points=1)
+        except Exception as e:
+            logger.debug(f"DOT traffic prefetch failed: {e}")
+    
     def _fetch_demographics(
         self,
         lat: float,
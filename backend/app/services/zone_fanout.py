@@ -0,0 +1,157 @@
+"""
+Concurrent metric fetching for many candidate zones.
+
+`ZoneDataFetcher.fetch_zone_metrics` gathers one zone's sources one after
+another. `ZoneMetricsFanout` fetches every zone of a sweep at once:
+
+- each zone's competitors and traffic run concurrently, then its trends
+  (which read the other two)
+- every source has its own concurrency limit (SOURCE_CONCURRENCY), so a slow
+  SerpAPI cannot take all the threads that traffic and trend queries need
+- identical competitor searches are coalesced through the shared trade area
+  cache (one in-flight SerpAPI call per key, reused across requests), and
+  DOT traffic for all zone centers is resolved in one batch up front
+- the whole sweep shares one time budget. A source still running when the
+  budget runs out is replaced with its estimate and named in the zone's
+  `raw_data['estimated_sources']`, so slow zones degrade instead of failing
+  the request
+"""
+
+import asyncio
+import logging
+from typing import Any, Callable, Dict, List, Literal, Optional, Tuple
+
+from app.core.config import settings
+from app.services.trade_area_cache import round_coord, trade_area_cache
+from app.services.zone_data_fetcher import ZoneDataFetcher, ZoneMetrics
+
+logger = logging.getLogger(__name__)
+
+# Concurrent fetches per source across all zones of one sweep
+SOURCE_CONCURRENCY: Dict[str, int] = {
+    "competitors": 4,
+    "traffic": 4,
+    "trends": 4,
+}
+
+_TIMED_OUT = object()
+
+
+class ZoneMetricsFanout:
+    """Fetches ZoneMetrics for many zone centers concurrently within a time budget."""
+
+    def __init__(
+        self,
+        radius_miles: float,
+        business_type: Optional[str] = None,
+        traffic_mode: Literal["hybrid", "estimated"] = "hybrid",
+        budget_seconds: Optional[float] = None,
+        session_factory: Optional[Callable[[], Any]] = None,
+        concurrency: Optional[Dict[str, int]] = None,
+    ):
+        self.radius_miles = radius_miles
+        self.business_type = business_type
+        self.traffic_mode = traffic_mode
+        self.budget_seconds = budget_seconds if budget_seconds is not None else settings.ZONE_FETCH_BUDGET_SECONDS
+        self._session_factory = session_factory
+        self._concurrency = dict(concurrency or SOURCE_CONCURRENCY)
+        # Only used for its session-free helpers (demographics, estimates)
+        self._estimator = ZoneDataFetcher(db=None)
+
+    async def fetch_all(self, centers: List[Tuple[float, float]]) -> List[ZoneMetrics]:
+        """ZoneMetrics for each (lat, lng) center, in order"""
+        loop = asyncio.get_running_loop()
+        self._deadline = loop.time() + self.budget_seconds
+        self._limits = {source: asyncio.Semaphore(limit) for source, limit in self._concurrency.items()}
+
+        if self.traffic_mode == "hybrid":
+            await self._run("traffic", ZoneDataFetcher.prefetch_traffic, centers, self.radius_miles)
+
+        return list(await asyncio.gather(*(self._fetch_zone(lat, lng) for lat, lng in centers)))
+
+    async def _fetch_zone(self, lat: float, lng: float) -> ZoneMetrics:
+        metrics = ZoneMetrics()
+        metrics.raw_data = {
+            'center': {'lat': lat, 'lng': lng},
+            'radius_miles': self.radius_miles
+        }
+        estimated_sources = []
+
+        ZoneDataFetcher.apply_demographics(metrics, self._estimator._fetch_demographics(lat, lng, self.radius_miles))
+
+        sources = {"traffic": self._run("traffic", self._traffic, lat, lng)}
+        if self.business_type:
+            sources["competitors"] = self._run("competitors", self._competitors, lat, lng)
+        results = dict(zip(sources, await asyncio.gather(*sources.values())))
+
+        if "competitors" in results:
+            competitors = results["competitors"]
+            if competitors is _TIMED_OUT:
+                competitors = self._estimator._estimate_competitors(lat, lng, self.radius_miles, self.business_type)
+                estimated_sources.append("competitors")
+            ZoneDataFetcher.apply_competitors(metrics, competitors)
+
+        traffic = results["traffic"]
+        if traffic is _TIMED_OUT:
+            traffic = self._estimator._estimate_traffic(lat, lng, self.radius_miles)
+            estimated_sources.append("traffic")
+        ZoneDataFetcher.apply_traffic(metrics, traffic)
+
+        trends = await self._run("trends", self._trends, lat, lng, metrics.raw_data)
+        if trends is _TIMED_OUT:
+            trends = None
+            estimated_sources.append("trends")
+        metrics.raw_data['trends'] = trends
+        metrics.raw_data['estimated_sources'] = estimated_sources
+
+        return metrics
+
+    async def _run(self, source: str, fn: Callable, *args):
+        """Run fn in a thread under the source's limit; _TIMED_OUT once the budget is spent"""
+        async def limited():
+            async with self._limits[source]:
+                return await asyncio.to_thread(fn, *args)
+
+        remaining = self._deadline - asyncio.get_running_loop().time()
+        try:
+            return await asyncio.wait_for(limited(), timeout=max(0.0, remaining))
+        except asyncio.TimeoutError:
+            logger.info(f"Zone {source} fetch exceeded the {self.budget_seconds}s budget; using estimate")
+            return _TIMED_OUT
+
+    def _session(self):
+        if self._session_factory is not None:
+            return self._session_factory()
+        from app.db.database import SessionLocal
+        return SessionLocal()
+
+    def _competitors(self, lat: float, lng: float) -> Dict[str, Any]:
+        def fetch():
+            result = self._estimator._fetch_competitors(lat, lng, self.radius_miles, self.business_type)
+            # Estimates are cheap and must not be cached in place of real results.
+            return result if result.get('source') == 'serpapi' else None
+
+        key = ("zone", round_coord(lat), round_coord(lng), self.radius_miles, self.business_type)
+        return (
+            trade_area_cache.get_or_fetch("competitors", key, fetch)
+            or self._estimator._estimate_competitors(lat, lng, self.radius_miles, self.business_type)
+        )
+
+    def _traffic(self, lat: float, lng: float) -> Dict[str, Any]:
+        db = self._session()
+        try:
+            return ZoneDataFetcher(db)._fetch_traffic(lat, lng, self.radius_miles, mode=self.traffic_mode)
+        finally:
+            db.close()
+
+    def _trends(self, lat: float, lng: float, raw_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        from app.services.trend_indicators import calculate_trends
+
+        db = self._session()
+        try:
+            return calculate_trends(db, lat, lng, self.radius_miles, raw_data)
+        except Exception as e:
+            logger.warning(f"Failed to calculate trends: {e}")
+            return None
+        finally:
+            db.close()
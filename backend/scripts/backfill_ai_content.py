@@ -8,7 +8,6 @@ Backfill script to populate AI-generated content for all opportunities.
 import sys
 import os
 import json
-import time
 from datetime import datetime
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -19,6 +18,7 @@ from anthropic import Anthropic
 from anthropic.types import TextBlock
 
 from app.models.opportunity import Opportunity
+from app.services.ai_batch_engine import AIBatchEngine, run_batch_sync
 
 DATABASE_URL = os.environ.get("DATABASE_URL")
 if not DATABASE_URL:
@@ -80,14 +80,14 @@ def generate_raw_source_data(opp: Opportunity) -> dict:
         "confidence_score": 0.85
     }
 
-def analyze_opportunity(opp: Opportunity) -> dict | None:
-    """Call Anthropic API to analyze opportunity"""
+def build_prompt(opp: Opportunity) -> str:
+    """Analysis prompt for an opportunity (built before any worker thread runs)"""
     title: str = getattr(opp, 'title', None) or ""
     description: str = getattr(opp, 'description', None) or ""
     category: str = getattr(opp, 'category', None) or ""
     subcategory: str = getattr(opp, 'subcategory', None) or "N/A"
     
-    prompt = f"""Analyze this opportunity:
+    return f"""Analyze this opportunity:
 
 TITLE: {title}
 
@@ -101,33 +101,31 @@ GEOGRAPHIC SCOPE: {opp.geographic_scope}
 
 Provide your structured JSON analysis."""
 
-    try:
-        response = client.messages.create(
-            model="claude-sonnet-4-5",
-            max_tokens=1024,
-            system=ANALYSIS_SYSTEM_PROMPT,
-            messages=[{"role": "user", "content": prompt}]
-        )
-        
-        text_parts = []
-        for block in response.content:
-            if isinstance(block, TextBlock):
-                text_parts.append(block.text)
-        if not text_parts:
-            print("  Warning: No text content in API response")
-            return None
-        response_text = "".join(text_parts)
-        start_idx = response_text.find('{')
-        end_idx = response_text.rfind('}') + 1
-        if start_idx != -1 and end_idx > start_idx:
-            json_str = response_text[start_idx:end_idx]
-            return json.loads(json_str)
-        return None
-    except Exception as e:
-        print(f"  API Error: {e}")
+def analyze_prompt(prompt: str) -> dict | None:
+    """Call Anthropic API; API errors propagate so the batch engine can retry them"""
+    response = client.messages.create(
+        model="claude-sonnet-4-5",
+        max_tokens=1024,
+        system=ANALYSIS_SYSTEM_PROMPT,
+        messages=[{"role": "user", "content": prompt}]
+    )
+    
+    text_parts = []
+    for block in response.content:
+        if isinstance(block, TextBlock):
+            text_parts.append(block.text)
+    if not text_parts:
+        print("  Warning: No text content in API response")
         return None
-
-def update_opportunity(db, opp: Opportunity, analysis: dict):
+    response_text = "".join(text_parts)
+    start_idx = response_text.find('{')
+    end_idx = response_text.rfind('}') + 1
+    if start_idx != -1 and end_idx > start_idx:
+        json_str = response_text[start_idx:end_idx]
+        return json.loads(json_str)
+    return None
+
+def update_opportunity(db, opp: Opportunity, analysis: dict, commit: bool = True):
     """Update opportunity with analysis results"""
     opp.ai_analyzed = True  # type: ignore[assignment]
     opp.ai_analyzed_at = datetime.utcnow()  # type: ignore[assignment]
@@ -153,33 +151,8 @@ def update_opportunity(db, opp: Opportunity, analysis: dict):
     if not market_size and analysis.get("market_size_estimate"):
         opp.market_size = analysis.get("market_size_estimate", "")
     
-    db.commit()
-
-def backfill_opportunity(db, opp: Opportunity) -> bool:
-    """Backfill a single opportunity with AI content"""
-    try:
-        raw_source_data = getattr(opp, 'raw_source_data', None)
-        if not raw_source_data:
-            raw_data = generate_raw_source_data(opp)
-            opp.raw_source_data = json.dumps(raw_data)  # type: ignore[assignment]
-            db.commit()
-        
-        ai_generated_title = getattr(opp, 'ai_generated_title', None)
-        ai_problem_statement = getattr(opp, 'ai_problem_statement', None)
-        if not ai_generated_title or not ai_problem_statement:
-            analysis = analyze_opportunity(opp)
-            
-            if analysis:
-                update_opportunity(db, opp, analysis)
-                return True
-            else:
-                return False
-        
-        return True
-    except Exception as e:
-        print(f"  Error: {e}")
-        db.rollback()
-        return False
+    if commit:
+        db.commit()
 
 def main():
     print("=" * 60)
@@ -200,9 +173,8 @@ def main():
     print(f"  - Need AI content: {needs_ai}")
     print()
     
-    success_count = 0
-    error_count = 0
     skipped_count = 0
+    jobs = []
     
     for i, opp in enumerate(opportunities, 1):
         raw_data = getattr(opp, 'raw_source_data', None)
@@ -215,16 +187,40 @@ def main():
             print(f"[{i}/{total}] ID {opp.id}: Skipped (already complete)")
             continue
         
-        print(f"[{i}/{total}] ID {opp.id}: {opp.title[:50]}...")
+        if not raw_data:
+            opp.raw_source_data = json.dumps(generate_raw_source_data(opp))  # type: ignore[assignment]
         
-        if backfill_opportunity(db, opp):
-            success_count += 1
-            print(f"  ✓ Updated successfully")
-        else:
-            error_count += 1
-            print(f"  ✗ Failed")
-        
-        time.sleep(0.3)
+        if not ai_title or not ai_problem:
+            # Prompts are built up front: the batch engine's commits expire ORM objects.
+            jobs.append((opp, build_prompt(opp)))
+    
+    db.commit()
+    
+    print(f"\nAnalyzing {len(jobs)} opportunities...")
+    
+    def apply_analysis(job, analysis):
+        opp = job[0]
+        if not analysis:
+            print(f"  ✗ ID {opp.id}: Failed")
+            return False
+        update_opportunity(db, opp, analysis, commit=False)
+        print(f"  ✓ ID {opp.id}: Updated successfully")
+    
+    # Concurrency, request pacing and 429 retries come from AIBatchEngine
+    # (AI_BATCH_CONCURRENCY, ANTHROPIC_REQUESTS_PER_MINUTE).
+    stats = run_batch_sync(
+        AIBatchEngine(provider="anthropic"),
+        jobs,
+        lambda job: analyze_prompt(job[1]),
+        on_result=apply_analysis,
+        db=db,
+        describe=lambda job: f"ID {job[0].id}",
+    )
+    for error in stats.errors:
+        print(f"  Error: {error}")
+    
+    success_count = (total - skipped_count - len(jobs)) + stats.processed
+    error_count = stats.failed
     
     db.close()
     
@@ -3,7 +3,6 @@
 import sys
 import os
 import json
-import time
 from datetime import datetime
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -13,6 +12,8 @@ from sqlalchemy.orm import sessionmaker
 from anthropic import Anthropic
 from anthropic.types import TextBlock
 
+from app.services.ai_batch_engine import AIBatchEngine, run_batch_sync
+
 DATABASE_URL = os.environ.get("DATABASE_URL")
 if not DATABASE_URL:
     print("ERROR: DATABASE_URL not set")
@@ -42,63 +43,73 @@ SYSTEM_PROMPT = """You are a market research analyst. Analyze the opportunity an
     "next_steps": ["<action>"]
 }"""
 
-def analyze_and_update(db, opp_id, title, description, category):
+def request_analysis(job):
+    """Blocking API call for one (id, title, description, category) row"""
+    opp_id, title, description, category = job
     prompt = f"TITLE: {title}\nDESCRIPTION: {description[:1500] if description else 'N/A'}\nCATEGORY: {category}"
     
-    try:
-        response = client.messages.create(
-            model="claude-sonnet-4-5",
-            max_tokens=800,
-            system=SYSTEM_PROMPT,
-            messages=[{"role": "user", "content": prompt}]
-        )
-        
-        text_parts = []
-        for block in response.content:
-            if isinstance(block, TextBlock):
-                text_parts.append(block.text)
-        if not text_parts:
-            print(f"Warning: No text content in API response for {opp_id}")
+    response = client.messages.create(
+        model="claude-sonnet-4-5",
+        max_tokens=800,
+        system=SYSTEM_PROMPT,
+        messages=[{"role": "user", "content": prompt}]
+    )
+    
+    text_parts = []
+    for block in response.content:
+        if isinstance(block, TextBlock):
+            text_parts.append(block.text)
+    if not text_parts:
+        print(f"Warning: No text content in API response for {opp_id}")
+        return None
+    response_text = "".join(text_parts)
+    start = response_text.find('{')
+    end = response_text.rfind('}') + 1
+    if start != -1 and end > start:
+        return json.loads(response_text[start:end])
+    return None
+
+def make_updater(db, total):
+    done = 0
+
+    def apply_analysis(job, data):
+        nonlocal done
+        done += 1
+        opp_id = job[0]
+        if not data:
+            print(f"[{done}/{total}] ID {opp_id}: FAIL")
             return False
-        response_text = "".join(text_parts)
-        start = response_text.find('{')
-        end = response_text.rfind('}') + 1
-        if start != -1 and end > start:
-            data = json.loads(response_text[start:end])
-            
-            db.execute(text("""
-                UPDATE opportunities SET
-                    ai_analyzed = true,
-                    ai_analyzed_at = :now,
-                    ai_generated_title = :title,
-                    ai_problem_statement = :problem,
-                    ai_opportunity_score = :score,
-                    ai_summary = :summary,
-                    ai_market_size_estimate = :market,
-                    ai_competition_level = :comp,
-                    ai_urgency_level = :urgency,
-                    ai_target_audience = :audience,
-                    ai_pain_intensity = :pain
-                WHERE id = :id
-            """), {
-                'now': datetime.utcnow(),
-                'title': data.get('idea_title', '')[:500],
-                'problem': data.get('problem_statement', ''),
-                'score': data.get('opportunity_score', 50),
-                'summary': data.get('summary', '')[:500],
-                'market': data.get('market_size_estimate', 'Unknown'),
-                'comp': data.get('competition_level', 'medium'),
-                'urgency': data.get('urgency_level', 'medium'),
-                'audience': data.get('target_audience', '')[:255],
-                'pain': data.get('pain_intensity', 5),
-                'id': opp_id
-            })
-            db.commit()
-            return True
-    except Exception as e:
-        print(f"Error on {opp_id}: {e}")
-        db.rollback()
-    return False
+        
+        db.execute(text("""
+            UPDATE opportunities SET
+                ai_analyzed = true,
+                ai_analyzed_at = :now,
+                ai_generated_title = :title,
+                ai_problem_statement = :problem,
+                ai_opportunity_score = :score,
+                ai_summary = :summary,
+                ai_market_size_estimate = :market,
+                ai_competition_level = :comp,
+                ai_urgency_level = :urgency,
+                ai_target_audience = :audience,
+                ai_pain_intensity = :pain
+            WHERE id = :id
+        """), {
+            'now': datetime.utcnow(),
+            'title': data.get('idea_title', '')[:500],
+            'problem': data.get('problem_statement', ''),
+            'score': data.get('opportunity_score', 50),
+            'summary': data.get('summary', '')[:500],
+            'market': data.get('market_size_estimate', 'Unknown'),
+            'comp': data.get('competition_level', 'medium'),
+            'urgency': data.get('urgency_level', 'medium'),
+            'audience': data.get('target_audience', '')[:255],
+            'pain': data.get('pain_intensity', 5),
+            'id': opp_id
+        })
+        print(f"[{done}/{total}] ID {opp_id}: OK")
+
+    return apply_analysis
 
 def main():
     db = SessionLocal()
@@ -113,18 +124,21 @@ def main():
     
     print(f"Processing {len(opps)} opportunities...")
     
-    success = 0
-    for i, (id, title, desc, cat) in enumerate(opps, 1):
-        print(f"[{i}/{len(opps)}] ID {id}: ", end="", flush=True)
-        if analyze_and_update(db, id, title, desc, cat):
-            print("OK")
-            success += 1
-        else:
-            print("FAIL")
-        time.sleep(0.3)
+    # Concurrency, request pacing and 429 retries come from AIBatchEngine
+    # (AI_BATCH_CONCURRENCY, ANTHROPIC_REQUESTS_PER_MINUTE).
+    stats = run_batch_sync(
+        AIBatchEngine(provider="anthropic"),
+        opps,
+        request_analysis,
+        on_result=make_updater(db, len(opps)),
+        db=db,
+        describe=lambda job: f"ID {job[0]}",
+    )
+    for error in stats.errors:
+        print(f"Error on {error}")
     
     db.close()
-    print(f"\nComplete: {success}/{len(opps)} success")
+    print(f"\nComplete: {stats.processed}/{len(opps)} success")
 
 if __name__ == "__main__":
     main()
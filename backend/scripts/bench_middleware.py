@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Benchmark the HTTP middleware stack.
+
+Compares the previous BaseHTTPMiddleware versions of the security headers,
+rate limit and trace ID middleware (reproduced below) against the current
+pure-ASGI ones, on a trivial endpoint behind the same CORS setup as app.main.
+Requests are driven in-process through httpx's ASGI transport, so the numbers
+isolate middleware overhead from networking.
+
+Usage:
+    python scripts/bench_middleware.py [--requests 5000] [--concurrency 50]
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+import uuid
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("SECRET_KEY", "bench")
+
+import httpx
+from fastapi import FastAPI
+from fastapi.middleware.cors import CORSMiddleware
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from app.middleware.rate_limit import RateLimitMiddleware
+from app.middleware.security import SecurityHeadersMiddleware
+from app.middleware.trace_id import TraceIdMiddleware, trace_id_var
+from app.services.rate_limiter import InMemoryRateLimiter
+
+# High enough that the benchmark never trips the limiter.
+BENCH_LIMIT_PER_MINUTE = 10_000_000
+
+
+class LegacySecurityHeadersMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request, call_next):
+        response = await call_next(request)
+        response.headers.setdefault("X-Content-Type-Options", "nosniff")
+        response.headers.setdefault("X-Frame-Options", "DENY")
+        response.headers.setdefault("Referrer-Policy", "strict-origin-when-cross-origin")
+        response.headers.setdefault("Permissions-Policy", "geolocation=(), microphone=(), camera=()")
+        if request.url.scheme == "https":
+            response.headers.setdefault("Strict-Transport-Security", "max-age=31536000; includeSubDomains; preload")
+        return response
+
+
+class LegacyRateLimitMiddleware(BaseHTTPMiddleware):
+    def __init__(self, app):
+        super().__init__(app)
+        self.limiter = InMemoryRateLimiter()
+
+    async def dispatch(self, request, call_next):
+        ip = request.client.host if request.client else "unknown"
+        result = self.limiter.hit(f"{ip}:{request.url.path}", BENCH_LIMIT_PER_MINUTE)
+        response = await call_next(request)
+        response.headers.setdefault("X-RateLimit-Limit", str(result.limit))
+        response.headers.setdefault("X-RateLimit-Remaining", str(result.remaining))
+        response.headers.setdefault("X-RateLimit-Reset", str(result.reset_after))
+        return response
+
+
+class LegacyTraceIdMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request, call_next):
+        trace_id = request.headers.get("X-Trace-ID") or str(uuid.uuid4())[:12]
+        trace_id_var.set(trace_id)
+        response = await call_next(request)
+        response.headers["X-Trace-ID"] = trace_id
+        return response
+
+
+def build_app(legacy: bool) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/ping")
+    def ping():
+        return {"ok": True}
+
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["*"],
+        allow_credentials=False,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+    if legacy:
+        app.add_middleware(LegacySecurityHeadersMiddleware)
+        app.add_middleware(LegacyRateLimitMiddleware)
+        app.add_middleware(LegacyTraceIdMiddleware)
+    else:
+        app.add_middleware(SecurityHeadersMiddleware)
+        app.add_middleware(
+            RateLimitMiddleware,
+            default_limit_per_minute=BENCH_LIMIT_PER_MINUTE,
+            backend=InMemoryRateLimiter(),
+        )
+        app.add_middleware(TraceIdMiddleware)
+    return app
+
+
+async def run(app: FastAPI, total: int, concurrency: int) -> dict:
+    latencies = []
+    queue = asyncio.Queue()
+    for _ in range(total):
+        queue.put_nowait(None)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for _ in range(min(200, total)):
+            await client.get("/ping")
+
+        async def worker():
+            while True:
+                try:
+                    queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                start = time.perf_counter()
+                response = await client.get("/ping")
+                latencies.append(time.perf_counter() - start)
+                assert response.status_code == 200
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "rps": total / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark middleware stack overhead")
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+
+    print(f"{args.requests} requests, concurrency {args.concurrency}")
+    print(f"{'stack':<22}{'req/s':>10}{'p50 ms':>10}{'p99 ms':>10}")
+    for label, legacy in (("BaseHTTPMiddleware", True), ("pure ASGI", False)):
+        stats = asyncio.run(run(build_app(legacy), args.requests, args.concurrency))
+        print(f"{label:<22}{stats['rps']:>10.0f}{stats['p50_ms']:>10.2f}{stats['p99_ms']:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -29,6 +29,7 @@ from sqlalchemy import text
 from sqlalchemy.orm import Session
 from app.db.database import get_db, engine
 from app.models.traffic_road import TrafficRoad
+from app.services.vector_tiles import invalidate_tile_cache
 
 DATA_SOURCES = {
     'current': {
@@ -260,6 +261,7 @@ def import_florida_data(source: str = 'current', clear_existing: bool = True, cl
         print(f"Finished: {datetime.now().isoformat()}")
         print("=" * 60)
         
+        invalidate_tile_cache("traffic_roads")
         return total_imported
         
     finally:
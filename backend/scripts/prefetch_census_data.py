@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Census prefetch script
+
+Warms the shared Census cache (census_data_cache table) for whole states so
+map and report views never wait on the Census API for them. For each state
+it loads, in one pass:
+
+- ACS 5-year profiles for the state and all of its counties
+- ACS extended demographics (income/age/commute/internet) for all counties
+- ACS county-to-county migration flows for all counties
+- Population estimates for all counties, one request per year
+
+With --zctas it also loads the national ZCTA profile table once.
+
+Usage:
+    python scripts/prefetch_census_data.py TX FL 06
+    python scripts/prefetch_census_data.py all --zctas
+"""
+
+import os
+import sys
+import asyncio
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.census_service import census_service
+from app.services.google_trends_service import STATE_TO_FIPS
+
+
+def resolve_states(values):
+    if any(value.lower() == "all" for value in values):
+        return sorted(STATE_TO_FIPS.values())
+    states = []
+    for value in values:
+        if value.isdigit() and len(value) == 2:
+            states.append(value)
+        elif value.upper() in STATE_TO_FIPS:
+            states.append(STATE_TO_FIPS[value.upper()])
+        else:
+            raise SystemExit(f"Unknown state: {value}")
+    return states
+
+
+async def prefetch(states, year, population_years, include_zctas):
+    for i, state_fips in enumerate(states):
+        try:
+            counts = await census_service.prefetch_state(
+                state_fips,
+                year=year,
+                population_years=population_years,
+                include_zctas=include_zctas and i == 0,
+            )
+            print(f"State {state_fips}: " + ", ".join(f"{name}={count}" for name, count in counts.items()))
+        except Exception as e:
+            print(f"State {state_fips}: failed ({e})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Prefetch Census data into the shared cache")
+    parser.add_argument("states", nargs="+", help="State abbreviations or FIPS codes, or 'all'")
+    parser.add_argument("--year", type=int, default=None, help="ACS 5-year vintage (default: service default)")
+    parser.add_argument("--population-years", type=int, nargs="+", default=[2020, 2021, 2022, 2023],
+                        help="Population estimate years to load")
+    parser.add_argument("--zctas", action="store_true", help="Also load the national ZCTA profile table")
+    args = parser.parse_args()
+
+    if not census_service.is_configured:
+        print("ERROR: CENSUS_API_KEY not set")
+        sys.exit(1)
+
+    asyncio.run(prefetch(resolve_states(args.states), args.year, args.population_years, args.zctas))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""Tests for the bounded concurrent AI batch engine."""
+import asyncio
+import threading
+import time
+from contextlib import nullcontext
+from unittest.mock import MagicMock
+
+from app.services.ai_batch_engine import AIBatchEngine, TokenBucket
+
+
+class RateLimited(Exception):
+    status_code = 429
+
+
+def _engine(**kwargs):
+    kwargs.setdefault("bucket", TokenBucket(600000, burst=1000))
+    kwargs.setdefault("base_backoff", 0.001)
+    return AIBatchEngine(**kwargs)
+
+
+def _mock_db():
+    db = MagicMock()
+    db.begin_nested.side_effect = lambda: nullcontext()
+    return db
+
+
+def test_concurrency_is_bounded():
+    lock = threading.Lock()
+    state = {"active": 0, "peak": 0}
+
+    def call(item):
+        with lock:
+            state["active"] += 1
+            state["peak"] = max(state["peak"], state["active"])
+        time.sleep(0.01)
+        with lock:
+            state["active"] -= 1
+        return item * 2
+
+    seen = []
+    stats = asyncio.run(_engine(concurrency=3).run(range(12), call, on_result=lambda i, r: seen.append(r)))
+
+    assert stats.processed == 12
+    assert sorted(seen) == [i * 2 for i in range(12)]
+    assert 1 < state["peak"] <= 3
+
+
+def test_rate_limited_calls_are_retried():
+    attempts = {}
+
+    def call(item):
+        attempts[item] = attempts.get(item, 0) + 1
+        if attempts[item] < 3:
+            raise RateLimited("slow down")
+        return item
+
+    stats = asyncio.run(_engine(max_retries=4).run([1, 2], call))
+
+    assert stats.processed == 2
+    assert stats.retries == 4
+
+
+def test_non_retryable_and_rejected_results_fail():
+    def call(item):
+        if item == "boom":
+            raise ValueError("bad response")
+        return item
+
+    stats = asyncio.run(_engine().run(["ok", "boom", "reject"], call, on_result=lambda i, r: r != "reject"))
+
+    assert stats.processed == 1
+    assert stats.failed == 2
+    assert len(stats.errors) == 2
+
+
+def test_commits_every_n_results_and_at_end():
+    db = _mock_db()
+
+    stats = asyncio.run(_engine(commit_every=2).run(range(5), lambda i: i, on_result=lambda i, r: None, db=db))
+
+    assert stats.processed == 5
+    assert db.commit.call_count == 3
+    assert db.begin_nested.call_count == 5
+
+
+def test_token_bucket_paces_after_burst():
+    bucket = TokenBucket(60, burst=2)
+
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == 0
+    assert 0.9 < bucket.reserve() <= 1.0
@@ -0,0 +1,55 @@
+"""Tests for the shared Census cache (SQLite back tier)."""
+import asyncio
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.pool import StaticPool
+
+from app.models.census_data_cache import CensusDataCache
+from app.services.census_cache import CensusCache
+from app.services.census_service import CensusDataService
+
+
+@pytest.fixture
+def engine():
+    # One shared connection: async lookups reach the database from worker threads.
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    CensusDataCache.__table__.create(engine)
+    return engine
+
+
+def test_results_are_shared_through_the_database_and_isolated_from_callers(engine):
+    writer = CensusCache(memory_entries=10, engine=engine)
+    reader = CensusCache(memory_entries=10, engine=engine)
+
+    stored = writer.set_many("acs/acs5", 2023, "county", {"48453": {"population": 1300000}, "48001": None})
+    assert stored == 1
+
+    first = reader.get("acs/acs5", 2023, "county", "48453")
+    assert first == {"population": 1300000}
+    first["population"] = 0
+    assert reader.get("acs/acs5", 2023, "county", "48453") == {"population": 1300000}
+    assert reader.get("acs/acs5", 2022, "county", "48453") is None
+
+    writer.set("acs/acs5", 2023, "county", "48453", {"population": 1400000})
+    reader.clear_memory()
+    assert reader.get("acs/acs5", 2023, "county", "48453") == {"population": 1400000}
+    assert reader.stats()["db_hits"] == 2
+
+
+def test_expired_rows_miss(engine):
+    cache = CensusCache(memory_entries=10, engine=engine, ttl_days=1)
+    cache._ttl = -cache._ttl
+    cache.set("acs/acs5", 2023, "state", "48", {"population": 1})
+
+    assert cache.get("acs/acs5", 2023, "state", "48") is None
+
+
+def test_service_serves_warmed_geographies_without_the_api(engine):
+    service = CensusDataService(cache=CensusCache(memory_entries=10, engine=engine))
+    service.api_key = "test"
+    service.cache.set(service.DATASET, service.DEFAULT_YEAR, "county", "48453", {"population": 1300000})
+    service.cache.set(service.PEP_DATASET, 2023, "county", "48453", [{"pop": 1300000}])
+
+    assert asyncio.run(service.fetch_by_county("48", "453")) == {"population": 1300000}
+    assert asyncio.run(service.fetch_population_estimates("48", "453", 2023)) == [{"pop": 1300000}]
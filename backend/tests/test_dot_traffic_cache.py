@@ -0,0 +1,53 @@
+"""Tests for batched, shared DOT AADT lookups."""
+import pytest
+
+from app.services import dot_traffic_service
+from app.services.dot_traffic_service import DOTTrafficService, TrafficDataResult, invalidate_dot_traffic_cache
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    invalidate_dot_traffic_cache()
+    yield
+    invalidate_dot_traffic_cache()
+
+
+def test_batch_resolves_local_points_in_one_query_and_shares_the_cache(monkeypatch):
+    batches = []
+
+    def nearest_batch(self, points, radius_miles, state):
+        batches.append(dict(points))
+        return {
+            key: TrafficDataResult(aadt=1000 + i, source="local_db", state=state)
+            for i, key in enumerate(points)
+        }
+
+    monkeypatch.setattr(DOTTrafficService, "_query_local_nearest_traffic_batch", nearest_batch)
+    # Tampa and Miami (FL has local data); the duplicate rounds to the same key.
+    points = [(27.9506, -82.4572), (25.7617, -80.1918), (27.95061, -82.45721)]
+
+    results = DOTTrafficService().get_traffic_for_locations(points, 0.5)
+
+    assert len(batches) == 1 and len(batches[0]) == 2
+    assert [r.aadt for r in results] == [1000, 1001, 1000]
+
+    # A new instance (new request) is served from the shared cache.
+    assert DOTTrafficService().get_traffic_for_location(25.7617, -80.1918, 0.5).aadt == 1001
+    assert len(batches) == 1
+
+
+def test_unresolved_points_fall_back_to_dot_api_then_estimate(monkeypatch):
+    monkeypatch.setattr(DOTTrafficService, "_query_local_nearest_traffic_batch", lambda self, points, radius, state: {})
+    monkeypatch.setattr(
+        DOTTrafficService,
+        "_query_state_dot",
+        lambda self, state, lat, lng, radius: TrafficDataResult(aadt=5000, source="dot_api", state=state) if state == "TX" else None,
+    )
+
+    austin, tampa = DOTTrafficService().get_traffic_for_locations([(30.2672, -97.7431), (27.9506, -82.4572)], 0.5)
+
+    assert austin.source == "dot_api"
+    assert tampa.source == "estimated"
+    # Only the DOT API result is kept for the day; the estimate expires soon.
+    assert dot_traffic_service._traffic_cache.currsize == 1
+    assert dot_traffic_service._estimate_cache.currsize == 1
@@ -0,0 +1,55 @@
+"""Tests for precomputed foot traffic summaries and hex bins."""
+import math
+
+from app.services.foot_traffic_aggregates import (
+    DEFAULT_INTENSITY,
+    HEX_EDGE_METERS,
+    MAX_BINS_ACROSS,
+    bin_deltas,
+    hex_cell,
+    hex_center,
+    resolution_for,
+    summarize_popular_times,
+)
+
+
+def test_summary_matches_popular_times():
+    popular_times = {day: [0] * 24 for day in ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday")}
+    popular_times["Friday"][18] = 100
+    popular_times["Saturday"] = [10] * 24
+    popular_times["Sunday"] = [20] * 24
+
+    summary = summarize_popular_times(popular_times)
+
+    assert summary["avg_intensity"] == round((100 + 240 + 480) / (7 * 24), 2)
+    assert summary["peak_hour"] == 18
+    assert summary["peak_day"] == "Sunday"
+    assert summary["weekday_avg"] == round(100 / (5 * 24), 2)
+    assert summary["weekend_avg"] == 15
+    assert summarize_popular_times({})["avg_intensity"] is None
+
+
+def test_hex_cells_contain_their_points():
+    for resolution, edge in HEX_EDGE_METERS.items():
+        for lat, lng in [(30.2672, -97.7431), (47.6062, -122.3321), (-33.8688, 151.2093)]:
+            q, r = hex_cell(lat, lng, resolution)
+            center_lat, center_lng = hex_center(q, r, resolution)
+            assert hex_cell(center_lat, center_lng, resolution) == (q, r)
+            # Mercator cells shrink on the ground by cos(lat)
+            dy = (center_lat - lat) * 111320
+            dx = (center_lng - lng) * 111320 * math.cos(math.radians(lat))
+            assert math.hypot(dx, dy) <= edge * math.cos(math.radians(lat)) * 1.01
+
+
+def test_updates_move_bin_sums_and_resolution_is_bounded():
+    new = bin_deltas([(30.2672, -97.7431, None, {"avg_intensity": 40.0})])
+    assert len(new) == len(HEX_EDGE_METERS)
+    assert all(delta == [1, 40.0, 40.0, 40.0] for delta in new.values())
+
+    updated = bin_deltas([(30.2672, -97.7431, {"avg_intensity": 40.0}, {"avg_intensity": None})])
+    assert all(delta == [0, DEFAULT_INTENSITY - 40, DEFAULT_INTENSITY - 40, DEFAULT_INTENSITY - 40] for delta in updated.values())
+
+    for radius in (100, 1000, 5000, 50000, 100000):
+        resolution = resolution_for(radius)
+        assert radius / HEX_EDGE_METERS[resolution] <= MAX_BINS_ACROSS or resolution == min(HEX_EDGE_METERS)
+    assert resolution_for(1000, zoom=9) == 6
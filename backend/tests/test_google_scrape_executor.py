@@ -0,0 +1,88 @@
+"""Tests for the concurrent, cached Google scrape job executor."""
+import asyncio
+import threading
+import time
+
+import pytest
+
+from app.services import ai_batch_engine
+from app.services.google_scrape_executor import ScrapeJobExecutor
+
+
+class FakeSerpAPI:
+    def __init__(self, delay=0.1):
+        self.delay = delay
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def _call(self):
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.delay)
+
+    def google_maps_search(self, query, location=None):
+        self._call()
+        return {"local_results": [{"data_id": f"{query}-{i}", "title": f"{query} {i}"} for i in range(4)]}
+
+    def google_maps_reviews(self, data_id):
+        self._call()
+        if data_id.startswith("broken"):
+            raise RuntimeError("reviews unavailable")
+        return {"reviews": [{"snippet": f"review of {data_id}"}]}
+
+
+class InMemoryExecutor(ScrapeJobExecutor):
+    """Keeps google_search_cache and google_maps_businesses rows in dicts (the tables are Postgres-only)."""
+
+    def __init__(self, store, *args, **kwargs):
+        super().__init__(None, *args, **kwargs)
+        self.store = store
+
+    def read_cache(self, hashes):
+        return {h: self.store["cache"][h] for h in hashes if h in self.store["cache"]}
+
+    def write_cache(self, entries):
+        self.store["cache_writes"] += 1
+        for entry in entries:
+            self.store["cache"][entry["query_hash"]] = entry["raw_results"]
+
+    def upsert_businesses(self, places, location_id):
+        self.store["business_writes"] += 1
+        for place in places:
+            self.store["businesses"][place["data_id"]] = self.store["businesses"].get(place["data_id"], 0) + 1
+
+
+@pytest.fixture
+def store(monkeypatch):
+    monkeypatch.setitem(ai_batch_engine._buckets, "serpapi", ai_batch_engine.TokenBucket(60000, burst=1000))
+    return {"cache": {}, "businesses": {}, "cache_writes": 0, "business_writes": 0}
+
+
+def test_job_fans_out_and_reruns_from_cache(store):
+    serpapi = FakeSerpAPI(delay=0.1)
+    keywords = [f"kw{i}" for i in range(5)]
+
+    started = time.monotonic()
+    results = asyncio.run(InMemoryExecutor(store, serpapi, concurrency=20).run_maps_reviews(keywords, "Austin, TX", 1))
+    elapsed = time.monotonic() - started
+
+    # 5 searches + 15 reviews; sequentially this would take 2s
+    assert serpapi.calls == 20
+    assert elapsed < 1.0
+    assert [r["keyword"] for r in results] == [kw for kw in keywords for _ in range(3)]
+    assert len(store["businesses"]) == 15
+    assert (store["cache_writes"], store["business_writes"]) == (1, 1)
+
+    rerun = InMemoryExecutor(store, serpapi, concurrency=20)
+    assert asyncio.run(rerun.run_maps_reviews(keywords, "Austin, TX", 1)) == results
+    assert serpapi.calls == 20
+    assert (rerun.api_calls, rerun.cache_hits) == (0, 20)
+
+
+def test_review_errors_skip_the_place(store):
+    serpapi = FakeSerpAPI(delay=0)
+    results = asyncio.run(InMemoryExecutor(store, serpapi).run_maps_reviews(["broken"], "Austin, TX", None))
+
+    assert results == []
+    assert store["businesses"] == {}
+    assert len(store["cache"]) == 1  # the search itself is still cached
@@ -0,0 +1,53 @@
+"""Tests for vectorized optimal-zone grid scoring."""
+import random
+
+import numpy as np
+
+from app.services.grid_scoring import GridScorer, haversine_matrix
+from app.services.location_analyzer import GridPoint, LocationAnalyzer
+
+
+def _competitors(count, seed=7):
+    rng = random.Random(seed)
+    return [
+        {"lat": 30 + rng.uniform(-0.2, 0.2), "lng": -97 + rng.uniform(-0.2, 0.2), "rating": rng.choice([2.5, 4.0, 4.8])}
+        for _ in range(count)
+    ]
+
+
+def _miles(lat1, lng1, lat2, lng2):
+    return haversine_matrix(np.array([lat1]), np.array([lng1]), np.array([lat2]), np.array([lng2]))[0, 0]
+
+
+def test_vectorized_competition_matches_per_point_scoring():
+    competitors = _competitors(40)
+    points = LocationAnalyzer.generate_grid_points(30, -97, 10, num_rings=3)
+    lats = np.array([p.lat for p in points])
+    lngs = np.array([p.lng for p in points])
+    scorer = GridScorer(competitors, analysis_radius_miles=2, base_score=0, competition_weight=1)
+
+    vectorized = scorer.competition_scores(scorer.nearby_mask(lats, lngs))
+
+    for point, score in zip(points, vectorized):
+        nearby = [c for c in competitors if _miles(point.lat, point.lng, c["lat"], c["lng"]) <= 2]
+        assert score == LocationAnalyzer.score_competition(nearby)[0]
+        assert nearby == scorer.competitors_near(point.lat, point.lng)
+
+
+def test_high_resolution_returns_ranked_separated_zones():
+    analyzer = LocationAnalyzer()
+    zones = analyzer.find_optimal_zones(30, -97, 15, 2, competitors=_competitors(200), top_n=3, resolution="high")
+    standard = analyzer.find_optimal_zones(30, -97, 15, 2, competitors=_competitors(200), top_n=1)
+
+    assert [z.rank for z in zones] == [1, 2, 3]
+    assert zones[0].total_score >= standard[0].total_score
+    for i, a in enumerate(zones):
+        for b in zones[i + 1:]:
+            assert _miles(a.center_lat, a.center_lng, b.center_lat, b.center_lng) >= 2
+    # Zones are built by analyze_zone, so insights match the per-point path.
+    top = zones[0]
+    expected = analyzer.analyze_zone(
+        GridPoint(top.center_lat, top.center_lng), 2,
+        competitors=[c for c in _competitors(200) if _miles(top.center_lat, top.center_lng, c["lat"], c["lng"]) <= 2],
+    )
+    assert expected.total_score == top.total_score and expected.insights == top.insights
@@ -0,0 +1,123 @@
+"""Tests for opportunity-created events and the instant alert dispatcher (no Postgres)."""
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import Column, Integer, String, create_engine
+from sqlalchemy.orm import Session, declarative_base
+
+from app.models.opportunity import Opportunity
+from app.models.saved_search import SavedSearch
+from app.services.opportunity_events import opportunity_created, opportunity_events
+
+NOW = datetime(2026, 10, 16, 12, 0, tzinfo=timezone.utc)
+
+Base = declarative_base()
+
+
+class Row(Base):
+    __tablename__ = "rows"
+    id = Column(Integer, primary_key=True)
+    name = Column(String)
+
+
+@pytest.fixture
+def published():
+    events = []
+    handler = events.append
+    opportunity_events.subscribe(handler)
+    yield events
+    opportunity_events.unsubscribe(handler)
+
+
+@pytest.fixture
+def session():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as db:
+        yield db
+
+
+def test_events_are_published_after_commit(session, published):
+    row = Row(name="a")
+    session.add(row)
+    opportunity_created(session, row)
+    session.flush()
+    assert published == []
+
+    session.commit()
+    assert published == [[row.id]]
+
+
+def test_rolled_back_opportunities_are_not_published(session, published):
+    row = Row(name="a")
+    session.add(row)
+    opportunity_created(session, row)
+    session.flush()
+    session.rollback()
+    session.commit()
+    assert published == []
+
+
+def test_failed_savepoint_keeps_outer_transaction_events(session, published):
+    row = Row(name="a")
+    session.add(row)
+    opportunity_created(session, row)
+    session.flush()
+    try:
+        with session.begin_nested():
+            session.add(Row(id=row.id, name="duplicate"))
+    except Exception:
+        pass
+
+    session.commit()
+    assert published == [[row.id]]
+
+
+class FakeQuery:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def filter(self, *args):
+        return self
+
+    def all(self):
+        return self.rows
+
+
+class FakeSession:
+    def __init__(self, searches, opportunities):
+        self.rows = {SavedSearch: searches, Opportunity: opportunities}
+
+    def query(self, model):
+        return FakeQuery(self.rows[model])
+
+    def close(self):
+        pass
+
+
+def test_deliver_due_respects_debounce_and_coalesces(monkeypatch):
+    # saved_search_alerts pulls in the AI router and its provider SDKs
+    instant_alerts = pytest.importorskip("app.services.instant_alerts")
+    InstantAlertDispatcher = instant_alerts.InstantAlertDispatcher
+
+    search = SimpleNamespace(id=1, user_id=5, filters={}, last_notified_at=NOW - timedelta(minutes=4))
+    opportunities = [
+        SimpleNamespace(id=10, created_at=NOW - timedelta(minutes=1), feasibility_score=50.0),
+        SimpleNamespace(id=11, created_at=NOW, feasibility_score=80.0),
+    ]
+    delivered = []
+    monkeypatch.setattr(instant_alerts, "deliver_matches", lambda db, matches: delivered.append(matches) or len(matches))
+
+    dispatcher = InstantAlertDispatcher(lambda: FakeSession([search], opportunities), coalesce_seconds=0)
+    dispatcher._pending[1] = {10, 11}
+    dispatcher._due_at[1] = search.last_notified_at + dispatcher.debounce
+
+    assert dispatcher.deliver_due(now=NOW) == 0
+    assert delivered == []
+
+    assert dispatcher.deliver_due(now=NOW + timedelta(minutes=6)) == 1
+    (user_id, [(matched_search, matches)]), = delivered[0].items()
+    assert user_id == 5 and matched_search is search
+    assert [o.id for o in matches] == [11, 10]
+    assert dispatcher._pending == {} and dispatcher._due_at == {}
@@ -0,0 +1,58 @@
+"""Tests for the shared LLM response cache."""
+from app.services.llm_cache import CachedResponse, LLMResponseCache
+
+
+def _cache():
+    return LLMResponseCache(memory_entries=10, use_database=False)
+
+
+def test_key_covers_every_request_parameter():
+    base = dict(provider="anthropic", model="m", prompt="p", system="s", temperature=0.2, max_tokens=100)
+    key = LLMResponseCache.make_key(**base)
+
+    assert key == LLMResponseCache.make_key(**base)
+    for field, value in [("provider", "deepseek"), ("model", "m2"), ("prompt", "p2"),
+                         ("system", "s2"), ("temperature", 0.3), ("max_tokens", 200)]:
+        assert LLMResponseCache.make_key(**{**base, field: value}) != key
+
+
+def test_second_identical_request_is_served_from_cache():
+    cache = _cache()
+    calls = []
+
+    def generate():
+        calls.append(1)
+        return CachedResponse("hello", input_tokens=10, output_tokens=5)
+
+    first = cache.get_or_generate("anthropic", "m", "prompt", generate, task="report")
+    second = cache.get_or_generate("anthropic", "m", "prompt", generate, task="report")
+
+    assert len(calls) == 1
+    assert not first.cached
+    assert second.cached and second.text == "hello"
+
+    stats = cache.stats()
+    assert stats["misses"] == 1
+    assert stats["memory_hits"] == 1
+    assert stats["input_tokens_saved"] == 10
+    assert stats["output_tokens_saved"] == 5
+
+
+def test_empty_responses_are_not_cached():
+    cache = _cache()
+    responses = iter([CachedResponse(""), CachedResponse("ok")])
+
+    assert cache.get_or_generate("anthropic", "m", "p", lambda: next(responses)).text == ""
+    assert cache.get_or_generate("anthropic", "m", "p", lambda: next(responses)).text == "ok"
+
+
+def test_expired_entries_miss(monkeypatch):
+    cache = _cache()
+    key = cache.make_key("anthropic", "m", "p")
+    cache.set(key, CachedResponse("old"), "anthropic", "m", task="platform_coordination")
+
+    import app.services.llm_cache as llm_cache_module
+    now = llm_cache_module.time.time()
+    monkeypatch.setattr(llm_cache_module.time, "time", lambda: now + 2 * 3600)
+
+    assert cache.get(key) is None
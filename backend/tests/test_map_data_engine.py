@@ -0,0 +1,96 @@
+"""Tests for MapDataEngine bounds queries (SQL execution is stubbed)."""
+from contextlib import nullcontext
+from types import SimpleNamespace
+
+from sqlalchemy.exc import OperationalError, ProgrammingError
+
+from app.services import map_data_engine
+from app.services.map_data_engine import MapDataEngine
+
+US_BOUNDS = {"north": 50, "south": 24, "east": -66, "west": -125}
+BLOCK_BOUNDS = {"north": 30.27, "south": 30.26, "east": -97.74, "west": -97.75}
+
+
+def _engine(results):
+    engine = MapDataEngine(db=None)
+    calls = []
+
+    def execute(sql, params):
+        calls.append((sql, params))
+        return results.pop(0)
+
+    engine._execute_in_bounds = execute
+    return engine, calls
+
+
+def test_estimate_zoom_from_longitude_span():
+    assert MapDataEngine.estimate_zoom({"east": 180, "west": -180}) == 0
+    assert MapDataEngine.estimate_zoom(US_BOUNDS) == 3
+    assert MapDataEngine.estimate_zoom(BLOCK_BOUNDS) > MapDataEngine.CLUSTER_MAX_ZOOM
+
+
+def test_low_zoom_returns_clusters():
+    buckets = [
+        SimpleNamespace(layer="pins", n=40, lat=30.0, lng=-97.0, intensity=None, first_id=1),
+        SimpleNamespace(layer="pins", n=1, lat=31.0, lng=-98.0, intensity=None, first_id=7),
+        SimpleNamespace(layer="heatmap", n=5, lat=32.0, lng=-96.0, intensity=0.8, first_id=3),
+    ]
+    engine, calls = _engine([buckets, []])
+
+    data = engine.get_map_data_for_bounds(US_BOUNDS)
+
+    assert data["clustered"] is True
+    assert data["layers"]["clusters"]["data"] == [{"lat": 30.0, "lng": -97.0, "count": 40}]
+    assert data["layers"]["pins"]["data"] == [{"id": 7, "lat": 31.0, "lng": -98.0}]
+    assert data["layers"]["heatmap"]["data"][0]["count"] == 5
+    assert data["totalFeatures"] == 46
+    assert "GROUP BY" in calls[0][0]
+
+
+def test_high_zoom_returns_raw_pins_without_popups():
+    rows = [
+        SimpleNamespace(id=1, latitude=30.265, longitude=-97.745, feature_type="point", location_name=None,
+                        source="google_maps", name="Cafe", rating=4.5, reviews=12, intensity=None,
+                        title=None, geojson=None),
+        SimpleNamespace(id=2, latitude=30.266, longitude=-97.746, feature_type="point", location_name=None,
+                        source="reddit", name=None, rating=None, reviews=None, intensity=None,
+                        title="Need childcare", geojson=None),
+    ]
+    engine, _ = _engine([rows])
+
+    data = engine.get_map_data_for_bounds(BLOCK_BOUNDS)
+
+    assert data["clustered"] is False
+    pin = data["layers"]["pins"]["data"][0]
+    assert pin["id"] == 1 and pin["rating"] == 4.5
+    assert "popup" not in pin
+    assert data["layers"]["heatmap"]["data"][0]["intensity"] == 0.5
+
+
+class _GeomFailingSession:
+    def __init__(self, error):
+        self.error = error
+        self.statements = []
+
+    def begin_nested(self):
+        return nullcontext()
+
+    def execute(self, statement, params):
+        self.statements.append(str(statement))
+        if "geom &&" in str(statement):
+            raise self.error
+        return SimpleNamespace(fetchall=lambda: [])
+
+
+def test_geom_path_disabled_only_when_postgis_is_missing(monkeypatch):
+    monkeypatch.setattr(map_data_engine, "_geom_supported", None)
+    timeout = OperationalError("SELECT", {}, SimpleNamespace(pgcode="57014"))
+    db = _GeomFailingSession(timeout)
+    MapDataEngine(db=db)._execute_in_bounds("SELECT 1 WHERE {bbox}", {})
+    assert map_data_engine._geom_supported is None
+    assert "latitude BETWEEN" in db.statements[-1]
+
+    missing = ProgrammingError("SELECT", {}, SimpleNamespace(pgcode="42703"))
+    db = _GeomFailingSession(missing)
+    MapDataEngine(db=db)._execute_in_bounds("SELECT 1 WHERE {bbox}", {})
+    assert map_data_engine._geom_supported is False
@@ -0,0 +1,54 @@
+"""Tests for the security header and trace ID middleware."""
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.middleware.security import SecurityHeadersMiddleware
+from app.middleware.trace_id import TraceIdMiddleware, get_trace_id
+
+
+def _client(base_url="http://testserver"):
+    app = FastAPI()
+
+    @app.get("/trace")
+    def trace():
+        return {"trace_id": get_trace_id()}
+
+    @app.get("/stream")
+    def stream():
+        return StreamingResponse(iter([b"a", b"b", b"c"]), media_type="text/plain")
+
+    app.add_middleware(SecurityHeadersMiddleware)
+    app.add_middleware(TraceIdMiddleware)
+    return TestClient(app, base_url=base_url)
+
+
+class TestSecurityHeadersMiddleware:
+    def test_sets_default_headers(self):
+        response = _client().get("/trace")
+        assert response.headers["X-Content-Type-Options"] == "nosniff"
+        assert response.headers["X-Frame-Options"] == "DENY"
+        assert response.headers["Referrer-Policy"] == "strict-origin-when-cross-origin"
+        assert "Strict-Transport-Security" not in response.headers
+
+    def test_hsts_over_https(self):
+        response = _client(base_url="https://testserver").get("/trace")
+        assert response.headers["Strict-Transport-Security"].startswith("max-age=31536000")
+
+
+class TestTraceIdMiddleware:
+    def test_propagates_incoming_trace_id(self):
+        response = _client().get("/trace", headers={"X-Trace-ID": "abc123"})
+        assert response.headers["X-Trace-ID"] == "abc123"
+        assert response.json() == {"trace_id": "abc123"}
+
+    def test_generates_trace_id(self):
+        response = _client().get("/trace")
+        assert len(response.headers["X-Trace-ID"]) == 12
+        assert response.json()["trace_id"] == response.headers["X-Trace-ID"]
+
+    def test_streaming_response(self):
+        response = _client().get("/stream")
+        assert response.text == "abc"
+        assert "X-Trace-ID" in response.headers
+        assert response.headers["X-Frame-Options"] == "DENY"
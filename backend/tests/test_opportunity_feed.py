@@ -0,0 +1,100 @@
+"""Tests for opportunity feed cursors and count caching."""
+from datetime import datetime, timezone
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.models.opportunity import Opportunity
+from app.services import opportunity_feed
+from app.services.opportunity_feed import (
+    InvalidCursor,
+    cached_count,
+    decode_cursor,
+    encode_cursor,
+    invalidate_opportunity_counts,
+)
+
+
+@pytest.fixture(autouse=True)
+def clear_counts():
+    invalidate_opportunity_counts()
+    yield
+    invalidate_opportunity_counts()
+
+
+def test_cursor_round_trip_for_datetime_sort():
+    created = datetime(2026, 3, 1, 12, 30, tzinfo=timezone.utc)
+    opp = Opportunity(id=42, created_at=created)
+
+    assert decode_cursor(encode_cursor("recent", opp), "recent") == (created, 42)
+
+
+def test_cursor_round_trip_for_null_sort_value():
+    opp = Opportunity(id=7, feasibility_score=None)
+
+    assert decode_cursor(encode_cursor("feasibility", opp), "feasibility") == (None, 7)
+
+
+def test_cursor_rejects_other_sort_and_garbage():
+    opp = Opportunity(id=1, growth_rate=3.5)
+    cursor = encode_cursor("trending", opp)
+
+    with pytest.raises(InvalidCursor):
+        decode_cursor(cursor, "recent")
+    with pytest.raises(InvalidCursor):
+        decode_cursor("not-a-cursor", "recent")
+
+
+def test_count_is_cached_per_key_until_invalidated():
+    query = MagicMock()
+    query.order_by.return_value.count.side_effect = [10, 11, 12]
+
+    assert cached_count(query, ("active", None)) == 10
+    assert cached_count(query, ("active", None)) == 10
+    assert cached_count(query, ("active", "Tech")) == 11
+
+    invalidate_opportunity_counts()
+    assert cached_count(query, ("active", None)) == 12
+
+
+def test_insert_listener_invalidates_counts():
+    query = MagicMock()
+    query.order_by.return_value.count.side_effect = [5, 6]
+    cached_count(query, ("active",))
+
+    opportunity_feed._opportunity_written(None, None, Opportunity(id=1))
+
+    assert cached_count(query, ("active",)) == 6
+
+
+def test_counts_are_invalidated_at_commit_not_flush():
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import Session
+
+    engine = create_engine("sqlite://")
+    Opportunity.__table__.create(engine)
+    query = MagicMock()
+    query.order_by.return_value.count.side_effect = [5, 6]
+    cached_count(query, ("active",))
+
+    with Session(engine) as db:
+        db.add(Opportunity(title="New", description="x", category="Other", severity=3))
+        db.flush()
+        assert cached_count(query, ("active",)) == 5
+        db.commit()
+
+    assert cached_count(query, ("active",)) == 6
+
+
+def test_count_racing_an_invalidation_is_not_cached():
+    query = MagicMock()
+
+    def count_while_invalidated():
+        invalidate_opportunity_counts()
+        return 5
+
+    calls = iter([count_while_invalidated, lambda: 6])
+    query.order_by.return_value.count.side_effect = lambda: next(calls)()
+
+    assert cached_count(query, ("active",)) == 5
+    assert cached_count(query, ("active",)) == 6
@@ -0,0 +1,73 @@
+"""Tests for the streaming OpportunityProcessor pipeline (SQLite)."""
+import asyncio
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.models.opportunity import Opportunity
+from app.models.scraped_source import ScrapedSource
+from app.services.opportunity_processor import OpportunityProcessor
+
+PAIN_TEXT = "It is so frustrating that nobody offers late night dog grooming in this neighborhood, I really need it"
+
+
+@pytest.fixture
+def db(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'processor.db'}")
+    ScrapedSource.__table__.create(engine)
+    Opportunity.__table__.create(engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+
+def _processor(db):
+    processor = OpportunityProcessor(db)
+    processor.client = None  # rule-based fallback analysis, even where an API key is configured
+    return processor
+
+
+def _add_sources(db, count, text=PAIN_TEXT):
+    for i in range(count):
+        db.add(ScrapedSource(external_id=f"post-{i}", source_type="reddit", raw_data={"title": text, "body": str(i)}))
+    db.commit()
+
+
+def test_backlog_is_streamed_in_pages_and_committed_in_micro_batches(db, monkeypatch):
+    _add_sources(db, 25)
+    db.add(Opportunity(title="Existing", description="x", category="Other", severity=3, source_id="post-10"))
+    db.commit()
+
+    processor = _processor(db)
+    commits = []
+    original_commit = db.commit
+    monkeypatch.setattr(db, "commit", lambda: (commits.append(1), original_commit())[1])
+
+    stats = asyncio.run(processor.process_pending_sources(limit=20, page_size=7, commit_every=4))
+
+    assert stats == {"processed": 20, "opportunities_created": 19, "skipped": 1, "errors": 0}
+    assert len(commits) >= 5
+    # Newest first: the five oldest sources are left for the next run
+    pending = {s.external_id for s in db.query(ScrapedSource).filter(ScrapedSource.processed == 0)}
+    assert pending == {f"post-{i}" for i in range(5)}
+    assert db.query(Opportunity).filter(Opportunity.source_id == "post-10").count() == 1
+
+
+def test_a_failing_source_does_not_lose_the_rest_of_its_batch(db, monkeypatch):
+    _add_sources(db, 6)
+    processor = _processor(db)
+    original_create = processor._create_opportunity_from_analysis
+
+    def create(source, analysis, raw_data):
+        if source.external_id == "post-2":
+            raise ValueError("bad analysis")
+        return original_create(source, analysis, raw_data)
+
+    monkeypatch.setattr(processor, "_create_opportunity_from_analysis", create)
+    stats = asyncio.run(processor.process_pending_sources(limit=10, commit_every=10))
+
+    assert stats == {"processed": 6, "opportunities_created": 5, "skipped": 0, "errors": 1}
+    failed = db.query(ScrapedSource).filter(ScrapedSource.external_id == "post-2").one()
+    assert failed.processed == -1 and "bad analysis" in failed.error_message
+    assert db.query(Opportunity).count() == 5
@@ -0,0 +1,109 @@
+"""Tests for the compiled signal pattern matcher."""
+import re
+
+from sqlalchemy import Column, Integer, String, create_engine
+from sqlalchemy.orm import Session, declarative_base
+
+from app.services.pattern_matcher import (
+    PatternEntry,
+    PatternMatcher,
+    SIGNAL_PATTERN_GROUPS,
+    get_pattern_matcher,
+    invalidate_pattern_matcher,
+    keyword_matrix_entries,
+    required_literal,
+)
+
+
+def _naive_matches(entries, text):
+    matches = []
+    for entry in entries:
+        try:
+            if re.search(entry.regex, text, re.IGNORECASE):
+                matches.append({
+                    'category': entry.category,
+                    'pattern': entry.name,
+                    'confidence': entry.confidence,
+                })
+        except re.error:
+            continue
+    return matches
+
+
+def _sample_texts():
+    texts = ["", "Great place, friendly staff.", "Switched to Acme last month, Acme is better"]
+    for patterns in SIGNAL_PATTERN_GROUPS.values():
+        for data in patterns.values():
+            texts.extend(data.get('examples', []))
+    texts.append(" ".join(texts))
+    texts.append("NEW POLICY: we NOW CHARGE $5 every time. Hidden fees, wasn't told about it")
+    texts.append("NEW POL\u0130CY, \u017furprise fee, caf\u00e9 wait times")
+    return texts
+
+
+class TestRequiredLiteral:
+    def test_leading_word(self):
+        assert required_literal(r"hidden\s+(fee|charge|cost)") == "hidden"
+
+    def test_optional_trailing_char_dropped(self):
+        assert required_literal(r"months?\s+ago") == "month"
+
+    def test_word_boundary_skipped(self):
+        assert required_literal(r"\bparking\s+fee") == "parking"
+
+    def test_top_level_alternation(self):
+        assert required_literal(r"always|constantly") is None
+
+    def test_no_literal(self):
+        assert required_literal(r"[A-Z][a-z]+\s+is\s+better") is None
+        assert required_literal(r"\$\d+") is None
+
+
+class TestPatternMatcher:
+    def test_matches_naive_search(self):
+        entries = keyword_matrix_entries()
+        matcher = PatternMatcher(entries)
+        for text in _sample_texts():
+            assert matcher.match(text) == _naive_matches(entries, text)
+
+    def test_overlapping_literals(self):
+        entries = [
+            PatternEntry('x', 'short', r"new", 0.6),
+            PatternEntry('x', 'long', r"news\w*", 0.7),
+            PatternEntry('x', 'inner', r"wsp", 0.8),
+        ]
+        matcher = PatternMatcher(entries)
+        assert [m['pattern'] for m in matcher.match("Newspaper")] == ['short', 'long', 'inner']
+
+    def test_invalid_pattern_skipped(self):
+        matcher = PatternMatcher([
+            PatternEntry('x', 'broken', r"(unclosed", 0.5),
+            PatternEntry('x', 'ok', r"late\s+again", 0.9),
+        ])
+        assert len(matcher) == 1
+        assert matcher.match("late again") == [{'category': 'x', 'pattern': 'ok', 'confidence': 0.9}]
+
+
+Base = declarative_base()
+
+
+class Note(Base):
+    __tablename__ = "notes"
+    id = Column(Integer, primary_key=True)
+    text = Column(String)
+
+
+def test_failed_pattern_read_keeps_the_callers_pending_work():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)  # no validation_patterns table
+    invalidate_pattern_matcher()
+    try:
+        with Session(engine) as db:
+            db.add(Note(text="pending"))
+            db.flush()
+            matcher = get_pattern_matcher(db)
+            db.commit()
+            assert len(matcher) == len(keyword_matrix_entries())
+            assert db.query(Note).count() == 1
+    finally:
+        invalidate_pattern_matcher()
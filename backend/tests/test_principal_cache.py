@@ -0,0 +1,155 @@
+"""Tests for the authenticated principal cache (SQLite)."""
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.models.subscription import Subscription, SubscriptionStatus, SubscriptionTier, UnlockedOpportunity, UnlockMethod
+from app.models.user import User
+from app.services import principal_cache
+from app.services.entitlements import get_entitlements_for_many, get_opportunity_entitlements, load_entitlement_context
+
+
+@pytest.fixture
+def session_factory():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    for model in (User, Subscription, UnlockedOpportunity):
+        model.__table__.create(engine)
+
+    selects = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def count_selects(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            selects.append(statement)
+
+    factory = sessionmaker(bind=engine)
+    db = factory()
+    user = User(email="owner@example.com", name="Owner", hashed_password="x")
+    db.add(user)
+    db.flush()
+    db.add(Subscription(user_id=user.id, tier=SubscriptionTier.PRO, status=SubscriptionStatus.ACTIVE))
+    db.add(UnlockedOpportunity(user_id=user.id, opportunity_id=7, unlock_method=UnlockMethod.PAY_PER_UNLOCK))
+    db.commit()
+    db.close()
+
+    principal_cache.clear_principals()
+    factory.selects = selects
+    yield factory
+    principal_cache.clear_principals()
+
+
+def _opportunity(opportunity_id, author_id=None):
+    return SimpleNamespace(id=opportunity_id, author_id=author_id, created_at=datetime.now(timezone.utc) - timedelta(days=100))
+
+
+def test_warm_requests_load_only_the_user_row(session_factory):
+    db = session_factory()
+    user = principal_cache.load_principal(db, "owner@example.com")
+    load_entitlement_context(db, user)
+    db.close()
+
+    session_factory.selects.clear()
+    db = session_factory()
+    user = principal_cache.load_principal(db, "owner@example.com")
+    context = load_entitlement_context(db, user)
+    unlocked = get_opportunity_entitlements(db, _opportunity(7), user, context)
+    locked = get_opportunity_entitlements(db, _opportunity(8), user, context)
+
+    assert len(session_factory.selects) == 1 and "users" in session_factory.selects[0]
+    assert user.email == "owner@example.com"
+    assert context.tier == SubscriptionTier.PRO
+    assert unlocked.is_unlocked and unlocked.unlock_method == UnlockMethod.PAY_PER_UNLOCK.value
+    assert not locked.is_unlocked
+    db.close()
+
+
+def test_writes_invalidate_the_cached_principal(session_factory):
+    db = session_factory()
+    user = principal_cache.load_principal(db, "owner@example.com")
+    load_entitlement_context(db, user)
+    db.query(Subscription).filter(Subscription.user_id == user.id).one().tier = SubscriptionTier.BUSINESS
+    user.is_banned = True
+    db.commit()
+    db.close()
+
+    db = session_factory()
+    user = principal_cache.load_principal(db, "owner@example.com")
+    assert user.is_banned
+    assert load_entitlement_context(db, user).tier == SubscriptionTier.BUSINESS
+
+    session_factory.selects.clear()
+    principal_cache.invalidate_principal(user.id)
+    principal_cache.load_principal(db, "owner@example.com")
+    assert len(session_factory.selects) == 1
+    db.close()
+
+
+def test_page_entitlements_load_unlocks_in_one_query(session_factory):
+    db = session_factory()
+    user = db.query(User).filter(User.email == "owner@example.com").one()
+    page = [_opportunity(7), _opportunity(8), _opportunity(9, author_id=user.id)]
+
+    session_factory.selects.clear()
+    entitlements = get_entitlements_for_many(db, page, user)
+
+    unlock_queries = [sql for sql in session_factory.selects if "unlocked_opportunities" in sql]
+    assert len(unlock_queries) == 1 and " IN " in unlock_queries[0]
+    assert [entitlements[i].is_unlocked for i in (7, 8, 9)] == [True, False, True]
+    assert entitlements[8].can_pay_to_unlock is False  # Pro tier: archive is included
+    assert all(ent.is_accessible for ent in entitlements.values())
+    db.close()
+
+
+def test_cached_principal_does_not_overwrite_concurrent_writes(session_factory):
+    db = session_factory()
+    principal_cache.load_principal(db, "owner@example.com")
+    db.close()
+
+    # Another worker's write: no mapper events fire in this process
+    other = session_factory()
+    other.execute(text("UPDATE users SET impact_points = 50 WHERE email = 'owner@example.com'"))
+    other.commit()
+    other.close()
+
+    db = session_factory()
+    user = principal_cache.load_principal(db, "owner@example.com")
+    user.impact_points += 10
+    db.commit()
+    db.close()
+
+    db = session_factory()
+    assert db.query(User).filter(User.email == "owner@example.com").one().impact_points == 60
+    db.close()
+
+
+def test_versions_bump_at_commit_not_flush(session_factory):
+    writer = session_factory()
+    writer.query(User).filter(User.email == "owner@example.com").one().is_banned = True
+    writer.flush()
+
+    # A request between the writer's flush and commit caches the principal...
+    reader = session_factory()
+    principal_cache.load_principal(reader, "owner@example.com")
+    reader.close()
+    assert principal_cache._current_entry("owner@example.com") is not None
+
+    # ...and the commit invalidates it.
+    writer.commit()
+    writer.close()
+    assert principal_cache._current_entry("owner@example.com") is None
+
+
+def test_evicting_a_live_version_stamp_drops_cached_principals(session_factory, monkeypatch):
+    monkeypatch.setattr(principal_cache, "_versions", principal_cache._VersionStamps(maxsize=1, ttl=60))
+    db = session_factory()
+    principal_cache.load_principal(db, "owner@example.com")
+    db.close()
+
+    principal_cache.invalidate_principal(1001)
+    assert principal_cache._principals.currsize == 1
+    principal_cache.invalidate_principal(1002)
+    assert principal_cache._principals.currsize == 0
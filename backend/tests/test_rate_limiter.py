@@ -0,0 +1,143 @@
+"""Tests for the rate limiter backends and the ASGI rate limit middleware."""
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.middleware.rate_limit import RateLimitMiddleware
+from app.services.rate_limiter import InMemoryRateLimiter, PostgresRateLimiter
+
+
+class TestInMemoryRateLimiter:
+    def test_allows_burst_up_to_limit(self):
+        limiter = InMemoryRateLimiter()
+        results = [limiter.hit("k", 5) for _ in range(5)]
+        assert all(r.allowed for r in results)
+        assert [r.remaining for r in results] == [4, 3, 2, 1, 0]
+
+    def test_rejects_over_limit(self):
+        limiter = InMemoryRateLimiter()
+        for _ in range(3):
+            limiter.hit("k", 3)
+        result = limiter.hit("k", 3)
+        assert not result.allowed
+        assert result.remaining == 0
+        assert result.retry_after >= 1
+
+    def test_rejected_hits_do_not_consume_quota(self):
+        limiter = InMemoryRateLimiter()
+        for _ in range(10):
+            limiter.hit("k", 2)
+        # Only the two allowed hits advanced the key's theoretical arrival time.
+        assert limiter._tat["k"] - time.monotonic() <= 60
+
+    def test_keys_are_independent(self):
+        limiter = InMemoryRateLimiter()
+        limiter.hit("a", 1)
+        assert not limiter.hit("a", 1).allowed
+        assert limiter.hit("b", 1).allowed
+
+
+class TestPostgresRateLimiterKeys:
+    def test_long_keys_fit_source_column(self):
+        source = PostgresRateLimiter._source_for("203.0.113.9:/api/v1/opportunities/" + "x" * 80)
+        assert len(source) <= 50
+        assert source.startswith("rl:")
+
+    def test_short_keys_kept_readable(self):
+        assert PostgresRateLimiter._source_for("team_7") == "rl:team_7"
+
+
+class _RecordingEngine:
+    def __init__(self):
+        self.params = []
+
+    @contextmanager
+    def begin(self):
+        yield self
+
+    def execute(self, statement, params):
+        self.params.append(params)
+        return SimpleNamespace(fetchone=lambda: (1, 0))
+
+
+def test_postgres_windows_are_utc_regardless_of_local_timezone(monkeypatch):
+    if not hasattr(time, "tzset"):
+        pytest.skip("time.tzset unavailable")
+    engine = _RecordingEngine()
+    monkeypatch.setattr(PostgresRateLimiter, "_engine", staticmethod(lambda: engine))
+    monkeypatch.setenv("TZ", "Asia/Tokyo")
+    time.tzset()
+    try:
+        PostgresRateLimiter().hit("k", 5)
+    finally:
+        monkeypatch.undo()
+        time.tzset()
+
+    hit, cleanup = engine.params
+    utc_now = datetime.now(timezone.utc).replace(tzinfo=None)
+    assert abs((hit["now"] - utc_now).total_seconds()) < 5
+    assert timedelta(0) <= utc_now - hit["window_start"] <= timedelta(seconds=65)
+    assert cleanup["cutoff"] < hit["window_start"]
+
+
+def _client(**kwargs):
+    app = FastAPI()
+
+    @app.get("/ping")
+    def ping():
+        return {"ok": True}
+
+    @app.post("/api/v1/auth/login")
+    def login():
+        return {"ok": True}
+
+    @app.get("/health")
+    def health():
+        return {"ok": True}
+
+    app.add_middleware(RateLimitMiddleware, backend=InMemoryRateLimiter(), **kwargs)
+    return TestClient(app)
+
+
+class TestRateLimitMiddleware:
+    def test_sets_rate_limit_headers(self):
+        client = _client(default_limit_per_minute=10)
+        response = client.get("/ping")
+        assert response.status_code == 200
+        assert response.headers["X-RateLimit-Limit"] == "10"
+        assert response.headers["X-RateLimit-Remaining"] == "9"
+
+    def test_returns_429_when_exceeded(self):
+        client = _client(default_limit_per_minute=2)
+        client.get("/ping")
+        client.get("/ping")
+        response = client.get("/ping")
+        assert response.status_code == 429
+        assert response.json() == {"detail": "Rate limit exceeded"}
+        assert "Retry-After" in response.headers
+
+    def test_route_override(self):
+        client = _client(default_limit_per_minute=100)
+        response = client.post("/api/v1/auth/login")
+        assert response.headers["X-RateLimit-Limit"] == "20"
+
+    def test_prefix_override(self):
+        client = _client(default_limit_per_minute=100, overrides={("GET", "/pi*"): 7})
+        assert client.get("/ping").headers["X-RateLimit-Limit"] == "7"
+
+    def test_skipped_paths_not_limited(self):
+        client = _client(default_limit_per_minute=1)
+        for _ in range(3):
+            response = client.get("/health")
+            assert response.status_code == 200
+            assert "X-RateLimit-Limit" not in response.headers
+
+    def test_disabled(self):
+        client = _client(enabled=False, default_limit_per_minute=1)
+        assert client.get("/ping").status_code == 200
+        assert client.get("/ping").status_code == 200
@@ -0,0 +1,82 @@
+"""Tests for the layer report queue: claiming, deduplication and progress events (SQLite)."""
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.models.generated_report import GeneratedReport, ReportStatus, ReportType
+from app.services.report_queue import ReportProgressBroker, claim_next_job, heartbeat_reports, requeue_stale_reports
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    GeneratedReport.__table__.create(engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+
+def _report(db, user_id, opportunity_id, report_type=ReportType.LAYER_2_DEEP_DIVE, status=ReportStatus.PENDING):
+    report = GeneratedReport(user_id=user_id, opportunity_id=opportunity_id, report_type=report_type, status=status)
+    db.add(report)
+    db.commit()
+    return report
+
+
+def test_claim_groups_identical_jobs_across_users(db):
+    first = _report(db, user_id=1, opportunity_id=10)
+    other_type = _report(db, user_id=2, opportunity_id=10, report_type=ReportType.LAYER_1_OVERVIEW)
+    duplicate = _report(db, user_id=3, opportunity_id=10)
+    other_opportunity = _report(db, user_id=1, opportunity_id=11)
+
+    job = claim_next_job(db)
+
+    assert job.report_ids == [first.id, duplicate.id]
+    assert job.report_type == ReportType.LAYER_2_DEEP_DIVE
+    db.expire_all()
+    assert first.status == duplicate.status == ReportStatus.GENERATING
+    assert other_type.status == other_opportunity.status == ReportStatus.PENDING
+
+    assert claim_next_job(db).report_ids == [other_type.id]
+    assert claim_next_job(db).report_ids == [other_opportunity.id]
+    assert claim_next_job(db) is None
+
+
+def test_claim_ignores_other_report_types(db):
+    _report(db, user_id=1, opportunity_id=10, report_type=ReportType.BUSINESS_PLAN)
+    assert claim_next_job(db) is None
+
+
+def test_heartbeat_keeps_long_renders_from_being_requeued(db):
+    running = _report(db, user_id=1, opportunity_id=10)
+    dead = _report(db, user_id=2, opportunity_id=11)
+    claim_next_job(db)
+    claim_next_job(db)
+    long_ago = datetime.utcnow() - timedelta(hours=1)
+    db.query(GeneratedReport).update({GeneratedReport.updated_at: long_ago}, synchronize_session=False)
+    db.commit()
+
+    heartbeat_reports(db, [running.id])
+
+    assert requeue_stale_reports(db) == 1
+    db.expire_all()
+    assert running.status == ReportStatus.GENERATING
+    assert dead.status == ReportStatus.PENDING
+
+
+def test_progress_reaches_sse_subscribers():
+    broker = ReportProgressBroker()
+
+    async def listen():
+        queue = broker.subscribe(7)
+        broker.publish(7, None, "generating", 40, "Analyzing trade area")
+        event = await asyncio.wait_for(queue.get(), timeout=1)
+        broker.unsubscribe(7, queue)
+        return event
+
+    event = asyncio.run(listen())
+    assert event == {"report_id": 7, "status": "generating", "progress": 40, "message": "Analyzing trade area"}
+    assert broker.latest(7) == event
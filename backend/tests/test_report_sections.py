@@ -0,0 +1,74 @@
+"""Tests for concurrent report section rendering."""
+import threading
+
+import pytest
+
+from app.services.report_sections import ReportSection, render_sections
+
+
+def test_independent_sections_run_concurrently_and_dependents_get_results():
+    barrier = threading.Barrier(2, timeout=5)
+    calls = []
+
+    def shared(r, db):
+        calls.append("shared")
+        return {"population": 1000}
+
+    def waits_for_peer(name):
+        def build(r, db):
+            # Both sections must be running at once for the barrier to open.
+            barrier.wait()
+            return name
+        return build
+
+    sections = [
+        ReportSection("left", waits_for_peer("left")),
+        ReportSection("right", waits_for_peer("right")),
+        ReportSection("shared", shared),
+        ReportSection("uses_shared", lambda r, db: r["shared"]["population"] + 1, after=("shared",)),
+        ReportSection("joins", lambda r, db: (r["left"], r["uses_shared"]), after=("left", "uses_shared")),
+    ]
+    progress = []
+
+    rendered = render_sections(sections, max_workers=3, progress=lambda done, total, name: progress.append((done, total)))
+
+    assert rendered["joins"] == ("left", 1001)
+    assert calls == ["shared"]
+    assert set(rendered.timings_ms) == {"left", "right", "shared", "uses_shared", "joins"}
+    assert rendered.metadata()["slowest_section"] in rendered.timings_ms
+    assert progress[-1] == (5, 5)
+
+
+def test_db_sections_get_their_own_session():
+    opened = []
+
+    def session_factory():
+        session = type("FakeSession", (), {"close": lambda self: opened.append("closed")})()
+        opened.append(session)
+        return session
+
+    rendered = render_sections(
+        [ReportSection("query", lambda r, db: db, uses_db=True)],
+        max_workers=2,
+        session_factory=session_factory,
+    )
+
+    assert rendered["query"] is opened[0]
+    assert opened[1] == "closed"
+
+
+def test_failures_propagate_and_bad_graphs_are_rejected():
+    def boom(r, db):
+        raise RuntimeError("section failed")
+
+    with pytest.raises(RuntimeError, match="section failed"):
+        render_sections([ReportSection("boom", boom)], max_workers=2)
+
+    with pytest.raises(ValueError, match="unknown section"):
+        render_sections([ReportSection("a", boom, after=("missing",))], max_workers=2)
+
+    with pytest.raises(ValueError, match="cycle"):
+        render_sections(
+            [ReportSection("a", boom, after=("b",)), ReportSection("b", boom, after=("a",))],
+            max_workers=2,
+        )
@@ -0,0 +1,98 @@
+"""Tests for the inverted saved-search matcher (no database)."""
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+from app.services import saved_search_matcher
+from app.services.saved_search_matcher import SavedSearchIndex, match_new_opportunities
+
+NOW = datetime(2026, 10, 16, 12, 0, tzinfo=timezone.utc)
+
+
+def _search(id, user_id=1, last_notified_at=None, **filters):
+    return SimpleNamespace(id=id, user_id=user_id, filters=filters, last_notified_at=last_notified_at)
+
+
+def _opportunity(id, hours_ago=1, **fields):
+    values = dict(
+        title="Mobile pet grooming",
+        description="Pet owners want grooming at home",
+        category="Services",
+        realm_type="physical",
+        country="US",
+        geographic_scope="local",
+        completion_status="open",
+        feasibility_score=70.0,
+        validation_count=3,
+    )
+    values.update(fields)
+    return SimpleNamespace(id=id, created_at=NOW - timedelta(hours=hours_ago), **values)
+
+
+def test_equality_filters_and_wildcards():
+    index = SavedSearchIndex([
+        _search(1, category="Services"),
+        _search(2, category="Technology"),
+        _search(3),
+        _search(4, country="US", realm_type="physical"),
+        _search(5, country="CA"),
+    ], now=NOW)
+
+    assert sorted(index.match(_opportunity(10))) == [1, 3, 4]
+
+
+def test_search_term_is_case_insensitive_substring():
+    index = SavedSearchIndex([
+        _search(1, search="GROOM"),
+        _search(2, search="at home"),
+        _search(3, search="veterinary"),
+        _search(4, search="pe"),
+    ], now=NOW)
+
+    assert sorted(index.match(_opportunity(10))) == [1, 2, 4]
+
+
+def test_range_filters_and_since():
+    index = SavedSearchIndex([
+        _search(1, min_feasibility=60, max_feasibility=80),
+        _search(2, min_feasibility=75),
+        _search(3, min_validations=5),
+        _search(4, last_notified_at=NOW - timedelta(minutes=30)),
+        _search(5, max_age_days=1),
+    ], now=NOW)
+
+    assert sorted(index.match(_opportunity(10))) == [1, 5]
+    assert 1 not in index.match(_opportunity(11, feasibility_score=None))
+    assert index.match(_opportunity(12, hours_ago=30)) == []
+
+
+def test_matches_grouped_by_user_and_sorted(monkeypatch):
+    opportunities = [
+        _opportunity(1, feasibility_score=60.0),
+        _opportunity(2, feasibility_score=90.0),
+        _opportunity(3, category="Technology"),
+    ]
+    seen_since = []
+
+    def stream(db, since):
+        seen_since.append(since)
+        return iter(opportunities)
+
+    monkeypatch.setattr(saved_search_matcher, "stream_new_opportunities", stream)
+    searches = [
+        _search(1, user_id=7, category="Services"),
+        _search(2, user_id=7, category="Technology"),
+        _search(3, user_id=8, category="Retail"),
+        _search(4, user_id=9, last_notified_at=NOW - timedelta(hours=2)),
+    ]
+
+    result = match_new_opportunities(None, searches, now=NOW)
+
+    assert seen_since == [NOW - timedelta(hours=24)]
+    assert set(result) == {7, 9}
+    by_search = {search.id: [o.id for o in matches] for search, matches in result[7]}
+    assert by_search == {1: [2, 1], 2: [3]}
+
+
+def test_no_searches_skips_the_scan(monkeypatch):
+    monkeypatch.setattr(saved_search_matcher, "stream_new_opportunities", lambda db, since: 1 / 0)
+    assert match_new_opportunities(None, [], now=NOW) == {}
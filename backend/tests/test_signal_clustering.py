@@ -0,0 +1,61 @@
+"""Tests for the bucketed signal clustering engine."""
+import random
+from datetime import datetime, timedelta
+
+from app.services.signal_clustering import cluster_signals
+from app.services.signal_to_opportunity import SignalToOpportunityProcessor
+
+
+CATEGORIES = ['restaurant', 'apartment', 'childcare', 'retail', '']
+CITIES = ['Austin', 'austin ', 'Miami', 'Boston', '', None]
+WORDS = ['parking', 'rent', 'slow', 'service', 'daycare', 'waitlist', 'noise', 'price', 'clean', 'late']
+
+
+def _make_signals(count, seed):
+    rng = random.Random(seed)
+    base = datetime(2026, 1, 1)
+    signals = []
+    for i in range(count):
+        has_coords = rng.random() < 0.6
+        signals.append({
+            'id': f"sig_{rng.randint(0, count * 2)}",
+            'detected_category': rng.choice(CATEGORIES),
+            'city': rng.choice(CITIES),
+            'latitude': 30.0 + rng.uniform(-1, 1) if has_coords else None,
+            'longitude': -97.0 + rng.uniform(-1, 1) if has_coords else None,
+            'text': ' '.join(rng.choice(WORDS) for _ in range(rng.randint(0, 8))),
+            'scraped_at': base + timedelta(hours=rng.randint(0, 24 * 60)),
+        })
+    return signals
+
+
+def _pairwise(signals):
+    processor = SignalToOpportunityProcessor.__new__(SignalToOpportunityProcessor)
+    return processor._cluster_signals_pairwise(signals)
+
+
+def _ids(clusters):
+    return [[id(s) for s in cluster] for cluster in clusters]
+
+
+class TestClusterSignals:
+    def test_matches_pairwise_greedy(self):
+        for seed in range(20):
+            signals = _make_signals(150, seed)
+            assert _ids(cluster_signals(signals)) == _ids(_pairwise(signals))
+
+    def test_iso_string_timestamps(self):
+        signals = _make_signals(60, 99)
+        for s in signals:
+            s['scraped_at'] = s['scraped_at'].isoformat() + 'Z'
+        assert _ids(cluster_signals(signals)) == _ids(_pairwise(signals))
+
+    def test_unrelated_signals_stay_separate(self):
+        signals = [
+            {'id': 'a', 'detected_category': 'restaurant', 'city': 'Austin', 'text': 'slow service'},
+            {'id': 'b', 'detected_category': 'childcare', 'city': 'Boston', 'text': 'daycare waitlist'},
+        ]
+        assert len(cluster_signals(signals)) == 2
+
+    def test_empty_input(self):
+        assert cluster_signals([]) == []
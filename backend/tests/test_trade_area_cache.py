@@ -0,0 +1,96 @@
+"""Tests for the shared trade area component cache."""
+import threading
+
+from app.services.trade_area_cache import TradeAreaCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _cache(clock):
+    return TradeAreaCache(max_entries=100, ttls={"competitors": (10, 60)}, clock=clock)
+
+
+def test_fresh_hits_then_stale_while_revalidate():
+    clock = FakeClock()
+    cache = _cache(clock)
+    calls = []
+
+    def fetch():
+        calls.append(clock.now)
+        return [{"name": f"Shop {len(calls)}"}]
+
+    assert cache.get_or_fetch("competitors", "k", fetch) == [{"name": "Shop 1"}]
+    clock.now = 5
+    assert cache.get_or_fetch("competitors", "k", fetch) == [{"name": "Shop 1"}]
+    assert len(calls) == 1
+
+    refreshed = threading.Event()
+
+    def slow_refresh():
+        result = fetch()
+        refreshed.set()
+        return result
+
+    clock.now = 20
+    # Stale: served immediately while the refresh runs in the background.
+    assert cache.get_or_fetch("competitors", "k", slow_refresh) == [{"name": "Shop 1"}]
+    assert refreshed.wait(5)
+    cache._refresh_executor.shutdown(wait=True)
+    assert cache.get_or_fetch("competitors", "k", fetch) == [{"name": "Shop 2"}]
+
+    clock.now = 200
+    assert cache.get_or_fetch("competitors", "k", fetch) == [{"name": "Shop 3"}]
+    assert cache.stats()["competitors.stale"] == 1
+
+
+def test_concurrent_misses_share_one_fetch_and_empty_results_are_not_stored():
+    cache = _cache(FakeClock())
+    release = threading.Event()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        release.wait(5)
+        return [{"name": "Shop"}]
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(cache.get_or_fetch("competitors", "k", fetch)))
+        for _ in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    while cache.stats().get("competitors.joined", 0) + cache.stats().get("competitors.miss", 0) < 4:
+        pass
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert len(calls) == 1
+    assert results == [[{"name": "Shop"}]] * 4
+
+    empty_calls = []
+    for _ in range(2):
+        cache.get_or_fetch("competitors", "empty", lambda: empty_calls.append(1) or [])
+    assert len(empty_calls) == 2
+
+
+def test_trade_area_map_key_includes_secondary_signals(monkeypatch):
+    from app.services.trade_area_analyzer import TradeAreaAnalyzer
+    from app.services.trade_area_cache import invalidate_trade_area_cache
+
+    analyzer = TradeAreaAnalyzer()
+    monkeypatch.setattr(analyzer, "_generate_trade_area_map", lambda lat, lng, radius, competitors, signals: str(signals))
+    invalidate_trade_area_cache("map")
+    try:
+        first = analyzer._cached_trade_area_map(30.0, -97.0, 3.0, [], [{"type": "secondary", "lat": 30.01, "lng": -97.01}])
+        second = analyzer._cached_trade_area_map(30.0, -97.0, 3.0, [], [{"type": "secondary", "lat": 30.05, "lng": -97.05}])
+        assert first != second
+    finally:
+        invalidate_trade_area_cache("map")
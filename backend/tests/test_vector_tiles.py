@@ -0,0 +1,64 @@
+"""Tests for vector tile validation and the on-disk tile cache (PostGIS is stubbed)."""
+import pytest
+
+from app.core.config import settings
+from app.services import vector_tiles
+from app.services.vector_tiles import InvalidTile, get_tile, invalidate_tile_cache, validate_tile
+
+
+class FakeResult:
+    def __init__(self, value):
+        self.value = value
+
+    def fetchone(self):
+        return (self.value,)
+
+
+class FakeSession:
+    def __init__(self, tile=b"\x1a\x02mvt"):
+        self.tile = tile
+        self.calls = []
+
+    def execute(self, sql, params):
+        self.calls.append(params)
+        return FakeResult(self.tile)
+
+
+@pytest.fixture(autouse=True)
+def tile_cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "TILE_CACHE_DIR", str(tmp_path))
+    return tmp_path
+
+
+def test_validate_tile_rejects_bad_requests():
+    with pytest.raises(InvalidTile):
+        validate_tile("parcels", 10, 0, 0)
+    with pytest.raises(InvalidTile):
+        validate_tile("traffic_roads", 3, 8, 0)
+    assert validate_tile("traffic_roads", 3, 7, 7).name == "traffic_roads"
+
+
+def test_simplification_and_road_filter_relax_with_zoom():
+    assert vector_tiles.simplify_tolerance(14) < vector_tiles.simplify_tolerance(8)
+    assert vector_tiles.road_min_aadt(6) > vector_tiles.road_min_aadt(9) > vector_tiles.road_min_aadt(14) == 0
+
+
+def test_tiles_below_min_zoom_skip_the_database():
+    db = FakeSession()
+    data, _ = get_tile(db, "foot_traffic", 2, 1, 1)
+    assert data == b""
+    assert db.calls == []
+
+
+def test_tiles_are_cached_until_invalidated(tile_cache_dir):
+    db = FakeSession()
+    first, _ = get_tile(db, "traffic_roads", 12, 1100, 1700)
+    second, _ = get_tile(db, "traffic_roads", 12, 1100, 1700)
+
+    assert first == second == b"\x1a\x02mvt"
+    assert len(db.calls) == 1
+    assert (tile_cache_dir / "traffic_roads" / "12" / "1100" / "1700.mvt").exists()
+
+    invalidate_tile_cache("traffic_roads")
+    get_tile(db, "traffic_roads", 12, 1100, 1700)
+    assert len(db.calls) == 2
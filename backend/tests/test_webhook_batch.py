@@ -0,0 +1,74 @@
+"""Bulk ingestion path of WebhookGateway.process_batch (needs DATABASE_URL)."""
+import asyncio
+import uuid
+
+from app.models.scraped_source import ScrapedSource
+from app.services.webhook_gateway import WebhookGateway
+
+
+def test_batch_reports_one_status_per_item(db_session, monkeypatch):
+    monkeypatch.setenv("WEBHOOK_DEV_MODE", "1")
+    gateway = WebhookGateway(db_session)
+    prefix = f"test-batch-{uuid.uuid4().hex}"
+    first, second = f"{prefix}-1", f"{prefix}-2"
+
+    try:
+        asyncio.run(gateway.process_batch("custom", [{"id": first, "data": {}}], pre_authenticated=True))
+
+        result = asyncio.run(gateway.process_batch(
+            "custom",
+            [
+                {"id": first, "data": {}},
+                {"id": second, "data": {"n": 1}},
+                {"id": second, "data": {"n": 2}},
+                {"id": f"{prefix}-3"},
+            ],
+            pre_authenticated=True,
+        ))
+
+        assert len(result["items"]) == 4
+        assert (result["errors"], result["duplicates"]) == (1, 2)
+        assert result["accepted"] + result["rate_limited"] == 1
+        if result["accepted"]:
+            accepted = next(item for item in result["items"] if item["status"] == "accepted")
+            stored = db_session.get(ScrapedSource, accepted["source_id"])
+            assert (stored.external_id, stored.raw_data) == (second, {"id": second, "data": {"n": 1}})
+    finally:
+        db_session.query(ScrapedSource).filter(ScrapedSource.external_id.like(f"{prefix}%")).delete(
+            synchronize_session=False
+        )
+        db_session.commit()
+
+
+def test_one_bad_row_does_not_fail_the_batch(db_session, monkeypatch):
+    monkeypatch.setenv("WEBHOOK_DEV_MODE", "1")
+    gateway = WebhookGateway(db_session)
+    prefix = f"test-batch-{uuid.uuid4().hex}"
+
+    try:
+        result = asyncio.run(gateway.process_batch(
+            "custom",
+            [
+                {"id": f"{prefix}-1", "data": {}},
+                {"id": f"{prefix}-bad", "data": {"text": "nul \u0000 byte"}},  # JSONB rejects \u0000
+                {"id": f"{prefix}-2", "data": {}},
+            ],
+            pre_authenticated=True,
+        ))
+
+        assert result["errors"] == 1
+        error = next(item for item in result["items"] if item["status"] == "error")
+        assert error["external_id"] == f"{prefix}-bad"
+        stored = {
+            row.external_id
+            for row in db_session.query(ScrapedSource).filter(ScrapedSource.external_id.like(f"{prefix}%"))
+        }
+        assert stored == {
+            item["external_id"] for item in result["items"] if item["status"] == "accepted"
+        }
+        assert result["accepted"] + result["rate_limited"] == 2
+    finally:
+        db_session.query(ScrapedSource).filter(ScrapedSource.external_id.like(f"{prefix}%")).delete(
+            synchronize_session=False
+        )
+        db_session.commit()
@@ -0,0 +1,71 @@
+"""Tests for concurrent zone metric fetching."""
+import asyncio
+import threading
+import time
+
+import pytest
+
+from app.services import trend_indicators
+from app.services.trade_area_cache import invalidate_trade_area_cache
+from app.services.zone_data_fetcher import ZoneDataFetcher
+from app.services.zone_fanout import ZoneMetricsFanout
+
+
+class FakeSession:
+    def close(self):
+        pass
+
+
+@pytest.fixture(autouse=True)
+def fakes(monkeypatch):
+    invalidate_trade_area_cache()
+    monkeypatch.setattr(trend_indicators, "calculate_trends", lambda db, lat, lng, radius, data: {"momentum": 1})
+    yield
+    invalidate_trade_area_cache()
+
+
+def _fanout(**kwargs):
+    return ZoneMetricsFanout(radius_miles=3, traffic_mode="estimated", session_factory=FakeSession, **kwargs)
+
+
+def test_sources_run_concurrently_and_identical_searches_are_coalesced(monkeypatch):
+    searches = []
+    searching = threading.Event()
+
+    def fetch_competitors(self, lat, lng, radius, business_type):
+        searches.append((lat, lng))
+        searching.set()
+        time.sleep(0.05)
+        return {"count": 4, "source": "serpapi"}
+
+    def fetch_traffic(self, lat, lng, radius, mode="hybrid"):
+        # Only returns real data if the competitor search is running alongside.
+        concurrent = searching.wait(2)
+        return {"foot_traffic_monthly": 100, "drive_by_traffic_monthly": 200 if concurrent else 0}
+
+    monkeypatch.setattr(ZoneDataFetcher, "_fetch_competitors", fetch_competitors)
+    monkeypatch.setattr(ZoneDataFetcher, "_fetch_traffic", fetch_traffic)
+
+    zones = asyncio.run(_fanout(business_type="cafe").fetch_all([(30.0, -97.0), (30.0, -97.0)]))
+
+    assert len(searches) == 1
+    for metrics in zones:
+        assert metrics.total_competitors == 4
+        assert metrics.drive_by_traffic_monthly == 200
+        assert metrics.raw_data["trends"] == {"momentum": 1}
+        assert metrics.raw_data["estimated_sources"] == []
+
+
+def test_sources_past_the_budget_fall_back_to_flagged_estimates(monkeypatch):
+    def slow_traffic(self, lat, lng, radius, mode="hybrid"):
+        time.sleep(0.5)
+        return {"foot_traffic_monthly": 1, "drive_by_traffic_monthly": 1}
+
+    monkeypatch.setattr(ZoneDataFetcher, "_fetch_traffic", slow_traffic)
+
+    metrics = asyncio.run(_fanout(budget_seconds=0.1).fetch_all([(30.0, -97.0)]))[0]
+
+    assert metrics.raw_data["estimated_sources"] == ["traffic", "trends"]
+    assert metrics.raw_data["traffic"]["source"] == "estimated"
+    assert metrics.foot_traffic_monthly > 1
+    assert metrics.total_population > 0
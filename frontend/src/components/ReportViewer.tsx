@@ -1,4 +1,4 @@
-import { useState } from 'react'
+import { useEffect, useRef, useState } from 'react'
 import { useMutation, useQuery } from '@tanstack/react-query'
 import { X, Download, FileText, Lock, Loader2, CheckCircle } from 'lucide-react'
 import { useAuthStore } from '../stores/authStore'
@@ -23,6 +23,84 @@ type ReportViewerProps = {
   hasUnlockedAccess?: boolean
 }
 
+type ReportProgress = {
+  status: string
+  progress: number
+  message: string | null
+}
+
+const REPORT_WAIT_TIMEOUT_MS = 10 * 60 * 1000
+const STATUS_POLL_INTERVAL_MS = 2000
+
+class ReportFailedError extends Error {}
+
+const sleep = (ms: number, signal: AbortSignal) =>
+  new Promise<void>((resolve, reject) => {
+    const timer = setTimeout(resolve, ms)
+    signal.addEventListener('abort', () => {
+      clearTimeout(timer)
+      reject(signal.reason)
+    }, { once: true })
+  })
+
+// Progress events end with a completed or failed one; anything else keeps waiting.
+const checkFinished = (event: ReportProgress & { error_message?: string }): boolean => {
+  if (event.status === 'failed') {
+    throw new ReportFailedError(event.error_message || event.message || 'Report generation failed')
+  }
+  return event.status === 'completed'
+}
+
+// Waits for a queued report to finish. Progress is streamed from the report's
+// SSE endpoint; if the stream is unavailable, the status endpoint is polled.
+async function waitForReport(
+  reportId: number,
+  token: string | null,
+  signal: AbortSignal,
+  onProgress: (event: ReportProgress) => void,
+): Promise<void> {
+  const headers = { Authorization: `Bearer ${token}` }
+  try {
+    const res = await fetch(`/api/v1/reports/${reportId}/events`, { headers, signal })
+    if (res.ok && res.body) {
+      const reader = res.body.getReader()
+      const decoder = new TextDecoder()
+      let buffer = ''
+      for (;;) {
+        const { value, done } = await reader.read()
+        if (done) break
+        buffer += decoder.decode(value, { stream: true })
+        const messages = buffer.split('\n\n')
+        buffer = messages.pop() ?? ''
+        for (const message of messages) {
+          const data = message
+            .split('\n')
+            .filter((line) => line.startsWith('data:'))
+            .map((line) => line.slice(5).trim())
+            .join('\n')
+          if (!data) continue
+          const event = JSON.parse(data) as ReportProgress
+          onProgress(event)
+          if (checkFinished(event)) return
+        }
+      }
+    }
+  } catch (err) {
+    if (signal.aborted) throw signal.reason
+    if (err instanceof ReportFailedError) throw err
+    // Stream unavailable (e.g. a buffering proxy): fall back to polling below.
+  }
+
+  for (;;) {
+    await sleep(STATUS_POLL_INTERVAL_MS, signal)
+    const statusRes = await fetch(`/api/v1/reports/${reportId}/status`, { headers, signal })
+    const status = await statusRes.json()
+    if (!statusRes.ok) throw new Error(status.detail || 'Failed to check report status')
+    onProgress(status)
+    if (checkFinished(status)) return
+  }
+}
+
 const layerConfig = {
   layer1: {
     title: 'Problem Overview',
@@ -60,6 +138,10 @@ export default function ReportViewer({
   const [selectedLayer, setSelectedLayer] = useState<ReportLayer>(initialLayer)
   const [generatedReport, setGeneratedReport] = useState<GeneratedReport | null>(null)
   const [error, setError] = useState<string | null>(null)
+  const [progress, setProgress] = useState<ReportProgress | null>(null)
+  const waitController = useRef<AbortController | null>(null)
+
+  useEffect(() => () => waitController.current?.abort(), [])
 
   const tierLevel = (tier: string): number => {
     const levels: Record<string, number> = { free: 0, pro: 1, business: 2, enterprise: 3 }
@@ -87,7 +169,27 @@ export default function ReportViewer({
       if (!res.ok) {
         throw new Error(data.detail?.message || data.detail || 'Failed to generate report')
       }
-      const report = data.report
+      let report = data.report
+      if (!report) {
+        // Reports are generated by a background queue; wait (bounded) for the job to finish.
+        const headers = { Authorization: `Bearer ${token}` }
+        waitController.current?.abort()
+        const controller = new AbortController()
+        waitController.current = controller
+        const timeout = setTimeout(
+          () => controller.abort(new Error('Report is taking longer than expected. Check your reports again in a few minutes.')),
+          REPORT_WAIT_TIMEOUT_MS,
+        )
+        try {
+          await waitForReport(data.report_id, token, controller.signal, setProgress)
+        } finally {
+          clearTimeout(timeout)
+          setProgress(null)
+        }
+        const reportRes = await fetch(`/api/v1/reports/${data.report_id}`, { headers, signal: controller.signal })
+        report = await reportRes.json()
+        if (!reportRes.ok) throw new Error(report.detail || 'Failed to load report')
+      }
       return {
         id: report.id,
         opportunity_id: opportunityId,
@@ -337,7 +439,7 @@ export default function ReportViewer({
                 {generateMutation.isPending ? (
                   <>
                     <Loader2 className="w-5 h-5 animate-spin" />
-                    Generating...
+                    {progress ? `${progress.message || 'Generating'}... ${progress.progress}%` : 'Generating...'}
                   </>
                 ) : (
                   <>
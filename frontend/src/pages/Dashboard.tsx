@@ -2,7 +2,7 @@ import { Link, useSearchParams, useNavigate } from 'react-router-dom'
 import { useQuery } from '@tanstack/react-query'
 import { useAuthStore } from '../stores/authStore'
 import { useUpgrade } from '../contexts/UpgradeContext'
-import { useMemo, useEffect, useState } from 'react'
+import { useEffect, useState } from 'react'
 import { 
   Brain, Target, Lightbulb, Users, FileText, DollarSign, Zap, Loader2, Lock, Bookmark, ChevronRight, Briefcase, CheckCircle, X
 } from 'lucide-react'
@@ -39,6 +39,8 @@ type Opportunity = {
 
 type OpportunityList = {
   opportunities: Opportunity[]
+  // Per-card lock state, keyed by opportunity id
+  access?: Record<number, AccessInfo>
   total: number
 }
 
@@ -151,28 +153,6 @@ export default function Dashboard() {
     ? Math.round(topOpportunities.reduce((acc, o) => acc + (o.feasibility_score || 75), 0) / topOpportunities.length)
     : 0
 
-  const opportunityIds = useMemo(() => 
-    topOpportunities.map(o => o.id),
-    [topOpportunities]
-  )
-
-  const { data: accessInfoData } = useQuery({
-    queryKey: ['dashboard-batch-access', opportunityIds],
-    enabled: opportunityIds.length > 0,
-    queryFn: async (): Promise<Record<number, AccessInfo>> => {
-      const headers: Record<string, string> = { 'Content-Type': 'application/json' }
-      if (token) headers.Authorization = `Bearer ${token}`
-      const res = await fetch('/api/v1/opportunities/batch-access', {
-        method: 'POST',
-        headers,
-        body: JSON.stringify(opportunityIds),
-      })
-      if (!res.ok) return {}
-      return res.json()
-    },
-    staleTime: 60 * 1000,
-  })
-
   return (
     <div className="max-w-7xl mx-auto px-4 sm:px-6 lg:px-8 py-8">
       {showSubscriptionSuccess && (
@@ -267,7 +247,7 @@ export default function Dashboard() {
                   const growth = opp.growth_rate || (5 + (opp.id % 25))
                   const signals = opp.validation_count || (2 + (opp.id % 18))
                   const marketSize = formatMarketSize(opp.ai_market_size_estimate)
-                  const accessInfo = accessInfoData?.[opp.id]
+                  const accessInfo = opportunities?.access?.[opp.id]
                   const isAccessible = accessInfo?.is_accessible ?? true
                   
                   return (
@@ -48,7 +48,7 @@ export interface RecommendedOpportunitiesResponse {
 export interface OpportunitiesResponse {
   opportunities: Opportunity[]
   total: number
-  page: number
+  page: number | null // null for cursor (keyset) pages
   page_size: number
   has_more?: boolean
   is_gated: boolean